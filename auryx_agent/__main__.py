@@ -306,16 +306,58 @@ For more information, visit: https://github.com/Badim41/network_tools
     
     # Network commands
     ping_parser = subparsers.add_parser("ping", help="Ping a host")
-    ping_parser.add_argument("host", type=str, help="Host to ping")
+    ping_parser.add_argument("host", type=str, nargs="+", help="Host(s) to ping")
+    ping_parser.add_argument("--count", "-c", type=int, default=4, help="Packets per host (default: 4)")
     
     dns_parser = subparsers.add_parser("dns", help="DNS lookup")
     dns_parser.add_argument("host", type=str, help="Host to lookup")
+    dns_parser.add_argument("--type", "-t", type=str, default=None,
+                            help="Record types to query, e.g. MX,TXT,NS (default: addresses)")
     
     ports_parser = subparsers.add_parser("ports", help="Port scan")
     ports_parser.add_argument("host", type=str, help="Host to scan")
+    ports_parser.add_argument("--ports", "-p", type=str, default=None,
+                              help="Ports to scan, e.g. 1-1024,8080 (default: common ports)")
+    ports_parser.add_argument("--concurrency", "-c", type=int, default=256,
+                              help="Connection attempts in flight (default: 256)")
+    ports_parser.add_argument("--timeout", "-t", type=float, default=1.0,
+                              help="Connect timeout per port in seconds (default: 1.0)")
+    
+    sweep_parser = subparsers.add_parser("sweep", help="Check many hosts at once")
+    sweep_parser.add_argument("targets", type=str, nargs="+",
+                              help="CIDR blocks and/or hosts, e.g. 192.168.1.0/24 web1 web2")
+    sweep_parser.add_argument("--ports", "-p", type=str, default=None,
+                              help="Ports to probe on each host, e.g. 22,80,443")
+    sweep_parser.add_argument("--concurrency", "-c", type=int, default=64,
+                              help="Hosts checked at once (default: 64)")
+    sweep_parser.add_argument("--timeout", "-t", type=float, default=1.0,
+                              help="Seconds per ping, connect or lookup (default: 1.0)")
+    sweep_parser.add_argument("--no-ping", action="store_true", help="Use TCP connects only")
+    sweep_parser.add_argument("--no-dns", action="store_true", help="Skip hostname lookups")
+    sweep_parser.add_argument("--all", action="store_true", help="Also list hosts that are down")
+    
+    monitor_parser = subparsers.add_parser("monitor", help="Watch latency, loss and DNS timings")
+    monitor_parser.add_argument("targets", type=str, nargs="*",
+                                help="Hosts, host:port or dns:name (default: configured targets)")
+    monitor_parser.add_argument("--interval", "-i", type=float, default=1.0,
+                                help="Seconds between samples (default: 1.0)")
+    monitor_parser.add_argument("--duration", "-d", type=float, default=60.0,
+                                help="Seconds to run; Ctrl+C stops early (default: 60)")
     
     traceroute_parser = subparsers.add_parser("traceroute", help="Traceroute to host")
     traceroute_parser.add_argument("host", type=str, help="Host to trace")
+    traceroute_parser.add_argument("--max-hops", "-m", type=int, default=30, help="Maximum hops (default: 30)")
+    traceroute_parser.add_argument("--timeout", "-w", type=float, default=1.0,
+                                   help="Seconds to wait per probe (default: 1.0)")
+    traceroute_parser.add_argument("--no-dns", action="store_true", help="Don't resolve hop names")
+    
+    download_parser = subparsers.add_parser("download", help="Download a file (resumable)")
+    download_parser.add_argument("url", type=str, help="URL to download")
+    download_parser.add_argument("--output", "-o", type=str, help="File or directory to save to")
+    download_parser.add_argument("--checksum", type=str, help="Expected digest, e.g. sha256:<hex>")
+    download_parser.add_argument("--connections", "-n", type=int, default=4,
+                                 help="Parallel ranges for large files (default: 4)")
+    download_parser.add_argument("--no-resume", action="store_true", help="Start over instead of resuming")
     
     # Utility commands
     subparsers.add_parser("balance", help="Check account balance")
@@ -447,28 +489,39 @@ def main():
     
     # Handle network commands
     if args.command == "ping":
-        from auryx_agent.tools.network_tools import NetworkTools
+        from auryx_agent.tools.icmp import ping_many
         from auryx_agent.core.formatter import Formatter
         
         fmt = Formatter()
-        result = NetworkTools.ping(args.host)
+        results = ping_many(args.host, count=args.count)
         
-        if result["success"]:
-            print(fmt.section(f"Ping {args.host}", "🏓"))
-            print(result["output"])
-        else:
-            print(fmt.error(f"Ping failed: {result['error']}"))
-            sys.exit(1)
-        sys.exit(0)
+        for stats in results:
+            print(fmt.section(f"Ping {stats.host}", "🏓"))
+            if stats.error and not stats.received:
+                print(fmt.error(f"Ping failed: {stats.error}"))
+                continue
+            if stats.address and stats.address != stats.host:
+                print(fmt.key_value("Address", stats.address))
+            print(fmt.key_value("Received", f"{stats.received}/{stats.transmitted} ({stats.loss:g}% loss)"))
+            summary = stats.summary()
+            if stats.received:
+                print(fmt.key_value("RTT min/avg/max/mdev",
+                                    f"{summary['min_ms']}/{summary['avg_ms']}/{summary['max_ms']}/{summary['mdev_ms']} ms"))
+        sys.exit(0 if any(stats.received for stats in results) else 1)
     
     if args.command == "dns":
         from auryx_agent.tools.network_tools import NetworkTools
         from auryx_agent.core.formatter import Formatter
         
         fmt = Formatter()
-        result = NetworkTools.dns_lookup(args.host)
+        result = NetworkTools.dns_lookup(args.host, args.type)
         
-        if result["success"]:
+        if args.type and result["success"]:
+            print(fmt.section(f"DNS Lookup: {args.host}", "🔍"))
+            for record_type, values in result["records"].items():
+                shown = ", ".join(values) if values else result["rcode"][record_type]
+                print(fmt.key_value(record_type, shown))
+        elif result["success"]:
             print(fmt.section(f"DNS Lookup: {args.host}", "🔍"))
             print(fmt.key_value("Hostname", result["hostname"]))
             if result["aliases"]:
@@ -480,37 +533,169 @@ def main():
         sys.exit(0)
     
     if args.command == "ports":
-        from auryx_agent.tools.network_tools import NetworkTools
+        import socket
+        from auryx_agent.tools.port_scanner import scan_ports
         from auryx_agent.core.formatter import Formatter
         
         fmt = Formatter()
+        
+        def print_open(result):
+            if result.is_open:
+                service = f" ({result.service})" if result.service else ""
+                print(fmt.success(f"{result.port}/tcp open{service}"))
+        
         print(fmt.info(f"Scanning ports on {args.host}..."))
-        result = NetworkTools.scan_ports(args.host)
+        try:
+            result = scan_ports(args.host, args.ports, concurrency=args.concurrency,
+                                timeout=args.timeout, on_result=print_open)
+        except (ValueError, socket.gaierror) as e:
+            print(fmt.error(f"Port scan failed: {e}"))
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print(fmt.warning("Scan cancelled"))
+            sys.exit(130)
         
         print(fmt.section(f"Port Scan: {args.host}", "🔌"))
         print(fmt.key_value("Total scanned", str(result["total_scanned"])))
+        print(fmt.key_value("Duration", f"{result['duration']}s"))
         
         if result["open_ports"]:
             print(fmt.key_value("Open ports", ", ".join(map(str, result["open_ports"]))))
         else:
             print(fmt.warning("No open ports found"))
+        if result["filtered_ports"]:
+            print(fmt.key_value("Filtered", str(len(result["filtered_ports"]))))
+        
+        sys.exit(0)
+    
+    if args.command == "sweep":
+        from auryx_agent.tools.sweep import format_table, sweep_network
+        from auryx_agent.core.formatter import Formatter
+        
+        fmt = Formatter()
+        
+        def print_host(host):
+            if host.alive:
+                ports = f" ports: {', '.join(map(str, host.open_ports))}" if host.open_ports else ""
+                name = f" ({host.hostname})" if host.hostname and host.hostname != host.host else ""
+                print(fmt.success(f"{host.host}{name} is up{ports}"))
+            elif host.error:
+                print(fmt.warning(f"{host.host}: {host.error}"))
+        
+        print(fmt.info(f"Sweeping {' '.join(args.targets)}..."))
+        try:
+            result = sweep_network(args.targets, args.ports or (), ping=not args.no_ping,
+                                   resolve=not args.no_dns, concurrency=args.concurrency,
+                                   timeout=args.timeout, on_result=print_host)
+        except ValueError as e:
+            print(fmt.error(f"Sweep failed: {e}"))
+            sys.exit(1)
+        except KeyboardInterrupt:
+            print(fmt.warning("Sweep cancelled"))
+            sys.exit(130)
         
+        print(fmt.section("Sweep Summary", "📡"))
+        if result["alive"] or args.all:
+            print(format_table(result["results"], show_down=args.all))
+        print(fmt.key_value("Hosts up", f"{result['alive']}/{result['total']}"))
+        print(fmt.key_value("Duration", f"{result['duration']}s"))
+        sys.exit(0)
+    
+    if args.command == "monitor":
+        import math
+        import time
+        from auryx_agent.tools.net_monitor import NetworkMonitor, format_summary
+        from auryx_agent.core.formatter import Formatter
+        
+        fmt = Formatter()
+        
+        def print_round(results):
+            cells = [f"{target} {'lost' if math.isnan(value) else f'{value * 1000:.1f}ms'}"
+                     for target, value in results.items()]
+            print(f"{time.strftime('%H:%M:%S')}  " + "  ".join(cells))
+        
+        try:
+            monitor = NetworkMonitor(args.targets, interval=args.interval, on_sample=print_round)
+        except ValueError as e:
+            print(fmt.error(f"Bad target: {e}"))
+            sys.exit(1)
+        
+        print(fmt.info(f"Monitoring {', '.join(t.spec for t in monitor.targets)} "
+                       f"every {args.interval:g}s for {args.duration:g}s (Ctrl+C to stop)..."))
+        monitor.start()
+        try:
+            time.sleep(args.duration)
+        except KeyboardInterrupt:
+            pass
+        monitor.stop()
+        
+        summary = monitor.summary()
+        print(fmt.section("Network Monitor Summary", "📈"))
+        print(format_summary(summary))
+        for anomaly in summary["anomalies"]:
+            print(fmt.warning(anomaly))
+        if summary["healthy"]:
+            print(fmt.success("No anomalies"))
         sys.exit(0)
     
     if args.command == "traceroute":
-        from auryx_agent.tools.network_tools import NetworkTools
+        from auryx_agent.tools.traceroute import trace
         from auryx_agent.core.formatter import Formatter
         
         fmt = Formatter()
-        print(fmt.info(f"Tracing route to {args.host}..."))
-        result = NetworkTools.traceroute(args.host)
+        print(fmt.section(f"Traceroute: {args.host}", "🗺️"))
+        try:
+            result = trace(args.host, max_hops=args.max_hops, timeout=args.timeout,
+                           resolve=not args.no_dns, on_hop=lambda hop: print(hop.text()))
+        except KeyboardInterrupt:
+            print(fmt.warning("Traceroute cancelled"))
+            sys.exit(130)
         
-        if result["success"]:
-            print(fmt.section(f"Traceroute: {args.host}", "🗺️"))
-            print(result["output"])
-        else:
-            print(fmt.error(f"Traceroute failed: {result['error']}"))
+        if result.error and not result.hops:
+            print(fmt.error(f"Traceroute failed: {result.error}"))
             sys.exit(1)
+        status = "reached" if result.reached else "not reached"
+        print(fmt.key_value("Destination", f"{result.address} ({status}, {result.duration:.2f}s)"))
+        sys.exit(0)
+    
+    if args.command == "download":
+        import time
+        from auryx_agent.tools.downloader import download
+        from auryx_agent.core.formatter import Formatter
+        
+        fmt = Formatter()
+        shown = {"at": 0.0}
+        
+        def show_progress(done, total):
+            now = time.monotonic()
+            if now - shown["at"] < 0.2 and done != total:
+                return
+            shown["at"] = now
+            bar = fmt.progress_bar(done, total) if total else ""
+            print(f"\r  {bar} {done / 1e6:.1f} MB", end="", flush=True)
+        
+        print(fmt.section(f"Download: {args.url}", "⬇️"))
+        try:
+            result = download(args.url, args.output, checksum=args.checksum, parts=args.connections,
+                              resume=not args.no_resume, on_progress=show_progress)
+        except KeyboardInterrupt:
+            print()
+            print(fmt.warning("Download interrupted; run the same command to resume"))
+            sys.exit(130)
+        except (OSError, ValueError) as e:
+            print()
+            print(fmt.error(f"Download failed: {e}"))
+            sys.exit(1)
+        
+        print()
+        info = result.to_dict()
+        print(fmt.key_value("Saved to", info["output"]))
+        print(fmt.key_value("Size", f"{info['size']:,} bytes in {info['duration']:.1f}s "
+                                    f"({info['speed_mbps']} Mbit/s)"))
+        if result.resumed_from:
+            print(fmt.key_value("Resumed from", f"{result.resumed_from:,} bytes"))
+        if result.checksum:
+            print(fmt.success(f"{result.checksum['algorithm']} verified"))
         sys.exit(0)
     
     if args.command == "history":
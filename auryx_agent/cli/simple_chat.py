@@ -159,6 +159,21 @@ def simple_chat(model_spec=None):
     agent = Agent(client)
     use_tools = True
     
+    def print_command_output(stream, text):
+        if stream == "stderr":
+            text = f"{fmt.colors.YELLOW}{text}{fmt.colors.RESET}"
+        sys.stdout.write(text)
+        sys.stdout.flush()
+    
+    # Keep configured directories indexed for fast lookups
+    if config.watch_dirs:
+        from auryx_agent.tools.file_watcher import watch_path
+        for directory in config.watch_dirs:
+            try:
+                watch_path(directory)
+            except OSError as e:
+                print(fmt.warning(f"Cannot watch {directory}: {e}"))
+    
     # Chat loop
     while True:
         try:
@@ -261,7 +276,9 @@ def simple_chat(model_spec=None):
                                 # Reload history
                                 load_chat_history(client)
                                 # Recreate agent with new client
+                                planning = agent.planning
                                 agent = Agent(client)
+                                agent.planning = planning
                                 print(fmt.success(f"Switched to {fmt.model_badge(client.current_model, True)} ({provider_name.upper()})"))
                             except Exception as e:
                                 print(fmt.error(f"Failed to switch provider: {e}"))
@@ -283,6 +300,12 @@ def simple_chat(model_spec=None):
                     print(fmt.success(f"Tool mode {status}"))
                     continue
                 
+                elif cmd == "/plan":
+                    agent.planning = not agent.planning
+                    status = "enabled" if agent.planning else "disabled"
+                    print(fmt.success(f"Plan-and-execute mode {status}"))
+                    continue
+                
                 elif cmd == "/save":
                     if len(cmd_parts) < 2:
                         print(fmt.warning("Usage: /save <filename>"))
@@ -319,14 +342,32 @@ def simple_chat(model_spec=None):
                         print(fmt.warning("Usage: /exec <command>"))
                         continue
                     
-                    import subprocess
                     command = user_input[6:].strip()  # Remove "/exec "
+                    
                     try:
-                        result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=30)
-                        if result.stdout:
-                            print(result.stdout)
-                        if result.stderr:
-                            print(fmt.warning(result.stderr))
+                        if sys.platform == "win32":
+                            from auryx_agent.tools.streaming import StreamingCommand
+                            running = StreamingCommand(command, timeout=300, on_output=print_command_output).start()
+                            try:
+                                result = running.wait()
+                            except KeyboardInterrupt:
+                                result = running.result()
+                        else:
+                            # Persistent session: cd and export carry over between /exec calls
+                            from auryx_agent.tools.shell_pool import get_shell_pool
+                            started = time.time()
+                            try:
+                                result = get_shell_pool().run(command, session="cli", timeout=300,
+                                                              on_output=print_command_output)
+                            except KeyboardInterrupt:
+                                result = {"cancelled": True, "duration": time.time() - started}
+                        
+                        if result.get("cancelled"):
+                            print("\n" + fmt.warning(f"Cancelled after {result['duration']:.1f}s"))
+                        elif result["timed_out"]:
+                            print("\n" + fmt.warning(f"Timed out after {result['duration']:.1f}s"))
+                        elif result["returncode"] != 0:
+                            print(fmt.warning(f"Exit code {result['returncode']} ({result['duration']:.1f}s)"))
                     except Exception as e:
                         print(fmt.error(f"Command failed: {e}"))
                     continue
@@ -335,6 +376,7 @@ def simple_chat(model_spec=None):
                     print(fmt.section("Current Session Info", "ℹ️"))
                     print(fmt.key_value("Current Model", fmt.model_badge(client.current_model, True)))
                     print(fmt.key_value("Tool Mode", "Enabled" if use_tools else "Disabled"))
+                    print(fmt.key_value("Plan Mode", "Enabled" if agent.planning else "Disabled"))
                     print(fmt.key_value("History Length", str(len(client.chat_history))))
                     print(fmt.key_value("History File", str(get_history_file())))
                     print(fmt.key_value("Assistant Name", config.assistant_name))
@@ -410,13 +452,14 @@ def simple_chat(model_spec=None):
                     print(fmt.command("/info", "Show session info & history"))
                     print(fmt.command("/clear", "Clear chat history"))
                     print(fmt.command("/tools", "Toggle tool mode"))
+                    print(fmt.command("/plan", "Toggle plan-and-execute mode"))
                     print(fmt.command("/memory", "Show memory stats"))
                     print(fmt.command("/remember <text>", "Add to memory"))
                     print(fmt.command("/recall <query>", "Search memory"))
                     print(fmt.command("/forget", "Clear all memories"))
                     print(fmt.command("/save <file>", "Export conversation"))
                     print(fmt.command("/load <file>", "Import conversation"))
-                    print(fmt.command("/exec <cmd>", "Execute shell command"))
+                    print(fmt.command("/exec <cmd>", "Run in a persistent shell (cd/export persist, Ctrl+C cancels)"))
                     print(fmt.command("/help", "Show this help"))
                     print(fmt.command("/quit", "Save & exit chat"))
                     print(fmt.info("\n💡 History auto-saves between sessions"))
@@ -443,6 +486,16 @@ def simple_chat(model_spec=None):
             spinner_thread = threading.Thread(target=show_spinner, daemon=True)
             spinner_thread.start()
             
+            def show_command_output(stream, text):
+                nonlocal loading
+                if loading:
+                    # Output of a command the agent runs replaces the spinner
+                    loading = False
+                    spinner_thread.join(timeout=0.2)
+                print_command_output(stream, text)
+            
+            agent.on_command_output = show_command_output
+            
             try:
                 if use_tools:
                     response = agent.process(user_input)
@@ -4,15 +4,22 @@ Author: sqrilizz
 GitHub: https://github.com/Sqrilizz/auryx-agent
 """
 
+import inspect
 import json
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 from auryx_agent.core.yellowfire_client import YellowFireClient
+from auryx_agent.core.compactor import compact_result
+from auryx_agent.core.guard import HallucinationGuard
 from auryx_agent.core.memory import MemorySystem
-from auryx_agent.tools.computer_tools import ComputerTools
-from auryx_agent.tools.network_tools import NetworkTools
-from auryx_agent.tools.code_tools import CodeTools
-from auryx_agent.tools.web_tools import WebTools
-from auryx_agent.tools.advanced_computer_tools import AdvancedComputerTools
+from auryx_agent.core.planner import (
+    ANSWER_PROMPT, MAX_PLAN_STEPS, PLANNING_PROMPT, PlanError, PlanExecutor, parse_plan
+)
+from auryx_agent.core.speculation import SpeculativeExecutor
+from auryx_agent.tools.registry import ToolRegistry
+
+
+# Built-in tools whose output can be shown live -> computer_tools function taking on_output
+STREAMED_TOOLS = {"execute_command": "run_command", "run_in_session": "run_session_command"}
 
 
 class Agent:
@@ -43,6 +50,18 @@ class Agent:
 - System monitoring and process management
 - Long-term memory (remembers user preferences and context)
 
+🗂️ Computer Tools:
+- execute_command(command, cwd, timeout): Run a shell command
+- run_in_session(command, session, timeout): Run in a persistent shell (cd/export persist per session)
+- read_file(path, start_line, end_line, tail_lines, grep, context, offset, length): Read a window of a file (large files are never loaded whole)
+- write_file(path, content, append): Write a file
+- apply_patch(patch, base_dir, dry_run): Apply a unified diff to one or more files (atomic)
+- edit_files(edits, base_dir, dry_run): Search/replace edits across files, e.g. [{"path": "a.py", "search": "old", "replace": "new"}] (atomic)
+- list_directory(path, depth, pattern, gitignore, sizes, sort, offset, limit): List a directory tree (optionally skipping .gitignore'd entries, paginated)
+- get_system_info(): Get OS information
+- watch_directory(path, stop): Keep an index of a directory (faster find_files/list_directory)
+- recent_changes(path, since_seconds, limit): What changed in a watched directory
+
 💻 Code Tools:
 - generate_code(description, language, filename): Generate code
 - review_code(filepath): Review and analyze code
@@ -55,11 +74,14 @@ class Agent:
 
 🌐 Web Tools:
 - web_search(query, num_results): Search the web
-- fetch_url(url, timeout): Fetch webpage content
-- download_file(url, output_path): Download files
+- fetch_url(url, timeout, max_tokens, query): Fetch a page as readable markdown (boilerplate removed); pass query to get the most relevant parts of long pages
+- fetch_many(urls, max_tokens, query): Fetch several pages concurrently in one call (use it instead of repeated fetch_url when comparing pages)
+- download_file(url, output_path, checksum=None): Download files (resumes partial downloads, verifies "sha256:<hex>" checksums)
 - check_website(url): Check website status
 - get_weather(location): Get weather information
-- extract_links(url): Extract links from webpage
+- extract_links(url, limit, scope): Links on a page in page order, resolved to absolute URLs; scope is "all", "internal" or "external"
+- crawl_site(url, max_pages, max_depth): Crawl a site (same origin, robots.txt respected) into a local search index
+- search_crawl_index(query, site): Search crawled pages; crawl a documentation site once, then search it instead of fetching page after page
 
 🖥️ Advanced Computer Tools:
 - list_processes(filter_name): List running processes
@@ -68,7 +90,7 @@ class Agent:
 - get_memory_info(): Get RAM/swap info
 - get_cpu_info(): Get CPU information
 - get_network_connections(): List network connections
-- find_files(pattern, directory): Find files
+- find_files(pattern, directory, max_results, content): Find files by name glob, optionally grepping contents with a regex
 - compress_files(files, output, format): Create archives
 - extract_archive(archive, output_dir): Extract archives
 - monitor_system(duration): Monitor system resources
@@ -79,10 +101,12 @@ class Agent:
 - memory_get_context(): Get relevant context
 
 📡 Network Tools:
-- ping(host): Ping a host
-- dns_lookup(host): DNS lookup
-- scan_ports(host): Scan ports
-- traceroute(host): Traceroute
+- ping(host, count): Ping one or more hosts (comma-separated); returns loss and min/avg/max RTT
+- dns_lookup(host, record_type): DNS lookup; addresses by default, or record types like "MX,TXT,NS" (cached by TTL)
+- scan_ports(host, ports, concurrency, timeout): Scan TCP ports concurrently (ports like "1-1024,8080"; default: common ports)
+- network_sweep(targets, ports, ping, resolve): Check many hosts concurrently (CIDR like "192.168.1.0/24" or a host list)
+- traceroute(host, max_hops): Traceroute with per-hop addresses, RTTs and loss
+- network_monitor(action, targets, interval, window): Background latency/loss/DNS sampling; "summary" returns percentiles, jitter and anomaly flags in one call (use it for "is my connection flaky?")
 
 To use a tool, respond with JSON:
 {"tool": "tool_name", "args": {"arg1": "value1"}}
@@ -103,66 +127,24 @@ When you learn something important, use memory_add and mention it briefly at the
 Categories: "preference", "fact", "context", "skill", "project"
 Importance: 1-10 (use 7-9 for important user info)"""
     
-    def __init__(self, client: YellowFireClient, enable_memory: bool = True):
+    def __init__(self, client: YellowFireClient, enable_memory: bool = True,
+                 load_plugins: bool = True, speculative: bool = True):
         """Initialize agent.
         
         Args:
             client: YellowFire client instance
             enable_memory: Enable long-term memory system
+            load_plugins: Discover tools from entry points and the plugins directory
+            speculative: Prefetch obviously needed read-only tools during the first model call
         """
         self.client = client
-        self.computer = ComputerTools()
-        self.network = NetworkTools()
-        self.code = CodeTools()
-        self.web = WebTools()
-        self.advanced = AdvancedComputerTools()
         self.memory = MemorySystem() if enable_memory else None
         
-        # Register all tools
-        self.tools = {
-            # Basic computer tools
-            "execute_command": self.computer.execute_command,
-            "read_file": self.computer.read_file,
-            "write_file": self.computer.write_file,
-            "list_directory": self.computer.list_directory,
-            "get_system_info": self.computer.get_system_info,
-            
-            # Network tools
-            "ping": self.network.ping,
-            "dns_lookup": self.network.dns_lookup,
-            "scan_ports": self.network.scan_ports,
-            "traceroute": self.network.traceroute,
-            
-            # Code tools
-            "generate_code": self.code.generate_code,
-            "review_code": self.code.review_code,
-            "refactor_code": self.code.refactor_code,
-            "find_bugs": self.code.find_bugs,
-            "generate_docs": self.code.generate_docs,
-            "git_status": self.code.git_status,
-            "git_diff": self.code.git_diff,
-            "create_template": self.code.create_template,
-            
-            # Web tools
-            "web_search": self.web.web_search,
-            "fetch_url": self.web.fetch_url,
-            "download_file": self.web.download_file,
-            "check_website": self.web.check_website,
-            "get_weather": self.web.get_weather,
-            "extract_links": self.web.extract_links,
-            
-            # Advanced computer tools
-            "list_processes": self.advanced.list_processes,
-            "kill_process": self.advanced.kill_process,
-            "get_disk_usage": self.advanced.get_disk_usage,
-            "get_memory_info": self.advanced.get_memory_info,
-            "get_cpu_info": self.advanced.get_cpu_info,
-            "get_network_connections": self.advanced.get_network_connections,
-            "find_files": self.advanced.find_files,
-            "compress_files": self.advanced.compress_files,
-            "extract_archive": self.advanced.extract_archive,
-            "monitor_system": self.advanced.monitor_system,
-        }
+        # Register tools by metadata; implementations are imported on first call
+        self.tools = ToolRegistry()
+        if load_plugins:
+            self.tools.load_entry_points()
+            self.tools.load_plugins()
         
         # Add memory tools if enabled
         if self.memory:
@@ -171,6 +153,20 @@ Importance: 1-10 (use 7-9 for important user info)"""
                 "memory_search": self._memory_search,
                 "memory_get_context": self._memory_get_context,
             })
+        
+        self.speculator = SpeculativeExecutor(self.tools) if speculative else None
+        self.guard = HallucinationGuard()
+        
+        # Plan-and-execute mode (toggled with /plan in chat)
+        self.planning = False
+        
+        # Character budgets for tool results sent back to the model
+        self.context_budget = 24000
+        self.max_result_chars = 8000
+        self.min_result_chars = 1000
+        
+        # Called with (stream_name, text) as a shell tool prints, e.g. by the CLI to show it live
+        self.on_command_output: Optional[Callable[[str, str], None]] = None
     
     def _memory_add(self, content: str, category: str = "fact", 
                     importance: int = 5, tags: List[str] = None) -> Dict[str, Any]:
@@ -208,64 +204,20 @@ Importance: 1-10 (use 7-9 for important user info)"""
         Returns:
             True if hallucination risk detected
         """
-        # Keywords that indicate user wants real system data
-        system_info_keywords = [
-            'neofetch', 'system info', 'disk usage', 'disk space', 'memory', 'cpu', 'processes',
-            'running', 'network', 'connections', 'files', 'directory', 'ls',
-            'ps', 'top', 'df', 'free', 'ifconfig', 'ip addr', 'netstat',
-            'uname', 'hostname', 'uptime', 'who', 'w', 'last', 'kernel'
-        ]
-        
-        # Check if user is asking for system info
-        user_lower = user_input.lower()
-        asking_for_system_info = any(keyword in user_lower for keyword in system_info_keywords)
-        
-        if not asking_for_system_info:
-            return False
-        
-        # Check if response contains data without tool call
-        # If response has specific numbers/paths but no tool was used, it's likely hallucinated
-        has_specific_data = any([
-            'GB' in response or 'MB' in response or 'KB' in response or 'TB' in response,
-            'CPU:' in response or 'Memory:' in response,
-            'Kernel:' in response or 'OS:' in response,
-            '/dev/' in response or '/home/' in response,
-            'PID' in response and 'USER' in response,
-        ])
-        
-        # Check if agent is making excuses instead of using tools
-        excuse_phrases = [
-            'слишком много данных',
-            'не может быть полностью отображён',
-            'ограничений',
-            'обычно neofetch отображает',
-            'если вам нужно что-то конкретное',
-            'too much data',
-            'cannot be displayed',
-            'limitations',
-            'usually shows',
-            'if you need something specific',
-        ]
-        
-        making_excuses = any(phrase.lower() in response.lower() for phrase in excuse_phrases)
-        
-        return has_specific_data or making_excuses
+        return self.guard.detect(user_input, response)
     
-    def process(self, user_input: str, max_iterations: int = 5) -> str:
-        """Process user input with tool support.
-        
-        Args:
-            user_input: User's message
-            max_iterations: Maximum tool call iterations
-            
-        Returns:
-            Final response to user
-        """
+    def _prepare_turn(self, user_input: str) -> None:
+        """Refresh the system prompt and start speculative prefetches for a turn."""
         from auryx_agent.core.yellowfire_client import ChatMessage
         
         # Build system prompt with current memory context
         system_prompt = self.SYSTEM_PROMPT
         
+        # Advertise tools contributed by plugins and entry points
+        extra_tools = self.tools.describe("plugin") + "\n" + self.tools.describe("entry_point")
+        if extra_tools.strip():
+            system_prompt += f"\n\n🔌 Plugin Tools:\n{extra_tools.strip()}"
+        
         # Add memory context if available
         if self.memory:
             memory_context = self.memory.get_context_summary()
@@ -280,7 +232,106 @@ Importance: 1-10 (use 7-9 for important user info)"""
             # Add new system prompt
             self.client.chat_history.insert(0, ChatMessage(role="system", content=system_prompt))
         
+        # Start cheap read-only tools the request obviously needs while the model thinks
+        if self.speculator:
+            self.speculator.discard()
+            self.speculator.start(user_input)
+    
+    def _run_tool(self, tool_name: str, tool_args: Dict[str, Any]) -> Any:
+        """Run a tool, reusing a speculative prefetch when one matches."""
+        result = self.speculator.take(tool_name, tool_args) if self.speculator else None
+        if result is None:
+            spec = self.tools.spec(tool_name)
+            if self.on_command_output and tool_name in STREAMED_TOOLS and spec and spec.source == "builtin":
+                result = self._run_streamed(tool_name, tool_args)
+            else:
+                result = self.tools[tool_name](**tool_args)
+        return result
+    
+    def _run_streamed(self, tool_name: str, tool_args: Dict[str, Any]) -> Any:
+        """Run a built-in shell tool with its output passed to on_command_output."""
+        from auryx_agent.tools import computer_tools
+        
+        # The model may only pass the tool's own arguments, not the callback or limits
+        inspect.signature(self.tools[tool_name]).bind(**tool_args)
+        run = getattr(computer_tools, STREAMED_TOOLS[tool_name])
+        return run(**tool_args, on_output=self.on_command_output)
+    
+    def _result_budget(self, used: int = 0, parts: int = 1) -> int:
+        """Characters available for tool results given what the turn already used.
+        
+        Args:
+            used: Characters of the turn's conversation so far
+            parts: Number of results sharing the budget
+            
+        Returns:
+            Character budget for one result
+        """
+        remaining = self.context_budget - used
+        budget = min(remaining, self.max_result_chars) // max(parts, 1)
+        return max(budget, self.min_result_chars)
+    
+    def _format_result(self, result: Any, budget: Optional[int] = None) -> str:
+        """Serialize a tool result for the model within a character budget."""
+        return compact_result(result, budget or self._result_budget())
+    
+    def process_planned(self, user_input: str) -> str:
+        """Process user input in plan-and-execute mode.
+        
+        The model plans all tool calls in one response, the plan is executed
+        (independent steps in parallel) and one final call produces the answer.
+        
+        Args:
+            user_input: User's message
+            
+        Returns:
+            Final response to user
+        """
+        self._prepare_turn(user_input)
+        
+        response = self.client.generate(PLANNING_PROMPT % (MAX_PLAN_STEPS, user_input), use_history=True)
+        
+        try:
+            steps = parse_plan(response)
+        except PlanError as e:
+            return f"Error: Invalid plan ({e})"
+        
+        if steps is None:
+            # No tools needed - the planning response is the answer
+            return response
+        
+        results = PlanExecutor(self.tools, run_tool=self._run_tool).execute(steps)
+        budget = self._result_budget(len(user_input), parts=len(results))
+        
+        sections = []
+        for step_result in results:
+            step = step_result.step
+            header = f"[{step.id}] {step.tool}({json.dumps(step.args, ensure_ascii=False)})"
+            if step_result.error:
+                sections.append(f"{header}\nError: {step_result.error}")
+            else:
+                sections.append(f"{header}\nResult: {self._format_result(step_result.result, budget)}")
+        
+        return self.client.generate(ANSWER_PROMPT % (user_input, "\n\n".join(sections)), use_history=True)
+    
+    def process(self, user_input: str, max_iterations: int = 5) -> str:
+        """Process user input with tool support.
+        
+        Args:
+            user_input: User's message
+            max_iterations: Maximum tool call iterations
+            
+        Returns:
+            Final response to user
+        """
+        if self.planning:
+            return self.process_planned(user_input)
+        
+        self._prepare_turn(user_input)
+        
+        request = user_input
         conversation = f"User: {user_input}\n\n"
+        tool_used = False
         
         for iteration in range(max_iterations):
             # Get AI response
@@ -290,9 +341,23 @@ Importance: 1-10 (use 7-9 for important user info)"""
             tool_call = self._extract_tool_call(response)
             
             if not tool_call:
-                # Check for potential hallucination before returning
-                if self._detect_hallucination_risk(user_input, response):
-                    # Force agent to use tools
+                # Answers based on a tool result are grounded; only guard tool-less answers
+                if not tool_used and self._detect_hallucination_risk(request, response):
+                    # Run the obviously relevant read-only tool instead of rejecting the answer
+                    guard_tool = self.guard.relevant_tool(request, self.tools)
+                    spec = self.tools.spec(guard_tool) if guard_tool else None
+                    if spec and spec.read_only:
+                        try:
+                            result = self._run_tool(guard_tool, {})
+                        except Exception as e:
+                            result = {"success": False, "error": str(e)}
+                        result_str = self._format_result(result, self._result_budget(len(conversation)))
+                        conversation += (f"Tool: {guard_tool}\nArgs: {{}}\nResult: {result_str}\n"
+                                         f"Answer the request using ONLY this real data.\n\n")
+                        tool_used = True
+                        continue
+                    
+                    # No obvious tool - force agent to use tools
                     warning = "\n\n⚠️ WARNING: You provided specific system data without using tools. This is likely fabricated. Please use the appropriate tool to get real data."
                     conversation += f"Assistant (REJECTED): {response}\n{warning}\n\n"
                     user_input = f"You must use a tool to answer this question. Do not fabricate data. {user_input}"
@@ -309,18 +374,14 @@ Importance: 1-10 (use 7-9 for important user info)"""
                 return f"Error: Unknown tool '{tool_name}'"
             
             try:
-                result = self.tools[tool_name](**tool_args)
-                
-                # Limit result size to prevent context overflow
-                result_str = json.dumps(result, indent=2)
-                max_result_size = 5000  # characters
-                if len(result_str) > max_result_size:
-                    result_str = result_str[:max_result_size] + f"\n... (truncated, {len(result_str) - max_result_size} chars omitted)"
+                result = self._run_tool(tool_name, tool_args)
+                result_str = self._format_result(result, self._result_budget(len(conversation)))
                 
                 conversation += f"Tool: {tool_name}\nArgs: {json.dumps(tool_args)}\nResult: {result_str}\n\n"
                 
                 # Continue conversation with tool result (also truncated)
                 user_input = f"Tool result: {result_str}\nPlease explain this to the user."
+                tool_used = True
             except Exception as e:
                 return f"Error executing tool: {str(e)}"
         
@@ -0,0 +1,162 @@
+"""Size-aware compaction of tool results.
+
+Tool results are serialized as compact JSON. When they do not fit the
+budget, the structure is shrunk step by step instead of cutting the
+string blindly:
+
+- long lists (processes, connections, files) become a count, the top-k
+  items and value counts of low-cardinality fields
+- long strings (stdout, file content) keep their head and tail
+- the output always stays valid JSON
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import json
+from collections import Counter
+from typing import Any, Dict, List
+
+
+# (top_k, max_string_length) tried in order until the result fits
+SHRINK_LEVELS = [
+    (20, 4000),
+    (10, 1500),
+    (5, 600),
+    (3, 200),
+    (1, 80),
+]
+
+MIN_BUDGET = 200
+
+
+def dumps_compact(value: Any) -> str:
+    """Serialize to JSON without whitespace."""
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def head_tail(text: str, limit: int) -> str:
+    """Keep the head and tail of a long string.
+    
+    The tail usually holds errors and summaries, so it gets a third of the
+    space. Cuts are moved to line boundaries when one is close.
+    
+    Args:
+        text: Text to shorten
+        limit: Maximum length of the result (approximate for tiny limits)
+    
+    Returns:
+        Shortened text with an omission marker
+    """
+    if len(text) <= limit:
+        return text
+    
+    marker_len = 40
+    keep = max(limit - marker_len, 2)
+    head_len = keep * 2 // 3
+    tail_len = keep - head_len
+    
+    head = text[:head_len]
+    newline = head.rfind("\n")
+    if newline > head_len // 2:
+        head = head[:newline + 1]
+    
+    tail = text[len(text) - tail_len:] if tail_len else ""
+    newline = tail.find("\n")
+    if 0 <= newline < tail_len // 2:
+        tail = tail[newline + 1:]
+    
+    omitted = len(text) - len(head) - len(tail)
+    return f"{head}\n...[{omitted} chars omitted]...\n{tail}"
+
+
+def summarize_list(items: List[Any], top_k: int, max_string: int) -> Any:
+    """Summarize a long list as a count, top-k items and field value counts.
+    
+    Args:
+        items: List to summarize
+        top_k: Number of leading items to keep (tools already sort by relevance)
+        max_string: String limit applied inside kept items
+    
+    Returns:
+        The shrunk list itself if short enough, else a summary dict
+    """
+    if len(items) <= top_k:
+        return [shrink(item, top_k, max_string) for item in items]
+    
+    summary: Dict[str, Any] = {
+        "count": len(items),
+        "top": [shrink(item, top_k, max_string) for item in items[:top_k]],
+        "omitted": len(items) - top_k,
+    }
+    
+    # Value counts of categorical fields (status, name, type...) over the whole list
+    if all(isinstance(item, dict) for item in items):
+        fields = set().union(*(item.keys() for item in items))
+        for name in sorted(fields):
+            values = [item.get(name) for item in items]
+            if not all(isinstance(v, str) for v in values):
+                continue
+            counts = Counter(values)
+            if 1 < len(counts) <= 8 and len(counts) < len(items):
+                summary[f"by_{name}"] = dict(counts.most_common())
+    elif all(isinstance(item, str) for item in items):
+        # File lists: extension counts tell the model what is there
+        extensions = Counter(
+            item.rsplit(".", 1)[-1].lower() if "." in item.rsplit("/", 1)[-1] else ""
+            for item in items
+        )
+        if 1 < len(extensions) <= 12:
+            summary["by_extension"] = dict(extensions.most_common())
+    
+    return summary
+
+
+def shrink(value: Any, top_k: int, max_string: int) -> Any:
+    """Recursively shrink a JSON-like value.
+    
+    Args:
+        value: Value to shrink
+        top_k: Items kept from long lists
+        max_string: Maximum string length
+    
+    Returns:
+        Shrunk value
+    """
+    if isinstance(value, str):
+        return head_tail(value, max_string)
+    if isinstance(value, dict):
+        return {key: shrink(item, top_k, max_string) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return summarize_list(list(value), top_k, max_string)
+    return value
+
+
+def compact_result(result: Any, budget: int = 4000) -> str:
+    """Serialize a tool result to compact JSON that fits a character budget.
+    
+    Args:
+        result: Tool result
+        budget: Maximum number of characters
+    
+    Returns:
+        Valid JSON string no longer than the budget
+    """
+    budget = max(budget, MIN_BUDGET)
+    
+    text = dumps_compact(result)
+    if len(text) <= budget:
+        return text
+    
+    for top_k, max_string in SHRINK_LEVELS:
+        text = dumps_compact(shrink(result, top_k, max_string))
+        if len(text) <= budget:
+            return text
+    
+    # Still too large (e.g. a huge dict): keep head and tail of the serialized form
+    preview = head_tail(text, budget - 40)
+    text = dumps_compact({"truncated": True, "preview": preview})
+    while len(text) > budget:
+        preview = head_tail(preview, len(preview) - (len(text) - budget) - 20)
+        text = dumps_compact({"truncated": True, "preview": preview})
+    return text
@@ -39,6 +39,14 @@ class Config:
         assistant_name: Custom name for the AI assistant
         system_prompt: Custom system prompt for AI behavior
         temperature: Temperature for AI generation (0.0-2.0)
+        watch_dirs: Directories indexed by the file watcher at startup
+        monitor_targets: Hosts and DNS names sampled by the network monitor
+        web_cache_mb: Size of the on-disk HTTP cache in megabytes (0 disables it)
+        web_cache_stale: Seconds a stale cached page may be served while it is refreshed
+        shell_max_memory_mb: Address space limit per command process in megabytes (0 = unlimited)
+        shell_max_cpu_seconds: CPU time limit per command process in seconds (0 = unlimited)
+        shell_max_file_size_mb: Largest file a command may write in megabytes (0 = unlimited)
+        shell_max_open_files: Open file limit per command process (0 = unlimited)
     """
     provider: str = "yellowfire"
     default_model: str = "command-a"
@@ -61,6 +69,14 @@ class Config:
     assistant_name: str = "Auryx"
     system_prompt: str = ""
     temperature: float = 0.7
+    watch_dirs: list = field(default_factory=list)
+    monitor_targets: list = field(default_factory=list)
+    web_cache_mb: int = 100
+    web_cache_stale: int = 0
+    shell_max_memory_mb: int = 0
+    shell_max_cpu_seconds: int = 0
+    shell_max_file_size_mb: int = 0
+    shell_max_open_files: int = 0
 
 
 def create_default_config() -> None:
@@ -115,6 +131,10 @@ vercel = ""
 # Network settings
 [network]
 default_timeout = 5
+# Targets sampled by the network monitor: hosts are pinged, "host:port" is a
+# TCP connect and "dns:name" times a DNS query (empty = built-in defaults)
+# monitor = ["1.1.1.1", "github.com:443", "dns:example.com"]
+monitor = []
 
 # History settings
 [history]
@@ -126,6 +146,31 @@ show_spinners = true
 card_width = 60
 show_logo = true
 
+# File settings
+[files]
+# Directories to keep indexed (fast find_files/list_directory, "what changed?")
+# watch = ["~/projects/my-app"]
+watch = []
+
+# Web settings
+[web]
+# On-disk cache for fetched pages, searches and weather (0 disables it)
+cache_size_mb = 100
+# Serve a stale cached page for up to this many seconds while it is
+# refreshed in the background (0 = only when the server allows it)
+stale_while_revalidate = 0
+
+# Resource limits for commands the agent runs (0 = unlimited, POSIX only).
+# Each process a command starts gets these limits. Commands in a
+# persistent session also run inside its shell, whose own CPU time
+# (builtins, shell loops) adds up over the session; when it runs out the
+# session is reset.
+[shell]
+max_memory_mb = 0
+max_cpu_seconds = 0
+max_file_size_mb = 0
+max_open_files = 0
+
 # Logging settings
 [logging]
 level = "INFO"
@@ -201,6 +246,14 @@ def load_config() -> Config:
             assistant_name=data.get("ai", {}).get("assistant_name", "Auryx"),
             system_prompt=data.get("ai", {}).get("system_prompt", ""),
             temperature=data.get("ai", {}).get("temperature", 0.7),
+            watch_dirs=list(data.get("files", {}).get("watch", [])),
+            monitor_targets=list(data.get("network", {}).get("monitor", [])),
+            web_cache_mb=data.get("web", {}).get("cache_size_mb", 100),
+            web_cache_stale=data.get("web", {}).get("stale_while_revalidate", 0),
+            shell_max_memory_mb=data.get("shell", {}).get("max_memory_mb", 0),
+            shell_max_cpu_seconds=data.get("shell", {}).get("max_cpu_seconds", 0),
+            shell_max_file_size_mb=data.get("shell", {}).get("max_file_size_mb", 0),
+            shell_max_open_files=data.get("shell", {}).get("max_open_files", 0),
         )
         
         # Validate configuration
@@ -247,6 +300,17 @@ def validate_config(config: Config) -> None:
     if config.log_level.upper() not in valid_log_levels:
         raise ValueError(f"Invalid log_level '{config.log_level}'. Must be one of: {', '.join(valid_log_levels)}")
     
+    # Validate web cache settings
+    if config.web_cache_mb < 0:
+        raise ValueError(f"Invalid cache_size_mb '{config.web_cache_mb}'. Must not be negative.")
+    if config.web_cache_stale < 0:
+        raise ValueError(f"Invalid stale_while_revalidate '{config.web_cache_stale}'. Must not be negative.")
+    
+    # Validate shell resource limits
+    for name in ("max_memory_mb", "max_cpu_seconds", "max_file_size_mb", "max_open_files"):
+        if getattr(config, f"shell_{name}") < 0:
+            raise ValueError(f"Invalid {name} '{getattr(config, f'shell_{name}')}'. Must not be negative.")
+    
     # Validate temperature
     if config.temperature < 0.0 or config.temperature > 2.0:
         raise ValueError(f"Invalid temperature '{config.temperature}'. Must be between 0.0 and 2.0.")
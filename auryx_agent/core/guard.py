@@ -0,0 +1,120 @@
+"""Deterministic hallucination guard.
+
+Keyword, data and excuse lists are compiled once into word-boundary aware
+regular expressions, so "w" no longer matches every word containing a w
+and a lone "GB" in prose is not treated as system data. When a risky
+answer is detected, the guard names the obviously relevant read-only tool
+so the agent can run it directly instead of bouncing the turn back to the
+model with a rejection prompt.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import re
+from typing import Dict, Iterable, Optional, Tuple
+
+from auryx_agent.core.speculation import PREFETCH_RULES
+
+
+# Keywords that indicate the user wants real system data
+SYSTEM_INFO_KEYWORDS = (
+    'neofetch', 'system info', 'disk usage', 'disk space', 'memory', 'cpu', 'processes',
+    'running', 'network', 'connections', 'files', 'directory', 'ls',
+    'ps', 'top', 'df', 'free', 'ifconfig', 'ip addr', 'netstat',
+    'uname', 'hostname', 'uptime', 'who', 'w', 'last', 'kernel'
+)
+
+# Phrases the model uses when it avoids running a tool
+EXCUSE_PHRASES = (
+    'слишком много данных',
+    'не может быть полностью отображён',
+    'ограничений',
+    'обычно neofetch отображает',
+    'если вам нужно что-то конкретное',
+    'too much data',
+    'cannot be displayed',
+    'limitations',
+    'usually shows',
+    'if you need something specific',
+)
+
+# Patterns of concrete system data in a response
+DATA_PATTERNS = (
+    r'\d\s?[KMGTP]i?B\b',                  # 16GB, 7031 MiB
+    r'\b(?:CPU|Memory|Kernel|OS):',        # neofetch-style fields
+    r'/dev/\w',
+    r'/home/\w',
+)
+
+# Read-only tools that answer a request directly, most specific first
+GUARD_TOOLS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("get_disk_usage", PREFETCH_RULES["get_disk_usage"]),
+    ("get_memory_info", PREFETCH_RULES["get_memory_info"]),
+    ("list_processes", PREFETCH_RULES["list_processes"]),
+    ("get_cpu_info", ("cpu", "процессор")),
+    ("get_network_connections", ("connections", "netstat")),
+    ("get_system_info", ("neofetch", "system info", "uname", "kernel", "os version")),
+)
+
+
+def compile_keywords(keywords: Iterable[str]) -> "re.Pattern":
+    """Compile keywords into one case-insensitive, word-boundary aware regex.
+    
+    Longer keywords are tried first so "disk usage" wins over shorter overlaps.
+    """
+    alternatives = "|".join(re.escape(k) for k in sorted(set(keywords), key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)", re.IGNORECASE)
+
+
+class HallucinationGuard:
+    """Detects fabricated system data and picks the tool that would answer it."""
+    
+    _keywords = compile_keywords(SYSTEM_INFO_KEYWORDS)
+    _excuses = compile_keywords(EXCUSE_PHRASES)
+    _data = re.compile("|".join(DATA_PATTERNS))
+    _process_table = re.compile(r'\bPID\b.*\bUSER\b|\bUSER\b.*\bPID\b', re.DOTALL)
+    _tools = tuple((tool, compile_keywords(keywords)) for tool, keywords in GUARD_TOOLS)
+    
+    def asks_for_system_info(self, user_input: str) -> bool:
+        """Check whether the user asks for real system data."""
+        return self._keywords.search(user_input) is not None
+    
+    def has_specific_data(self, response: str) -> bool:
+        """Check whether a response contains concrete system data."""
+        return self._data.search(response) is not None or self._process_table.search(response) is not None
+    
+    def is_excuse(self, response: str) -> bool:
+        """Check whether a response avoids the request instead of using a tool."""
+        return self._excuses.search(response) is not None
+    
+    def detect(self, user_input: str, response: str) -> bool:
+        """Detect if a response might contain hallucinated data.
+        
+        Args:
+            user_input: User's original question
+            response: AI's response
+        
+        Returns:
+            True if hallucination risk detected
+        """
+        if not self.asks_for_system_info(user_input):
+            return False
+        return self.has_specific_data(response) or self.is_excuse(response)
+    
+    def relevant_tool(self, user_input: str, available: Optional[Dict] = None) -> Optional[str]:
+        """Pick the read-only tool that obviously answers a request.
+        
+        Args:
+            user_input: User's original question
+            available: Optional tool mapping to restrict the choice
+        
+        Returns:
+            Tool name or None if no tool is an obvious fit
+        """
+        for tool, pattern in self._tools:
+            if available is not None and tool not in available:
+                continue
+            if pattern.search(user_input):
+                return tool
+        return None
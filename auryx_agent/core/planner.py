@@ -0,0 +1,210 @@
+"""Plan-and-execute support for the agent.
+
+Instead of looping "model -> one tool -> model", the model is asked once
+for a small DAG of tool steps. The executor runs the steps (independent
+steps in parallel) and a single final model call turns all results into
+the answer, so multi-step tasks need two LLM calls instead of five or more.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+
+MAX_PLAN_STEPS = 8
+
+PLANNING_PROMPT = """Plan the tool calls needed to answer the request below, all at once.
+Respond ONLY with JSON in this format:
+{"plan": [{"id": "s1", "tool": "tool_name", "args": {"arg1": "value1"}, "after": []}]}
+
+Rules:
+- Use at most %d steps
+- "after" lists ids of steps that must finish first; leave it empty for independent steps
+- Independent steps run in parallel, so do not chain steps without a reason
+- If no tools are needed, answer the request directly in plain text instead of JSON
+
+Request: %s"""
+
+ANSWER_PROMPT = """Tool results for the request "%s":
+
+%s
+
+Using ONLY these results, answer the request for the user."""
+
+
+@dataclass
+class PlanStep:
+    """A single tool call in a plan."""
+    id: str
+    tool: str
+    args: Dict[str, Any] = field(default_factory=dict)
+    after: List[str] = field(default_factory=list)
+
+
+@dataclass
+class StepResult:
+    """Outcome of a plan step."""
+    step: PlanStep
+    result: Any = None
+    error: Optional[str] = None
+    skipped: bool = False
+    
+    @property
+    def ok(self) -> bool:
+        """True if the step ran and its tool reported success."""
+        if self.error or self.skipped:
+            return False
+        if isinstance(self.result, dict) and self.result.get("success") is False:
+            return False
+        return True
+
+
+class PlanError(ValueError):
+    """Raised when a plan is malformed (unknown ids, cycles, too many steps)."""
+
+
+def parse_plan(response: str, max_steps: int = MAX_PLAN_STEPS) -> Optional[List[PlanStep]]:
+    """Extract a plan from a model response.
+    
+    A single ``{"tool": ..., "args": ...}`` call is accepted as a one-step plan.
+    
+    Args:
+        response: Model response text
+        max_steps: Maximum number of steps allowed
+    
+    Returns:
+        Plan steps, or None if the response contains no plan
+    
+    Raises:
+        PlanError: If the plan is malformed
+    """
+    start = response.find("{")
+    end = response.rfind("}") + 1
+    if start < 0 or end <= start:
+        return None
+    
+    try:
+        data = json.loads(response[start:end])
+    except json.JSONDecodeError:
+        return None
+    
+    if not isinstance(data, dict):
+        return None
+    
+    if "tool" in data:
+        raw_steps = [{"id": "s1", "tool": data["tool"], "args": data.get("args", {})}]
+    elif isinstance(data.get("plan"), list):
+        raw_steps = data["plan"]
+    else:
+        return None
+    
+    if len(raw_steps) > max_steps:
+        raise PlanError(f"Plan has {len(raw_steps)} steps, maximum is {max_steps}")
+    
+    steps = []
+    for index, raw in enumerate(raw_steps, 1):
+        if not isinstance(raw, dict) or not raw.get("tool"):
+            raise PlanError(f"Step {index} has no tool")
+        args = raw.get("args") or {}
+        if not isinstance(args, dict):
+            raise PlanError(f"Step {index} args must be an object")
+        after = raw.get("after") or []
+        if isinstance(after, str):
+            after = [after]
+        steps.append(PlanStep(id=str(raw.get("id") or f"s{index}"), tool=str(raw["tool"]),
+                              args=args, after=[str(a) for a in after]))
+    
+    plan_waves(steps)  # validate ids and dependencies
+    return steps
+
+
+def plan_waves(steps: List[PlanStep]) -> List[List[PlanStep]]:
+    """Group steps into waves that can run in parallel.
+    
+    Args:
+        steps: Plan steps
+    
+    Returns:
+        List of waves; every step's dependencies are in earlier waves
+    
+    Raises:
+        PlanError: On duplicate ids, unknown dependencies or cycles
+    """
+    ids = [s.id for s in steps]
+    if len(set(ids)) != len(ids):
+        raise PlanError("Plan has duplicate step ids")
+    
+    for step in steps:
+        unknown = [dep for dep in step.after if dep not in ids]
+        if unknown:
+            raise PlanError(f"Step {step.id} depends on unknown step(s): {', '.join(unknown)}")
+    
+    waves = []
+    done = set()
+    remaining = list(steps)
+    while remaining:
+        wave = [s for s in remaining if all(dep in done for dep in s.after)]
+        if not wave:
+            raise PlanError("Plan has a dependency cycle")
+        waves.append(wave)
+        done.update(s.id for s in wave)
+        remaining = [s for s in remaining if s.id not in done]
+    return waves
+
+
+class PlanExecutor:
+    """Executes plan steps wave by wave, in parallel within a wave."""
+    
+    def __init__(self, tools, max_workers: int = 4,
+                 run_tool: Optional[Callable[[str, Dict[str, Any]], Any]] = None):
+        """Initialize executor.
+        
+        Args:
+            tools: Tool registry (name -> callable mapping)
+            max_workers: Maximum steps running at once
+            run_tool: Optional override used to run a tool (name, args) -> result
+        """
+        self.tools = tools
+        self.max_workers = max_workers
+        self.run_tool = run_tool or (lambda name, args: self.tools[name](**args))
+    
+    def execute(self, steps: List[PlanStep]) -> List[StepResult]:
+        """Run all steps of a plan.
+        
+        Steps whose dependencies failed are skipped.
+        
+        Args:
+            steps: Plan steps
+        
+        Returns:
+            Step results in plan order
+        """
+        results: Dict[str, StepResult] = {}
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix="auryx-plan") as pool:
+            for wave in plan_waves(steps):
+                futures = {}
+                for step in wave:
+                    failed = [dep for dep in step.after if not results[dep].ok]
+                    if failed:
+                        results[step.id] = StepResult(
+                            step, skipped=True,
+                            error=f"Skipped because {', '.join(failed)} failed")
+                    elif step.tool not in self.tools:
+                        results[step.id] = StepResult(step, error=f"Unknown tool '{step.tool}'")
+                    else:
+                        futures[step.id] = pool.submit(self.run_tool, step.tool, step.args)
+                
+                for step_id, future in futures.items():
+                    step = next(s for s in wave if s.id == step_id)
+                    try:
+                        results[step_id] = StepResult(step, result=future.result())
+                    except Exception as e:
+                        results[step_id] = StepResult(step, error=str(e))
+        
+        return [results[s.id] for s in steps]
@@ -0,0 +1,165 @@
+"""Speculative tool prefetch for the agent.
+
+When a request obviously needs system data ("disk usage", "memory",
+"processes"...), the matching cheap read-only tool is started in a
+background thread while the first LLM call is still running. If the model
+then asks for that tool with the same arguments, the prefetched result is
+handed over instead of running the tool again, hiding tool latency behind
+model latency.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import inspect
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Cheap, read-only tools worth running before the model asks for them,
+# keyed to the system-info keywords that predict them.
+PREFETCH_RULES: Dict[str, Tuple[str, ...]] = {
+    "get_disk_usage": ("disk usage", "disk space", "df", "диск"),
+    "get_memory_info": ("memory", "free", "ram", "swap", "память", "памяти"),
+    "list_processes": ("processes", "running", "ps", "top", "процессы"),
+}
+
+
+def _compile_rule(keywords: Tuple[str, ...]) -> "re.Pattern":
+    alternatives = "|".join(re.escape(k) for k in sorted(keywords, key=len, reverse=True))
+    return re.compile(rf"(?<!\w)(?:{alternatives})(?!\w)", re.IGNORECASE)
+
+
+_PREFETCH_PATTERNS = {tool: _compile_rule(keywords) for tool, keywords in PREFETCH_RULES.items()}
+
+
+def predict_tools(user_input: str) -> List[str]:
+    """Predict which prefetchable tools a request is going to need.
+    
+    Args:
+        user_input: User's message
+    
+    Returns:
+        Tool names in PREFETCH_RULES order
+    """
+    return [tool for tool, pattern in _PREFETCH_PATTERNS.items() if pattern.search(user_input)]
+
+
+class SpeculativeExecutor:
+    """Runs predicted read-only tools in parallel with the first model call."""
+    
+    def __init__(self, tools, max_workers: int = 3, ttl: float = 15.0,
+                 wait_timeout: float = 10.0):
+        """Initialize executor.
+        
+        Args:
+            tools: Tool registry (name -> callable mapping with ``spec()``)
+            max_workers: Maximum tools running at once
+            ttl: Seconds a prefetched result stays valid
+            wait_timeout: Seconds to wait for a prefetch that is still running
+        """
+        self.tools = tools
+        self.max_workers = max_workers
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Tuple[float, Dict[str, Any], Future]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def start(self, user_input: str) -> List[str]:
+        """Start prefetching the tools predicted for a request.
+        
+        Args:
+            user_input: User's message
+        
+        Returns:
+            Names of tools that were started
+        """
+        started = []
+        for name in predict_tools(user_input):
+            spec = self.tools.spec(name)
+            if spec is None or not spec.read_only:
+                continue
+            
+            with self._lock:
+                if name in self._pending:
+                    continue
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix="auryx-prefetch")
+                future = self._pool.submit(self._run, name)
+                self._pending[name] = (time.monotonic(), {}, future)
+            started.append(name)
+        return started
+    
+    def _run(self, name: str) -> Any:
+        return self.tools[name]()
+    
+    def take(self, name: str, args: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Hand over a prefetched result if it matches the requested call.
+        
+        Args:
+            name: Tool name requested by the model
+            args: Arguments requested by the model
+        
+        Returns:
+            Prefetched result, or None if the call must run normally
+        """
+        with self._lock:
+            entry = self._pending.pop(name, None)
+        
+        if entry is None:
+            return None
+        
+        started, prefetch_args, future = entry
+        if time.monotonic() - started > self.ttl or not self._same_call(name, prefetch_args, args or {}):
+            future.cancel()
+            self.misses += 1
+            return None
+        
+        try:
+            result = future.result(timeout=self.wait_timeout)
+        except Exception:
+            self.misses += 1
+            return None
+        
+        self.hits += 1
+        return result
+    
+    def _same_call(self, name: str, prefetch_args: Dict[str, Any], args: Dict[str, Any]) -> bool:
+        """Compare calls after filling in default argument values."""
+        if args == prefetch_args:
+            return True
+        
+        try:
+            signature = inspect.signature(self.tools[name])
+            requested = signature.bind(**args)
+            prefetched = signature.bind(**prefetch_args)
+        except (TypeError, ValueError):
+            return False
+        
+        requested.apply_defaults()
+        prefetched.apply_defaults()
+        return requested.arguments == prefetched.arguments
+    
+    def discard(self) -> None:
+        """Drop all prefetches that were not used during the turn."""
+        with self._lock:
+            pending = list(self._pending.values())
+            self._pending.clear()
+        
+        for _, _, future in pending:
+            future.cancel()
+    
+    def shutdown(self) -> None:
+        """Stop the worker threads."""
+        self.discard()
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
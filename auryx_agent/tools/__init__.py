@@ -1,15 +1,28 @@
-"""Tools package for Auryx Agent."""
-
-from auryx_agent.tools.computer_tools import ComputerTools
-from auryx_agent.tools.network_tools import NetworkTools
-from auryx_agent.tools.code_tools import CodeTools
-from auryx_agent.tools.web_tools import WebTools
-from auryx_agent.tools.advanced_computer_tools import AdvancedComputerTools
-
-__all__ = [
-    "ComputerTools",
-    "NetworkTools", 
-    "CodeTools",
-    "WebTools",
-    "AdvancedComputerTools"
-]
+"""Tools package for Auryx Agent.
+
+Tool classes are imported lazily so that importing the package (or the
+tool registry) does not pull in psutil and friends.
+"""
+
+from importlib import import_module
+
+_EXPORTS = {
+    "ComputerTools": "auryx_agent.tools.computer_tools",
+    "NetworkTools": "auryx_agent.tools.network_tools",
+    "CodeTools": "auryx_agent.tools.code_tools",
+    "WebTools": "auryx_agent.tools.web_tools",
+    "AdvancedComputerTools": "auryx_agent.tools.advanced_computer_tools",
+    "PatchTools": "auryx_agent.tools.patch_tools",
+    "WatchTools": "auryx_agent.tools.file_watcher",
+    "ToolRegistry": "auryx_agent.tools.registry",
+    "ToolSpec": "auryx_agent.tools.registry",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(module), name)
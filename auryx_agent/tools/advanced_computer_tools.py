@@ -208,30 +208,67 @@ class AdvancedComputerTools:
             return {"success": False, "error": str(e)}
     
     def find_files(self, pattern: str, directory: str = ".", 
-                   max_results: int = 50) -> Dict[str, Any]:
+                   max_results: int = 50, content: Optional[str] = None,
+                   ignore_case: bool = False, include_hidden: bool = False,
+                   use_index: bool = False) -> Dict[str, Any]:
         """Find files matching pattern.
         
+        Directories are scanned in parallel, .gitignore'd files and
+        .git/node_modules/venvs are skipped, and the search stops at
+        max_results.
+        
         Args:
             pattern: File pattern (e.g., "*.py", "test*")
             directory: Directory to search in
             max_results: Maximum number of results
+            content: Optional regex the file content must match
+            ignore_case: Case-insensitive content search
+            include_hidden: Also search dotfiles and dot-directories
+            use_index: Reuse the persistent file name index
             
         Returns:
-            Dict with found files
+            Dict with found files (and matching lines for content search)
         """
         try:
-            import glob
+            from auryx_agent.tools.file_search import search_files
+            from auryx_agent.tools.file_watcher import find_watcher
             
-            search_path = Path(directory).expanduser() / "**" / pattern
-            files = list(glob.glob(str(search_path), recursive=True))
+            base = Path(directory).expanduser()
             
-            return {
+            # A watched directory answers name searches from its index
+            watched = find_watcher(str(base)) if not content else None
+            if watched is not None:
+                watcher, rel = watched
+                files, truncated = watcher.find(pattern, under=rel, include_hidden=include_hidden,
+                                                max_results=max_results)
+                return {
+                    "success": True,
+                    "pattern": pattern,
+                    "directory": directory,
+                    "count": len(files),
+                    "truncated": truncated,
+                    "files": [str(base / f) for f in files],
+                    "source": "index"
+                }
+            
+            found = search_files(str(base), pattern=pattern, content=content,
+                                 ignore_case=ignore_case, include_hidden=include_hidden,
+                                 max_results=max_results, use_index=use_index)
+            
+            result = {
                 "success": True,
                 "pattern": pattern,
                 "directory": directory,
-                "count": len(files),
-                "files": files[:max_results]
+                "count": len(found["results"]),
+                "truncated": found["truncated"],
+                "dirs_scanned": found["dirs_scanned"]
             }
+            if content:
+                result["files"] = [str(base / r["path"]) for r in found["results"]]
+                result["matches"] = {str(base / r["path"]): r["matches"] for r in found["results"]}
+            else:
+                result["files"] = [str(base / r) for r in found["results"]]
+            return result
         except Exception as e:
             return {"success": False, "error": str(e)}
     
@@ -0,0 +1,35 @@
+"""Helpers for calling asyncio code from the synchronous tools.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import asyncio
+import threading
+from typing import Any, Dict
+
+
+def run_sync(coro):
+    """Run a coroutine to completion from synchronous code.
+    
+    Uses a helper thread when called from inside a running event loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    
+    outcome: Dict[str, Any] = {}
+    
+    def target():
+        try:
+            outcome["value"] = asyncio.run(coro)
+        except BaseException as e:
+            outcome["error"] = e
+    
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join()
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["value"]
@@ -1,9 +1,79 @@
 """Tools for computer interaction - execute commands, work with files."""
 
 import os
-import subprocess
+import sys
+import threading
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
+
+from auryx_agent.tools.file_watcher import find_watcher
+from auryx_agent.tools.fs_walk import list_tree
+from auryx_agent.tools.file_reader import DEFAULT_MAX_BYTES, BinaryFileError, read_window
+from auryx_agent.tools.shell_pool import get_resource_limits
+from auryx_agent.tools.streaming import run_streaming
+
+
+def run_command(command: str, cwd: Optional[str] = None, timeout: int = 30,
+                on_output: Optional[Callable[[str, str], None]] = None,
+                max_output: int = 65536,
+                cancel_event: Optional[threading.Event] = None) -> Dict[str, Any]:
+    """``execute_command`` with live output and cancellation.
+    
+    For the agent and CLI; the callbacks are not tool arguments.
+    
+    Args:
+        command: Shell command to execute
+        cwd: Working directory (None for current)
+        timeout: Command timeout in seconds
+        on_output: Called with (stream_name, text) as output arrives
+        max_output: Characters of output kept per stream
+        cancel_event: Set from another thread to cancel the command
+    """
+    try:
+        limits = get_resource_limits()
+        return run_streaming(
+            command,
+            cwd=cwd,
+            timeout=timeout,
+            on_output=on_output,
+            max_output=max_output,
+            cancel_event=cancel_event,
+            preexec_fn=limits.apply if limits.enabled and sys.platform != "win32" else None
+        )
+    except Exception as e:
+        return {
+            "stdout": "",
+            "stderr": str(e),
+            "returncode": -1,
+            "success": False
+        }
+
+
+def run_session_command(command: str, session: str = "default", timeout: int = 30,
+                        on_output: Optional[Callable[[str, str], None]] = None,
+                        max_output: int = 65536) -> Dict[str, Any]:
+    """``run_in_session`` with live output, like ``run_command``.
+    
+    Args:
+        command: Shell command to execute
+        session: Session name
+        timeout: Command timeout in seconds (the session is reset on timeout)
+        on_output: Called with (stream_name, text) as output arrives
+        max_output: Characters of output kept per stream
+    """
+    if sys.platform == "win32":
+        return run_command(command, timeout=timeout, on_output=on_output, max_output=max_output)
+    try:
+        from auryx_agent.tools.shell_pool import get_shell_pool
+        return get_shell_pool().run(command, session=session, timeout=timeout,
+                                    on_output=on_output, max_output=max_output)
+    except Exception as e:
+        return {
+            "stdout": "",
+            "stderr": str(e),
+            "returncode": -1,
+            "success": False
+        }
 
 
 class ComputerTools:
@@ -13,68 +83,94 @@ class ComputerTools:
     def execute_command(command: str, cwd: Optional[str] = None, timeout: int = 30) -> Dict[str, Any]:
         """Execute a shell command and return the result.
         
+        Output is streamed into bounded head/tail buffers, so long commands
+        don't exhaust memory and a timeout still returns partial output.
+        
         Args:
             command: Shell command to execute
             cwd: Working directory (None for current)
             timeout: Command timeout in seconds
             
         Returns:
-            Dict with 'stdout', 'stderr', 'returncode', 'success'
+            Dict with 'stdout', 'stderr', 'returncode', 'success',
+            'timed_out', 'cancelled', 'truncated', 'duration'
         """
-        try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                cwd=cwd,
-                capture_output=True,
-                text=True,
-                timeout=timeout
-            )
-            
-            return {
-                "stdout": result.stdout,
-                "stderr": result.stderr,
-                "returncode": result.returncode,
-                "success": result.returncode == 0
-            }
-        except subprocess.TimeoutExpired:
-            return {
-                "stdout": "",
-                "stderr": f"Command timed out after {timeout} seconds",
-                "returncode": -1,
-                "success": False
-            }
-        except Exception as e:
-            return {
-                "stdout": "",
-                "stderr": str(e),
-                "returncode": -1,
-                "success": False
-            }
+        return run_command(command, cwd=cwd, timeout=timeout)
     
     @staticmethod
-    def read_file(path: str, max_lines: Optional[int] = None) -> Dict[str, Any]:
+    def run_in_session(command: str, session: str = "default", timeout: int = 30) -> Dict[str, Any]:
+        """Run a command in a persistent shell session.
+        
+        The working directory and exported variables carry over between
+        calls with the same session name, so multi-step workflows
+        (cd, activate a venv, build) don't re-spawn a shell every time.
+        Falls back to ``execute_command`` on Windows.
+        
+        Args:
+            command: Shell command to execute
+            session: Session name
+            timeout: Command timeout in seconds (the session is reset on timeout)
+        
+        Returns:
+            Dict with 'stdout', 'stderr', 'returncode', 'success', 'cwd',
+            'session', 'timed_out', 'session_reset', 'truncated', 'duration'
+        """
+        return run_session_command(command, session=session, timeout=timeout)
+    
+    @staticmethod
+    def read_file(path: str, max_lines: Optional[int] = None, start_line: Optional[int] = None,
+                  end_line: Optional[int] = None, tail_lines: Optional[int] = None,
+                  grep: Optional[str] = None, context: int = 0, ignore_case: bool = False,
+                  offset: Optional[int] = None, length: Optional[int] = None,
+                  max_bytes: int = DEFAULT_MAX_BYTES) -> Dict[str, Any]:
         """Read file content.
         
+        The file is memory-mapped and only the requested window is decoded,
+        so large logs are never loaded whole. Binary files can be read as a
+        hex dump with offset/length.
+        
         Args:
             path: Path to file
             max_lines: Maximum lines to read (None for all)
+            start_line: First line to read, 1-based
+            end_line: Last line to read, inclusive
+            tail_lines: Read the last N lines
+            grep: Regex; return only matching lines with line numbers
+            context: Lines of context around grep matches
+            ignore_case: Case-insensitive grep
+            offset: Byte offset to read from (negative counts from the end)
+            length: Number of bytes to read from offset
+            max_bytes: Largest window returned
             
         Returns:
-            Dict with 'content', 'success', 'error'
+            Dict with 'content', 'success', 'error' plus 'encoding', 'size',
+            'start_line', 'end_line', 'total_lines', 'matches', 'truncated'
+            depending on the mode
         """
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                if max_lines:
-                    lines = [f.readline() for _ in range(max_lines)]
-                    content = ''.join(lines)
-                else:
-                    content = f.read()
+            if max_lines and end_line is None:
+                end_line = (start_line or 1) + max_lines - 1
             
+            result = read_window(
+                path,
+                start_line=start_line,
+                end_line=end_line,
+                tail_lines=tail_lines,
+                offset=offset,
+                length=length,
+                grep=grep,
+                ignore_case=ignore_case,
+                context=context,
+                max_bytes=max_bytes
+            )
+            result.update(success=True, error=None)
+            return result
+        except BinaryFileError as e:
             return {
-                "content": content,
-                "success": True,
-                "error": None
+                "content": "",
+                "success": False,
+                "error": str(e),
+                "binary": True
             }
         except Exception as e:
             return {
@@ -111,32 +207,67 @@ class ComputerTools:
             }
     
     @staticmethod
-    def list_directory(path: str = ".") -> Dict[str, Any]:
+    def list_directory(path: str = ".", depth: int = 1, pattern: Optional[str] = None,
+                       show_hidden: bool = True, gitignore: bool = False, sizes: bool = False,
+                       sort: str = "name", offset: int = 0,
+                       limit: Optional[int] = None) -> Dict[str, Any]:
         """List directory contents.
         
+        Walks with os.scandir; .git/node_modules/venvs are listed but not
+        descended into.
+        
         Args:
             path: Directory path
+            depth: Levels to list (1 = direct children)
+            pattern: Glob filter, e.g. "*.py"
+            show_hidden: Include dotfiles
+            gitignore: Skip entries matched by .gitignore files
+            sizes: Include file sizes and directory sizes (always over the
+                whole subtree, ignored files included)
+            sort: 'name', 'size' or 'mtime'
+            offset: Entries to skip (pagination)
+            limit: Maximum entries returned (None = all)
             
         Returns:
-            Dict with 'files', 'dirs', 'success', 'error'
+            Dict with 'files', 'dirs', 'success', 'error' plus 'total',
+            'has_more', 'offset' and, with sizes, 'sizes' and 'total_size'
         """
         try:
-            p = Path(path)
+            # A watched directory is listed from the watcher's index when
+            # the index filters .gitignore'd paths the same way
+            entries = None
+            watched = find_watcher(path)
+            if watched is not None and watched[0].gitignore == gitignore:
+                watcher, rel = watched
+                entries = watcher.walk_entries(rel)
+            
+            tree = list_tree(path, depth=depth, pattern=pattern, include_hidden=show_hidden,
+                             gitignore=gitignore, sizes=sizes, sort=sort, offset=offset,
+                             limit=limit, entries=entries)
+            
+            base = Path(path)
             files = []
             dirs = []
+            item_sizes = {}
+            for entry in tree["entries"]:
+                item = str(base / entry["path"])
+                (dirs if entry["type"] == "dir" else files).append(item)
+                if sizes:
+                    item_sizes[item] = entry["size"]
             
-            for item in p.iterdir():
-                if item.is_file():
-                    files.append(str(item))
-                elif item.is_dir():
-                    dirs.append(str(item))
-            
-            return {
+            result = {
                 "files": files,
                 "dirs": dirs,
+                "total": tree["total"],
+                "offset": offset,
+                "has_more": tree["has_more"],
                 "success": True,
                 "error": None
             }
+            if sizes:
+                result["sizes"] = item_sizes
+                result["total_size"] = tree["total_size"]
+            return result
         except Exception as e:
             return {
                 "files": [],
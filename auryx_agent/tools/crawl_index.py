@@ -0,0 +1,161 @@
+"""Local full-text index of crawled pages.
+
+Pages are stored as the heading-aligned markdown chunks produced by
+``html_extract`` in a SQLite FTS5 table, so a search returns the relevant
+part of a page rather than the whole page. Re-crawling a page replaces
+its chunks; results are ranked with FTS5's BM25.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from auryx_agent.tools.html_extract import CHARS_PER_TOKEN, Chunk
+
+
+DEFAULT_RESULTS = 5
+# Per-result content budget in search results
+RESULT_TOKENS = 400
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    site TEXT NOT NULL,
+    title TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    chunks INTEGER NOT NULL,
+    crawled_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_site ON pages (site);
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks USING fts5(
+    title, heading, content, url UNINDEXED, site UNINDEXED,
+    tokenize = 'porter unicode61'
+);
+"""
+
+
+def match_expression(query: str) -> str:
+    """An FTS5 MATCH expression for free text: any of the words, each quoted."""
+    terms = re.findall(r"\w+", query.lower())
+    return " OR ".join(f'"{term}"' for term in dict.fromkeys(terms))
+
+
+class CrawlIndex:
+    """Searchable store of crawled pages in a SQLite file."""
+    
+    def __init__(self, path: Union[str, Path]):
+        """Open the index (the file is created on first use)."""
+        self.path = Path(path)
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            try:
+                db.executescript(_SCHEMA)
+            except sqlite3.DatabaseError:
+                # Not a usable index file: start over
+                db.close()
+                self.path.unlink()
+                db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+                db.executescript(_SCHEMA)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._db = db
+        return self._db
+    
+    def add_page(self, url: str, site: str, title: str, chunks: Sequence[Chunk], depth: int = 0) -> None:
+        """Store a page, replacing any earlier copy."""
+        with self._lock:
+            db = self._connection()
+            db.execute("BEGIN")
+            try:
+                db.execute("DELETE FROM chunks WHERE url = ?", (url,))
+                db.executemany("INSERT INTO chunks (title, heading, content, url, site) VALUES (?, ?, ?, ?, ?)",
+                               [(title, chunk.heading, chunk.text, url, site) for chunk in chunks])
+                db.execute("INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                           (url, site, title, depth, len(chunks), time.time()))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+    
+    def search(self, query: str, site: Optional[str] = None, limit: int = DEFAULT_RESULTS,
+               max_tokens: int = RESULT_TOKENS) -> List[Dict[str, Any]]:
+        """The chunks best matching a free-text query, best first.
+        
+        Args:
+            query: Words to look for (any of them; pages with more rank higher)
+            site: Only search pages of this origin, e.g. "https://docs.python.org"
+            limit: Maximum number of results
+            max_tokens: Content budget per result
+        """
+        expression = match_expression(query)
+        if not expression:
+            return []
+        sql = ("SELECT url, title, heading, content, bm25(chunks, 5.0, 3.0, 1.0) AS score "
+               "FROM chunks WHERE chunks MATCH ?")
+        params: list = [expression]
+        if site:
+            sql += " AND site = ?"
+            params.append(site.rstrip("/"))
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._connection().execute(sql, params).fetchall()
+        limit_chars = max_tokens * CHARS_PER_TOKEN
+        return [{
+            "url": url,
+            "title": title,
+            "heading": heading,
+            "content": content[:limit_chars],
+            "truncated": len(content) > limit_chars,
+            # bm25() is lower for better matches
+            "score": round(-score, 3),
+        } for url, title, heading, content, score in rows]
+    
+    def sites(self) -> List[Dict[str, Any]]:
+        """Indexed sites with their page counts."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT site, COUNT(*), MAX(crawled_at) FROM pages GROUP BY site ORDER BY site").fetchall()
+        return [{"site": site, "pages": pages, "crawled_at": crawled_at} for site, pages, crawled_at in rows]
+    
+    def clear(self, site: Optional[str] = None) -> None:
+        """Remove all pages, or those of one site."""
+        with self._lock:
+            db = self._connection()
+            if site:
+                db.execute("DELETE FROM chunks WHERE site = ?", (site.rstrip("/"),))
+                db.execute("DELETE FROM pages WHERE site = ?", (site.rstrip("/"),))
+            else:
+                db.execute("DELETE FROM chunks")
+                db.execute("DELETE FROM pages")
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+
+_index: Optional[CrawlIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_crawl_index() -> CrawlIndex:
+    """The process-wide index in the data directory."""
+    global _index
+    with _index_lock:
+        if _index is None:
+            from auryx_agent.core.paths import get_data_dir
+            
+            _index = CrawlIndex(get_data_dir() / "crawl_index.db")
+        return _index
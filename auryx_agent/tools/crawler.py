@@ -0,0 +1,281 @@
+"""Polite, bounded site crawler feeding the local crawl index.
+
+Starting from a seed URL the crawler walks the site breadth-first, one
+depth level at a time, staying on the seed's origin. Each page is fetched
+through the shared HTTP client (so the response cache applies) and parsed
+once for both its readable content and its links. URLs are normalised
+before they enter the visited set, robots.txt is honoured (including
+Crawl-delay) and requests to the site are spaced by a rate limiter, with
+up to ``concurrency`` fetches in flight. Extracted pages go into the
+``CrawlIndex`` for later searches.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import codecs
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+from auryx_agent.tools.crawl_index import CrawlIndex, get_crawl_index
+from auryx_agent.tools.html_extract import Chunk, HTMLExtractor
+from auryx_agent.tools.http_client import HTTPClient, get_client
+from auryx_agent.tools.link_extract import LinkExtractor, normalize_url
+
+
+ROBOTS_AGENT = "auryx-agent"
+DEFAULT_MAX_PAGES = 30
+DEFAULT_MAX_DEPTH = 2
+DEFAULT_CONCURRENCY = 4
+# Seconds between requests to the site
+DEFAULT_DELAY = 0.5
+MAX_PAGES = 200
+MAX_DEPTH = 5
+MAX_CONCURRENCY = 8
+# Longest robots.txt Crawl-delay honoured; slower sites get fewer pages instead
+MAX_CRAWL_DELAY = 10.0
+MAX_LINKS_PER_PAGE = 500
+PAGE_TIMEOUT = 10
+PAGE_TTL = 300
+ROBOTS_TTL = 3600
+HTML_TYPES = {"text/html", "application/xhtml+xml"}
+# Not worth a request: never HTML
+SKIP_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".ico", ".bmp", ".pdf",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".tar", ".whl", ".exe", ".dmg",
+    ".mp3", ".mp4", ".webm", ".woff", ".woff2", ".ttf", ".css", ".js", ".json", ".xml",
+}
+
+
+def origin(url: str) -> str:
+    """scheme://host[:port] of a normalised URL."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _skipped_extension(url: str) -> bool:
+    path = urlsplit(url).path.lower()
+    return "." in path.rsplit("/", 1)[-1] and "." + path.rsplit(".", 1)[-1] in SKIP_EXTENSIONS
+
+
+class RateLimiter:
+    """Spaces calls at least ``interval`` seconds apart (thread-safe)."""
+    
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._next = 0.0
+        self._lock = threading.Lock()
+    
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def fetch_robots(client: HTTPClient, site: str, timeout: float = PAGE_TIMEOUT) -> RobotFileParser:
+    """The site's robots.txt rules.
+    
+    A missing file (4xx) allows everything; a server error disallows
+    everything (RFC 9309). If the file can't be fetched at all the crawl
+    goes ahead and the page fetches report the problem.
+    """
+    robots = RobotFileParser(site + "/robots.txt")
+    try:
+        response = client.get(site + "/robots.txt", timeout=timeout, cache=True, default_ttl=ROBOTS_TTL)
+    except OSError:
+        robots.allow_all = True
+        return robots
+    if response.ok:
+        robots.parse(response.text.splitlines())
+    elif response.status_code >= 500:
+        response.close()
+        robots.disallow_all = True
+    else:
+        response.close()
+        robots.allow_all = True
+    return robots
+
+
+@dataclass
+class Page:
+    """One fetched page."""
+    url: str
+    depth: int
+    title: str = ""
+    chunks: List[Chunk] = field(default_factory=list)
+    links: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+@dataclass
+class CrawlResult:
+    seed: str
+    pages: List[Page] = field(default_factory=list)
+    skipped: Dict[str, int] = field(default_factory=dict)
+    delay: float = 0.0
+    duration: float = 0.0
+    
+    def to_dict(self) -> Dict[str, Any]:
+        indexed = [page for page in self.pages if page.error is None]
+        failed = [page for page in self.pages if page.error is not None]
+        return {
+            "seed": self.seed,
+            "pages_indexed": len(indexed),
+            "pages": [{"url": page.url, "title": page.title, "depth": page.depth} for page in indexed],
+            "failed": [{"url": page.url, "error": page.error} for page in failed],
+            "skipped": self.skipped,
+            "delay": self.delay,
+            "duration": round(self.duration, 2),
+        }
+
+
+class Crawler:
+    """Breadth-first, same-origin crawler with robots.txt and rate limiting."""
+    
+    def __init__(self, client: Optional[HTTPClient] = None, index: Optional[CrawlIndex] = None,
+                 max_pages: int = DEFAULT_MAX_PAGES, max_depth: int = DEFAULT_MAX_DEPTH,
+                 concurrency: int = DEFAULT_CONCURRENCY, delay: float = DEFAULT_DELAY):
+        """Configure the crawler.
+        
+        Args:
+            client: HTTP client (default: the shared one)
+            index: Where pages are stored (default: the shared index)
+            max_pages: Most pages fetched per crawl
+            max_depth: Most links followed from the seed
+            concurrency: Fetches in flight at once
+            delay: Minimum seconds between requests (robots.txt may ask for more)
+        """
+        self.client = client or get_client()
+        self.index = index or get_crawl_index()
+        self.max_pages = max(1, min(max_pages, MAX_PAGES))
+        self.max_depth = max(0, min(max_depth, MAX_DEPTH))
+        self.concurrency = max(1, min(concurrency, MAX_CONCURRENCY))
+        self.delay = max(0.0, delay)
+    
+    def _parse(self, response, url: str) -> Tuple[HTMLExtractor, LinkExtractor]:
+        """Feed the body to the content and link parsers in one pass."""
+        try:
+            decoder = codecs.getincrementaldecoder(response.encoding)(errors="replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        content = HTMLExtractor(url)
+        links = LinkExtractor(url, limit=MAX_LINKS_PER_PAGE, scope="internal")
+        for data in response.iter_content():
+            text = decoder.decode(data)
+            if not content.done:
+                content.feed(text)
+            if not links.done:
+                links.feed(text)
+            if content.done and links.done:
+                break
+        text = decoder.decode(b"", final=True)
+        content.feed(text)
+        links.feed(text)
+        response.close()
+        links.close()
+        return content, links
+    
+    def _fetch(self, url: str, depth: int, limiter: RateLimiter) -> Page:
+        page = Page(url, depth)
+        limiter.wait()
+        try:
+            response = self.client.get(url, timeout=PAGE_TIMEOUT, cache=True, default_ttl=PAGE_TTL)
+        except OSError as e:
+            page.error = str(e)
+            return page
+        if not response.ok:
+            response.close()
+            page.error = f"HTTP {response.status_code} {response.reason}"
+            return page
+        final = normalize_url(response.url)
+        if origin(final) != origin(url):
+            response.close()
+            page.error = f"Redirected off-site to {final}"
+            return page
+        if response.headers.get_content_type() not in HTML_TYPES:
+            response.close()
+            page.error = f"Not HTML ({response.headers.get_content_type()})"
+            return page
+        
+        page.url = final
+        try:
+            content, links = self._parse(response, final)
+        except Exception as e:
+            response.close()
+            page.error = str(e)
+            return page
+        document = content.close()
+        page.title = document.title
+        page.chunks = document.chunks()
+        page.links = [link.url for link in links.links if not link.nofollow]
+        return page
+    
+    def _resolve_seed(self, seed: str) -> str:
+        """Follow the seed's redirects (http -> https, bare -> www) so the origin is right."""
+        try:
+            response = self.client.head(seed, timeout=PAGE_TIMEOUT)
+            response.close()
+        except OSError:
+            return seed
+        return normalize_url(response.url) if response.ok else seed
+    
+    def crawl(self, seed: str) -> CrawlResult:
+        """Crawl the site of seed and index its pages."""
+        start = time.monotonic()
+        seed = self._resolve_seed(normalize_url(seed if "://" in seed else f"https://{seed}"))
+        site = origin(seed)
+        result = CrawlResult(seed)
+        skipped = {"robots": 0, "duplicate": 0, "limit": 0}
+        
+        robots = fetch_robots(self.client, site)
+        crawl_delay = robots.crawl_delay(ROBOTS_AGENT) or 0
+        result.delay = max(self.delay, min(float(crawl_delay), MAX_CRAWL_DELAY))
+        limiter = RateLimiter(result.delay)
+        
+        visited = {seed}
+        frontier = [seed]
+        fetched = set()
+        depth = 0
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            while frontier:
+                allowed = []
+                for url in frontier:
+                    if not robots.can_fetch(ROBOTS_AGENT, url):
+                        skipped["robots"] += 1
+                    elif len(result.pages) + len(allowed) >= self.max_pages:
+                        skipped["limit"] += 1
+                    else:
+                        allowed.append(url)
+                
+                next_frontier = []
+                for page in pool.map(lambda url: self._fetch(url, depth, limiter), allowed):
+                    if page.error is None and page.url in fetched:
+                        # Another URL redirected to a page we already have
+                        skipped["duplicate"] += 1
+                        continue
+                    fetched.add(page.url)
+                    visited.add(page.url)
+                    result.pages.append(page)
+                    if page.error is not None:
+                        continue
+                    self.index.add_page(page.url, site, page.title, page.chunks, depth)
+                    if depth >= self.max_depth:
+                        continue
+                    for link in page.links:
+                        if link not in visited and origin(link) == site and not _skipped_extension(link):
+                            visited.add(link)
+                            next_frontier.append(link)
+                frontier = next_frontier
+                depth += 1
+        
+        result.skipped = {reason: count for reason, count in skipped.items() if count}
+        result.duration = time.monotonic() - start
+        return result
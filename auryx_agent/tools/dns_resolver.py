@@ -0,0 +1,692 @@
+"""Asynchronous caching DNS stub resolver.
+
+Queries are encoded and decoded in-process and sent over UDP (TCP when
+the answer is truncated) to the nameservers from ``/etc/resolv.conf``.
+When there are several nameservers the query is raced: the next server
+is tried after a short stagger instead of waiting for a full timeout.
+A and AAAA lookups run in parallel, ``/etc/hosts`` is honoured, and
+answers (including negative ones) are cached in-process for their TTL,
+so the network tools resolving the same host over and over only pay for
+the first lookup.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import asyncio
+import ipaddress
+import os
+import random
+import socket
+import struct
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from auryx_agent.tools.aio import run_sync
+
+
+RECORD_TYPES = {
+    "A": 1, "NS": 2, "CNAME": 5, "SOA": 6, "PTR": 12, "MX": 15, "TXT": 16,
+    "AAAA": 28, "SRV": 33, "CAA": 257, "ANY": 255,
+}
+TYPE_NAMES = {value: name for name, value in RECORD_TYPES.items()}
+RCODES = {0: "NOERROR", 1: "FORMERR", 2: "SERVFAIL", 3: "NXDOMAIN", 4: "NOTIMP", 5: "REFUSED"}
+
+DEFAULT_TIMEOUT = 2.0
+DEFAULT_ATTEMPTS = 2
+# Delay before the same query is also sent to the next nameserver
+STAGGER = 0.3
+NEGATIVE_TTL = 30
+MAX_CACHE_ENTRIES = 4096
+EDNS_UDP_SIZE = 1232
+HOSTS_PATH = (os.path.join(os.environ.get("SystemRoot", r"C:\Windows"), r"System32\drivers\etc\hosts")
+              if os.name == "nt" else "/etc/hosts")
+RESOLV_CONF = "/etc/resolv.conf"
+
+_HEADER = struct.Struct("!HHHHHH")
+_RR = struct.Struct("!HHIH")
+FLAG_QR = 0x8000
+FLAG_TC = 0x0200
+FLAG_RD = 0x0100
+
+Server = Union[str, Tuple[str, int]]
+
+
+class DNSError(socket.gaierror):
+    """A name could not be resolved (also caught by ``except socket.gaierror``)."""
+
+
+@dataclass
+class DNSRecord:
+    """One resource record, with its data rendered like ``dig`` does."""
+    name: str
+    type: str
+    ttl: int
+    data: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"name": self.name, "type": self.type, "ttl": self.ttl, "data": self.data}
+
+
+@dataclass
+class Answer:
+    """Response to one query."""
+    name: str
+    type: str
+    rcode: str = "NOERROR"
+    records: List[DNSRecord] = field(default_factory=list)  # answer section
+    authority: List[DNSRecord] = field(default_factory=list)
+    nameserver: str = ""
+    cached: bool = False
+    
+    @property
+    def values(self) -> List[str]:
+        """Data of the records of the requested type (CNAMEs are followed by the server)."""
+        if self.type == "ANY":
+            return [r.data for r in self.records]
+        return [r.data for r in self.records if r.type == self.type]
+    
+    @property
+    def aliases(self) -> List[str]:
+        """Names in the CNAME chain leading to the answer."""
+        return [r.name for r in self.records if r.type == "CNAME"]
+    
+    def ttl(self) -> int:
+        """How long the answer may be cached."""
+        if self.records:
+            return min(r.ttl for r in self.records)
+        # Negative answers are cached for the SOA minimum (RFC 2308)
+        for record in self.authority:
+            if record.type == "SOA":
+                return min(record.ttl, int(record.data.split()[-1]))
+        return NEGATIVE_TTL
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "rcode": self.rcode,
+            "records": [r.to_dict() for r in self.records],
+            "nameserver": self.nameserver,
+            "cached": self.cached,
+        }
+
+
+def encode_name(name: str) -> bytes:
+    """Encode a domain name as length-prefixed labels."""
+    name = name.rstrip(".")
+    if not name:
+        return b"\0"
+    out = bytearray()
+    for label in name.split("."):
+        raw = label.encode("idna") if not label.isascii() else label.encode("ascii")
+        if not raw or len(raw) > 63:
+            raise ValueError(f"Invalid domain name: {name}")
+        out.append(len(raw))
+        out += raw
+    out.append(0)
+    if len(out) > 255:
+        raise ValueError(f"Domain name too long: {name}")
+    return bytes(out)
+
+
+def build_query(name: str, qtype: str, query_id: int, edns: bool = True) -> bytes:
+    """Build a recursive query for one name and type."""
+    if qtype not in RECORD_TYPES:
+        raise ValueError(f"Unsupported record type: {qtype}")
+    header = _HEADER.pack(query_id, FLAG_RD, 1, 0, 0, 1 if edns else 0)
+    question = encode_name(name) + struct.pack("!HH", RECORD_TYPES[qtype], 1)
+    # OPT pseudo-record advertising a larger UDP payload (RFC 6891)
+    opt = b"\0" + struct.pack("!HHIH", 41, EDNS_UDP_SIZE, 0, 0) if edns else b""
+    return header + question + opt
+
+
+def read_name(message: bytes, offset: int) -> Tuple[str, int]:
+    """Decode a possibly compressed name; returns (name, offset after it)."""
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        if offset >= len(message):
+            raise ValueError("Truncated name")
+        length = message[offset]
+        if length & 0xC0 == 0xC0:
+            if offset + 1 >= len(message):
+                raise ValueError("Truncated name pointer")
+            if end is None:
+                end = offset + 2
+            jumps += 1
+            if jumps > 64:
+                raise ValueError("Name compression loop")
+            offset = ((length & 0x3F) << 8) | message[offset + 1]
+        elif length == 0:
+            offset += 1
+            break
+        else:
+            labels.append(message[offset + 1:offset + 1 + length].decode("ascii", errors="replace"))
+            offset += 1 + length
+    return ".".join(labels), end if end is not None else offset
+
+
+def _render(message: bytes, rtype: int, start: int, length: int) -> str:
+    rdata = message[start:start + length]
+    if rtype == 1 and length == 4:
+        return socket.inet_ntop(socket.AF_INET, rdata)
+    if rtype == 28 and length == 16:
+        return socket.inet_ntop(socket.AF_INET6, rdata)
+    if rtype in (2, 5, 12):
+        return read_name(message, start)[0]
+    if rtype == 15:
+        return f"{struct.unpack_from('!H', message, start)[0]} {read_name(message, start + 2)[0]}"
+    if rtype == 16:
+        parts, i = [], 0
+        while i < length:
+            size = rdata[i]
+            parts.append(rdata[i + 1:i + 1 + size].decode("utf-8", errors="replace"))
+            i += 1 + size
+        return "".join(parts)
+    if rtype == 6:
+        mname, offset = read_name(message, start)
+        rname, offset = read_name(message, offset)
+        numbers = struct.unpack_from("!IIIII", message, offset)
+        return " ".join([mname, rname, *map(str, numbers)])
+    if rtype == 33:
+        priority, weight, port = struct.unpack_from("!HHH", message, start)
+        return f"{priority} {weight} {port} {read_name(message, start + 6)[0]}"
+    if rtype == 257 and length >= 2:
+        tag_len = rdata[1]
+        tag = rdata[2:2 + tag_len].decode("ascii", errors="replace")
+        value = rdata[2 + tag_len:].decode("utf-8", errors="replace")
+        return f'{rdata[0]} {tag} "{value}"'
+    return rdata.hex()
+
+
+def parse_response(message: bytes) -> Tuple[int, int, List[DNSRecord], List[DNSRecord], Optional[str]]:
+    """Decode a response.
+    
+    Returns:
+        (id, flags, answer records, authority records, question name)
+    
+    Raises:
+        ValueError: On a malformed message
+    """
+    if len(message) < _HEADER.size:
+        raise ValueError("Truncated DNS header")
+    query_id, flags, qdcount, ancount, nscount, _ = _HEADER.unpack_from(message)
+    offset = _HEADER.size
+    question = None
+    for _ in range(qdcount):
+        question, offset = read_name(message, offset)
+        offset += 4
+    
+    sections: List[List[DNSRecord]] = [[], []]
+    for index, count in enumerate((ancount, nscount)):
+        for _ in range(count):
+            name, offset = read_name(message, offset)
+            if offset + _RR.size > len(message):
+                raise ValueError("Truncated resource record")
+            rtype, _, ttl, length = _RR.unpack_from(message, offset)
+            offset += _RR.size
+            if offset + length > len(message):
+                raise ValueError("Truncated record data")
+            type_name = TYPE_NAMES.get(rtype, f"TYPE{rtype}")
+            try:
+                data = _render(message, rtype, offset, length)
+            except (struct.error, IndexError):
+                raise ValueError(f"Malformed {type_name} record") from None
+            sections[index].append(DNSRecord(name, type_name, ttl, data))
+            offset += length
+    return query_id, flags, sections[0], sections[1], question
+
+
+@dataclass
+class ResolvConf:
+    """The parts of resolv.conf the stub resolver uses."""
+    nameservers: List[str] = field(default_factory=list)
+    search: List[str] = field(default_factory=list)
+    timeout: float = DEFAULT_TIMEOUT
+    attempts: int = DEFAULT_ATTEMPTS
+
+
+def read_resolv_conf(path: str = RESOLV_CONF) -> ResolvConf:
+    """Parse resolv.conf (an empty config if it doesn't exist)."""
+    conf = ResolvConf()
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            lines = f.readlines()
+    except OSError:
+        return conf
+    for line in lines:
+        parts = line.split("#", 1)[0].split(";", 1)[0].split()
+        if len(parts) < 2:
+            continue
+        key, values = parts[0], parts[1:]
+        if key == "nameserver":
+            conf.nameservers.append(values[0])
+        elif key in ("search", "domain"):
+            conf.search = values
+        elif key == "options":
+            for option in values:
+                name, _, value = option.partition(":")
+                try:
+                    if name == "timeout":
+                        conf.timeout = float(value)
+                    elif name == "attempts":
+                        conf.attempts = max(1, int(value))
+                except ValueError:
+                    pass
+    return conf
+
+
+class HostsFile:
+    """Static name table, reloaded when the file changes."""
+    
+    def __init__(self, path: str = HOSTS_PATH):
+        self.path = path
+        self._mtime: Optional[int] = None
+        self.names: Dict[str, List[str]] = {}
+        self.addresses: Dict[str, str] = {}
+        self._lock = threading.Lock()
+    
+    def _load(self) -> None:
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            self.names, self.addresses, self._mtime = {}, {}, None
+            return
+        if mtime == self._mtime:
+            return
+        names: Dict[str, List[str]] = {}
+        addresses: Dict[str, str] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    parts = line.split("#", 1)[0].split()
+                    if len(parts) < 2:
+                        continue
+                    address = parts[0].split("%", 1)[0]
+                    try:
+                        ipaddress.ip_address(address)
+                    except ValueError:
+                        continue
+                    addresses.setdefault(address, parts[1])
+                    for name in parts[1:]:
+                        entries = names.setdefault(name.lower().rstrip("."), [])
+                        if address not in entries:
+                            entries.append(address)
+        except OSError:
+            return
+        self.names, self.addresses, self._mtime = names, addresses, mtime
+    
+    def lookup(self, name: str) -> List[str]:
+        """Addresses listed for a name."""
+        with self._lock:
+            self._load()
+            return list(self.names.get(name.lower().rstrip("."), []))
+    
+    def reverse(self, address: str) -> Optional[str]:
+        """First name listed for an address."""
+        with self._lock:
+            self._load()
+            return self.addresses.get(address)
+
+
+class DNSCache:
+    """Thread-safe LRU cache of answers that expire with their TTL."""
+    
+    def __init__(self, max_entries: int = MAX_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Answer]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, name: str, qtype: str) -> Optional[Answer]:
+        """A cached answer with TTLs counted down, or None."""
+        key = (name.lower().rstrip("."), qtype)
+        with self._lock:
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            expires, answer = entry
+        elapsed = int(now - (expires - answer.ttl()))
+        records = [replace(r, ttl=max(0, r.ttl - elapsed)) for r in answer.records]
+        return replace(answer, records=records, cached=True)
+    
+    def put(self, answer: Answer) -> None:
+        """Store an answer for its TTL (answers with TTL 0 are not stored)."""
+        ttl = answer.ttl()
+        if ttl <= 0:
+            return
+        key = (answer.name.lower().rstrip("."), answer.type)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, answer)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _UDPExchange(asyncio.DatagramProtocol):
+    """Waits for the datagram answering one query."""
+    
+    def __init__(self, query_id: int, future: asyncio.Future):
+        self.query_id = query_id
+        self.future = future
+    
+    def datagram_received(self, data: bytes, addr) -> None:
+        if len(data) >= 2 and struct.unpack_from("!H", data)[0] == self.query_id and not self.future.done():
+            self.future.set_result(data)
+    
+    def error_received(self, exc: Exception) -> None:
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+
+async def _exchange_udp(server: Tuple[str, int], query: bytes, query_id: int, timeout: float) -> bytes:
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    transport, _ = await loop.create_datagram_endpoint(
+        lambda: _UDPExchange(query_id, future), remote_addr=server)
+    try:
+        transport.sendto(query)
+        return await asyncio.wait_for(future, timeout)
+    finally:
+        transport.close()
+
+
+async def _exchange_tcp(server: Tuple[str, int], query: bytes, timeout: float) -> bytes:
+    async def exchange() -> bytes:
+        reader, writer = await asyncio.open_connection(*server)
+        try:
+            writer.write(struct.pack("!H", len(query)) + query)
+            await writer.drain()
+            length = struct.unpack("!H", await reader.readexactly(2))[0]
+            return await reader.readexactly(length)
+        finally:
+            writer.close()
+    
+    return await asyncio.wait_for(exchange(), timeout)
+
+
+class Resolver:
+    """Stub resolver with racing nameservers and a TTL cache."""
+    
+    def __init__(self, nameservers: Optional[Sequence[Server]] = None, port: int = 53,
+                 timeout: Optional[float] = None, attempts: Optional[int] = None,
+                 search: Optional[Sequence[str]] = None, hosts: Optional[HostsFile] = None,
+                 resolv_conf: str = RESOLV_CONF, stagger: float = STAGGER,
+                 cache: Optional[DNSCache] = None):
+        """Configure the resolver.
+        
+        Args:
+            nameservers: Servers to query, as addresses or (address, port)
+                pairs (default: from resolv.conf)
+            port: Port for nameservers given as plain addresses
+            timeout: Seconds to wait for each server (default: resolv.conf or 2)
+            attempts: Rounds over all servers (default: resolv.conf or 2)
+            search: Search domains for single-label names (default: resolv.conf)
+            hosts: Static hosts table (default: the system hosts file)
+            resolv_conf: Path of resolv.conf
+            stagger: Seconds before the next nameserver joins a query
+            cache: Answer cache (default: a new one)
+        """
+        conf = read_resolv_conf(resolv_conf)
+        self.nameservers: List[Server] = (list(nameservers) if nameservers is not None
+                                          else list(conf.nameservers))
+        self.port = port
+        self.timeout = timeout if timeout is not None else conf.timeout
+        self.attempts = attempts if attempts is not None else conf.attempts
+        self.search = list(search) if search is not None else conf.search
+        self.hosts = hosts if hosts is not None else HostsFile()
+        self.stagger = stagger
+        self.cache = cache if cache is not None else DNSCache()
+        self.queries_sent = 0
+        # Identical lookups in flight on the same event loop share one query
+        self._inflight: "weakref.WeakKeyDictionary[Any, Dict[Tuple[str, str], asyncio.Future]]" = \
+            weakref.WeakKeyDictionary()
+    
+    async def _ask(self, server: Server, name: str, qtype: str, edns: bool = True) -> Answer:
+        query_id = random.getrandbits(16)
+        query = build_query(name, qtype, query_id, edns)
+        address = server if isinstance(server, tuple) else (server.split("%", 1)[0], self.port)
+        self.queries_sent += 1
+        message = await _exchange_udp(address, query, query_id, self.timeout)
+        _, flags, records, authority, question = parse_response(message)
+        if flags & 0xF == 1 and edns:
+            # Old servers reject the EDNS OPT record
+            return await self._ask(server, name, qtype, edns=False)
+        if flags & FLAG_TC:
+            message = await _exchange_tcp(address, query, self.timeout)
+            _, flags, records, authority, question = parse_response(message)
+        if not flags & FLAG_QR or (question or "").lower() != name.lower().rstrip("."):
+            raise ValueError(f"Mismatched response from {server}")
+        return Answer(name, qtype, RCODES.get(flags & 0xF, f"RCODE{flags & 0xF}"),
+                      records, authority, f"{address[0]}:{address[1]}")
+    
+    async def _race(self, name: str, qtype: str) -> Answer:
+        """Ask the nameservers, each joining ``stagger`` seconds after the previous one."""
+        if not self.nameservers:
+            raise DNSError(socket.EAI_FAIL, "No nameservers configured")
+        
+        async def delayed(server: Server, delay: float) -> Answer:
+            if delay:
+                await asyncio.sleep(delay)
+            return await self._ask(server, name, qtype)
+        
+        errors: List[str] = []
+        fallback: Optional[Answer] = None
+        for _ in range(self.attempts):
+            tasks = [asyncio.ensure_future(delayed(server, i * self.stagger))
+                     for i, server in enumerate(self.nameservers)]
+            try:
+                for future in asyncio.as_completed(tasks):
+                    try:
+                        answer = await future
+                    except (asyncio.TimeoutError, OSError, ValueError) as e:
+                        errors.append(str(e) or "timed out")
+                        continue
+                    # A server that can't answer isn't authoritative about failure
+                    if answer.rcode in ("SERVFAIL", "REFUSED", "NOTIMP"):
+                        fallback = fallback or answer
+                        continue
+                    return answer
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+        if fallback is not None:
+            return fallback
+        raise DNSError(socket.EAI_AGAIN, f"No response from nameservers for {name} ({errors[-1] if errors else 'timed out'})")
+    
+    async def query(self, name: str, qtype: str = "A", use_cache: bool = True) -> Answer:
+        """Look up one record type, from the cache when possible.
+        
+        Args:
+            name: Domain name
+            qtype: Record type
+            use_cache: Answer from the cache if possible (fresh answers
+                are stored either way)
+        
+        Raises:
+            ValueError: On an invalid name or unsupported type
+            DNSError: If no nameserver answered
+        """
+        qtype = qtype.upper()
+        if qtype not in RECORD_TYPES:
+            raise ValueError(f"Unsupported record type: {qtype}")
+        name = name.rstrip(".")
+        cached = self.cache.get(name, qtype) if use_cache else None
+        if cached is not None:
+            return cached
+        
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.setdefault(loop, {})
+        key = (name.lower(), qtype)
+        if key in inflight and use_cache:
+            return await asyncio.shield(inflight[key])
+        
+        future = asyncio.ensure_future(self._race(name, qtype))
+        inflight[key] = future
+        future.add_done_callback(lambda _: inflight.pop(key, None))
+        answer = await asyncio.shield(future)
+        if answer.rcode in ("NOERROR", "NXDOMAIN"):
+            self.cache.put(answer)
+        return answer
+    
+    def _candidates(self, name: str) -> List[str]:
+        if "." in name or not self.search:
+            return [name]
+        return [f"{name}.{domain}" for domain in self.search] + [name]
+    
+    async def _addresses(self, name: str, family: int) -> Tuple[str, List[str], List[str]]:
+        types = {socket.AF_INET: ["A"], socket.AF_INET6: ["AAAA"]}.get(family, ["A", "AAAA"])
+        answers = await asyncio.gather(*(self.query(name, qtype) for qtype in types),
+                                       return_exceptions=True)
+        canonical = name
+        aliases: List[str] = []
+        addresses: List[str] = []
+        errors = []
+        for answer in answers:
+            if isinstance(answer, BaseException):
+                if not isinstance(answer, (OSError, ValueError)):
+                    raise answer
+                errors.append(answer)
+            else:
+                addresses.extend(answer.values)
+                aliases.extend(a for a in answer.aliases if a not in aliases)
+                chain = [r for r in answer.records if r.type == "CNAME"]
+                if chain:
+                    canonical = chain[-1].data
+        if not addresses and errors and len(errors) == len(answers):
+            raise errors[0]
+        return canonical, aliases, addresses
+    
+    async def resolve_ex(self, host: str,
+                         family: int = socket.AF_UNSPEC) -> Tuple[str, List[str], List[str]]:
+        """Canonical name, CNAME aliases and addresses of a host, IPv4 first.
+        
+        IP literals are returned as-is and the hosts file is consulted
+        before DNS. If DNS gives no answer the system resolver is tried,
+        so names only it knows (mDNS, VPN split DNS) still work.
+        
+        Returns:
+            (hostname, aliases, addresses) like ``socket.gethostbyname_ex``;
+            aliases are only known for names answered over DNS
+        
+        Raises:
+            DNSError: If the host can't be resolved
+        """
+        host = host.strip().rstrip(".")
+        try:
+            ipaddress.ip_address(host.split("%", 1)[0])
+            return host, [], [host]
+        except ValueError:
+            pass
+        if not host:
+            raise DNSError(socket.EAI_NONAME, "Empty host name")
+        
+        listed = self.hosts.lookup(host)
+        if family != socket.AF_UNSPEC:
+            want = 6 if family == socket.AF_INET6 else 4
+            listed = [a for a in listed if ipaddress.ip_address(a.split("%", 1)[0]).version == want]
+        if listed:
+            return host, [], sorted(listed, key=lambda a: ":" in a)
+        
+        if self.nameservers:
+            for candidate in self._candidates(host):
+                try:
+                    canonical, aliases, addresses = await self._addresses(candidate, family)
+                except (OSError, ValueError):
+                    break
+                if addresses:
+                    addresses = sorted(dict.fromkeys(addresses), key=lambda a: ":" in a)
+                    return canonical, aliases, addresses
+        
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await loop.getaddrinfo(host, None, family=family, type=socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            raise DNSError(e.errno, f"{host}: {e.strerror or 'Name or service not known'}") from None
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        return host, [], sorted(addresses, key=lambda a: ":" in a)
+    
+    async def resolve(self, host: str, family: int = socket.AF_UNSPEC) -> List[str]:
+        """Addresses of a host, IPv4 first (see ``resolve_ex``).
+        
+        Raises:
+            DNSError: If the host can't be resolved
+        """
+        return (await self.resolve_ex(host, family))[2]
+    
+    async def reverse(self, address: str) -> Optional[str]:
+        """Name of an address from the hosts file or a PTR record (None if unknown)."""
+        listed = self.hosts.reverse(address)
+        if listed:
+            return listed
+        if not self.nameservers:
+            return None
+        try:
+            answer = await self.query(ipaddress.ip_address(address).reverse_pointer, "PTR")
+        except (OSError, ValueError):
+            return None
+        return answer.values[0] if answer.values else None
+    
+    def stats(self) -> Dict[str, int]:
+        return {"cache_entries": len(self.cache), "cache_hits": self.cache.hits,
+                "cache_misses": self.cache.misses, "queries_sent": self.queries_sent}
+
+
+_resolver: Optional[Resolver] = None
+_resolver_lock = threading.Lock()
+
+
+def get_resolver() -> Resolver:
+    """The process-wide resolver shared by the network tools."""
+    global _resolver
+    with _resolver_lock:
+        if _resolver is None:
+            _resolver = Resolver()
+        return _resolver
+
+
+def resolve_host(host: str, family: int = socket.AF_UNSPEC) -> List[str]:
+    """Blocking ``get_resolver().resolve``."""
+    return run_sync(get_resolver().resolve(host, family))
+
+
+def resolve_host_ex(host: str, family: int = socket.AF_UNSPEC) -> Tuple[str, List[str], List[str]]:
+    """Blocking ``get_resolver().resolve_ex``."""
+    return run_sync(get_resolver().resolve_ex(host, family))
+
+
+def lookup(name: str, record_types: Sequence[str] = ("A",)) -> Dict[str, Answer]:
+    """Query several record types of a name in parallel (blocking).
+    
+    Raises:
+        ValueError: On an invalid name or unsupported type
+        DNSError: If no nameserver answered
+    """
+    resolver = get_resolver()
+    
+    async def run() -> Dict[str, Answer]:
+        answers = await asyncio.gather(*(resolver.query(name, qtype) for qtype in record_types))
+        return dict(zip(record_types, answers))
+    
+    return run_sync(run())
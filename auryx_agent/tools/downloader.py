@@ -0,0 +1,404 @@
+"""Resumable, optionally parallel file downloads.
+
+The body is streamed to ``<output>.part`` in fixed-size chunks, so
+memory use doesn't depend on the file size, and there is no overall time
+limit, only a timeout on each read. Progress is recorded next to the
+partial file; an interrupted download continues where it stopped with a
+``Range`` request (guarded by ``If-Range`` so a changed file starts
+over), and dropped connections are retried the same way. Large files on
+servers that accept ranges are split into parts fetched in parallel.
+When a checksum is given the finished file is verified before it is
+moved into place.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from auryx_agent.tools.http_client import HTTPClient, HTTPError, get_client
+
+
+CHUNK_SIZE = 256 * 1024
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_RETRIES = 5
+DEFAULT_PARTS = 4
+MAX_PARTS = 16
+# Files smaller than this are fetched in one stream
+PARALLEL_THRESHOLD = 16 * 1024 * 1024
+MIN_PART_SIZE = 4 * 1024 * 1024
+# Seconds between saves of the resume state
+STATE_INTERVAL = 1.0
+PARTIAL_SUFFIX = ".part"
+STATE_SUFFIX = ".part.json"
+
+# Hex digest length -> algorithm, for checksums given without a prefix
+DIGEST_LENGTHS = {32: "md5", 40: "sha1", 64: "sha256", 128: "sha512"}
+_CONTENT_RANGE_RE = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+class DownloadError(HTTPError):
+    """A download failed in a way retrying won't fix."""
+
+
+class ChecksumMismatch(DownloadError):
+    """The downloaded file doesn't match the expected checksum."""
+
+
+def parse_checksum(spec: str) -> Tuple[str, str]:
+    """Split "sha256:abc..." (or a bare hex digest) into (algorithm, digest).
+    
+    Raises:
+        ValueError: On an unknown algorithm or malformed digest
+    """
+    algorithm, _, digest = spec.strip().rpartition(":")
+    digest = digest.lower()
+    if not re.fullmatch(r"[0-9a-f]+", digest):
+        raise ValueError(f"Invalid checksum digest: {spec}")
+    algorithm = algorithm.lower().replace("-", "") or DIGEST_LENGTHS.get(len(digest), "")
+    if algorithm not in hashlib.algorithms_available:
+        raise ValueError(f"Unknown checksum algorithm in {spec!r}")
+    return algorithm, digest
+
+
+def file_digest(path: Path, algorithm: str) -> str:
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def output_path(url: str, output: Optional[str] = None) -> Path:
+    """Where to save a URL: output, or the URL's file name inside output if it is a directory."""
+    # Decode before taking the last segment, so "..%2F" or "%2Fetc" can't leave output
+    name = re.split(r"[/\\]", unquote(urlsplit(url).path))[-1].replace("\0", "").strip()
+    if name in ("", ".", ".."):
+        name = "download"
+    if not output:
+        return Path(name)
+    path = Path(output).expanduser()
+    if path.is_dir() or output.endswith(("/", os.sep)):
+        return path / name
+    return path
+
+
+@dataclass
+class Segment:
+    """A byte range of the file and how much of it is on disk."""
+    start: int
+    end: Optional[int]  # exclusive; None while the size is unknown
+    done: int = 0
+    
+    @property
+    def complete(self) -> bool:
+        return self.end is not None and self.start + self.done >= self.end
+
+
+@dataclass
+class DownloadResult:
+    url: str
+    path: Path
+    size: int
+    resumed_from: int = 0
+    parts: int = 1
+    duration: float = 0.0
+    checksum: Optional[Dict[str, str]] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "output": str(self.path),
+            "size": self.size,
+            "resumed_from": self.resumed_from,
+            "parts": self.parts,
+            "duration": round(self.duration, 3),
+            "speed_mbps": round(self.size / max(self.duration, 1e-6) / 1e6 * 8, 2),
+            "checksum": self.checksum,
+        }
+
+
+@dataclass
+class _Remote:
+    url: str
+    size: Optional[int] = None
+    ranges: bool = False
+    validator: Optional[str] = None
+
+
+@dataclass
+class _State:
+    url: str
+    size: Optional[int]
+    validator: Optional[str]
+    segments: List[Segment] = field(default_factory=list)
+    
+    @property
+    def done(self) -> int:
+        return sum(segment.done for segment in self.segments)
+
+
+class _RangesIgnored(Exception):
+    """The server answered a range request with the whole file."""
+
+
+class Downloader:
+    """Streams URLs to disk with resume, retries and parallel ranges."""
+    
+    def __init__(self, client: Optional[HTTPClient] = None, parts: int = DEFAULT_PARTS,
+                 timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES,
+                 on_progress: Optional[ProgressCallback] = None):
+        """Configure the downloader.
+        
+        Args:
+            client: HTTP client (default: the shared one)
+            parts: Parallel ranges for large files (1 disables splitting)
+            timeout: Seconds for connecting and for each read
+            retries: Attempts per range after a dropped connection
+            on_progress: Called with (bytes done, total bytes or None)
+        """
+        self.client = client or get_client()
+        self.parts = max(1, min(parts, MAX_PARTS))
+        self.timeout = timeout
+        self.retries = retries
+        self.on_progress = on_progress
+        self._lock = threading.Lock()
+        self._state: Optional[_State] = None
+        self._state_path: Optional[Path] = None
+        self._saved_at = 0.0
+    
+    def _probe(self, url: str) -> _Remote:
+        """Size, range support and validator of the file (best effort)."""
+        try:
+            response = self.client.head(url, headers={"Accept-Encoding": "identity"},
+                                        timeout=self.timeout)
+            response.close()
+        except OSError:
+            return _Remote(url)
+        if not response.ok:
+            return _Remote(url)
+        headers = response.headers
+        etag = headers.get("ETag")
+        length = headers.get("Content-Length")
+        return _Remote(
+            response.url,
+            size=int(length) if length and length.isdigit() else None,
+            ranges=headers.get("Accept-Ranges", "").lower() == "bytes",
+            # If-Range needs a strong validator
+            validator=etag if etag and not etag.startswith("W/") else headers.get("Last-Modified"),
+        )
+    
+    def _load_state(self, remote: _Remote, partial: Path) -> Optional[_State]:
+        try:
+            data = json.loads(self._state_path.read_text())
+        except (OSError, ValueError):
+            return None
+        if (data.get("url") != remote.url or data.get("size") != remote.size
+                or data.get("validator") != remote.validator or not partial.exists()
+                or not remote.ranges):
+            return None
+        return _State(remote.url, remote.size, remote.validator,
+                      [Segment(*segment) for segment in data["segments"]])
+    
+    def _save_state(self, force: bool = False) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if self._state is None or (not force and now - self._saved_at < STATE_INTERVAL):
+                return
+            self._saved_at = now
+            data = {"url": self._state.url, "size": self._state.size,
+                    "validator": self._state.validator,
+                    "segments": [[s.start, s.end, s.done] for s in self._state.segments]}
+        try:
+            self._state_path.write_text(json.dumps(data))
+        except OSError:
+            pass
+    
+    def _plan(self, remote: _Remote, parallel: Optional[bool]) -> List[Segment]:
+        size = remote.size
+        if parallel is None:
+            parallel = size is not None and size >= PARALLEL_THRESHOLD
+        count = min(self.parts, size // MIN_PART_SIZE) if (parallel and remote.ranges and size) else 1
+        if count <= 1:
+            return [Segment(0, size)]
+        step = -(-size // count)
+        return [Segment(start, min(start + step, size)) for start in range(0, size, step)]
+    
+    def _report(self, count: int) -> None:
+        if self.on_progress and self._state:
+            self.on_progress(self._state.done, self._state.size)
+        if count:
+            self._save_state()
+    
+    def _fetch_segment(self, url: str, partial: Path, segment: Segment, validator: Optional[str],
+                       single: bool) -> None:
+        offset = segment.start + segment.done
+        headers = {"Accept-Encoding": "identity"}
+        if offset or segment.end is not None and not single:
+            last = str(segment.end - 1) if segment.end is not None else ""
+            headers["Range"] = f"bytes={offset}-{last}"
+            if validator:
+                headers["If-Range"] = validator
+        response = self.client.get(url, headers=headers, timeout=self.timeout)
+        
+        if response.status_code == 206:
+            match = _CONTENT_RANGE_RE.match(response.headers.get("Content-Range", ""))
+            if not match or int(match.group(1)) != offset:
+                response.close()
+                raise DownloadError(f"Server sent the wrong range for {url}")
+        elif response.status_code == 200 and "Range" in headers:
+            # Range unsupported, or the file changed since the partial download
+            if not single:
+                response.close()
+                raise _RangesIgnored()
+            with self._lock:
+                segment.done = 0
+            offset = 0
+        elif response.status_code == 416 and segment.end is None and offset:
+            # Nothing left past offset: the earlier attempt got everything
+            response.close()
+            segment.end = offset
+            return
+        elif not response.ok:
+            response.close()
+            raise DownloadError(f"HTTP {response.status_code} {response.reason} for {url}")
+        
+        with response, open(partial, "r+b") as f:
+            f.seek(offset)
+            if single and segment.end is None:
+                f.truncate()
+            for data in response.iter_raw(CHUNK_SIZE):
+                if segment.end is not None:
+                    data = data[:segment.end - segment.start - segment.done]
+                    if not data:
+                        break
+                f.write(data)
+                with self._lock:
+                    segment.done += len(data)
+                self._report(len(data))
+        if segment.end is None:
+            segment.end = segment.start + segment.done
+        elif not segment.complete:
+            raise ConnectionResetError(f"Connection closed after {segment.done} bytes")
+    
+    def _fetch_with_retries(self, url: str, partial: Path, segment: Segment,
+                            validator: Optional[str], single: bool) -> None:
+        for attempt in range(self.retries + 1):
+            try:
+                self._fetch_segment(url, partial, segment, validator, single)
+                return
+            except DownloadError:
+                raise
+            except (OSError, http.client.HTTPException):
+                self._save_state(force=True)
+                if attempt == self.retries:
+                    raise
+                time.sleep(min(0.5 * 2 ** attempt, 10.0))
+    
+    def _discard(self, partial: Path) -> None:
+        """Forget the partial download and its saved state."""
+        with self._lock:
+            self._state = None
+        for leftover in (partial, self._state_path):
+            try:
+                leftover.unlink()
+            except OSError:
+                pass
+    
+    def download(self, url: str, output: Optional[str] = None, checksum: Optional[str] = None,
+                 resume: bool = True, parallel: Optional[bool] = None) -> DownloadResult:
+        """Download a URL to a file.
+        
+        Args:
+            url: http:// or https:// URL
+            output: File or directory to save to (default: URL file name)
+            checksum: Expected digest, "sha256:<hex>" or a bare hex digest
+            resume: Continue a previous partial download of the same file
+            parallel: Split into ranges (default: for files over 16 MB)
+        
+        Returns:
+            DownloadResult
+        
+        Raises:
+            ValueError: On a malformed checksum
+            ChecksumMismatch: If the file doesn't match the checksum
+            OSError: On network and file errors that persist after retries
+        """
+        expected = parse_checksum(checksum) if checksum else None
+        start = time.monotonic()
+        path = output_path(url, output)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(path.name + PARTIAL_SUFFIX)
+        self._state_path = path.with_name(path.name + STATE_SUFFIX)
+        
+        remote = self._probe(url)
+        state = self._load_state(remote, partial) if resume else None
+        if state is None:
+            state = _State(remote.url, remote.size, remote.validator, self._plan(remote, parallel))
+            with open(partial, "wb") as f:
+                if len(state.segments) > 1:
+                    f.truncate(remote.size)
+        resumed_from = state.done
+        self._state = state
+        self._report(0)
+        
+        pending = [segment for segment in state.segments if not segment.complete]
+        try:
+            if len(state.segments) == 1:
+                for segment in pending:
+                    self._fetch_with_retries(state.url, partial, segment, state.validator, True)
+            else:
+                with ThreadPoolExecutor(max_workers=len(pending) or 1) as pool:
+                    futures = [pool.submit(self._fetch_with_retries, state.url, partial, segment,
+                                           state.validator, False) for segment in pending]
+                    for future in futures:
+                        future.result()
+        except _RangesIgnored:
+            # Start over as one stream
+            state.segments = [Segment(0, state.size)]
+            resumed_from = 0
+            self._fetch_with_retries(state.url, partial, state.segments[0], None, True)
+        except DownloadError:
+            if not state.done:
+                self._discard(partial)
+            raise
+        finally:
+            self._save_state(force=True)
+        
+        size = partial.stat().st_size
+        if state.size is not None and size != state.size:
+            raise DownloadError(f"Size mismatch: expected {state.size} bytes, got {size}")
+        result = DownloadResult(state.url, path, size, resumed_from, len(state.segments))
+        if expected:
+            algorithm, digest = expected
+            actual = file_digest(partial, algorithm)
+            if actual != digest:
+                self._discard(partial)
+                raise ChecksumMismatch(f"{algorithm} mismatch: expected {digest}, got {actual}")
+            result.checksum = {"algorithm": algorithm, "digest": actual, "verified": True}
+        os.replace(partial, path)
+        self._discard(partial)
+        result.duration = time.monotonic() - start
+        return result
+
+
+def download(url: str, output: Optional[str] = None, checksum: Optional[str] = None,
+             parts: int = DEFAULT_PARTS, resume: bool = True, parallel: Optional[bool] = None,
+             timeout: float = DEFAULT_TIMEOUT,
+             on_progress: Optional[ProgressCallback] = None) -> DownloadResult:
+    """Download a URL with a new ``Downloader`` (see ``Downloader.download``)."""
+    downloader = Downloader(parts=parts, timeout=timeout, on_progress=on_progress)
+    return downloader.download(url, output, checksum, resume, parallel)
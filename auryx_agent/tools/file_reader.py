@@ -0,0 +1,419 @@
+"""Windowed reading of large files.
+
+Files are memory-mapped instead of read into memory, and only the window
+the caller asks for is decoded: a line range, the last N lines, a byte
+range or the lines matching a regex. Line ranges use a sparse line index
+(newline counts per 1 MiB chunk) that is built with one C-level
+``bytes.count`` per chunk and cached per (path, size, mtime), so jumping to
+line 5,000,000 of a multi-GB log touches one chunk.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import codecs
+import mmap
+import os
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DEFAULT_MAX_BYTES = 1024 * 1024
+INDEX_CHUNK = 1024 * 1024
+SNIFF_BYTES = 8192
+HEXDUMP_MAX_BYTES = 4096
+MAX_LINE_CHARS = 1000
+MAX_CACHED_INDEXES = 32
+
+# Encodings whose newlines are not a single b"\n" byte (decoded in full instead)
+WIDE_MAX_BYTES = 64 * 1024 * 1024
+
+# Longest BOMs first: the UTF-32 LE BOM starts with the UTF-16 LE one
+BOMS = (
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+
+
+class BinaryFileError(ValueError):
+    """Raised when a binary file is read as text."""
+
+
+def sniff_encoding(sample: bytes) -> Optional[str]:
+    """Guess the encoding of a file from its first bytes.
+    
+    Args:
+        sample: Leading bytes of the file
+    
+    Returns:
+        Encoding name, or None for binary data
+    """
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return encoding
+    
+    if b"\0" in sample:
+        return None
+    
+    try:
+        sample.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut by the end of the sample is still UTF-8
+        if e.start < len(sample) - 3:
+            return "latin-1"
+    return "utf-8"
+
+
+def is_wide(encoding: str) -> bool:
+    """True for encodings where b"\\n" does not mark line ends."""
+    return encoding.startswith(("utf-16", "utf-32"))
+
+
+def hexdump(data: bytes, offset: int = 0) -> str:
+    """Format bytes like ``hexdump -C``."""
+    lines = []
+    for i in range(0, len(data), 16):
+        chunk = data[i:i + 16]
+        hex_part = " ".join(f"{b:02x}" for b in chunk)
+        text = "".join(chr(b) if 32 <= b < 127 else "." for b in chunk)
+        lines.append(f"{offset + i:08x}  {hex_part:<47}  |{text}|")
+    return "\n".join(lines)
+
+
+class LineIndex:
+    """Sparse line index: number of newlines before each chunk of a file."""
+    
+    def __init__(self, mm, size: int, chunk_size: int = INDEX_CHUNK):
+        """Build the index.
+        
+        Args:
+            mm: Memory map (or bytes) of the file
+            size: File size
+            chunk_size: Bytes per index entry
+        """
+        self.size = size
+        self.chunk_size = chunk_size
+        self.newlines = array("Q")
+        count = 0
+        for start in range(0, size, chunk_size):
+            self.newlines.append(count)
+            count += mm[start:start + chunk_size].count(b"\n")
+        self.newline_total = count
+        
+        ends_with_newline = size > 0 and mm[size - 1:size] == b"\n"
+        self.total_lines = count if ends_with_newline or size == 0 else count + 1
+    
+    def offset_of_line(self, mm, line: int) -> int:
+        """Byte offset where a 0-based line starts (file size if past the end)."""
+        if line <= 0:
+            return 0
+        if line > self.newline_total:
+            return self.size
+        
+        # Last chunk that starts before the line-th newline
+        chunk = bisect_left(self.newlines, line) - 1
+        pos = chunk * self.chunk_size
+        for _ in range(line - self.newlines[chunk]):
+            pos = mm.find(b"\n", pos) + 1
+        return pos
+    
+    def line_of_offset(self, mm, offset: int) -> int:
+        """0-based line containing a byte offset."""
+        chunk = min(offset // self.chunk_size, len(self.newlines) - 1)
+        start = chunk * self.chunk_size
+        return self.newlines[chunk] + mm[start:offset].count(b"\n")
+
+
+_index_cache: "OrderedDict[str, Tuple[Tuple[int, int], LineIndex]]" = OrderedDict()
+_index_lock = threading.Lock()
+
+
+def _cached_index(path: str, st: os.stat_result) -> Optional[LineIndex]:
+    key = os.path.realpath(path)
+    with _index_lock:
+        entry = _index_cache.get(key)
+        if entry is None or entry[0] != (st.st_size, st.st_mtime_ns):
+            return None
+        _index_cache.move_to_end(key)
+        return entry[1]
+
+
+def get_line_index(path: str, st: os.stat_result, mm) -> LineIndex:
+    """Get the line index of a file, building and caching it if needed."""
+    index = _cached_index(path, st)
+    if index is not None:
+        return index
+    
+    index = LineIndex(mm, st.st_size)
+    with _index_lock:
+        _index_cache[os.path.realpath(path)] = ((st.st_size, st.st_mtime_ns), index)
+        while len(_index_cache) > MAX_CACHED_INDEXES:
+            _index_cache.popitem(last=False)
+    return index
+
+
+def _decode(data: bytes, encoding: str) -> str:
+    return data.decode(encoding, errors="replace")
+
+
+def _clip_line(text: str) -> str:
+    text = text.rstrip("\r\n")
+    if len(text) > MAX_LINE_CHARS:
+        return text[:MAX_LINE_CHARS] + f"...[{len(text) - MAX_LINE_CHARS} chars]"
+    return text
+
+
+def _count_lines(text: str) -> int:
+    if not text:
+        return 0
+    return text.count("\n") + (0 if text.endswith("\n") else 1)
+
+
+def _cap_window(data: bytes, max_bytes: int) -> Tuple[bytes, bool]:
+    """Cut a window to max_bytes, at a line boundary when there is one."""
+    if len(data) <= max_bytes:
+        return data, False
+    cut = data.rfind(b"\n", 0, max_bytes)
+    return data[:cut + 1 if cut >= 0 else max_bytes], True
+
+
+def _grep_lines(lines: List[str], regex: "re.Pattern", context: int,
+                max_matches: int) -> Tuple[List[Dict[str, Any]], List[str], bool]:
+    """Grep decoded lines (used for wide encodings)."""
+    matches, output, last = [], [], -1
+    for number, line in enumerate(lines):
+        if not regex.search(line):
+            continue
+        if len(matches) >= max_matches:
+            return matches, output, True
+        matches.append({"line": number + 1, "text": _clip_line(line)})
+        for ctx in range(max(number - context, last + 1), number):
+            output.append(f"{ctx + 1}-{_clip_line(lines[ctx])}")
+        output.append(f"{number + 1}:{_clip_line(line)}")
+        last = number
+        for ctx in range(number + 1, min(number + context, len(lines) - 1) + 1):
+            if regex.search(lines[ctx]):
+                break  # next match prints it
+            output.append(f"{ctx + 1}-{_clip_line(lines[ctx])}")
+            last = ctx
+    return matches, output, False
+
+
+def _grep_mmap(mm, size: int, regex: "re.Pattern", encoding: str, context: int,
+               max_matches: int) -> Tuple[List[Dict[str, Any]], List[str], bool]:
+    """Grep a memory-mapped file without decoding the lines that don't match."""
+    matches, output = [], []
+    pos = counted_to = line_no = 0
+    last_emitted = -1
+    
+    def line_bounds(start: int) -> Tuple[int, int]:
+        end = mm.find(b"\n", start)
+        return start, size if end < 0 else end
+    
+    while pos <= size:
+        match = regex.search(mm, pos)
+        if match is None:
+            break
+        if match.start() == size and mm[size - 1:size] == b"\n":
+            break  # the empty "line" after a final newline isn't a line
+        
+        line_start = mm.rfind(b"\n", 0, match.start()) + 1
+        _, line_end = line_bounds(line_start)
+        if regex.search(mm, line_start, line_end) is None:
+            # The match ran across a newline; lines are matched one at a time
+            pos = line_end + 1
+            continue
+        if len(matches) >= max_matches:
+            return matches, output, True
+        line_no += mm[counted_to:line_start].count(b"\n")
+        counted_to = line_start
+        
+        text = _clip_line(_decode(mm[line_start:line_end], encoding))
+        matches.append({"line": line_no + 1, "text": text})
+        
+        # Context before: walk back line by line
+        before = []
+        start = line_start
+        for ctx in range(line_no - 1, max(line_no - context, last_emitted + 1) - 1, -1):
+            prev = mm.rfind(b"\n", 0, start - 1) + 1
+            before.append(f"{ctx + 1}-{_clip_line(_decode(mm[prev:start], encoding))}")
+            start = prev
+        if output and before and line_no - len(before) > last_emitted + 1:
+            output.append("--")
+        output.extend(reversed(before))
+        output.append(f"{line_no + 1}:{text}")
+        last_emitted = line_no
+        
+        # Context after
+        start = line_end + 1
+        for ctx in range(line_no + 1, line_no + context + 1):
+            if start >= size:
+                break
+            _, end = line_bounds(start)
+            if regex.search(mm, start, end):
+                break  # next match prints it
+            output.append(f"{ctx + 1}-{_clip_line(_decode(mm[start:end], encoding))}")
+            last_emitted = ctx
+            start = end + 1
+        
+        pos = line_end + 1
+    
+    return matches, output, False
+
+
+def read_window(path: str, start_line: Optional[int] = None, end_line: Optional[int] = None,
+                tail_lines: Optional[int] = None, offset: Optional[int] = None,
+                length: Optional[int] = None, grep: Optional[str] = None,
+                ignore_case: bool = False, context: int = 0, max_matches: int = 100,
+                encoding: Optional[str] = None,
+                max_bytes: int = DEFAULT_MAX_BYTES) -> Dict[str, Any]:
+    """Read a window of a file.
+    
+    Exactly one mode is used, in this order: byte range (offset/length),
+    grep, tail, line range (start_line/end_line, whole file by default).
+    
+    Args:
+        path: Path to file
+        start_line: First line, 1-based
+        end_line: Last line, inclusive
+        tail_lines: Read the last N lines
+        offset: Byte offset (negative counts from the end)
+        length: Bytes to read from offset
+        grep: Regex; return matching lines with line numbers
+        ignore_case: Case-insensitive grep
+        context: Lines of context around grep matches
+        max_matches: Stop grep after this many matches
+        encoding: Text encoding (sniffed if None)
+        max_bytes: Largest window returned; longer windows are cut at a line end
+    
+    Returns:
+        Dict with 'content', 'encoding', 'size' and mode specific keys
+        ('start_line', 'end_line', 'total_lines', 'matches', 'offset',
+        'truncated')
+    
+    Raises:
+        BinaryFileError: If a binary file is read as text
+        OSError: If the file cannot be read
+    """
+    st = os.stat(path)
+    size = st.st_size
+    
+    with open(path, "rb") as f:
+        sample = f.read(SNIFF_BYTES)
+        if encoding is None:
+            encoding = sniff_encoding(sample)
+        
+        result: Dict[str, Any] = {"encoding": encoding or "binary", "size": size}
+        
+        if offset is not None or length is not None:
+            start = offset or 0
+            if start < 0:
+                start = max(size + start, 0)
+            limit = HEXDUMP_MAX_BYTES if encoding is None else max_bytes
+            length = min(length if length is not None else limit, limit)
+            f.seek(start)
+            data = f.read(length)
+            content = hexdump(data, start) if encoding is None else _decode(data, encoding)
+            result.update(content=content, offset=start, length=len(data),
+                          truncated=start + len(data) < size)
+            return result
+        
+        if encoding is None:
+            raise BinaryFileError(
+                f"Binary file ({size} bytes); pass offset/length for a hex dump"
+            )
+        
+        if size == 0:
+            result.update(content="", start_line=0, end_line=0, total_lines=0, truncated=False)
+            return result
+        
+        if is_wide(encoding):
+            if size > WIDE_MAX_BYTES:
+                raise ValueError(f"{encoding} files larger than {WIDE_MAX_BYTES} bytes are not supported")
+            f.seek(0)
+            return _read_decoded(_decode(f.read(), encoding), result, start_line, end_line,
+                                 tail_lines, grep, ignore_case, context, max_matches, max_bytes)
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            if grep:
+                # MULTILINE so ^ and $ match at line boundaries, as in _grep_lines
+                flags = re.MULTILINE | (re.IGNORECASE if ignore_case else 0)
+                pattern_encoding = "utf-8" if encoding == "utf-8-sig" else encoding
+                regex = re.compile(grep.encode(pattern_encoding, errors="replace"), flags)
+                matches, lines, more = _grep_mmap(mm, size, regex, encoding, context, max_matches)
+                result.update(content="\n".join(lines), matches=matches, truncated=more)
+                return result
+            
+            if tail_lines:
+                end = size - 1 if mm[size - 1:size] == b"\n" else size
+                start = end
+                for _ in range(tail_lines):
+                    start = mm.rfind(b"\n", 0, start)
+                    if start < 0:
+                        break
+                start += 1
+                data, truncated = _cap_window(mm[start:size], max_bytes)
+                index = _cached_index(path, st)
+                first = index.line_of_offset(mm, start) + 1 if index else None
+                total = index.total_lines if index else None
+            else:
+                index = get_line_index(path, st, mm)
+                first = max(start_line or 1, 1)
+                start = index.offset_of_line(mm, first - 1)
+                end = index.offset_of_line(mm, end_line) if end_line else size
+                data, truncated = _cap_window(mm[start:end], max_bytes)
+                total = index.total_lines
+    
+    content = _decode(data, encoding)
+    result.update(
+        content=content,
+        start_line=first,
+        end_line=first + _count_lines(content) - 1 if first is not None else None,
+        total_lines=total,
+        truncated=truncated,
+    )
+    return result
+
+
+def _read_decoded(text: str, result: Dict[str, Any], start_line: Optional[int],
+                  end_line: Optional[int], tail_lines: Optional[int], grep: Optional[str],
+                  ignore_case: bool, context: int, max_matches: int,
+                  max_bytes: int) -> Dict[str, Any]:
+    """Line modes over already decoded text."""
+    lines = text.splitlines(keepends=True)
+    
+    if grep:
+        regex = re.compile(grep, re.IGNORECASE if ignore_case else 0)
+        matches, output, more = _grep_lines(lines, regex, context, max_matches)
+        result.update(content="\n".join(output), matches=matches, truncated=more)
+        return result
+    
+    if tail_lines:
+        first = max(len(lines) - tail_lines, 0) + 1
+        window = lines[first - 1:]
+    else:
+        first = max(start_line or 1, 1)
+        window = lines[first - 1:end_line]
+    
+    content, kept = "", 0
+    for line in window:
+        if len(content) + len(line) > max_bytes and content:
+            break
+        content += line
+        kept += 1
+    
+    result.update(
+        content=content,
+        start_line=first,
+        end_line=first + kept - 1,
+        total_lines=len(lines),
+        truncated=kept < len(window),
+    )
+    return result
@@ -0,0 +1,269 @@
+"""Parallel, gitignore-aware file search.
+
+Directories are listed with ``os.scandir`` on a thread pool (the syscalls
+release the GIL), ignored and vendored directories are pruned before they
+are queued, and the search stops as soon as ``max_results`` files are
+found. Content search greps candidate files on the same pool through the
+memory-mapped reader.
+
+An optional persistent name index caches directory listings keyed by the
+directory's mtime (which changes whenever an entry is added, removed or
+renamed), so repeated searches of a large tree only stat directories
+instead of listing them.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from auryx_agent.tools.file_reader import BinaryFileError, read_window
+from auryx_agent.tools.fs_walk import DEFAULT_IGNORED_DIRS, GitIgnore, is_ignored, matches_glob
+
+
+DEFAULT_WORKERS = 8
+MAX_GREP_FILE_SIZE = 10 * 1024 * 1024
+MATCHES_PER_FILE = 3
+MAX_INDEXED_DIRS = 200000
+
+Listing = Tuple[List[str], List[str]]
+
+
+def scan_directory(path: str) -> Listing:
+    """List a directory as (file names, subdirectory names); symlinks are not followed."""
+    files, dirs = [], []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs.append(entry.name)
+                else:
+                    files.append(entry.name)
+            except OSError:
+                continue
+    return files, dirs
+
+
+class NameIndex:
+    """Persistent cache of directory listings, invalidated by directory mtime."""
+    
+    def __init__(self, path: Optional[Path] = None):
+        """Load the index.
+        
+        Args:
+            path: Index file (default: file_index.json in the data directory)
+        """
+        if path is None:
+            from auryx_agent.core.paths import get_data_dir
+            path = get_data_dir() / "file_index.json"
+        self.path = Path(path)
+        self.dirs: Dict[str, list] = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.dirs = json.load(f).get("dirs", {})
+        except (OSError, ValueError):
+            self.dirs = {}
+    
+    def list(self, path: str) -> Listing:
+        """List a directory, from the index if its mtime is unchanged."""
+        key = os.path.abspath(path)
+        mtime = os.stat(path).st_mtime_ns
+        entry = self.dirs.get(key)
+        if entry is not None and entry[0] == mtime:
+            self.hits += 1
+            return entry[1], entry[2]
+        
+        files, dirs = scan_directory(path)
+        with self._lock:
+            self.misses += 1
+            self.dirs[key] = [mtime, files, dirs]
+        return files, dirs
+    
+    def save(self) -> None:
+        """Write the index if anything changed."""
+        if not self.misses:
+            return
+        from auryx_agent.tools.patch_tools import atomic_write
+        
+        with self._lock:
+            if len(self.dirs) > MAX_INDEXED_DIRS:
+                # Drop the oldest entries (dicts keep insertion order)
+                for key in list(self.dirs)[:len(self.dirs) - MAX_INDEXED_DIRS]:
+                    del self.dirs[key]
+            data = json.dumps({"version": 1, "dirs": self.dirs}, separators=(",", ":"))
+        try:
+            atomic_write(self.path, data)
+        except OSError:
+            pass
+
+
+def grep_file(path: str, regex: str, ignore_case: bool = False,
+              max_matches: int = MATCHES_PER_FILE,
+              max_size: int = MAX_GREP_FILE_SIZE) -> List[Dict[str, Any]]:
+    """Return the first matching lines of a text file (binary and huge files are skipped)."""
+    try:
+        if os.path.getsize(path) > max_size:
+            return []
+        result = read_window(path, grep=regex, ignore_case=ignore_case, max_matches=max_matches)
+    except (BinaryFileError, OSError, ValueError):
+        return []
+    return result["matches"]
+
+
+class FileSearch:
+    """One search over a directory tree."""
+    
+    def __init__(self, root: str = ".", pattern: str = "*", content: Optional[str] = None,
+                 ignore_case: bool = False, include_hidden: bool = False, gitignore: bool = True,
+                 max_results: int = 50, workers: int = DEFAULT_WORKERS,
+                 index: Optional[NameIndex] = None):
+        """Configure the search.
+        
+        Args:
+            root: Directory to search
+            pattern: Glob for file names (or relative paths if it contains '/')
+            content: Optional regex that file contents must match
+            ignore_case: Case-insensitive content search
+            include_hidden: Search dotfiles and dot-directories
+            gitignore: Skip files ignored by .gitignore
+            max_results: Stop after this many results
+            workers: Thread pool size
+            index: Name index to list directories through
+        """
+        self.root = root
+        self.pattern = pattern or "*"
+        self.content = content
+        self.ignore_case = ignore_case
+        self.include_hidden = include_hidden
+        self.gitignore = gitignore
+        self.max_results = max_results
+        self.workers = workers
+        self.index = index
+        self.dirs_scanned = 0
+        self.files_seen = 0
+    
+    def _list(self, path: str) -> Listing:
+        if self.index is not None:
+            return self.index.list(path)
+        return scan_directory(path)
+    
+    def _keep(self, name: str, rel_path: str, is_dir: bool, ignores: List[GitIgnore]) -> bool:
+        if not self.include_hidden and name.startswith("."):
+            return False
+        if is_dir and name in DEFAULT_IGNORED_DIRS:
+            return False
+        return not (ignores and is_ignored(ignores, rel_path, is_dir))
+    
+    def run(self) -> Tuple[List[Any], bool]:
+        """Run the search.
+        
+        Results come in completion order, so which files are returned when
+        the search stops early depends on scheduling; they are sorted by path.
+        
+        Returns:
+            (results, truncated) where results are relative paths, or
+            dicts with 'path' and 'matches' for content searches
+        """
+        if not os.path.isdir(self.root):
+            raise NotADirectoryError(f"Not a directory: {self.root}")
+        
+        results: List[Any] = []
+        truncated = False
+        pool = ThreadPoolExecutor(max_workers=self.workers)
+        try:
+            pending = {pool.submit(self._list, self.root): ("dir", "", [])}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind, rel_path, ignores = pending.pop(future)
+                    try:
+                        value = future.result()
+                    except OSError:
+                        continue
+                    
+                    if kind == "grep":
+                        if value:
+                            results.append({"path": rel_path, "matches": value})
+                        continue
+                    
+                    self.dirs_scanned += 1
+                    files, dirs = value
+                    base = os.path.join(self.root, rel_path)
+                    if self.gitignore and ".gitignore" in files:
+                        ignores = ignores + [GitIgnore.from_file(os.path.join(base, ".gitignore"), rel_path)]
+                    
+                    for name in dirs:
+                        child = f"{rel_path}/{name}" if rel_path else name
+                        if self._keep(name, child, True, ignores):
+                            pending[pool.submit(self._list, os.path.join(base, name))] = ("dir", child, ignores)
+                    
+                    for name in files:
+                        child = f"{rel_path}/{name}" if rel_path else name
+                        self.files_seen += 1
+                        if not matches_glob(child, name, self.pattern):
+                            continue
+                        if not self._keep(name, child, False, ignores):
+                            continue
+                        if self.content:
+                            future = pool.submit(grep_file, os.path.join(base, name), self.content,
+                                                 self.ignore_case)
+                            pending[future] = ("grep", child, None)
+                        else:
+                            results.append(child)
+                
+                if len(results) >= self.max_results:
+                    truncated = bool(pending) or len(results) > self.max_results
+                    break
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            if self.index is not None:
+                self.index.save()
+        
+        results = results[:self.max_results]
+        results.sort(key=lambda r: r["path"] if isinstance(r, dict) else r)
+        return results, truncated
+
+
+def search_files(root: str = ".", pattern: str = "*", content: Optional[str] = None,
+                 ignore_case: bool = False, include_hidden: bool = False,
+                 gitignore: bool = True, max_results: int = 50, use_index: bool = False,
+                 workers: int = DEFAULT_WORKERS) -> Dict[str, Any]:
+    """Search a tree for files by name and, optionally, content.
+    
+    Args:
+        root: Directory to search
+        pattern: Glob for file names
+        content: Optional regex to grep for
+        ignore_case: Case-insensitive content search
+        include_hidden: Search dotfiles and dot-directories
+        gitignore: Skip gitignored files
+        max_results: Stop after this many results
+        use_index: List directories through the persistent name index
+        workers: Thread pool size
+    
+    Returns:
+        Dict with 'results', 'truncated', 'dirs_scanned', 'files_seen'
+        and, with the index, 'index_hits'
+    """
+    index = NameIndex() if use_index else None
+    search = FileSearch(root, pattern=pattern, content=content, ignore_case=ignore_case,
+                        include_hidden=include_hidden, gitignore=gitignore,
+                        max_results=max_results, workers=workers, index=index)
+    results, truncated = search.run()
+    summary = {
+        "results": results,
+        "truncated": truncated,
+        "dirs_scanned": search.dirs_scanned,
+        "files_seen": search.files_seen,
+    }
+    if index is not None:
+        summary["index_hits"] = index.hits
+    return summary
@@ -0,0 +1,495 @@
+"""Incremental file index for watched directories.
+
+A watcher walks its root once, then keeps an in-memory index of paths,
+sizes and mtimes up to date from inotify events (Linux, via ctypes) or,
+where inotify is unavailable, by periodic polling. File lookups and
+"what changed?" questions are answered from the index, so repeated
+searches cost O(changes) instead of a full tree walk.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from auryx_agent.tools.fs_walk import (
+    DEFAULT_IGNORED_DIRS, GitIgnore, WalkEntry, is_ignored, matches_glob, walk
+)
+
+
+MAX_CHANGES = 2000
+POLL_INTERVAL = 2.0
+# Repeated writes to the same file within this window are logged once
+COALESCE_SECONDS = 1.0
+
+# inotify constants (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class Inotify:
+    """Minimal ctypes binding for inotify."""
+    
+    def __init__(self):
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is only available on Linux")
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._libc = libc
+        self.fd = libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+    
+    def add_watch(self, path: str, mask: int = WATCH_MASK) -> int:
+        """Watch a directory; returns the watch descriptor."""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err), path)
+        return wd
+    
+    def read(self, timeout: float) -> List[Tuple[int, int, int, str]]:
+        """Read pending events as (wd, mask, cookie, name)."""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        data = os.read(self.fd, 256 * 1024)
+        events = []
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0")
+            offset += length
+            events.append((wd, mask, cookie, os.fsdecode(name)))
+        return events
+    
+    def close(self) -> None:
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class FileWatcher:
+    """Keeps an index of one directory tree current."""
+    
+    def __init__(self, root: str, gitignore: bool = True, include_hidden: bool = True,
+                 poll_interval: float = POLL_INTERVAL, max_changes: int = MAX_CHANGES,
+                 use_inotify: bool = True):
+        """Configure the watcher (call ``start`` to build the index).
+        
+        Args:
+            root: Directory to watch
+            gitignore: Leave gitignored paths out of the index
+            include_hidden: Index dotfiles
+            poll_interval: Seconds between rescans in polling mode
+            max_changes: Size of the change log
+            use_inotify: Try inotify before falling back to polling
+        """
+        self.root = os.path.abspath(os.path.expanduser(root))
+        self.gitignore = gitignore
+        self.include_hidden = include_hidden
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self.backend = "none"
+        self.entries: Dict[str, WalkEntry] = {}
+        self.change_log: deque = deque(maxlen=max_changes)
+        self._ignores: Dict[str, GitIgnore] = {}
+        self._lock = threading.RLock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._inotify: Optional[Inotify] = None
+        self._watches: Dict[int, str] = {}
+    
+    # Index maintenance
+    
+    def _scan(self) -> Dict[str, WalkEntry]:
+        entries = {e.path: e for e in walk(self.root, include_hidden=self.include_hidden,
+                                           gitignore=self.gitignore, stat=True)}
+        if self.gitignore:
+            self._ignores = {
+                os.path.dirname(path): GitIgnore.from_file(os.path.join(self.root, path),
+                                                           os.path.dirname(path))
+                for path in entries if os.path.basename(path) == ".gitignore"
+            }
+        return entries
+    
+    def _record(self, event: str, path: str, is_dir: bool) -> None:
+        now = time.time()
+        if event == "modified" and self.change_log:
+            last = self.change_log[-1]
+            if last["path"] == path and last["event"] in ("modified", "created") \
+                    and now - last["time"] < COALESCE_SECONDS:
+                last["time"] = now
+                return
+        self.change_log.append({"time": now, "event": event, "path": path,
+                                "type": "dir" if is_dir else "file"})
+    
+    def _diff(self, new_entries: Dict[str, WalkEntry]) -> None:
+        """Replace the index, logging what changed."""
+        with self._lock:
+            old = self.entries
+            for path, entry in new_entries.items():
+                previous = old.get(path)
+                if previous is None:
+                    self._record("created", path, entry.is_dir)
+                elif not entry.is_dir and (previous.size, previous.mtime) != (entry.size, entry.mtime):
+                    self._record("modified", path, False)
+            for path, entry in old.items():
+                if path not in new_entries:
+                    self._record("deleted", path, entry.is_dir)
+            self.entries = new_entries
+    
+    def _ignored(self, rel_path: str, is_dir: bool) -> bool:
+        name = os.path.basename(rel_path)
+        if not self.include_hidden and name.startswith("."):
+            return True
+        parent = os.path.dirname(rel_path)
+        parts = parent.split("/") if parent else []
+        if any(part in DEFAULT_IGNORED_DIRS for part in parts):
+            return True
+        if not self.gitignore or not self._ignores:
+            return False
+        chain = [self._ignores[d] for d in [""] + ["/".join(parts[:i + 1]) for i in range(len(parts))]
+                 if d in self._ignores]
+        return bool(chain) and is_ignored(chain, rel_path, is_dir)
+    
+    def _update_path(self, rel_path: str) -> None:
+        """Re-stat one path after an event."""
+        full = os.path.join(self.root, rel_path)
+        try:
+            st = os.lstat(full)
+        except OSError:
+            self._remove_path(rel_path)
+            return
+        
+        is_dir = os.path.isdir(full) and not os.path.islink(full)
+        if self._ignored(rel_path, is_dir):
+            return
+        
+        with self._lock:
+            previous = self.entries.get(rel_path)
+            entry = WalkEntry(rel_path, os.path.basename(rel_path), is_dir,
+                              rel_path.count("/") + 1, 0 if is_dir else st.st_size, st.st_mtime)
+            self.entries[rel_path] = entry
+            if previous is None:
+                self._record("created", rel_path, is_dir)
+            elif not is_dir and (previous.size, previous.mtime) != (entry.size, entry.mtime):
+                self._record("modified", rel_path, False)
+            
+            if os.path.basename(rel_path) == ".gitignore" and self.gitignore:
+                base = os.path.dirname(rel_path)
+                self._ignores[base] = GitIgnore.from_file(full, base)
+        
+        if is_dir and previous is None and os.path.basename(rel_path) not in DEFAULT_IGNORED_DIRS:
+            # New directory: watch it and index whatever appeared before the watch
+            self._add_watch(rel_path)
+            for child in walk(full, include_hidden=self.include_hidden,
+                              gitignore=self.gitignore, stat=True):
+                child_path = f"{rel_path}/{child.path}"
+                with self._lock:
+                    if child_path not in self.entries:
+                        child.path = child_path
+                        child.depth = child_path.count("/") + 1
+                        self.entries[child_path] = child
+                        self._record("created", child_path, child.is_dir)
+                if child.is_dir and child.name not in DEFAULT_IGNORED_DIRS:
+                    self._add_watch(child_path)
+    
+    def _remove_path(self, rel_path: str) -> None:
+        with self._lock:
+            entry = self.entries.pop(rel_path, None)
+            if entry is None:
+                return
+            self._record("deleted", rel_path, entry.is_dir)
+            if entry.name == ".gitignore":
+                self._ignores.pop(os.path.dirname(rel_path), None)
+            if entry.is_dir:
+                prefix = rel_path + "/"
+                for path in [p for p in self.entries if p.startswith(prefix)]:
+                    del self.entries[path]
+                for base in [b for b in self._ignores if b == rel_path or b.startswith(prefix)]:
+                    del self._ignores[base]
+    
+    # Backends
+    
+    def _add_watch(self, rel_dir: str) -> None:
+        if self._inotify is None:
+            return
+        try:
+            wd = self._inotify.add_watch(os.path.join(self.root, rel_dir))
+            self._watches[wd] = rel_dir
+        except OSError as e:
+            if e.errno == errno.ENOSPC:
+                # Out of inotify watches: switch to polling
+                self._switch_to_polling()
+    
+    def _switch_to_polling(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+            self._watches.clear()
+        self.backend = "polling"
+    
+    def _start_inotify(self) -> bool:
+        try:
+            self._inotify = Inotify()
+        except (OSError, AttributeError):
+            return False
+        self.backend = "inotify"
+        self._add_watch("")
+        for path, entry in list(self.entries.items()):
+            if entry.is_dir and entry.name not in DEFAULT_IGNORED_DIRS:
+                self._add_watch(path)
+                if self._inotify is None:
+                    return False
+        return True
+    
+    def _handle(self, wd: int, mask: int, name: str) -> None:
+        if mask & IN_Q_OVERFLOW:
+            self._diff(self._scan())
+            return
+        if mask & IN_IGNORED:
+            self._watches.pop(wd, None)
+            return
+        
+        rel_dir = self._watches.get(wd)
+        if rel_dir is None or not name:
+            return
+        rel_path = f"{rel_dir}/{name}" if rel_dir else name
+        
+        if mask & (IN_DELETE | IN_MOVED_FROM):
+            self._remove_path(rel_path)
+        elif mask & (IN_CREATE | IN_MOVED_TO | IN_MODIFY | IN_CLOSE_WRITE | IN_ATTRIB):
+            self._update_path(rel_path)
+    
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            if self._inotify is not None:
+                try:
+                    events = self._inotify.read(0.5)
+                except OSError:
+                    self._switch_to_polling()
+                    continue
+                for wd, mask, _, name in events:
+                    self._handle(wd, mask, name)
+            else:
+                if self._stop.wait(self.poll_interval):
+                    break
+                self._diff(self._scan())
+    
+    # Public API
+    
+    def start(self) -> "FileWatcher":
+        """Build the index and start following changes."""
+        if self._thread is not None:
+            return self
+        if not os.path.isdir(self.root):
+            raise NotADirectoryError(f"Not a directory: {self.root}")
+        
+        with self._lock:
+            self.entries = self._scan()
+        if not (self.use_inotify and self._start_inotify()):
+            self._switch_to_polling()
+        
+        self._thread = threading.Thread(target=self._run, name=f"watch:{self.root}", daemon=True)
+        self._thread.start()
+        return self
+    
+    def stop(self) -> None:
+        """Stop watching."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+    
+    def relative(self, path: str) -> Optional[str]:
+        """Path relative to the root ("" for the root), None if outside it."""
+        full = os.path.abspath(os.path.expanduser(path))
+        if full == self.root:
+            return ""
+        if full.startswith(self.root.rstrip(os.sep) + os.sep):
+            return os.path.relpath(full, self.root).replace(os.sep, "/")
+        return None
+    
+    def walk_entries(self, under: str = "") -> Iterator[WalkEntry]:
+        """Index entries below a relative directory, with paths relative to it."""
+        prefix = under + "/" if under else ""
+        base_depth = under.count("/") + 1 if under else 0
+        with self._lock:
+            items = list(self.entries.values())
+        for entry in items:
+            if prefix and not entry.path.startswith(prefix):
+                continue
+            yield WalkEntry(entry.path[len(prefix):], entry.name, entry.is_dir,
+                            entry.depth - base_depth, entry.size, entry.mtime)
+    
+    def find(self, pattern: str = "*", under: str = "", include_hidden: bool = False,
+             max_results: Optional[int] = None) -> Tuple[List[str], bool]:
+        """Find indexed files by glob.
+        
+        Returns:
+            (relative paths sorted, truncated)
+        """
+        found = []
+        for entry in self.walk_entries(under):
+            if entry.is_dir:
+                continue
+            if not include_hidden and any(part.startswith(".") for part in entry.path.split("/")):
+                continue
+            if matches_glob(entry.path, entry.name, pattern):
+                found.append(entry.path)
+        found.sort()
+        if max_results is not None and len(found) > max_results:
+            return found[:max_results], True
+        return found, False
+    
+    def changes(self, since: Optional[float] = None, under: str = "",
+                limit: int = 100) -> List[Dict[str, Any]]:
+        """Logged changes, newest last.
+        
+        Args:
+            since: Only changes after this epoch time
+            under: Only changes below this relative directory
+            limit: Maximum number of changes (the most recent are kept)
+        """
+        prefix = under + "/" if under else ""
+        with self._lock:
+            log = list(self.change_log)
+        selected = [c for c in log
+                    if (since is None or c["time"] > since) and c["path"].startswith(prefix)]
+        return selected[-limit:] if limit else selected
+    
+    def stats(self) -> Dict[str, Any]:
+        """Summary of the index."""
+        with self._lock:
+            files = sum(1 for e in self.entries.values() if not e.is_dir)
+            dirs = len(self.entries) - files
+        return {"root": self.root, "backend": self.backend, "files": files, "dirs": dirs,
+                "changes": len(self.change_log)}
+
+
+_watchers: Dict[str, FileWatcher] = {}
+_watchers_lock = threading.Lock()
+
+
+def watch_path(path: str, **kwargs) -> FileWatcher:
+    """Start (or return the running) watcher for a directory."""
+    root = os.path.abspath(os.path.expanduser(path))
+    with _watchers_lock:
+        watcher = _watchers.get(root)
+        if watcher is None:
+            watcher = FileWatcher(root, **kwargs).start()
+            _watchers[root] = watcher
+        return watcher
+
+
+def unwatch_path(path: str) -> bool:
+    """Stop watching a directory; returns False if it wasn't watched."""
+    root = os.path.abspath(os.path.expanduser(path))
+    with _watchers_lock:
+        watcher = _watchers.pop(root, None)
+    if watcher is None:
+        return False
+    watcher.stop()
+    return True
+
+
+def find_watcher(path: str) -> Optional[Tuple[FileWatcher, str]]:
+    """Find a running watcher whose root contains path.
+    
+    Returns:
+        (watcher, path relative to its root) or None
+    """
+    with _watchers_lock:
+        watchers = list(_watchers.values())
+    for watcher in sorted(watchers, key=lambda w: len(w.root), reverse=True):
+        rel = watcher.relative(path)
+        if rel is not None and (rel == "" or rel in watcher.entries):
+            return watcher, rel
+    return None
+
+
+class WatchTools:
+    """Tools for watching directories and asking what changed."""
+    
+    @staticmethod
+    def watch_directory(path: str = ".", stop: bool = False) -> Dict[str, Any]:
+        """Start (or stop) keeping an index of a directory tree.
+        
+        While a directory is watched, find_files and list_directory answer
+        from the index and recent_changes reports what changed.
+        
+        Args:
+            path: Directory to watch
+            stop: Stop watching instead
+        
+        Returns:
+            Dict with 'success', 'root', 'backend', 'files', 'dirs'
+        """
+        try:
+            if stop:
+                return {"success": unwatch_path(path), "root": os.path.abspath(path),
+                        "watching": False}
+            watcher = watch_path(path)
+            return {"success": True, "watching": True, **watcher.stats()}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    @staticmethod
+    def recent_changes(path: str = ".", since_seconds: Optional[float] = None,
+                       limit: int = 50) -> Dict[str, Any]:
+        """List files created, modified or deleted in a watched directory.
+        
+        Args:
+            path: Watched directory (or a directory inside one)
+            since_seconds: Only changes from the last N seconds
+            limit: Maximum number of changes
+        
+        Returns:
+            Dict with 'success', 'changes' (time, event, path, type), 'count'
+        """
+        found = find_watcher(path)
+        if found is None:
+            return {"success": False,
+                    "error": f"{path} is not being watched; call watch_directory first"}
+        watcher, rel = found
+        since = time.time() - since_seconds if since_seconds else None
+        changes = watcher.changes(since=since, under=rel, limit=limit)
+        return {
+            "success": True,
+            "root": watcher.root,
+            "count": len(changes),
+            "changes": [
+                {**c, "time": time.strftime("%H:%M:%S", time.localtime(c["time"]))}
+                for c in changes
+            ],
+        }
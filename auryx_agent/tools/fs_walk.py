@@ -0,0 +1,339 @@
+"""Fast, gitignore-aware directory walking.
+
+The walker is built on ``os.scandir``: the file type comes from the
+directory entry itself (no extra stat per item) and ``DirEntry.stat`` is
+only called when sizes or modification times are needed. Ignored and
+vendored directories are pruned before they are entered, so exploring a
+repository does not crawl ``.git`` or ``node_modules``.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import fnmatch
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Directories that are listed but never descended into
+DEFAULT_IGNORED_DIRS = frozenset({
+    ".git", ".hg", ".svn", "node_modules", "__pycache__", ".venv", "venv",
+    ".mypy_cache", ".pytest_cache", ".tox", ".ruff_cache", ".idea", ".cache",
+})
+
+SORT_KEYS = ("name", "size", "mtime")
+
+
+@dataclass
+class WalkEntry:
+    """A file or directory found by ``walk``."""
+    path: str
+    name: str
+    is_dir: bool
+    depth: int
+    size: int = 0
+    mtime: float = 0.0
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob to a regex body (no anchors)."""
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+        elif pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+        elif pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+        elif pattern[i] == "*":
+            out.append("[^/]*")
+            i += 1
+        elif pattern[i] == "?":
+            out.append("[^/]")
+            i += 1
+        elif pattern[i] == "[":
+            end = pattern.find("]", i + 2)
+            if end < 0:
+                out.append(re.escape("["))
+                i += 1
+            else:
+                body = pattern[i + 1:end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+        elif pattern[i] == "\\" and i + 1 < len(pattern):
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return "".join(out)
+
+
+class GitIgnore:
+    """Rules from one ``.gitignore`` file.
+    
+    Paths passed to ``match`` are relative to the directory holding the
+    file and use ``/`` separators.
+    """
+    
+    def __init__(self, lines: Iterable[str] = (), base: str = ""):
+        """Compile rules.
+        
+        Args:
+            lines: Lines of a .gitignore file
+            base: Directory of the file, relative to the walk root ("" for the root)
+        """
+        self.base = base.strip("/")
+        self.rules: List[Tuple["re.Pattern", bool, bool]] = []
+        for line in lines:
+            rule = self._compile(line)
+            if rule:
+                self.rules.append(rule)
+    
+    @staticmethod
+    def _compile(line: str) -> Optional[Tuple["re.Pattern", bool, bool]]:
+        line = line.rstrip("\n")
+        if not line.endswith("\\ "):
+            line = line.rstrip()
+        if not line or line.startswith("#"):
+            return None
+        
+        negate = line.startswith("!")
+        if negate:
+            line = line[1:]
+        elif line.startswith("\\!") or line.startswith("\\#"):
+            line = line[1:]
+        
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            return None
+        
+        anchored = "/" in line
+        line = line.lstrip("/")
+        body = _translate(line)
+        regex = f"^{body}$" if anchored else f"^(?:.*/)?{body}$"
+        return re.compile(regex), negate, dir_only
+    
+    @classmethod
+    def from_file(cls, path: str, base: str = "") -> "GitIgnore":
+        """Load rules from a file (empty if it can't be read)."""
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                return cls(f, base)
+        except OSError:
+            return cls((), base)
+    
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        """Check a path against the rules.
+        
+        Args:
+            rel_path: Path relative to the walk root
+            is_dir: Whether the path is a directory
+        
+        Returns:
+            True if ignored, False if re-included by a ``!`` rule,
+            None if no rule matches
+        """
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return None
+            rel_path = rel_path[len(self.base) + 1:]
+        
+        result = None
+        for regex, negate, dir_only in self.rules:
+            if dir_only and not is_dir:
+                continue
+            if regex.match(rel_path):
+                result = not negate
+        return result
+
+
+def is_ignored(ignores: List[GitIgnore], rel_path: str, is_dir: bool) -> bool:
+    """Apply ignore files from the root down; deeper files win."""
+    ignored = False
+    for ignore in ignores:
+        result = ignore.match(rel_path, is_dir)
+        if result is not None:
+            ignored = result
+    return ignored
+
+
+def matches_glob(entry_path: str, name: str, pattern: str) -> bool:
+    """Match a glob against the name, or the relative path if it contains '/'."""
+    if "/" in pattern:
+        return fnmatch.fnmatch(entry_path, pattern)
+    return fnmatch.fnmatch(name, pattern)
+
+
+def walk(root: str, max_depth: Optional[int] = None, include_hidden: bool = True,
+         gitignore: bool = True, ignored_dirs: Iterable[str] = DEFAULT_IGNORED_DIRS,
+         stat: bool = False, follow_symlinks: bool = False) -> Iterator[WalkEntry]:
+    """Walk a directory tree depth-first.
+    
+    Directories in ``ignored_dirs`` are yielded but not entered;
+    gitignored files and directories are skipped entirely.
+    
+    Args:
+        root: Directory to walk
+        max_depth: Deepest level to yield (1 = direct children, None = unlimited)
+        include_hidden: Include dotfiles and dot-directories
+        gitignore: Honour .gitignore files found during the walk
+        ignored_dirs: Directory names never descended into
+        stat: Fill in size and mtime (one stat per entry)
+        follow_symlinks: Descend into symlinked directories
+    
+    Yields:
+        WalkEntry for every file and directory
+    """
+    ignored_dirs = frozenset(ignored_dirs)
+    # (absolute dir, relative dir, depth of its children, active ignore files)
+    stack: List[Tuple[str, str, int, List[GitIgnore]]] = [(root, "", 1, [])]
+    
+    while stack:
+        directory, rel_dir, depth, ignores = stack.pop()
+        
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        
+        if gitignore:
+            for entry in entries:
+                if entry.name == ".gitignore":
+                    ignores = ignores + [GitIgnore.from_file(entry.path, rel_dir)]
+                    break
+        
+        subdirs = []
+        for entry in entries:
+            name = entry.name
+            if not include_hidden and name.startswith("."):
+                continue
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            try:
+                is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+            except OSError:
+                continue
+            
+            if ignores and is_ignored(ignores, rel_path, is_dir):
+                continue
+            
+            item = WalkEntry(rel_path, name, is_dir, depth)
+            if stat:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                    item.size = 0 if is_dir else st.st_size
+                    item.mtime = st.st_mtime
+                except OSError:
+                    pass
+            yield item
+            
+            if is_dir and name not in ignored_dirs and (max_depth is None or depth < max_depth):
+                subdirs.append((entry.path, rel_path, depth + 1, ignores))
+        
+        # Reversed so that directories are visited in listing order
+        stack.extend(reversed(subdirs))
+
+
+def aggregate_sizes(entries: Iterable[WalkEntry]) -> Dict[str, int]:
+    """Total size of each directory from the file entries below it."""
+    sizes: Dict[str, int] = {}
+    for entry in entries:
+        if entry.is_dir:
+            sizes.setdefault(entry.path, 0)
+            continue
+        parent = entry.path
+        while "/" in parent:
+            parent = parent.rsplit("/", 1)[0]
+            sizes[parent] = sizes.get(parent, 0) + entry.size
+    return sizes
+
+
+def list_tree(root: str = ".", depth: int = 1, pattern: Optional[str] = None,
+              include_hidden: bool = True, gitignore: bool = False, sizes: bool = False,
+              sort: str = "name", reverse: bool = False, offset: int = 0,
+              limit: Optional[int] = None, entries: Optional[Iterable[WalkEntry]] = None) -> Dict[str, Any]:
+    """List a directory tree with filtering, sizes, sorting and pagination.
+    
+    Args:
+        root: Directory to list
+        depth: Levels to list (1 = direct children)
+        pattern: Glob filter for names (or relative paths if it contains '/')
+        include_hidden: Include dotfiles
+        gitignore: Skip entries matched by .gitignore files
+        sizes: Report file sizes and aggregated directory sizes; directory
+            sizes always cover the whole subtree, ignored and hidden files included
+        sort: 'name', 'size' (largest first) or 'mtime' (newest first)
+        reverse: Reverse the sort order
+        offset: Number of entries to skip
+        limit: Maximum number of entries returned (None = all)
+        entries: Pre-walked entries (e.g. from a file watcher's index) to
+            list instead of walking root; they must carry sizes and mtimes
+    
+    Returns:
+        Dict with 'entries' (relative path, type, size), 'total', 'offset',
+        'has_more' and 'total_size' when sizes are requested
+    
+    Raises:
+        ValueError: On an unknown sort key
+        NotADirectoryError: If root is not a directory
+    """
+    if sort not in SORT_KEYS:
+        raise ValueError(f"Unknown sort key: {sort} (use one of {', '.join(SORT_KEYS)})")
+    if not os.path.isdir(root):
+        raise NotADirectoryError(f"Not a directory: {root}")
+    
+    if entries is not None:
+        entries = [e for e in entries
+                   if include_hidden or not any(p.startswith(".") for p in e.path.split("/"))]
+    else:
+        entries = list(walk(root, max_depth=depth, include_hidden=include_hidden,
+                            gitignore=gitignore, stat=sizes or sort != "name"))
+    
+    total_size = 0
+    dir_sizes: Dict[str, int] = {}
+    if sizes:
+        # Sizes are disk usage: walk the whole subtree, below the listed depth
+        # and into ignored and vendored directories too
+        everything = list(walk(root, gitignore=False, ignored_dirs=(), stat=True))
+        dir_sizes = aggregate_sizes(everything)
+        total_size = sum(e.size for e in everything if not e.is_dir)
+    
+    listed = [e for e in entries if e.depth <= depth]
+    if pattern:
+        listed = [e for e in listed if matches_glob(e.path, e.name, pattern)]
+    for entry in listed:
+        if entry.is_dir and sizes:
+            entry.size = dir_sizes.get(entry.path, 0)
+    
+    if sort == "name":
+        listed.sort(key=lambda e: e.path.lower(), reverse=reverse)
+    elif sort == "size":
+        listed.sort(key=lambda e: e.size, reverse=not reverse)
+    else:
+        listed.sort(key=lambda e: e.mtime, reverse=not reverse)
+    
+    page = listed[offset:] if limit is None else listed[offset:offset + limit]
+    result: Dict[str, Any] = {
+        "entries": [
+            {"path": e.path, "type": "dir" if e.is_dir else "file",
+             **({"size": e.size} if sizes else {})}
+            for e in page
+        ],
+        "total": len(listed),
+        "offset": offset,
+        "has_more": offset + len(page) < len(listed),
+    }
+    if sizes:
+        result["total_size"] = total_size
+    return result
+
@@ -0,0 +1,480 @@
+"""Readable-content extraction from HTML.
+
+Pages are parsed incrementally with ``html.parser`` as the response
+streams in and turned into markdown blocks: headings, paragraphs, list
+items, code, quotes and table rows, with links resolved against the page
+URL. Scripts, styles, navigation, headers, footers, sidebars and other
+boilerplate are dropped; when the page marks its main content
+(``<main>``, ``<article>``, ``role="main"``) only that is kept. The
+markdown is split into heading-aligned chunks and the selection that fits
+a token budget is returned, either from the top of the page or ranked
+against a query with BM25.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import codecs
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin
+
+DEFAULT_MAX_TOKENS = 1500
+CHUNK_TOKENS = 250
+# Stop collecting text after this much; the rest of a huge page is skipped
+MAX_TEXT_CHARS = 400_000
+# Rough size of a token in characters for English prose and markdown
+CHARS_PER_TOKEN = 4
+
+SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "canvas", "iframe",
+             "object", "select", "button", "head"}
+BOILERPLATE_TAGS = {"nav", "aside", "form", "dialog"}
+# Only boilerplate outside the main content (an article's own header is fine)
+PAGE_CHROME_TAGS = {"header", "footer"}
+MAIN_TAGS = {"main", "article"}
+# Never boilerplate, whatever their class says
+STRUCTURE_TAGS = MAIN_TAGS | {"html", "body"}
+BOILERPLATE_ROLES = {"navigation", "banner", "contentinfo", "complementary", "search", "menu", "menubar"}
+BLOCK_TAGS = {"p", "div", "section", "blockquote", "pre", "table", "tr", "ul", "ol", "li", "dl", "dt",
+              "dd", "figure", "figcaption", "h1", "h2", "h3", "h4", "h5", "h6", "hr", "details",
+              "summary", "main", "article", "header", "footer", "address", "caption"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+             "source", "track", "wbr"}
+INLINE_MARKS = {"strong": "**", "b": "**", "em": "*", "i": "*", "code": "`"}
+
+_BOILERPLATE_RE = re.compile(
+    r"(^|[\s_-])(nav|navbar|menu|footer|sidebar|side-bar|breadcrumbs?|cookie|consent|banner|"
+    r"advert|ads?|promo|social|share|sharing|related|comments?|newsletter|subscribe|popup|"
+    r"modal|skip-link|toc)($|[\s_-])", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+_BLANKS_RE = re.compile(r" {2,}")
+_LINE_RE = re.compile(r" *\n\s*")
+_WORD_RE = re.compile(r"\w+")
+_STOPWORDS = {"a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "how", "in", "is",
+              "it", "of", "on", "or", "that", "the", "this", "to", "was", "what", "when", "where",
+              "which", "with", "why", "do", "does", "i", "you"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate number of LLM tokens in a text."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _terms(text: str) -> List[str]:
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS]
+
+
+@dataclass
+class Block:
+    """One block of readable content."""
+    kind: str  # heading, paragraph, item, code, quote or row
+    text: str
+    level: int = 0  # heading level or list depth
+    ordered: bool = False
+    main: bool = False  # inside the page's marked main content
+    boilerplate: bool = False
+    link_chars: int = 0
+    # Length without markdown markup; 0 means the same as the text
+    text_chars: int = 0
+    
+    @property
+    def link_density(self) -> float:
+        """Share of the visible text that is link text."""
+        return min(1.0, self.link_chars / max(1, self.text_chars or len(self.text)))
+    
+    def markdown(self) -> str:
+        if self.kind == "heading":
+            return "#" * self.level + " " + self.text
+        if self.kind == "item":
+            return "  " * max(0, self.level - 1) + ("1. " if self.ordered else "- ") + self.text
+        if self.kind == "code":
+            return "```\n" + self.text + "\n```"
+        if self.kind == "quote":
+            return "> " + self.text
+        if self.kind == "row":
+            return "| " + self.text + " |"
+        return self.text
+
+
+@dataclass
+class Chunk:
+    """Consecutive blocks under one heading, about CHUNK_TOKENS long."""
+    index: int
+    text: str
+    heading: str = ""
+    
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+@dataclass
+class Extract:
+    """Content selected to fit a token budget."""
+    title: str
+    content: str
+    tokens: int
+    total_tokens: int
+    chunks: int
+    total_chunks: int
+    truncated: bool = False
+    
+    def to_dict(self) -> Dict:
+        return {"title": self.title, "content": self.content, "tokens": self.tokens,
+                "total_tokens": self.total_tokens, "truncated": self.truncated,
+                "chunks": self.chunks, "total_chunks": self.total_chunks}
+
+
+def _join(blocks: List[Block]) -> str:
+    """Markdown for consecutive blocks (list items and rows stay together)."""
+    out: List[str] = []
+    previous = None
+    for block in blocks:
+        if out:
+            tight = previous is not None and previous.kind == block.kind and block.kind in ("item", "row")
+            out.append("\n" if tight else "\n\n")
+        out.append(block.markdown())
+        previous = block
+    return "".join(out)
+
+
+@dataclass
+class Document:
+    """The readable content of a page."""
+    title: str = ""
+    blocks: List[Block] = field(default_factory=list)
+    
+    def content_blocks(self) -> List[Block]:
+        """Blocks left after dropping boilerplate."""
+        if any(block.main for block in self.blocks):
+            kept = [b for b in self.blocks if b.main and not b.boilerplate]
+        else:
+            # Without marked main content, link-heavy blocks are menus
+            kept = [b for b in self.blocks if not b.boilerplate
+                    and (b.kind in ("heading", "code") or b.link_density < 0.7)]
+        return kept or [b for b in self.blocks if not b.boilerplate] or self.blocks
+    
+    def markdown(self) -> str:
+        return _join(self.content_blocks())
+    
+    def chunks(self, chunk_tokens: int = CHUNK_TOKENS) -> List[Chunk]:
+        """Split the content at headings and into pieces of about chunk_tokens."""
+        chunks: List[Chunk] = []
+        current: List[Block] = []
+        heading = ""
+        size = 0
+        
+        def flush() -> None:
+            if current:
+                chunks.append(Chunk(len(chunks), _join(current), heading))
+                current.clear()
+        
+        for block in self.content_blocks():
+            block_tokens = estimate_tokens(block.text)
+            # Headings start chunks and always stay with the text that follows them
+            has_text = any(b.kind != "heading" for b in current)
+            if has_text and (block.kind == "heading" or size + block_tokens > chunk_tokens):
+                flush()
+                size = 0
+            if block.kind == "heading":
+                heading = block.markdown()
+            current.append(block)
+            size += block_tokens
+        flush()
+        return chunks
+    
+    def select(self, max_tokens: int = DEFAULT_MAX_TOKENS, query: Optional[str] = None,
+               chunk_tokens: int = CHUNK_TOKENS) -> Extract:
+        """The content that fits max_tokens.
+        
+        Without a query the page is taken from the top; with one, the
+        best-matching chunks are picked and returned in page order.
+        """
+        chunks = self.chunks(chunk_tokens)
+        total = sum(chunk.tokens for chunk in chunks)
+        order = list(range(len(chunks)))
+        if query:
+            scores = rank_chunks(chunks, query)
+            if any(scores):
+                # Only chunks that match at all, best first
+                order = sorted((i for i in order if scores[i] > 0), key=lambda i: -scores[i])
+        
+        # Chunk index -> text to use (the first pick may be cut to fit)
+        picked: Dict[int, str] = {}
+        used = 0
+        cut = False
+        for i in order:
+            text = chunks[i].text
+            cost = estimate_tokens(text) + (estimate_tokens(chunks[i].heading) if query else 0)
+            if used + cost > max_tokens:
+                if not picked:
+                    # The best chunk alone is over budget: cut it instead of skipping it
+                    text = text[:max(0, max_tokens - estimate_tokens(chunks[i].heading) - 1)
+                                * CHARS_PER_TOKEN].rstrip() + " …"
+                    picked[i] = text
+                    cut = True
+                if not query or cut:
+                    break
+                continue
+            picked[i] = text
+            used += cost
+        
+        parts = []
+        previous = -1
+        for i in sorted(picked):
+            text = picked[i]
+            heading = chunks[i].heading
+            if i != previous + 1:
+                if parts:
+                    parts.append("…")
+                if heading and not text.startswith("#"):
+                    text = heading + "\n\n" + text
+            parts.append(text)
+            previous = i
+        
+        content = "\n\n".join(parts)
+        return Extract(self.title, content, estimate_tokens(content), total, len(picked),
+                       len(chunks), truncated=cut or len(picked) < len(chunks))
+
+
+def rank_chunks(chunks: List[Chunk], query: str, k1: float = 1.5, b: float = 0.75) -> List[float]:
+    """BM25 score of every chunk against a query, counting its section heading."""
+    query_terms = set(_terms(query))
+    if not query_terms or not chunks:
+        return [0.0] * len(chunks)
+    counts = [Counter(_terms(chunk.heading) + _terms(chunk.text)) for chunk in chunks]
+    lengths = [sum(c.values()) for c in counts]
+    average = sum(lengths) / len(lengths) or 1.0
+    scores = []
+    for tf, length in zip(counts, lengths):
+        score = 0.0
+        for term in query_terms:
+            if not tf[term]:
+                continue
+            df = sum(1 for c in counts if c[term])
+            idf = math.log(1 + (len(chunks) - df + 0.5) / (df + 0.5))
+            score += idf * tf[term] * (k1 + 1) / (tf[term] + k1 * (1 - b + b * length / average))
+        scores.append(score)
+    return scores
+
+
+class HTMLExtractor(HTMLParser):
+    """Incremental HTML to markdown-blocks parser.
+    
+    Feed it decoded text as it arrives and call ``close()`` for the
+    Document. ``done`` turns true once MAX_TEXT_CHARS of text have been
+    collected, so callers can stop reading the response.
+    """
+    
+    def __init__(self, base_url: str = "", max_chars: int = MAX_TEXT_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.base_url = base_url
+        self.max_chars = max_chars
+        self.document = Document()
+        self._chars = 0
+        # Open elements: (tag, is_boilerplate, is_main)
+        self._stack: List[Tuple[str, bool, bool]] = []
+        self._skip = 0
+        self._boilerplate = 0
+        self._main = 0
+        self._pre = 0
+        self._lists: List[bool] = []  # ordered flag per open list
+        self._in_title = False
+        self._title: List[str] = []
+        self._parts: List[str] = []
+        self._kind = "paragraph"
+        self._level = 0
+        self._link_chars = 0
+        # Characters of link URLs and emphasis marks added to _parts
+        self._markup_chars = 0
+        # Open inline elements: (tag, index into _parts, href)
+        self._inline: List[Tuple[str, int, str]] = []
+    
+    @property
+    def done(self) -> bool:
+        return self._chars >= self.max_chars
+    
+    def _flush(self) -> None:
+        text = "".join(self._parts)
+        self._parts = []
+        self._inline = []
+        if self._kind == "code":
+            text = text.strip("\n")
+        else:
+            text = _LINE_RE.sub("\n", _BLANKS_RE.sub(" ", text)).strip()
+        kind, level, link_chars = self._kind, self._level, self._link_chars
+        markup_chars = self._markup_chars
+        self._kind, self._level, self._link_chars, self._markup_chars = "paragraph", 0, 0, 0
+        if not text or self.done:
+            return
+        blocks = self.document.blocks
+        if blocks and blocks[-1].text == text and blocks[-1].kind == kind:
+            return
+        self._chars += len(text)
+        blocks.append(Block(kind, text, level, bool(self._lists and self._lists[-1]),
+                            self._main > 0, self._boilerplate > 0, link_chars,
+                            max(1, len(text) - markup_chars)))
+    
+    def _is_boilerplate(self, tag: str, attrs: Dict[str, str]) -> bool:
+        if tag in BOILERPLATE_TAGS or (tag in PAGE_CHROME_TAGS and not self._main):
+            return True
+        if attrs.get("role", "").lower() in BOILERPLATE_ROLES or "hidden" in attrs:
+            return True
+        if attrs.get("aria-hidden") == "true":
+            return True
+        names = f"{attrs.get('id', '')} {attrs.get('class', '')}"
+        return tag not in STRUCTURE_TAGS and bool(_BOILERPLATE_RE.search(names))
+    
+    def handle_starttag(self, tag: str, attr_list) -> None:
+        attrs = {name: value or "" for name, value in attr_list}
+        if tag == "body" and any(open_tag == "head" for open_tag, _, _ in self._stack):
+            self.handle_endtag("head")  # </head> is optional
+        if tag in VOID_TAGS:
+            if tag == "br" and not self._skip:
+                self._parts.append("\n")
+            elif tag == "hr" and not self._skip:
+                self._flush()
+            return
+        
+        boilerplate = self._is_boilerplate(tag, attrs)
+        main = tag in MAIN_TAGS or attrs.get("role") == "main"
+        if boilerplate and not self._skip:
+            # Text so far belongs outside the boilerplate, even for inline containers
+            self._flush()
+        self._stack.append((tag, boilerplate, main))
+        self._boilerplate += boilerplate
+        self._main += main
+        # Only the page's own title; <svg> and friends have titles too
+        if tag == "title" and not self.document.title and not any(
+                open_tag in SKIP_TAGS and open_tag != "head" for open_tag, _, _ in self._stack[:-1]):
+            self._in_title = True
+        if tag in SKIP_TAGS:
+            self._skip += 1
+        if self._skip:
+            return
+        
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag in ("h1", "h2", "h3", "h4", "h5", "h6"):
+            self._kind, self._level = "heading", int(tag[1])
+        elif tag in ("ul", "ol"):
+            self._lists.append(tag == "ol")
+        elif tag == "li":
+            self._kind, self._level = "item", len(self._lists)
+        elif tag == "pre":
+            self._pre += 1
+            self._kind = "code"
+        elif tag == "blockquote":
+            self._kind = "quote"
+        elif tag == "tr":
+            self._kind = "row"
+        elif tag in ("td", "th"):
+            if self._parts:
+                self._parts.append(" | ")
+        elif tag == "a":
+            self._inline.append((tag, len(self._parts), attrs.get("href", "")))
+        elif tag in INLINE_MARKS and not self._pre:
+            self._inline.append((tag, len(self._parts), ""))
+    
+    def handle_endtag(self, tag: str) -> None:
+        if tag in VOID_TAGS or not any(open_tag == tag for open_tag, _, _ in self._stack):
+            return
+        # Close everything left open inside this element too
+        while self._stack:
+            open_tag, boilerplate, main = self._stack.pop()
+            self._close(open_tag)
+            if boilerplate and not self._skip:
+                self._flush()
+            self._boilerplate -= boilerplate
+            self._main -= main
+            if open_tag == tag:
+                break
+    
+    def _close(self, tag: str) -> None:
+        if tag == "title" and self._in_title:
+            self._in_title = False
+            self.document.title = _SPACE_RE.sub(" ", "".join(self._title)).strip()
+        if tag in SKIP_TAGS:
+            self._skip -= 1
+            return
+        if self._skip:
+            return
+        if self._inline and self._inline[-1][0] == tag:
+            self._close_inline()
+        if tag in BLOCK_TAGS:
+            self._flush()
+        if tag in ("ul", "ol") and self._lists:
+            self._lists.pop()
+        elif tag == "pre":
+            self._pre -= 1
+    
+    def _close_inline(self) -> None:
+        tag, start, href = self._inline.pop()
+        inner = "".join(self._parts[start:])
+        text = inner.strip()
+        if not text:
+            return
+        if tag == "a":
+            url = urljoin(self.base_url, href) if href else ""
+            self._link_chars += len(text)
+            if url.startswith(("http://", "https://")):
+                text = f"[{text}]({url})"
+        else:
+            mark = INLINE_MARKS[tag]
+            text = f"{mark}{text}{mark}"
+        self._markup_chars += len(text) - len(inner.strip())
+        # Keep the surrounding spaces outside the markup
+        lead = " " if inner[:1].isspace() else ""
+        trail = " " if inner[-1:].isspace() else ""
+        self._parts[start:] = [lead + text + trail]
+    
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self._title.append(data)
+            return
+        if self._skip or self.done:
+            return
+        self._parts.append(data if self._pre else _SPACE_RE.sub(" ", data))
+    
+    def close(self) -> Document:
+        super().close()
+        while self._stack:
+            self.handle_endtag(self._stack[-1][0])
+        self._flush()
+        return self.document
+
+
+def extract_html(html: str, base_url: str = "", max_tokens: int = DEFAULT_MAX_TOKENS,
+                 query: Optional[str] = None) -> Extract:
+    """Readable markdown of an HTML string, fitted to max_tokens."""
+    parser = HTMLExtractor(base_url)
+    parser.feed(html)
+    return parser.close().select(max_tokens, query)
+
+
+def extract_stream(chunks: Iterable[bytes], encoding: str = "utf-8", base_url: str = "",
+                   max_tokens: int = DEFAULT_MAX_TOKENS, query: Optional[str] = None) -> Tuple[Extract, int]:
+    """Like ``extract_html`` for a body arriving in byte chunks.
+    
+    Reading stops early once the parser has collected enough text.
+    
+    Returns:
+        (Extract, number of bytes read)
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parser = HTMLExtractor(base_url)
+    size = 0
+    for data in chunks:
+        size += len(data)
+        parser.feed(decoder.decode(data))
+        if parser.done:
+            break
+    parser.feed(decoder.decode(b"", final=True))
+    return parser.close().select(max_tokens, query), size
@@ -0,0 +1,405 @@
+"""On-disk HTTP response cache for the web tools.
+
+A private cache in the spirit of RFC 9111: responses are stored in a
+SQLite file with their headers, served locally while they are fresh
+(``Cache-Control: max-age``, ``Expires`` or a Last-Modified heuristic)
+and revalidated with ``If-None-Match``/``If-Modified-Since`` once they
+are stale, so an unchanged page costs a 304 instead of a full download.
+Within a stale-while-revalidate window the stale copy is returned
+immediately and refreshed in the background. The store is bounded by
+size and evicts the least recently used entries.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Tuple, Union
+from urllib.parse import urldefrag
+
+from auryx_agent.tools.http_client import HTTPClient, Response
+
+
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+MAX_ENTRY_BYTES = 5 * 1024 * 1024
+# Statuses cacheable without explicit freshness information (RFC 9110 15.1)
+CACHEABLE_STATUS = {200, 203, 204, 300, 301, 308, 404, 405, 410, 414, 501}
+# Cap on the Last-Modified heuristic
+MAX_HEURISTIC_TTL = 24 * 3600
+# Describe the stored (decoded) body, not what went over the wire
+_HOP_HEADERS = {"connection", "keep-alive", "transfer-encoding", "content-encoding",
+                "content-length", "te", "trailer", "upgrade", "proxy-connection"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    status INTEGER NOT NULL,
+    reason TEXT NOT NULL,
+    headers TEXT NOT NULL,
+    vary TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    response_time REAL NOT NULL,
+    initial_age REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+"""
+
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Optional[str]]:
+    """Cache-Control directives, lower-cased, with unquoted values."""
+    directives: Dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip().strip('"') if arg else None
+    return directives
+
+
+def _seconds(value: Optional[str]) -> Optional[int]:
+    try:
+        return max(0, int(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    try:
+        return parsedate_to_datetime(value).timestamp() if value else None
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def cache_key(url: str) -> str:
+    return "GET " + urldefrag(url)[0]
+
+
+@dataclass
+class CacheEntry:
+    """A stored response."""
+    url: str
+    status: int
+    reason: str
+    headers: List[Tuple[str, str]]
+    body: bytes
+    response_time: float  # wall clock when the response arrived
+    initial_age: float = 0.0  # age it already had then
+    vary: Dict[str, str] = field(default_factory=dict)  # request header values it applies to
+    
+    def header(self, name: str) -> Optional[str]:
+        name = name.lower()
+        for key, value in reversed(self.headers):
+            if key.lower() == name:
+                return value
+        return None
+    
+    @property
+    def directives(self) -> Dict[str, Optional[str]]:
+        return parse_cache_control(self.header("Cache-Control"))
+    
+    def age(self, now: float) -> float:
+        return self.initial_age + max(0.0, now - self.response_time)
+    
+    def lifetime(self, default_ttl: float = 0.0) -> float:
+        """Seconds the response stays fresh after it was generated."""
+        directives = self.directives
+        if "no-cache" in directives:
+            return 0.0
+        max_age = _seconds(directives.get("max-age"))
+        if max_age is not None:
+            return float(max_age)
+        expires = self.header("Expires")
+        if expires is not None:
+            date = _http_date(self.header("Date")) or self.response_time
+            return max(0.0, (_http_date(expires) or 0.0) - date)
+        last_modified = _http_date(self.header("Last-Modified"))
+        if last_modified is not None and self.status in CACHEABLE_STATUS:
+            date = _http_date(self.header("Date")) or self.response_time
+            heuristic = min(MAX_HEURISTIC_TTL, 0.1 * max(0.0, date - last_modified))
+            return max(heuristic, default_ttl)
+        return default_ttl
+    
+    def is_fresh(self, now: float, default_ttl: float = 0.0) -> bool:
+        return self.age(now) < self.lifetime(default_ttl)
+    
+    def stale_window(self, default: float = 0.0) -> float:
+        """Seconds past expiry the entry may be served while it is refreshed."""
+        directives = self.directives
+        if "must-revalidate" in directives or "no-cache" in directives:
+            return 0.0
+        return float(_seconds(directives.get("stale-while-revalidate")) or default)
+    
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.header("ETag"):
+            headers["If-None-Match"] = self.header("ETag")
+        if self.header("Last-Modified"):
+            headers["If-Modified-Since"] = self.header("Last-Modified")
+        return headers
+    
+    def refreshed(self, not_modified: Response, now: float) -> "CacheEntry":
+        """This entry updated with the headers of a 304 response."""
+        updated = {name.lower() for name in not_modified.headers.keys()} - _HOP_HEADERS
+        headers = [(k, v) for k, v in self.headers if k.lower() not in updated]
+        headers += [(k, v) for k, v in not_modified.headers.items() if k.lower() in updated]
+        return CacheEntry(self.url, self.status, self.reason, headers, self.body, now,
+                          _initial_age(not_modified, now), self.vary)
+    
+    def response(self, cache_status: str) -> Response:
+        response = Response.from_bytes(self.url, self.status, self.reason, self.headers, self.body)
+        response.cache_status = cache_status
+        return response
+
+
+def _initial_age(response: Response, now: float) -> float:
+    age = float(_seconds(response.headers.get("Age")) or 0)
+    date = _http_date(response.headers.get("Date"))
+    return max(age, now - date if date else 0.0)
+
+
+def _vary(vary: Optional[str], request_headers: Mapping[str, str]) -> Optional[Dict[str, str]]:
+    """The request header values a response varies on (None for ``Vary: *``)."""
+    lowered = {k.lower(): v for k, v in request_headers.items()}
+    values = {}
+    for name in (vary or "").split(","):
+        name = name.strip().lower()
+        if name == "*":
+            return None
+        if name:
+            values[name] = lowered.get(name, "")
+    return values
+
+
+class HTTPCache:
+    """Size-bounded LRU store of HTTP responses in a SQLite file."""
+    
+    def __init__(self, path: Union[str, Path], max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_entry_bytes: int = MAX_ENTRY_BYTES, stale_while_revalidate: float = 0.0):
+        """Configure the cache (the file is created on first use).
+        
+        Args:
+            path: SQLite database file
+            max_bytes: Total body bytes kept before the least recently used
+                entries are evicted
+            max_entry_bytes: Larger responses are passed through uncached
+            stale_while_revalidate: Seconds a stale response may still be
+                served while it is refreshed in the background (servers can
+                allow more with the directive of the same name)
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = min(max_entry_bytes, max_bytes)
+        self.stale_while_revalidate = stale_while_revalidate
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+    
+    def _connection(self) -> sqlite3.Connection:
+        if self._db is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+            try:
+                db.executescript(_SCHEMA)
+            except sqlite3.DatabaseError:
+                # Not a usable cache file: start over
+                db.close()
+                self.path.unlink()
+                db = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+                db.executescript(_SCHEMA)
+            db.execute("PRAGMA journal_mode=WAL")
+            self._db = db
+        return self._db
+    
+    def get(self, url: str, request_headers: Optional[Mapping[str, str]] = None) -> Optional[CacheEntry]:
+        """The stored entry for a URL (fresh or not), marking it recently used."""
+        key = cache_key(url)
+        with self._lock:
+            db = self._connection()
+            row = db.execute("SELECT url, status, reason, headers, vary, body, response_time, initial_age "
+                             "FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        entry = CacheEntry(row[0], row[1], row[2], [tuple(h) for h in json.loads(row[3])], row[5],
+                           row[6], row[7], json.loads(row[4]))
+        if entry.vary and _vary(",".join(entry.vary), request_headers or {}) != entry.vary:
+            return None
+        return entry
+    
+    def put(self, url: str, entry: CacheEntry) -> None:
+        """Store an entry, evicting least recently used ones to stay in bounds."""
+        if len(entry.body) > self.max_entry_bytes:
+            return
+        with self._lock:
+            db = self._connection()
+            db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                       (cache_key(url), entry.url, entry.status, entry.reason, json.dumps(entry.headers),
+                        json.dumps(entry.vary), entry.body, len(entry.body), entry.response_time,
+                        entry.initial_age, time.time()))
+            self._evict(db)
+    
+    def _evict(self, db: sqlite3.Connection) -> None:
+        total = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        doomed = []
+        for key, size in db.execute("SELECT key, size FROM entries ORDER BY accessed"):
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        db.executemany("DELETE FROM entries WHERE key = ?", doomed)
+    
+    def delete(self, url: str) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM entries WHERE key = ?", (cache_key(url),))
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM entries")
+    
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            entries, size = self._connection().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return {"entries": entries, "bytes": size, "hits": self.hits,
+                "misses": self.misses, "revalidated": self.revalidated}
+    
+    def _store(self, url: str, response: Response, request_headers: Mapping[str, str],
+               default_ttl: float) -> Response:
+        """Arrange for a cacheable network response to be stored once it has been read."""
+        directives = parse_cache_control(response.headers.get("Cache-Control"))
+        vary = _vary(response.headers.get("Vary"), request_headers)
+        length = _seconds(response.headers.get("Content-Length"))
+        if ("no-store" in directives or vary is None or response.status_code not in CACHEABLE_STATUS
+                or (length is not None and length > self.max_entry_bytes)):
+            return response
+        
+        now = time.time()
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in _HOP_HEADERS]
+        
+        def store(body: bytes) -> None:
+            entry = CacheEntry(response.url, response.status_code, response.reason, headers,
+                               body, now, _initial_age(response, now), vary)
+            # Worth keeping only if it can be served or revalidated later
+            if entry.lifetime(default_ttl) > 0 or entry.validators or entry.stale_window():
+                try:
+                    self.put(url, entry)
+                except (sqlite3.Error, OSError):
+                    pass
+        
+        # Stored once the caller has read the whole body; streaming callers
+        # that stop early leave nothing behind
+        response.tee(self.max_entry_bytes, store)
+        return response
+    
+    def _revalidate(self, client: HTTPClient, url: str, entry: Optional[CacheEntry],
+                    headers: Mapping[str, str], timeout: float, default_ttl: float) -> Response:
+        request_headers = dict(headers)
+        if entry:
+            request_headers.update(entry.validators)
+        response = client.request("GET", url, headers=request_headers, timeout=timeout)
+        if response.status_code == 304 and entry:
+            response.close()
+            entry = entry.refreshed(response, time.time())
+            try:
+                self.put(url, entry)
+            except (sqlite3.Error, OSError):
+                pass
+            self.revalidated += 1
+            return entry.response("revalidated")
+        self.misses += 1
+        response = self._store(url, response, headers, default_ttl)
+        response.cache_status = "miss"
+        return response
+    
+    def _refresh_in_background(self, client: HTTPClient, url: str, entry: CacheEntry,
+                               headers: Mapping[str, str], timeout: float, default_ttl: float) -> None:
+        key = cache_key(url)
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        def refresh() -> None:
+            try:
+                self._revalidate(client, url, entry, headers, timeout, default_ttl).content
+            except OSError:
+                pass
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+        
+        threading.Thread(target=refresh, name="http-cache-refresh", daemon=True).start()
+    
+    def fetch(self, client: HTTPClient, url: str, headers: Optional[Mapping[str, str]] = None,
+              timeout: Optional[float] = None, default_ttl: float = 0.0) -> Response:
+        """GET a URL through the cache.
+        
+        Args:
+            client: Client used for network requests
+            url: URL to fetch
+            headers: Extra request headers (``Cache-Control: no-cache``
+                forces revalidation)
+            timeout: Seconds for connecting and for each read
+            default_ttl: Freshness for responses that don't state any
+        
+        Returns:
+            Response with ``cache_status`` set to "hit", "stale",
+            "revalidated" or "miss"
+        """
+        headers = dict(headers or {})
+        request_directives = parse_cache_control(headers.get("Cache-Control"))
+        try:
+            entry = self.get(url, headers)
+        except (sqlite3.Error, OSError):
+            entry = None
+        
+        if entry is not None and "no-cache" not in request_directives:
+            now = time.time()
+            if entry.is_fresh(now, default_ttl):
+                self.hits += 1
+                return entry.response("hit")
+            overdue = entry.age(now) - entry.lifetime(default_ttl)
+            if overdue < entry.stale_window(self.stale_while_revalidate):
+                self.hits += 1
+                self._refresh_in_background(client, url, entry, headers, timeout, default_ttl)
+                return entry.response("stale")
+        return self._revalidate(client, url, entry, headers, timeout, default_ttl)
+
+
+_cache: Optional[HTTPCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[HTTPCache]:
+    """The process-wide cache, sized from the [web] config (None if disabled)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            from auryx_agent.core.config import Config, load_config
+            from auryx_agent.core.paths import get_config_file, get_data_dir
+            
+            try:
+                config = load_config() if get_config_file().exists() else Config()
+            except Exception:
+                config = Config()
+            if config.web_cache_mb <= 0:
+                return None
+            _cache = HTTPCache(get_data_dir() / "http_cache.db",
+                               max_bytes=config.web_cache_mb * 1024 * 1024,
+                               stale_while_revalidate=config.web_cache_stale)
+        return _cache
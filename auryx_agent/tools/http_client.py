@@ -0,0 +1,512 @@
+"""Shared in-process HTTP client for the web tools.
+
+Connections are kept alive and pooled per (scheme, host, port), so a
+sequence of requests to the same site pays for one TCP connect and one
+TLS handshake instead of one per call. Names are resolved through the
+shared caching DNS resolver, a single TLS context (with its session
+cache) is reused for every HTTPS connection, and gzip/deflate bodies are
+decoded as they stream in (brotli as well when the ``brotli`` package is
+installed). Requests are HTTP/1.1; a connection that the server closed
+while idle is transparently replaced. Like curl, the client honours the
+``http_proxy``/``https_proxy``/``no_proxy`` environment variables (HTTP
+proxies only; HTTPS goes through a CONNECT tunnel).
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import base64
+import http.client
+import json
+import socket
+import ssl
+import threading
+import time
+import zlib
+from collections import defaultdict
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
+from urllib.parse import unquote, urljoin, urlsplit
+from urllib.request import getproxies_environment, proxy_bypass_environment
+
+from auryx_agent import __version__
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+DEFAULT_TIMEOUT = 10.0
+MAX_REDIRECTS = 10
+MAX_IDLE_PER_HOST = 6
+# Servers commonly drop keep-alive connections after 5-60s of silence
+IDLE_TIMEOUT = 30.0
+CHUNK_SIZE = 64 * 1024
+USER_AGENT = f"auryx-agent/{__version__}"
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+# Not sent on to another origin when following a redirect
+CREDENTIAL_HEADERS = ("authorization", "cookie", "proxy-authorization")
+
+ACCEPT_ENCODING = "gzip, deflate, br" if brotli else "gzip, deflate"
+
+# Errors meaning a reused connection was closed by the server while idle
+_STALE_ERRORS = (http.client.RemoteDisconnected, http.client.BadStatusLine,
+                 ConnectionResetError, BrokenPipeError, ConnectionAbortedError)
+
+PoolKey = Tuple[str, str, int]
+
+
+class HTTPError(OSError):
+    """A request could not be completed (bad URL, too many redirects...)."""
+
+
+class _Decoder:
+    """Incremental Content-Encoding decoder."""
+    
+    def __init__(self, encoding: str):
+        self.encoding = encoding.strip().lower()
+        if self.encoding in ("gzip", "x-gzip"):
+            self._obj = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif self.encoding == "deflate":
+            self._obj = None  # zlib-wrapped or raw, decided on the first chunk
+        elif self.encoding == "br" and brotli:
+            self._obj = brotli.Decompressor()
+        elif self.encoding in ("", "identity"):
+            self._obj = None
+        else:
+            raise HTTPError(f"Unsupported content encoding: {encoding}")
+    
+    def decode(self, data: bytes) -> bytes:
+        if self.encoding == "deflate" and self._obj is None and data:
+            # Some servers send raw deflate despite the spec asking for zlib
+            raw = (data[0] & 0x0F) != 8
+            self._obj = zlib.decompressobj(-zlib.MAX_WBITS if raw else zlib.MAX_WBITS)
+        if self._obj is None:
+            return data
+        if self.encoding == "br":
+            return self._obj.process(data)
+        return self._obj.decompress(data)
+    
+    def flush(self) -> bytes:
+        if self._obj is None or self.encoding == "br":
+            return b""
+        return self._obj.flush()
+
+
+class Response:
+    """An HTTP response whose body is read lazily.
+    
+    The connection goes back to the pool once the body has been read to
+    the end; call ``close()`` when abandoning a streamed body early.
+    """
+    
+    def __init__(self, url: str, method: str, raw: Optional[http.client.HTTPResponse],
+                 release, elapsed: float, history: Optional[List["Response"]] = None):
+        self.url = url
+        self.method = method
+        self.status_code = raw.status if raw else 0
+        self.reason = raw.reason if raw else ""
+        self.headers = raw.headers if raw else http.client.HTTPMessage()
+        self.elapsed = elapsed
+        self.history = history or []
+        # "hit", "stale", "revalidated" or "miss" when the request went through the cache
+        self.cache_status: Optional[str] = None
+        self._raw = raw
+        self._release = release
+        self._content: Optional[bytes] = None
+        self._consumed = False
+        # (byte limit, callback) for keeping a copy of the body as it streams
+        self._tee: Optional[Tuple[int, Callable[[bytes], None]]] = None
+    
+    @classmethod
+    def from_bytes(cls, url: str, status_code: int, reason: str,
+                   headers: Sequence[Tuple[str, str]], content: bytes) -> "Response":
+        """A response whose (already decoded) body is in memory."""
+        response = cls(url, "GET", None, None, 0.0)
+        response.status_code, response.reason = status_code, reason
+        for name, value in headers:
+            response.headers[name] = value
+        response._content = content
+        response._consumed = True
+        return response
+    
+    def tee(self, limit: int, on_complete: Callable[[bytes], None]) -> None:
+        """Pass a copy of the decoded body to on_complete once it has been read to the end.
+        
+        Nothing is copied past limit bytes, and a body that is abandoned
+        early or runs over the limit is never passed on, so streaming
+        callers keep their bounded memory.
+        """
+        self._tee = (limit, on_complete)
+    
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+    
+    @property
+    def encoding(self) -> str:
+        return self.headers.get_content_charset() or "utf-8"
+    
+    def iter_content(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the decoded body in chunks as it arrives."""
+        if self._content is not None:
+            yield self._content
+            return
+        if self._consumed:
+            raise HTTPError("Response body was already consumed")
+        self._consumed = True
+        decoder = _Decoder(self.headers.get("Content-Encoding", ""))
+        limit, on_complete = self._tee or (0, None)
+        copy: Optional[List[bytes]] = [] if on_complete else None
+        copied = 0
+        
+        def keep(data: bytes) -> bytes:
+            nonlocal copy, copied
+            if copy is not None:
+                copied += len(data)
+                copy = copy if copied <= limit else None
+                if copy is not None:
+                    copy.append(data)
+            return data
+        
+        try:
+            while True:
+                data = self._raw.read1(chunk_size)
+                if not data:
+                    break
+                data = decoder.decode(data)
+                if data:
+                    yield keep(data)
+            tail = decoder.flush()
+            if tail:
+                yield keep(tail)
+        except BaseException:
+            self._consumed = True
+            self._release_connection(reusable=False)
+            raise
+        self._finish()
+        if copy is not None:
+            on_complete(b"".join(copy))
+    
+    def iter_raw(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """Yield the body exactly as sent (no content decoding)."""
+        if self._consumed:
+            raise HTTPError("Response body was already consumed")
+        self._consumed = True
+        try:
+            while True:
+                data = self._raw.read(chunk_size)
+                if not data:
+                    break
+                yield data
+        except BaseException:
+            self._consumed = True
+            self._release_connection(reusable=False)
+            raise
+        self._finish()
+    
+    @property
+    def content(self) -> bytes:
+        """The whole decoded body."""
+        if self._content is None:
+            self._content = b"".join(self.iter_content())
+        return self._content
+    
+    @property
+    def text(self) -> str:
+        try:
+            return self.content.decode(self.encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+    
+    def json(self) -> Any:
+        return json.loads(self.text)
+    
+    def _finish(self) -> None:
+        # Fully read: the connection can serve the next request
+        self._release_connection(reusable=True)
+    
+    def _release_connection(self, reusable: bool) -> None:
+        release, self._release = self._release, None
+        if release:
+            self._raw.close()  # the response only; the socket stays with the connection
+            release(reusable=reusable and not self._raw.will_close)
+    
+    def close(self) -> None:
+        """Release the connection.
+        
+        It goes back to the pool if nothing is left to read (HEAD, 204,
+        304 or an already-read body) and is closed otherwise.
+        """
+        self._consumed = True
+        if self._raw is not None:
+            self._release_connection(reusable=self._raw.isclosed() or self._raw.length == 0)
+    
+    def __enter__(self) -> "Response":
+        return self
+    
+    def __exit__(self, *exc) -> None:
+        self.close()
+    
+    def __repr__(self) -> str:
+        return f"<Response [{self.status_code}] {self.url}>"
+
+
+def redirect_headers(url: str, location: str, headers: Dict[str, str]) -> Dict[str, str]:
+    """Caller headers to send on to a redirect target.
+    
+    Credentials are dropped when the redirect leaves the origin (scheme,
+    host or port).
+    
+    Raises:
+        HTTPError: On a redirect from https to plain http
+    """
+    old, new = urlsplit(url), urlsplit(location)
+    if old.scheme == "https" and new.scheme == "http":
+        raise HTTPError(f"Refusing to follow a redirect from https to http ({location})")
+    
+    def origin(parts):
+        return parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80)
+    
+    if origin(old) == origin(new):
+        return headers
+    return {name: value for name, value in headers.items() if name.lower() not in CREDENTIAL_HEADERS}
+
+
+def _connect(host: str, port: int, timeout: Optional[float], source_address=None) -> socket.socket:
+    """Open a TCP connection, resolving through the shared DNS cache."""
+    from auryx_agent.tools.dns_resolver import resolve_host
+    
+    last_error: Optional[OSError] = None
+    for address in resolve_host(host):
+        family = socket.AF_INET6 if ":" in address else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if source_address:
+                sock.bind(source_address)
+            sock.connect((address, port))
+            return sock
+        except OSError as e:
+            sock.close()
+            last_error = e
+    raise last_error or OSError(f"No addresses for {host}")
+
+
+class HTTPClient:
+    """Thread-safe HTTP client with per-host keep-alive connection pools."""
+    
+    def __init__(self, timeout: float = DEFAULT_TIMEOUT, max_idle_per_host: int = MAX_IDLE_PER_HOST,
+                 max_redirects: int = MAX_REDIRECTS, user_agent: str = USER_AGENT,
+                 verify: bool = True, cache=None, proxies: Optional[Mapping[str, str]] = None):
+        """Configure the client.
+        
+        Args:
+            timeout: Default seconds for connecting and for each read
+            max_idle_per_host: Idle connections kept per host
+            max_redirects: Redirects followed before giving up
+            user_agent: User-Agent header sent with every request
+            verify: Verify TLS certificates
+            cache: HTTPCache used by requests made with ``cache=True``
+            proxies: Proxy URL per scheme, e.g. {"https": "http://proxy:3128",
+                "no": "localhost"} (default: the *_proxy environment variables)
+        """
+        self.timeout = timeout
+        self.max_idle_per_host = max(1, max_idle_per_host)
+        self.max_redirects = max_redirects
+        self.user_agent = user_agent
+        self.cache = cache
+        self.proxies = dict(getproxies_environment() if proxies is None else proxies)
+        self.ssl_context = ssl.create_default_context()
+        if not verify:
+            self.ssl_context.check_hostname = False
+            self.ssl_context.verify_mode = ssl.CERT_NONE
+        self._idle: Dict[PoolKey, List[Tuple[http.client.HTTPConnection, float]]] = defaultdict(list)
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+        self.connections_reused = 0
+    
+    def _proxy(self, scheme: str, host: str) -> Optional[Tuple[str, int, Dict[str, str]]]:
+        """(host, port, extra headers) of the proxy for a request, or None to go direct."""
+        url = self.proxies.get(scheme)
+        if not url or proxy_bypass_environment(host, self.proxies):
+            return None
+        parts = urlsplit(url if "://" in url else f"http://{url}")
+        if parts.scheme != "http" or not parts.hostname:
+            raise HTTPError(f"Unsupported proxy: {url} (only http:// proxies are supported)")
+        headers = {}
+        if parts.username:
+            credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+            headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode()
+        return parts.hostname, parts.port or 8080, headers
+    
+    def _new_connection(self, key: PoolKey, timeout: float) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        proxy = self._proxy(scheme, host)
+        connect_host, connect_port = (proxy[0], proxy[1]) if proxy else (host, port)
+        if scheme == "https":
+            conn = http.client.HTTPSConnection(connect_host, connect_port, timeout=timeout,
+                                               context=self.ssl_context)
+            if proxy:
+                conn.set_tunnel(host, port, headers=proxy[2])
+        else:
+            conn = http.client.HTTPConnection(connect_host, connect_port, timeout=timeout)
+        conn._create_connection = lambda address, timeout=None, source=None: _connect(
+            connect_host, connect_port, timeout, source)
+        with self._lock:
+            self.connections_opened += 1
+        return conn
+    
+    def _checkout(self, key: PoolKey, timeout: float) -> Tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                conn, since = idle.pop()
+                if now - since < IDLE_TIMEOUT and conn.sock is not None:
+                    self.connections_reused += 1
+                    conn.timeout = timeout
+                    conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+        return self._new_connection(key, timeout), False
+    
+    def _checkin(self, key: PoolKey, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable and conn.sock is not None:
+            with self._lock:
+                idle = self._idle[key]
+                if len(idle) < self.max_idle_per_host:
+                    idle.append((conn, time.monotonic()))
+                    return
+        conn.close()
+    
+    def _send(self, key: PoolKey, method: str, target: str, headers: Dict[str, str],
+              body: Optional[bytes], timeout: float):
+        while True:
+            conn, reused = self._checkout(key, timeout)
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                return conn, conn.getresponse()
+            except _STALE_ERRORS:
+                conn.close()
+                # Retry only when the server closed an idle connection on us
+                if not reused:
+                    raise
+            except BaseException:
+                conn.close()
+                raise
+    
+    def request(self, method: str, url: str, headers: Optional[Mapping[str, str]] = None,
+                data: Union[bytes, str, None] = None, timeout: Optional[float] = None,
+                allow_redirects: bool = True, cache: bool = False,
+                default_ttl: float = 0.0) -> Response:
+        """Send a request.
+        
+        The body isn't read yet: use ``content``/``text``/``json()`` or
+        stream it with ``iter_content()``.
+        
+        Args:
+            method: HTTP method
+            url: http:// or https:// URL
+            headers: Extra request headers
+            data: Request body
+            timeout: Seconds for connecting and for each read
+            allow_redirects: Follow 3xx responses with a Location
+            cache: Answer GETs from the client's cache when it's fresh
+                (revalidating it when it's stale)
+            default_ttl: Seconds a cached response without explicit
+                freshness information stays fresh
+        
+        Returns:
+            Response
+        
+        Raises:
+            HTTPError: On a malformed URL, too many redirects or a redirect
+                from https to http
+            OSError: On connection failures and timeouts
+        """
+        method = method.upper()
+        timeout = self.timeout if timeout is None else timeout
+        if cache and self.cache is not None and method == "GET" and data is None:
+            return self.cache.fetch(self, url, headers or {}, timeout, default_ttl)
+        body = data.encode() if isinstance(data, str) else data
+        extra = dict(headers or {})
+        history: List[Response] = []
+        
+        while True:
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.hostname:
+                raise HTTPError(f"Unsupported URL: {url}")
+            port = parts.port or (443 if parts.scheme == "https" else 80)
+            key = (parts.scheme, parts.hostname.lower(), port)
+            netloc = parts.netloc.rsplit("@", 1)[-1]
+            target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            proxy = self._proxy(parts.scheme, parts.hostname) if parts.scheme == "http" else None
+            if proxy:
+                # Plain HTTP through a proxy: absolute URI in the request line
+                target = f"http://{netloc}{target}"
+            request_headers = {
+                "Host": netloc,
+                "User-Agent": self.user_agent,
+                "Accept": "*/*",
+                "Accept-Encoding": ACCEPT_ENCODING,
+            }
+            if proxy:
+                request_headers.update(proxy[2])
+            request_headers.update(extra)
+            
+            start = time.monotonic()
+            conn, raw = self._send(key, method, target, request_headers, body, timeout)
+            response = Response(url, method, raw,
+                                lambda reusable, key=key, conn=conn: self._checkin(key, conn, reusable),
+                                time.monotonic() - start, history)
+            
+            location = raw.getheader("Location")
+            if not (allow_redirects and raw.status in REDIRECT_CODES and location):
+                return response
+            # Drain the redirect body so its connection can be reused
+            response._content = b"".join(response.iter_raw())
+            history.append(response)
+            if len(history) > self.max_redirects:
+                raise HTTPError(f"Too many redirects (more than {self.max_redirects})")
+            location = urljoin(url, location)
+            extra = redirect_headers(url, location, extra)
+            url = location
+            if raw.status == 303 or (raw.status in (301, 302) and method == "POST"):
+                method, body = "GET", None
+                extra = {k: v for k, v in extra.items() if k.lower() != "content-type"}
+    
+    def get(self, url: str, **kwargs) -> Response:
+        return self.request("GET", url, **kwargs)
+    
+    def head(self, url: str, **kwargs) -> Response:
+        return self.request("HEAD", url, **kwargs)
+    
+    def close(self) -> None:
+        """Close all idle connections."""
+        with self._lock:
+            pools, self._idle = self._idle, defaultdict(list)
+        for idle in pools.values():
+            for conn, _ in idle:
+                conn.close()
+    
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            idle = sum(len(pool) for pool in self._idle.values())
+        return {"connections_opened": self.connections_opened,
+                "connections_reused": self.connections_reused, "idle_connections": idle}
+
+
+_client: Optional[HTTPClient] = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> HTTPClient:
+    """The process-wide HTTP client shared by the web tools."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            from auryx_agent.tools.http_cache import get_cache
+            _client = HTTPClient(cache=get_cache())
+        return _client
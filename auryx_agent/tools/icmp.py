@@ -0,0 +1,288 @@
+"""In-process ICMP echo (ping) with structured statistics.
+
+Echo requests are sent from unprivileged ICMP datagram sockets
+(``SOCK_DGRAM`` + ``IPPROTO_ICMP``, available on macOS and on Linux when
+``net.ipv4.ping_group_range`` includes the user), so no process is spawned
+and no root is needed. Where those sockets aren't allowed the system
+``ping`` binary is used instead and its per-reply times are parsed, so the
+result has the same shape either way.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import asyncio
+import math
+import os
+import platform
+import re
+import socket
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence
+
+from auryx_agent.tools.aio import run_sync
+
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMP6_ECHO_REQUEST = 128
+ICMP6_ECHO_REPLY = 129
+DEFAULT_PAYLOAD = 56
+MAX_CONCURRENT_HOSTS = 64
+
+_HEADER = struct.Struct("!BBHHH")
+_RTT_RE = re.compile(r"time[=<]\s*([\d.]+)\s*ms", re.IGNORECASE)
+_icmp_allowed: Dict[int, bool] = {}
+
+
+@dataclass
+class PingStats:
+    """Result of pinging one host."""
+    host: str
+    address: str = ""
+    transmitted: int = 0
+    rtts: List[float] = field(default_factory=list)  # seconds, one per reply
+    method: str = ""  # "icmp" or "subprocess"
+    error: Optional[str] = None
+    
+    @property
+    def received(self) -> int:
+        return len(self.rtts)
+    
+    @property
+    def loss(self) -> float:
+        """Packet loss in percent."""
+        if not self.transmitted:
+            return 100.0
+        return round(100.0 * (self.transmitted - self.received) / self.transmitted, 1)
+    
+    def summary(self) -> Dict[str, Optional[float]]:
+        """min/avg/max/mdev in milliseconds, as reported by iputils ping."""
+        if not self.rtts:
+            return {"min_ms": None, "avg_ms": None, "max_ms": None, "mdev_ms": None}
+        ms = [rtt * 1000 for rtt in self.rtts]
+        avg = sum(ms) / len(ms)
+        mdev = math.sqrt(max(0.0, sum(x * x for x in ms) / len(ms) - avg * avg))
+        return {"min_ms": round(min(ms), 3), "avg_ms": round(avg, 3),
+                "max_ms": round(max(ms), 3), "mdev_ms": round(mdev, 3)}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "host": self.host,
+            "address": self.address,
+            "transmitted": self.transmitted,
+            "received": self.received,
+            "packet_loss": self.loss,
+            **self.summary(),
+            "method": self.method,
+            "success": self.received > 0,
+            "error": self.error,
+        }
+    
+    def text(self) -> str:
+        """One-line summary in the style of ping's footer."""
+        line = (f"{self.transmitted} packets transmitted, {self.received} received, "
+                f"{self.loss:g}% packet loss")
+        stats = self.summary()
+        if self.rtts:
+            line += (f", rtt min/avg/max/mdev = {stats['min_ms']}/{stats['avg_ms']}/"
+                     f"{stats['max_ms']}/{stats['mdev_ms']} ms")
+        return line
+
+
+def checksum(data: bytes) -> int:
+    """RFC 1071 Internet checksum."""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    while total >> 16:
+        total = (total & 0xFFFF) + (total >> 16)
+    return ~total & 0xFFFF
+
+
+def build_echo(ident: int, seq: int, payload: bytes, ipv6: bool = False) -> bytes:
+    """Build an echo request (the kernel fills in the checksum for ICMPv6)."""
+    kind = ICMP6_ECHO_REQUEST if ipv6 else ICMP_ECHO_REQUEST
+    header = _HEADER.pack(kind, 0, 0, ident, seq)
+    if ipv6:
+        return header + payload
+    return _HEADER.pack(kind, 0, checksum(header + payload), ident, seq) + payload
+
+
+def parse_echo_reply(packet: bytes, ipv6: bool = False) -> Optional[tuple]:
+    """Return (sequence, payload) of an echo reply, or None for anything else.
+    
+    Some systems (macOS) deliver IPv4 replies with the IP header attached.
+    """
+    if not ipv6 and packet and packet[0] >> 4 == 4:
+        packet = packet[(packet[0] & 0x0F) * 4:]
+    if len(packet) < _HEADER.size:
+        return None
+    kind, code, _, _, seq = _HEADER.unpack_from(packet)
+    if kind != (ICMP6_ECHO_REPLY if ipv6 else ICMP_ECHO_REPLY) or code != 0:
+        return None
+    return seq, packet[_HEADER.size:]
+
+
+def parse_ping_output(output: str) -> List[float]:
+    """Per-reply round-trip times (seconds) from ping's output."""
+    return [float(value) / 1000 for value in _RTT_RE.findall(output)]
+
+
+def ping_command(address: str, count: int, timeout: float, interval: float = 1.0) -> List[str]:
+    """Command line for the system ping binary."""
+    system = platform.system().lower()
+    if system == "windows":
+        return ["ping", "-n", str(count), "-w", str(int(timeout * 1000)), address]
+    if system == "darwin":
+        return ["ping", "-c", str(count), "-i", str(max(interval, 0.1)),
+                "-W", str(int(timeout * 1000)), address]
+    family = ["-6"] if ":" in address else []
+    # Intervals under 0.2s need root with iputils
+    return ["ping", *family, "-c", str(count), "-i", str(max(interval, 0.2)),
+            "-W", str(max(1, round(timeout))), address]
+
+
+def icmp_available(family: int = socket.AF_INET) -> bool:
+    """Whether unprivileged ICMP sockets can be opened (cached)."""
+    if family not in _icmp_allowed:
+        try:
+            _open_socket(family).close()
+            _icmp_allowed[family] = True
+        except OSError:
+            _icmp_allowed[family] = False
+    return _icmp_allowed[family]
+
+
+def _open_socket(family: int) -> socket.socket:
+    proto = socket.IPPROTO_ICMPV6 if family == socket.AF_INET6 else socket.IPPROTO_ICMP
+    sock = socket.socket(family, socket.SOCK_DGRAM, proto)
+    sock.setblocking(False)
+    return sock
+
+
+async def _resolve(host: str) -> tuple:
+    from auryx_agent.tools.dns_resolver import get_resolver
+    
+    address = (await get_resolver().resolve(host))[0]
+    return (socket.AF_INET6 if ":" in address else socket.AF_INET), address
+
+
+async def _ping_icmp(stats: PingStats, family: int, count: int, interval: float,
+                     timeout: float, size: int) -> None:
+    loop = asyncio.get_running_loop()
+    ipv6 = family == socket.AF_INET6
+    # Linux rewrites the identifier to the socket's port, so replies are
+    # matched on the sequence number and a per-run token in the payload
+    ident = os.getpid() & 0xFFFF
+    token = os.urandom(8)
+    payload = (token * (size // 8 + 1))[:max(size, 8)]
+    sent: Dict[int, float] = {}
+    
+    sock = _open_socket(family)
+    stats.method = "icmp"
+    
+    async def receive() -> None:
+        while len(stats.rtts) < count:
+            packet = await loop.sock_recv(sock, 65535)
+            now = time.monotonic()
+            reply = parse_echo_reply(packet, ipv6)
+            if reply and reply[0] in sent and reply[1][:8] == token:
+                stats.rtts.append(now - sent.pop(reply[0]))
+    
+    receiver = asyncio.ensure_future(receive())
+    try:
+        for seq in range(1, count + 1):
+            sent[seq] = time.monotonic()
+            sock.sendto(build_echo(ident, seq, payload, ipv6), (stats.address, 0))
+            stats.transmitted += 1
+            if seq < count:
+                await asyncio.wait([receiver], timeout=interval)
+        await asyncio.wait([receiver], timeout=timeout)
+    finally:
+        receiver.cancel()
+        await asyncio.gather(receiver, return_exceptions=True)
+        sock.close()
+    if receiver.done() and not receiver.cancelled() and receiver.exception():
+        stats.error = str(receiver.exception())
+
+
+async def _ping_subprocess(stats: PingStats, count: int, interval: float, timeout: float) -> None:
+    stats.method = "subprocess"
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *ping_command(stats.address, count, timeout, interval),
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+    except OSError as e:
+        stats.error = f"no ICMP socket permission and ping is unavailable: {e}"
+        return
+    try:
+        out, err = await asyncio.wait_for(process.communicate(),
+                                          count * max(interval, 0.2) + timeout + 5)
+    except asyncio.TimeoutError:
+        process.kill()
+        out, err = await process.communicate()
+    stats.transmitted = count
+    stats.rtts = parse_ping_output(out.decode(errors="replace"))
+    if process.returncode not in (0, 1, None) and not stats.rtts:
+        stats.error = err.decode(errors="replace").strip() or f"ping exited with {process.returncode}"
+
+
+async def ping_async(host: str, count: int = 4, interval: float = 0.2, timeout: float = 2.0,
+                     size: int = DEFAULT_PAYLOAD, use_icmp: bool = True) -> PingStats:
+    """Ping a host.
+    
+    Args:
+        host: Hostname or IP
+        count: Echo requests to send
+        interval: Seconds between requests
+        timeout: Seconds to wait for replies after the last request
+        size: Payload bytes (at least 8)
+        use_icmp: Try unprivileged ICMP sockets before the ping binary
+    
+    Returns:
+        PingStats (errors are recorded in ``error``, not raised)
+    """
+    stats = PingStats(host)
+    try:
+        family, stats.address = await _resolve(host)
+    except OSError as e:
+        stats.error = f"resolve failed: {e}"
+        return stats
+    
+    if use_icmp and icmp_available(family):
+        try:
+            await _ping_icmp(stats, family, count, interval, timeout, size)
+            return stats
+        except OSError as e:
+            # e.g. no route to host when sending; report it like ping would
+            stats.error = str(e)
+            return stats
+    await _ping_subprocess(stats, count, interval, timeout)
+    return stats
+
+
+async def ping_many_async(hosts: Sequence[str], count: int = 4, interval: float = 0.2,
+                          timeout: float = 2.0, concurrency: int = MAX_CONCURRENT_HOSTS) -> List[PingStats]:
+    """Ping several hosts concurrently; results keep the order of ``hosts``."""
+    slots = asyncio.Semaphore(max(1, concurrency))
+    
+    async def one(host: str) -> PingStats:
+        async with slots:
+            return await ping_async(host, count, interval, timeout)
+    
+    return list(await asyncio.gather(*(one(host) for host in hosts)))
+
+
+def ping(host: str, count: int = 4, interval: float = 0.2, timeout: float = 2.0) -> PingStats:
+    """Blocking version of ``ping_async``."""
+    return run_sync(ping_async(host, count, interval, timeout))
+
+
+def ping_many(hosts: Sequence[str], count: int = 4, interval: float = 0.2,
+              timeout: float = 2.0) -> List[PingStats]:
+    """Blocking version of ``ping_many_async``."""
+    return run_sync(ping_many_async(hosts, count, interval, timeout))
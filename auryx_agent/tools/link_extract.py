@@ -0,0 +1,190 @@
+"""Streaming link extraction from HTML.
+
+Links are collected with ``html.parser`` as the response streams in, so
+a multi-megabyte page never has to be held in memory and reading stops as
+soon as the limit is reached. ``href`` values are resolved against the
+page URL (or its ``<base>``), normalised, de-duplicated in first-seen
+order and classified as internal (same host) or external.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import codecs
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+DEFAULT_MAX_LINKS = 100
+MAX_LINK_TEXT = 200
+SCOPES = ("all", "internal", "external")
+DEFAULT_PORTS = {"http": 80, "https": 443}
+SKIP_SCHEMES = ("javascript:", "mailto:", "tel:", "data:", "about:", "blob:")
+
+
+def normalize_url(url: str) -> str:
+    """Canonical form of an http(s) URL for de-duplication.
+    
+    Lower-cases the scheme and host, drops the default port, the fragment
+    and any credentials, and gives an empty path "/".
+    
+    Raises:
+        ValueError: On a malformed port
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    port = parts.port
+    netloc = host if port is None or DEFAULT_PORTS.get(scheme) == port else f"{host}:{port}"
+    return urlunsplit((scheme, netloc, parts.path or "/", parts.query, ""))
+
+
+@dataclass
+class Link:
+    url: str
+    text: str = ""
+    internal: bool = False
+    nofollow: bool = False
+    
+    def to_dict(self) -> Dict[str, Any]:
+        result = {"url": self.url, "text": self.text, "internal": self.internal}
+        if self.nofollow:
+            result["nofollow"] = True
+        return result
+
+
+class LinkExtractor(HTMLParser):
+    """Incremental parser collecting the links of one page.
+    
+    Feed it text with ``feed`` and stop once ``done`` is set; ``close``
+    returns the links.
+    """
+    
+    def __init__(self, base_url: str = "", limit: Optional[int] = DEFAULT_MAX_LINKS, scope: str = "all"):
+        """Initialize the extractor.
+        
+        Args:
+            base_url: Page URL that relative links are resolved against
+            limit: Stop after this many links (None for no limit)
+            scope: Keep "all", only "internal" or only "external" links
+        """
+        super().__init__(convert_charrefs=True)
+        if scope not in SCOPES:
+            raise ValueError(f"scope must be one of {', '.join(SCOPES)}")
+        self.base_url = base_url
+        self.host = (urlsplit(base_url).hostname or "").lower()
+        self.limit = limit
+        self.scope = scope
+        self.links: List[Link] = []
+        self._seen = set()
+        self._base_seen = False
+        # Link whose anchor text is being collected
+        self._open: Optional[Link] = None
+        self._text: List[str] = []
+        self._text_chars = 0
+    
+    @property
+    def full(self) -> bool:
+        return self.limit is not None and len(self.links) >= self.limit
+    
+    @property
+    def done(self) -> bool:
+        """The limit is reached and the last link's text is complete."""
+        return self.full and self._open is None
+    
+    @property
+    def internal(self) -> List[Link]:
+        return [link for link in self.links if link.internal]
+    
+    @property
+    def external(self) -> List[Link]:
+        return [link for link in self.links if not link.internal]
+    
+    def _resolve(self, href: str) -> Optional[str]:
+        href = href.strip()
+        if not href or href.startswith("#") or href.lower().startswith(SKIP_SCHEMES):
+            return None
+        try:
+            url = normalize_url(urljoin(self.base_url, href))
+        except ValueError:
+            return None
+        return url if url.startswith(("http://", "https://")) else None
+    
+    def _close_link(self) -> None:
+        if self._open is not None:
+            self._open.text = " ".join("".join(self._text).split())[:MAX_LINK_TEXT]
+        self._open = None
+        self._text = []
+        self._text_chars = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag == "base" and not self._base_seen:
+            # Only the first <base> counts
+            self._base_seen = True
+            href = dict(attrs).get("href")
+            if href:
+                self.base_url = urljoin(self.base_url, href.strip())
+            return
+        if tag == "img" and self._open is not None and not self._text_chars:
+            self.handle_data(dict(attrs).get("alt") or "")
+            return
+        if tag not in ("a", "area") or self.full:
+            return
+        
+        self._close_link()
+        attrs = dict(attrs)
+        url = self._resolve(attrs.get("href") or "")
+        if url is None or url in self._seen:
+            return
+        self._seen.add(url)
+        internal = urlsplit(url).hostname == self.host
+        if self.scope != "all" and internal != (self.scope == "internal"):
+            return
+        link = Link(url, internal=internal,
+                    nofollow="nofollow" in (attrs.get("rel") or "").lower().split())
+        self.links.append(link)
+        if tag == "a":
+            self._open = link
+    
+    def handle_endtag(self, tag):
+        if tag == "a":
+            self._close_link()
+    
+    def handle_data(self, data):
+        if self._open is not None and self._text_chars < MAX_LINK_TEXT * 2:
+            self._text.append(data)
+            self._text_chars += len(data)
+    
+    def close(self) -> List[Link]:
+        super().close()
+        self._close_link()
+        return self.links
+
+
+def extract_links_stream(chunks: Iterable[bytes], encoding: str = "utf-8", base_url: str = "",
+                         limit: Optional[int] = DEFAULT_MAX_LINKS,
+                         scope: str = "all") -> Tuple[LinkExtractor, int]:
+    """Collect links from a body arriving in byte chunks.
+    
+    Reading stops as soon as ``limit`` links have been found.
+    
+    Returns:
+        (closed LinkExtractor, number of bytes read)
+    """
+    try:
+        decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parser = LinkExtractor(base_url, limit, scope)
+    size = 0
+    for data in chunks:
+        size += len(data)
+        parser.feed(decoder.decode(data))
+        if parser.done:
+            break
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    return parser, size
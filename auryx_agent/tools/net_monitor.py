@@ -0,0 +1,396 @@
+"""Continuous network monitoring.
+
+A background thread samples every target once per interval: ICMP echo
+(or a TCP connect when ICMP sockets aren't allowed) for hosts, a TCP
+connect for ``host:port`` and an uncached query for ``dns:name``. Samples
+go into fixed-size ``array``-backed ring buffers, so memory stays flat no
+matter how long the monitor runs, and a summary with percentiles,
+jitter, loss and anomaly flags can be produced at any time in one call.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import asyncio
+import math
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+DEFAULT_TARGETS = ["1.1.1.1", "8.8.8.8", "dns:example.com"]
+DEFAULT_INTERVAL = 5.0
+DEFAULT_CAPACITY = 720  # an hour at the default interval
+FALLBACK_TCP_PORT = 443
+
+# Anomaly thresholds
+LOSS_THRESHOLD = 5.0  # percent
+DOWN_AFTER = 3  # consecutive lost samples
+SPIKE_FACTOR = 3.0
+SPIKE_MIN_MS = 50.0
+JITTER_MIN_MS = 30.0
+SLOW_DNS_MS = 300.0
+
+LOST = float("nan")
+
+
+class RingBuffer:
+    """Fixed-capacity time series of float samples (NaN marks a lost sample)."""
+    
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = max(1, capacity)
+        self.times = array("d", [0.0]) * self.capacity
+        self.values = array("d", [LOST]) * self.capacity
+        self._next = 0
+        self.count = 0
+    
+    def append(self, timestamp: float, value: float) -> None:
+        self.times[self._next] = timestamp
+        self.values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+    
+    def snapshot(self, since: Optional[float] = None) -> Tuple[List[float], List[float]]:
+        """(timestamps, values) oldest first, optionally only those at or after ``since``."""
+        start = (self._next - self.count) % self.capacity
+        order = [(start + i) % self.capacity for i in range(self.count)]
+        times = [self.times[i] for i in order]
+        values = [self.values[i] for i in order]
+        if since is not None:
+            first = next((i for i, t in enumerate(times) if t >= since), len(times))
+            times, values = times[first:], values[first:]
+        return times, values
+    
+    def __len__(self) -> int:
+        return self.count
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Percentile by linear interpolation between closest ranks."""
+    if not sorted_values:
+        return LOST
+    position = (len(sorted_values) - 1) * pct / 100.0
+    low = int(position)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (position - low)
+
+
+@dataclass
+class Target:
+    """Something to sample."""
+    spec: str
+    kind: str  # "ping", "tcp" or "dns"
+    host: str
+    port: int = 0
+    
+    @classmethod
+    def parse(cls, spec: str) -> "Target":
+        """Parse "host", "host:port", "tcp:host:port" or "dns:name".
+        
+        Raises:
+            ValueError: On an empty target or a bad port
+        """
+        text = spec.strip()
+        if text.startswith("dns:"):
+            name = text[4:].strip()
+            if not name:
+                raise ValueError(f"Missing name in {spec!r}")
+            return cls(spec, "dns", name)
+        if text.startswith("tcp:"):
+            text = text[4:]
+        if text.startswith("["):  # [IPv6]:port
+            host, _, port = text[1:].partition("]:")
+        elif text.count(":") == 1:
+            host, _, port = text.partition(":")
+        else:
+            host, port = text, ""
+        if not host:
+            raise ValueError(f"Missing host in {spec!r}")
+        if port:
+            if not port.isdigit() or not 0 < int(port) < 65536:
+                raise ValueError(f"Bad port in {spec!r}")
+            return cls(spec, "tcp", host, int(port))
+        return cls(spec, "ping", host)
+
+
+def configured_targets() -> List[str]:
+    """Targets from the config file's [network] monitor list, or the defaults."""
+    try:
+        from auryx_agent.core.config import load_config
+        from auryx_agent.core.paths import get_config_file
+        if get_config_file().exists():
+            return list(load_config().monitor_targets) or list(DEFAULT_TARGETS)
+    except Exception:
+        pass
+    return list(DEFAULT_TARGETS)
+
+
+def summarize(values: Sequence[float]) -> Dict[str, Any]:
+    """Loss, percentiles and jitter (ms) of a series of samples in seconds."""
+    answered = [v * 1000 for v in values if not math.isnan(v)]
+    summary: Dict[str, Any] = {
+        "samples": len(values),
+        "loss": round(100.0 * (len(values) - len(answered)) / len(values), 1) if values else 0.0,
+    }
+    if not answered:
+        for key in ("min_ms", "p50_ms", "p90_ms", "p99_ms", "max_ms", "mean_ms", "jitter_ms", "last_ms"):
+            summary[key] = None
+        return summary
+    ordered = sorted(answered)
+    # Mean difference between consecutive replies, like RTP jitter
+    jitter = (sum(abs(b - a) for a, b in zip(answered, answered[1:])) / (len(answered) - 1)
+              if len(answered) > 1 else 0.0)
+    last = values[-1]
+    summary.update({
+        "min_ms": round(ordered[0], 2),
+        "p50_ms": round(percentile(ordered, 50), 2),
+        "p90_ms": round(percentile(ordered, 90), 2),
+        "p99_ms": round(percentile(ordered, 99), 2),
+        "max_ms": round(ordered[-1], 2),
+        "mean_ms": round(sum(answered) / len(answered), 2),
+        "jitter_ms": round(jitter, 2),
+        "last_ms": None if math.isnan(last) else round(last * 1000, 2),
+    })
+    return summary
+
+
+def find_anomalies(kind: str, values: Sequence[float], summary: Dict[str, Any]) -> List[str]:
+    """Human-readable flags for a target's recent behaviour."""
+    flags = []
+    recent = values[-DOWN_AFTER:]
+    if len(recent) == DOWN_AFTER and all(math.isnan(v) for v in recent):
+        flags.append(f"down: last {DOWN_AFTER} samples lost")
+    elif summary["loss"] >= LOSS_THRESHOLD:
+        flags.append(f"packet loss {summary['loss']}%")
+    p50, last = summary.get("p50_ms"), summary.get("last_ms")
+    if p50 is not None and last is not None and len(values) >= 5:
+        if last > max(p50 * SPIKE_FACTOR, p50 + SPIKE_MIN_MS):
+            flags.append(f"latency spike: {last}ms vs median {p50}ms")
+    jitter = summary.get("jitter_ms")
+    if jitter is not None and p50 is not None and jitter > max(JITTER_MIN_MS, p50 / 2):
+        flags.append(f"high jitter: {jitter}ms")
+    if kind == "dns" and p50 is not None and p50 > SLOW_DNS_MS:
+        flags.append(f"slow DNS: median {p50}ms")
+    return flags
+
+
+class NetworkMonitor:
+    """Samples targets on a background thread into ring buffers."""
+    
+    def __init__(self, targets: Optional[Sequence[str]] = None, interval: float = DEFAULT_INTERVAL,
+                 capacity: int = DEFAULT_CAPACITY, timeout: Optional[float] = None,
+                 on_sample: Optional[Callable[[Dict[str, float]], None]] = None):
+        """Configure the monitor.
+        
+        Args:
+            targets: Target specs (see ``Target.parse``; default: configured targets)
+            interval: Seconds between samples
+            capacity: Samples kept per target
+            timeout: Seconds to wait for each probe (default: the interval, at most 2s)
+            on_sample: Called after each round with {target: seconds or NaN}
+        
+        Raises:
+            ValueError: On a bad target
+        """
+        specs = list(targets) if targets else configured_targets()
+        self.targets = [Target.parse(spec) for spec in specs]
+        self.interval = max(0.1, interval)
+        self.timeout = timeout if timeout is not None else min(self.interval, 2.0)
+        self.capacity = capacity
+        self.buffers = {t.spec: RingBuffer(capacity) for t in self.targets}
+        self.methods: Dict[str, str] = {}
+        self.on_sample = on_sample
+        self.started: Optional[float] = None
+        self.rounds = 0
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._sampled = threading.Event()
+    
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    async def _sample_ping(self, target: Target) -> float:
+        from auryx_agent.tools.icmp import icmp_available, ping_async
+        
+        if icmp_available():
+            stats = await ping_async(target.host, count=1, timeout=self.timeout)
+            if stats.method == "icmp":
+                self.methods[target.spec] = "icmp"
+                return stats.rtts[0] if stats.rtts else LOST
+        # Without ICMP sockets a TCP handshake (or refusal) measures the round trip
+        self.methods[target.spec] = f"tcp:{FALLBACK_TCP_PORT}"
+        return await self._connect(target.host, FALLBACK_TCP_PORT, refused_ok=True)
+    
+    async def _connect(self, host: str, port: int, refused_ok: bool = False) -> float:
+        from auryx_agent.tools.dns_resolver import get_resolver
+        
+        address = (await get_resolver().resolve(host))[0]
+        start = time.monotonic()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), self.timeout)
+        except ConnectionRefusedError:
+            return time.monotonic() - start if refused_ok else LOST
+        except (asyncio.TimeoutError, OSError):
+            return LOST
+        elapsed = time.monotonic() - start
+        writer.close()
+        return elapsed
+    
+    async def _sample_dns(self, target: Target) -> float:
+        from auryx_agent.tools.dns_resolver import get_resolver
+        
+        start = time.monotonic()
+        try:
+            await asyncio.wait_for(get_resolver().query(target.host, use_cache=False), self.timeout)
+        except (asyncio.TimeoutError, OSError, ValueError):
+            return LOST
+        return time.monotonic() - start
+    
+    async def _sample(self, target: Target) -> float:
+        try:
+            if target.kind == "dns":
+                self.methods[target.spec] = "dns"
+                return await self._sample_dns(target)
+            if target.kind == "tcp":
+                self.methods[target.spec] = "tcp"
+                return await self._connect(target.host, target.port)
+            return await self._sample_ping(target)
+        except OSError:
+            return LOST
+    
+    async def sample_once(self) -> Dict[str, float]:
+        """Sample every target concurrently and record the results."""
+        now = time.time()
+        values = await asyncio.gather(*(self._sample(t) for t in self.targets))
+        results = dict(zip((t.spec for t in self.targets), values))
+        with self._lock:
+            for spec, value in results.items():
+                self.buffers[spec].append(now, value)
+            self.rounds += 1
+        self._sampled.set()
+        if self.on_sample:
+            self.on_sample(results)
+        return results
+    
+    async def _loop(self) -> None:
+        next_tick = time.monotonic()
+        while not self._stop.is_set():
+            await self.sample_once()
+            next_tick += self.interval
+            # Skip ticks that were missed instead of bursting to catch up
+            while next_tick < time.monotonic():
+                next_tick += self.interval
+            while not self._stop.is_set() and time.monotonic() < next_tick:
+                await asyncio.sleep(min(0.2, next_tick - time.monotonic()))
+    
+    def start(self) -> None:
+        """Start sampling in the background (no-op if already running)."""
+        if self.running:
+            return
+        self._stop.clear()
+        self.started = self.started or time.time()
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._loop()),
+                                        name="auryx-net-monitor", daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Stop sampling; collected samples are kept."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout + 1)
+        self._thread = None
+    
+    def wait_for_sample(self, timeout: float) -> bool:
+        """Block until at least one round has been recorded."""
+        return self._sampled.wait(timeout)
+    
+    def summary(self, window: Optional[float] = None) -> Dict[str, Any]:
+        """Per-target statistics and anomaly flags.
+        
+        Args:
+            window: Only consider the last this many seconds (default: everything kept)
+        """
+        since = time.time() - window if window else None
+        targets = []
+        anomalies = []
+        with self._lock:
+            series = {spec: buffer.snapshot(since)[1] for spec, buffer in self.buffers.items()}
+        for target in self.targets:
+            values = series[target.spec]
+            stats = summarize(values)
+            flags = find_anomalies(target.kind, values, stats)
+            targets.append({"target": target.spec, "kind": target.kind,
+                            "method": self.methods.get(target.spec, ""), **stats,
+                            "anomalies": flags})
+            anomalies.extend(f"{target.spec}: {flag}" for flag in flags)
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "rounds": self.rounds,
+            "uptime": round(time.time() - self.started, 1) if self.started else 0.0,
+            "window": window,
+            "targets": targets,
+            "anomalies": anomalies,
+            "healthy": not anomalies,
+        }
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    """Summary as an aligned table."""
+    rows = [("TARGET", "SAMPLES", "LOSS", "P50", "P90", "P99", "MAX", "JITTER")]
+    
+    def ms(value):
+        return f"{value:.1f}" if value is not None else "-"
+    
+    for t in summary["targets"]:
+        rows.append((t["target"], str(t["samples"]), f"{t['loss']:g}%", ms(t["p50_ms"]),
+                     ms(t["p90_ms"]), ms(t["p99_ms"]), ms(t["max_ms"]), ms(t["jitter_ms"])))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    lines = ["  ".join(cell.ljust(widths[0]) if i == 0 else cell.rjust(widths[i])
+                       for i, cell in enumerate(row))
+             for row in rows]
+    return "\n".join(lines)
+
+
+_monitor: Optional[NetworkMonitor] = None
+_monitor_lock = threading.Lock()
+
+
+def get_monitor() -> Optional[NetworkMonitor]:
+    """The shared background monitor, if one was started."""
+    return _monitor
+
+
+def start_monitor(targets: Optional[Sequence[str]] = None, interval: float = DEFAULT_INTERVAL,
+                  capacity: int = DEFAULT_CAPACITY) -> NetworkMonitor:
+    """Start the shared monitor, replacing it if the targets or interval changed.
+    
+    Raises:
+        ValueError: On a bad target
+    """
+    global _monitor
+    with _monitor_lock:
+        wanted = [Target.parse(spec).spec for spec in targets] if targets else None
+        current = _monitor
+        if current is not None and (
+                (wanted is not None and [t.spec for t in current.targets] != wanted)
+                or current.interval != max(0.1, interval)):
+            current.stop()
+            current = None
+        if current is None:
+            current = NetworkMonitor(targets, interval=interval, capacity=capacity)
+        current.start()
+        _monitor = current
+        return current
+
+
+def stop_monitor() -> Optional[NetworkMonitor]:
+    """Stop the shared monitor, keeping its samples for a final summary."""
+    with _monitor_lock:
+        if _monitor is not None:
+            _monitor.stop()
+        return _monitor
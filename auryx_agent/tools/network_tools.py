@@ -1,72 +1,83 @@
 """Network diagnostic tools - ping, DNS, port scan, traceroute."""
 
 import socket
-import subprocess
-import platform
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Union
 
 
 class NetworkTools:
     """Network diagnostic tools."""
     
     @staticmethod
-    def ping(host: str, count: int = 4) -> Dict[str, Any]:
-        """Ping a host.
+    def ping(host: Union[str, List[str]], count: int = 4, timeout: float = 2.0,
+             interval: float = 0.2) -> Dict[str, Any]:
+        """Ping one or more hosts.
+        
+        Uses unprivileged ICMP sockets when the OS allows them and the
+        system ping binary otherwise.
         
         Args:
-            host: Hostname or IP to ping
+            host: Hostname or IP, or several as a list or comma-separated string
             count: Number of ping packets
+            timeout: Seconds to wait for replies after the last packet
+            interval: Seconds between packets
             
         Returns:
-            Dict with ping results
+            Dict with loss and min/avg/max/mdev RTT in ms; for several hosts,
+            'results' holds one such dict per host
         """
-        param = '-n' if platform.system().lower() == 'windows' else '-c'
-        command = f"ping {param} {count} {host}"
+        from auryx_agent.tools.icmp import ping_many
         
-        try:
-            result = subprocess.run(
-                command.split(),
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            return {
-                "host": host,
-                "output": result.stdout,
-                "success": result.returncode == 0,
-                "error": result.stderr if result.returncode != 0 else None
-            }
-        except Exception as e:
-            return {
-                "host": host,
-                "output": "",
-                "success": False,
-                "error": str(e)
-            }
+        hosts = [h.strip() for h in host.split(",") if h.strip()] if isinstance(host, str) else list(host)
+        if not hosts:
+            return {"host": host, "success": False, "error": "No host given"}
+        results = ping_many(hosts, count=count, interval=interval, timeout=timeout)
+        
+        if len(results) == 1:
+            stats = results[0]
+            return {**stats.to_dict(), "output": stats.text()}
+        return {
+            "results": [stats.to_dict() for stats in results],
+            "reachable": sum(1 for stats in results if stats.received),
+            "total": len(results),
+            "success": any(stats.received for stats in results),
+            "error": None
+        }
     
     @staticmethod
-    def dns_lookup(host: str) -> Dict[str, Any]:
+    def dns_lookup(host: str, record_type: Union[str, List[str], None] = None) -> Dict[str, Any]:
         """Perform DNS lookup.
         
+        Answers are cached for their TTL, so repeated lookups are free.
+        
         Args:
             host: Hostname to lookup
+            record_type: Record type(s) to query, e.g. "MX" or "MX,TXT,NS"
+                (default: the host's IPv4 and IPv6 addresses)
             
         Returns:
             Dict with DNS results
         """
-        try:
-            ip_addresses = socket.gethostbyname_ex(host)
-            
+        from auryx_agent.tools.dns_resolver import lookup, resolve_host_ex
+        
+        if record_type:
+            types = record_type.split(",") if isinstance(record_type, str) else list(record_type)
+            types = [t.strip().upper() for t in types if t.strip()]
+            try:
+                answers = lookup(host, types)
+            except (ValueError, OSError) as e:
+                return {"host": host, "records": {}, "success": False, "error": str(e)}
             return {
                 "host": host,
-                "hostname": ip_addresses[0],
-                "aliases": ip_addresses[1],
-                "addresses": ip_addresses[2],
-                "success": True,
+                "records": {t: answer.values for t, answer in answers.items()},
+                "rcode": {t: answer.rcode for t, answer in answers.items()},
+                "cached": all(answer.cached for answer in answers.values()),
+                "success": any(answer.rcode == "NOERROR" for answer in answers.values()),
                 "error": None
             }
-        except socket.gaierror as e:
+        
+        try:
+            canonical, aliases, addresses = resolve_host_ex(host)
+        except OSError as e:
             return {
                 "host": host,
                 "hostname": None,
@@ -75,6 +86,15 @@ class NetworkTools:
                 "success": False,
                 "error": str(e)
             }
+        
+        return {
+            "host": host,
+            "hostname": canonical,
+            "aliases": aliases,
+            "addresses": addresses,
+            "success": True,
+            "error": None
+        }
     
     @staticmethod
     def scan_port(host: str, port: int, timeout: float = 1.0) -> bool:
@@ -98,73 +118,129 @@ class NetworkTools:
             return False
     
     @staticmethod
-    def scan_ports(host: str, ports: List[int] = None) -> Dict[str, Any]:
-        """Scan multiple ports.
+    def scan_ports(host: str, ports: Union[str, List[int], None] = None, concurrency: int = 256,
+                   timeout: float = 1.0, rate: Optional[float] = None) -> Dict[str, Any]:
+        """Scan ports concurrently.
         
         Args:
             host: Hostname or IP
-            ports: List of ports to scan (default: common ports)
+            ports: Ports to scan, as a list or a spec like "1-1024,8080"
+                (default: common ports)
+            concurrency: Maximum connection attempts in flight
+            timeout: Connection timeout per port
+            rate: Maximum connection attempts per second (default: unlimited)
             
         Returns:
             Dict with scan results
         """
-        if ports is None:
-            # Common ports
-            ports = [21, 22, 23, 25, 53, 80, 110, 143, 443, 3306, 3389, 5432, 8080, 8443]
+        from auryx_agent.tools.port_scanner import scan_ports
         
-        open_ports = []
-        closed_ports = []
+        try:
+            result = scan_ports(host, ports, concurrency=concurrency, timeout=timeout, rate=rate)
+        except (ValueError, OSError) as e:
+            return {
+                "host": host,
+                "open_ports": [],
+                "closed_ports": [],
+                "total_scanned": 0,
+                "success": False,
+                "error": str(e)
+            }
         
-        for port in ports:
-            if NetworkTools.scan_port(host, port):
-                open_ports.append(port)
+        result["success"] = True
+        result["error"] = None
+        return result
+    
+    @staticmethod
+    def network_sweep(targets: Union[str, List[str]], ports: Union[str, List[int], None] = None,
+                      ping: bool = True, resolve: bool = True, concurrency: int = 64,
+                      timeout: float = 1.0) -> Dict[str, Any]:
+        """Check many hosts at once.
+        
+        Args:
+            targets: CIDR blocks and/or hostnames, e.g. "192.168.1.0/24" or
+                "web1.example.com, web2.example.com"
+            ports: Ports to probe on each host, e.g. "22,80,443" (default: none)
+            ping: Check liveness with ping (TCP connects are the fallback)
+            resolve: Look up hostnames
+            concurrency: Hosts checked at once
+            timeout: Seconds per ping, connect or lookup
+        
+        Returns:
+            Dict with per-host results and a summary table
+        """
+        from auryx_agent.tools.sweep import format_table, sweep_network
+        
+        try:
+            result = sweep_network(targets, ports or (), ping=ping, resolve=resolve,
+                                   concurrency=concurrency, timeout=timeout)
+        except ValueError as e:
+            return {"hosts": [], "alive": 0, "total": 0, "success": False, "error": str(e)}
+        
+        result["table"] = format_table(result.pop("results"))
+        result["success"] = True
+        result["error"] = None
+        return result
+    
+    @staticmethod
+    def network_monitor(action: str = "summary", targets: Union[str, List[str], None] = None,
+                        interval: float = 5.0, window: Optional[float] = None) -> Dict[str, Any]:
+        """Background latency/loss/DNS monitor.
+        
+        Args:
+            action: "summary" (starts the monitor if needed), "start" or "stop"
+            targets: Hosts to ping, "host:port" for TCP, "dns:name" for DNS
+                timing (default: configured targets)
+            interval: Seconds between samples
+            window: Summarize only the last this many seconds
+        
+        Returns:
+            Dict with per-target percentiles, loss, jitter and anomaly flags
+        """
+        from auryx_agent.tools.net_monitor import get_monitor, start_monitor, stop_monitor
+        
+        if isinstance(targets, str):
+            targets = [t.strip() for t in targets.split(",") if t.strip()]
+        
+        try:
+            if action == "stop":
+                monitor = stop_monitor()
+                if monitor is None:
+                    return {"running": False, "success": False, "error": "Monitor is not running"}
+            elif action in ("start", "summary"):
+                monitor = get_monitor()
+                if action == "start" or targets or monitor is None or not monitor.running:
+                    monitor = start_monitor(targets, interval=interval)
+                monitor.wait_for_sample(monitor.timeout + 2)
             else:
-                closed_ports.append(port)
+                return {"success": False, "error": f"Unknown action: {action} (use summary, start or stop)"}
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
         
-        return {
-            "host": host,
-            "open_ports": open_ports,
-            "closed_ports": closed_ports,
-            "total_scanned": len(ports),
-            "success": True
-        }
+        return {**monitor.summary(window), "success": True, "error": None}
     
     @staticmethod
-    def traceroute(host: str, max_hops: int = 30) -> Dict[str, Any]:
+    def traceroute(host: str, max_hops: int = 30, probes: int = 3,
+                   timeout: float = 1.0) -> Dict[str, Any]:
         """Perform traceroute to host.
         
+        TTLs are probed in parallel, so a trace takes about one timeout
+        rather than one per hop.
+        
         Args:
             host: Hostname or IP
             max_hops: Maximum number of hops
+            probes: Probes per hop
+            timeout: Seconds to wait for each probe
             
         Returns:
-            Dict with traceroute results
+            Dict with per-hop addresses, RTTs (ms) and loss
         """
-        system = platform.system().lower()
-        
-        if system == 'windows':
-            command = f"tracert -h {max_hops} {host}"
-        else:
-            command = f"traceroute -m {max_hops} {host}"
+        from auryx_agent.tools.traceroute import trace
         
-        try:
-            result = subprocess.run(
-                command.split(),
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            
-            return {
-                "host": host,
-                "output": result.stdout,
-                "success": result.returncode == 0,
-                "error": result.stderr if result.returncode != 0 else None
-            }
-        except Exception as e:
-            return {
-                "host": host,
-                "output": "",
-                "success": False,
-                "error": str(e)
-            }
+        result = trace(host, max_hops=max_hops, probes=probes, timeout=timeout)
+        return {
+            **result.to_dict(),
+            "output": result.text(),
+            "success": bool(result.hops) and result.error is None,
+        }
@@ -0,0 +1,479 @@
+"""Batched, atomic multi-file editing.
+
+Instead of re-emitting whole files through write_file, the model sends a
+unified diff or a list of search/replace edits that may touch many files.
+Every edit is validated in memory first; only if all of them apply are the
+files written, each through a temp file in the same directory followed by
+``os.replace``. If a write fails midway, files already written are
+restored from their original contents.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import os
+import re
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+DEV_NULL = "/dev/null"
+
+
+class PatchError(ValueError):
+    """Raised when a patch or edit cannot be applied."""
+
+
+@dataclass
+class Hunk:
+    """One ``@@`` section of a unified diff."""
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+    lines: List[str] = field(default_factory=list)
+    old_no_eol: bool = False
+    new_no_eol: bool = False
+    
+    @property
+    def old_lines(self) -> List[str]:
+        return [line[1:] for line in self.lines if line[:1] in (" ", "-")]
+    
+    @property
+    def new_lines(self) -> List[str]:
+        return [line[1:] for line in self.lines if line[:1] in (" ", "+")]
+    
+    @property
+    def complete(self) -> bool:
+        """All the lines promised by the ``@@`` header have been read."""
+        return len(self.old_lines) >= self.old_count and len(self.new_lines) >= self.new_count
+
+
+@dataclass
+class FilePatch:
+    """Changes to one file in a unified diff."""
+    old_path: str
+    new_path: str
+    hunks: List[Hunk] = field(default_factory=list)
+    
+    @property
+    def path(self) -> str:
+        return self.old_path if self.new_path == DEV_NULL else self.new_path
+    
+    @property
+    def is_new(self) -> bool:
+        return self.old_path == DEV_NULL
+    
+    @property
+    def is_delete(self) -> bool:
+        return self.new_path == DEV_NULL
+
+
+def _strip_prefix(path: str) -> str:
+    path = path.split("\t", 1)[0].strip()
+    if path != DEV_NULL and path[:2] in ("a/", "b/"):
+        return path[2:]
+    return path
+
+
+def parse_unified_diff(diff: str) -> List[FilePatch]:
+    """Parse a (possibly multi-file) unified diff.
+    
+    ``git diff`` headers are accepted and ``a/``/``b/`` prefixes stripped.
+    
+    Raises:
+        PatchError: If the diff is malformed
+    """
+    patches: List[FilePatch] = []
+    current: Optional[FilePatch] = None
+    hunk: Optional[Hunk] = None
+    lines = diff.splitlines()
+    i = 0
+    
+    while i < len(lines):
+        line = lines[i]
+        if line.startswith("--- ") and i + 1 < len(lines) and lines[i + 1].startswith("+++ "):
+            current = FilePatch(_strip_prefix(line[4:]), _strip_prefix(lines[i + 1][4:]))
+            patches.append(current)
+            hunk = None
+            i += 2
+            continue
+        
+        match = HUNK_HEADER.match(line)
+        if match:
+            if current is None:
+                raise PatchError(f"Hunk without file header at line {i + 1}")
+            old_start, old_count, new_start, new_count = match.groups()
+            hunk = Hunk(int(old_start), int(old_count if old_count is not None else 1),
+                        int(new_start), int(new_count if new_count is not None else 1))
+            current.hunks.append(hunk)
+            i += 1
+            continue
+        
+        if hunk is not None and hunk.complete and not line.startswith("\\"):
+            # Blank separators, trailers and commentary after the last hunk line
+            hunk = None
+        
+        if hunk is not None and line[:1] in (" ", "-", "+"):
+            hunk.lines.append(line)
+        elif hunk is not None and line == "":
+            # Some tools drop the space of empty context lines
+            hunk.lines.append(" ")
+        elif hunk is not None and line.startswith("\\"):
+            # "\ No newline at end of file" refers to the previous line
+            previous = hunk.lines[-1][:1] if hunk.lines else " "
+            if previous in (" ", "-"):
+                hunk.old_no_eol = True
+            if previous in (" ", "+"):
+                hunk.new_no_eol = True
+        else:
+            # diff --git, index, mode lines and commentary between files
+            hunk = None
+        i += 1
+    
+    if not patches:
+        raise PatchError("No file headers (---/+++) found in patch")
+    
+    for patch in patches:
+        for hunk in patch.hunks:
+            old, new = len(hunk.old_lines), len(hunk.new_lines)
+            if (old, new) != (hunk.old_count, hunk.new_count):
+                raise PatchError(
+                    f"{patch.path}: hunk @@ -{hunk.old_start},{hunk.old_count} "
+                    f"+{hunk.new_start},{hunk.new_count} @@ has {old} old and {new} new lines"
+                )
+    return patches
+
+
+class Document:
+    """File text as lines, remembering its newline style."""
+    
+    def __init__(self, text: str = ""):
+        self.newline = "\r\n" if "\r\n" in text else "\n"
+        self.final_newline = text.endswith("\n")
+        self.lines = text.split("\n") if text else []
+        if self.newline == "\r\n":
+            self.lines = [line[:-1] if line.endswith("\r") else line for line in self.lines]
+        if self.final_newline:
+            self.lines.pop()
+    
+    def text(self) -> str:
+        if not self.lines:
+            return ""
+        return self.newline.join(self.lines) + (self.newline if self.final_newline else "")
+
+
+def _find_block(lines: List[str], block: List[str], expected: int, lowest: int) -> Optional[int]:
+    """Find block in lines, nearest to the expected position first.
+    
+    An exact match is preferred; otherwise trailing whitespace is ignored.
+    """
+    last = len(lines) - len(block)
+    if last < lowest:
+        return None
+    
+    expected = min(max(expected, lowest), last)
+    positions = sorted(range(lowest, last + 1), key=lambda p: abs(p - expected))
+    for normalize in (None, str.rstrip):
+        target = block if normalize is None else [normalize(line) for line in block]
+        for pos in positions:
+            window = lines[pos:pos + len(block)]
+            if normalize is not None:
+                window = [normalize(line) for line in window]
+            if window == target:
+                return pos
+    return None
+
+
+def apply_hunks(doc: Document, hunks: List[Hunk], path: str) -> Tuple[int, int]:
+    """Apply hunks to a document in place.
+    
+    Hunks may be offset from their stated line numbers (the file changed
+    since the diff was made); the nearest matching position is used.
+    
+    Returns:
+        (lines added, lines removed)
+    
+    Raises:
+        PatchError: If a hunk's context is not found
+    """
+    result: List[str] = []
+    cursor = 0
+    offset = 0
+    added = removed = 0
+    
+    for hunk in hunks:
+        old, new = hunk.old_lines, hunk.new_lines
+        if old:
+            pos = _find_block(doc.lines, old, hunk.old_start - 1 + offset, cursor)
+            if pos is None:
+                preview = "\n".join(old[:3])
+                raise PatchError(
+                    f"{path}: hunk @@ -{hunk.old_start},{hunk.old_count} @@ does not match the file "
+                    f"(expected lines starting with:\n{preview})"
+                )
+        else:
+            # Pure insertion after line old_start
+            pos = min(max(hunk.old_start + offset, cursor), len(doc.lines))
+        
+        result.extend(doc.lines[cursor:pos])
+        result.extend(new)
+        cursor = pos + len(old)
+        offset = pos - (hunk.old_start - 1 if old else hunk.old_start)
+        added += sum(1 for line in hunk.lines if line.startswith("+"))
+        removed += sum(1 for line in hunk.lines if line.startswith("-"))
+    
+    result.extend(doc.lines[cursor:])
+    at_end = cursor >= len(doc.lines)
+    if hunks and at_end:
+        last = hunks[-1]
+        if last.new_no_eol:
+            doc.final_newline = False
+        elif last.old_no_eol or not doc.lines:
+            doc.final_newline = True
+    doc.lines = result
+    return added, removed
+
+
+def replace_text(text: str, search: str, replace: str, path: str,
+                 replace_all: bool = False) -> Tuple[str, int]:
+    """Replace an exact snippet in text.
+    
+    Without replace_all the snippet must occur exactly once, so an edit
+    never lands in the wrong place.
+    
+    Returns:
+        (new text, number of replacements)
+    
+    Raises:
+        PatchError: If the snippet is missing or ambiguous
+    """
+    if not search:
+        raise PatchError(f"{path}: empty search text")
+    
+    if "\r\n" in text and "\r\n" not in search:
+        search = search.replace("\n", "\r\n")
+        replace = replace.replace("\n", "\r\n")
+    
+    count = text.count(search)
+    if count == 0:
+        raise PatchError(f"{path}: search text not found: {search[:80]!r}")
+    if count > 1 and not replace_all:
+        raise PatchError(f"{path}: search text found {count} times; add context or set 'all'")
+    return text.replace(search, replace), count
+
+
+def atomic_write(path: Path, content: str) -> None:
+    """Write a file via a temp file in the same directory and os.replace."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            os.chmod(tmp, path.stat().st_mode & 0o7777)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class Changeset:
+    """Pending edits to several files, applied all-or-nothing."""
+    
+    def __init__(self, base_dir: str = "."):
+        self.base_dir = Path(base_dir).expanduser()
+        self.originals: Dict[Path, Optional[str]] = {}
+        self.contents: Dict[Path, Optional[str]] = {}
+        self.stats: Dict[Path, Dict[str, Any]] = {}
+    
+    def resolve(self, path: str) -> Path:
+        p = Path(path).expanduser()
+        return p if p.is_absolute() else self.base_dir / p
+    
+    def current(self, path: Path) -> Optional[str]:
+        """Current (possibly already edited) content, None if the file doesn't exist."""
+        if path not in self.contents:
+            if path.exists():
+                try:
+                    text = path.read_bytes().decode("utf-8")
+                except UnicodeDecodeError:
+                    raise PatchError(f"{path}: not a UTF-8 text file")
+            else:
+                text = None
+            self.originals[path] = text
+            self.contents[path] = text
+        return self.contents[path]
+    
+    def set(self, path: Path, content: Optional[str], added: int = 0, removed: int = 0) -> None:
+        self.contents[path] = content
+        stats = self.stats.setdefault(path, {"added": 0, "removed": 0})
+        stats["added"] += added
+        stats["removed"] += removed
+    
+    def add_patch(self, patch: FilePatch) -> None:
+        path = self.resolve(patch.path)
+        text = self.current(path)
+        if patch.is_new and text is not None:
+            raise PatchError(f"{patch.path}: file already exists")
+        if not patch.is_new and text is None:
+            raise PatchError(f"{patch.path}: file not found")
+        
+        doc = Document(text or "")
+        added, removed = apply_hunks(doc, patch.hunks, patch.path)
+        self.set(path, None if patch.is_delete else doc.text(), added, removed)
+    
+    def add_edit(self, edit: Dict[str, Any]) -> None:
+        if "path" not in edit:
+            raise PatchError("edit without 'path'")
+        path = self.resolve(edit["path"])
+        text = self.current(path)
+        
+        if edit.get("delete"):
+            if text is None:
+                raise PatchError(f"{edit['path']}: file not found")
+            self.set(path, None, removed=len(Document(text).lines))
+        elif "content" in edit:
+            self.set(path, edit["content"], added=len(Document(edit["content"]).lines),
+                     removed=len(Document(text).lines) if text else 0)
+        else:
+            if text is None:
+                raise PatchError(f"{edit['path']}: file not found")
+            new_text, _ = replace_text(text, edit.get("search", ""), edit.get("replace", ""),
+                                       edit["path"], edit.get("all", False))
+            self.set(path, new_text, added=edit.get("replace", "").count("\n") + 1,
+                     removed=edit.get("search", "").count("\n") + 1)
+    
+    def summary(self) -> List[Dict[str, Any]]:
+        """Per-file result of the pending changes."""
+        files = []
+        for path, content in self.contents.items():
+            if path not in self.stats:
+                continue
+            original = self.originals[path]
+            if content is None:
+                status = "deleted"
+            elif original is None:
+                status = "created"
+            elif content == original:
+                status = "unchanged"
+            else:
+                status = "modified"
+            files.append({"path": str(path), "status": status, **self.stats[path]})
+        return files
+    
+    def commit(self) -> None:
+        """Write all changes; on failure restore the files already written."""
+        done: List[Path] = []
+        try:
+            for path, content in self.contents.items():
+                if path not in self.stats or content == self.originals[path]:
+                    continue
+                if content is None:
+                    if path.exists():
+                        path.unlink()
+                else:
+                    atomic_write(path, content)
+                done.append(path)
+        except OSError:
+            for path in reversed(done):
+                original = self.originals[path]
+                try:
+                    if original is None:
+                        path.unlink()
+                    else:
+                        atomic_write(path, original)
+                except OSError:
+                    pass
+            raise
+
+
+class PatchTools:
+    """Tools for editing many files in one call."""
+    
+    @staticmethod
+    def apply_patch(patch: str, base_dir: str = ".", dry_run: bool = False) -> Dict[str, Any]:
+        """Apply a unified diff to one or more files.
+        
+        Hunks are located by their context even if line numbers drifted.
+        Nothing is written unless every hunk of every file applies.
+        
+        Args:
+            patch: Unified diff text (``git diff`` output works)
+            base_dir: Directory relative paths are resolved against
+            dry_run: Only check that the patch applies
+        
+        Returns:
+            Dict with 'success', 'applied', 'files' (path, status, added,
+            removed) and 'error'
+        """
+        changes = Changeset(base_dir)
+        try:
+            for file_patch in parse_unified_diff(patch):
+                changes.add_patch(file_patch)
+            return PatchTools._finish(changes, dry_run)
+        except (PatchError, OSError) as e:
+            return PatchTools._failure(changes, e)
+    
+    @staticmethod
+    def edit_files(edits: List[Dict[str, Any]], base_dir: str = ".",
+                   dry_run: bool = False) -> Dict[str, Any]:
+        """Apply search/replace edits across files.
+        
+        Each edit is one of:
+            {"path": ..., "search": ..., "replace": ..., "all": False}
+            {"path": ..., "content": ...}   (create or overwrite)
+            {"path": ..., "delete": True}
+        
+        The search text must match exactly once (unless "all" is set).
+        Edits to the same file are applied in order. Nothing is written
+        unless every edit applies.
+        
+        Args:
+            edits: List of edits
+            base_dir: Directory relative paths are resolved against
+            dry_run: Only check that the edits apply
+        
+        Returns:
+            Dict with 'success', 'applied', 'files' (path, status, added,
+            removed) and 'error'
+        """
+        if isinstance(edits, dict):
+            edits = [edits]
+        changes = Changeset(base_dir)
+        try:
+            for edit in edits:
+                changes.add_edit(edit)
+            return PatchTools._finish(changes, dry_run)
+        except (PatchError, OSError) as e:
+            return PatchTools._failure(changes, e)
+    
+    @staticmethod
+    def _finish(changes: Changeset, dry_run: bool) -> Dict[str, Any]:
+        if not dry_run:
+            changes.commit()
+        return {
+            "success": True,
+            "applied": not dry_run,
+            "files": changes.summary(),
+            "error": None
+        }
+    
+    @staticmethod
+    def _failure(changes: Changeset, error: Exception) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "applied": False,
+            # Nothing was written; "planned" is what would have happened
+            "files": [{**entry, "status": "not applied", "planned": entry["status"]}
+                      for entry in changes.summary()],
+            "error": str(error)
+        }
@@ -0,0 +1,273 @@
+"""Concurrent TCP port scanner.
+
+Connections are opened on an asyncio event loop by a fixed pool of
+workers, so hundreds of ports are probed in roughly the time of a single
+connect timeout while at most ``concurrency`` sockets are open at once.
+An optional per-host rate limit spaces out connection attempts, and
+results are handed out as soon as each probe finishes.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import asyncio
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from auryx_agent.tools.aio import run_sync
+
+
+COMMON_PORTS = [21, 22, 23, 25, 53, 80, 110, 143, 443, 3306, 3389, 5432, 8080, 8443]
+DEFAULT_CONCURRENCY = 256
+DEFAULT_TIMEOUT = 1.0
+MAX_PORT = 65535
+# File descriptors left for everything else when capping concurrency
+RESERVED_FDS = 64
+
+# Used when the system services database doesn't know a port
+SERVICE_FALLBACK = {
+    21: "ftp", 22: "ssh", 23: "telnet", 25: "smtp", 53: "domain", 80: "http",
+    110: "pop3", 111: "rpcbind", 135: "msrpc", 139: "netbios-ssn", 143: "imap",
+    443: "https", 445: "microsoft-ds", 465: "smtps", 587: "submission", 993: "imaps",
+    995: "pop3s", 1433: "ms-sql", 1521: "oracle", 2049: "nfs", 2375: "docker",
+    3000: "http-dev", 3306: "mysql", 3389: "rdp", 5000: "http-dev", 5432: "postgresql",
+    5672: "amqp", 5900: "vnc", 6379: "redis", 6443: "kubernetes", 8000: "http-alt",
+    8080: "http-proxy", 8443: "https-alt", 9000: "http-alt", 9090: "prometheus",
+    9200: "elasticsearch", 11211: "memcached", 27017: "mongodb",
+}
+
+PortSpec = Union[str, int, Iterable[int], None]
+
+
+@dataclass
+class PortResult:
+    """Outcome of probing one port."""
+    host: str
+    port: int
+    state: str  # "open", "closed" (refused) or "filtered" (timed out / unreachable)
+    service: str = ""
+    latency: float = 0.0
+    
+    @property
+    def is_open(self) -> bool:
+        return self.state == "open"
+
+
+def parse_ports(spec: PortSpec) -> List[int]:
+    """Parse a port specification.
+    
+    Args:
+        spec: "22,80,8000-8100", a single port, a list of ports,
+            or None for the common ports
+    
+    Returns:
+        Sorted list of unique ports
+    
+    Raises:
+        ValueError: On malformed ranges or ports outside 1-65535
+    """
+    if spec is None or spec == "":
+        return list(COMMON_PORTS)
+    if isinstance(spec, int):
+        items: List[Any] = [spec]
+    elif isinstance(spec, str):
+        items = [part.strip() for part in spec.split(",") if part.strip()]
+    else:
+        items = list(spec)
+    
+    ports = set()
+    for item in items:
+        if isinstance(item, str) and "-" in item:
+            low, _, high = item.partition("-")
+            try:
+                start, end = int(low or 1), int(high or MAX_PORT)
+            except ValueError:
+                raise ValueError(f"Invalid port range: {item}") from None
+            if start > end:
+                raise ValueError(f"Invalid port range: {item}")
+        else:
+            try:
+                start = end = int(item)
+            except (TypeError, ValueError):
+                raise ValueError(f"Invalid port: {item}") from None
+        if start < 1 or end > MAX_PORT:
+            raise ValueError(f"Port out of range (1-{MAX_PORT}): {item}")
+        ports.update(range(start, end + 1))
+    return sorted(ports)
+
+
+def service_name(port: int, protocol: str = "tcp") -> str:
+    """Name of the service usually found on a port ("" if unknown)."""
+    try:
+        return socket.getservbyport(port, protocol)
+    except (OSError, OverflowError):
+        return SERVICE_FALLBACK.get(port, "")
+
+
+def max_concurrency(requested: int) -> int:
+    """Cap concurrency so the scan can't exhaust the file descriptor limit."""
+    requested = max(1, requested)
+    try:
+        import resource
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (ImportError, OSError, ValueError):
+        return requested
+    if soft == resource.RLIM_INFINITY:
+        return requested
+    return max(1, min(requested, soft - RESERVED_FDS))
+
+
+class RateLimiter:
+    """Spaces out events to at most ``rate`` per second."""
+    
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+    
+    async def wait(self) -> None:
+        """Sleep until the next slot is free, then take it."""
+        now = time.monotonic()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class PortScanner:
+    """Asynchronous connect() scanner."""
+    
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, timeout: float = DEFAULT_TIMEOUT,
+                 rate: Optional[float] = None):
+        """Configure the scanner.
+        
+        Args:
+            concurrency: Maximum connection attempts in flight
+            timeout: Seconds to wait for each connection
+            rate: Maximum connection attempts per second to each host (None = unlimited)
+        """
+        self.concurrency = max_concurrency(concurrency)
+        self.timeout = timeout
+        self.rate = rate
+        self._limiters: Dict[str, RateLimiter] = {}
+    
+    async def _resolve(self, host: str) -> str:
+        from auryx_agent.tools.dns_resolver import get_resolver
+        
+        # IPv4 first, like the old blocking scanner
+        return (await get_resolver().resolve(host))[0]
+    
+    async def probe(self, host: str, address: str, port: int) -> PortResult:
+        """Try to connect to one port."""
+        if self.rate:
+            limiter = self._limiters.setdefault(host, RateLimiter(self.rate))
+            await limiter.wait()
+        
+        start = time.monotonic()
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(address, port), self.timeout)
+        except ConnectionRefusedError:
+            state = "closed"
+        except (asyncio.TimeoutError, OSError):
+            state = "filtered"
+        else:
+            state = "open"
+            writer.close()
+            try:
+                await asyncio.wait_for(writer.wait_closed(), self.timeout)
+            except (asyncio.TimeoutError, OSError):
+                pass
+        latency = time.monotonic() - start
+        service = service_name(port) if state == "open" else ""
+        return PortResult(host, port, state, service, round(latency, 4))
+    
+    async def stream(self, hosts: Union[str, Sequence[str]], ports: PortSpec = None) -> AsyncIterator[PortResult]:
+        """Probe every host/port pair, yielding results in completion order.
+        
+        Raises:
+            socket.gaierror: If a host can't be resolved
+        """
+        if isinstance(hosts, str):
+            hosts = [hosts]
+        port_list = parse_ports(ports)
+        addresses = {host: await self._resolve(host) for host in hosts}
+        
+        # Interleave hosts so a per-host rate limit doesn't stall the whole scan
+        targets = iter([(host, port) for port in port_list for host in hosts])
+        queue: "asyncio.Queue[Optional[PortResult]]" = asyncio.Queue()
+        
+        async def worker() -> None:
+            try:
+                for host, port in targets:
+                    await queue.put(await self.probe(host, addresses[host], port))
+            finally:
+                await queue.put(None)
+        
+        total = len(port_list) * len(hosts)
+        workers = [asyncio.ensure_future(worker()) for _ in range(min(self.concurrency, total))]
+        try:
+            remaining = len(workers)
+            while remaining:
+                result = await queue.get()
+                if result is None:
+                    remaining -= 1
+                else:
+                    yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    async def scan_async(self, hosts: Union[str, Sequence[str]], ports: PortSpec = None,
+                         on_result: Optional[Callable[[PortResult], None]] = None) -> List[PortResult]:
+        """Collect all results, calling ``on_result`` as each one arrives."""
+        results = []
+        async for result in self.stream(hosts, ports):
+            results.append(result)
+            if on_result:
+                on_result(result)
+        return results
+    
+    def scan(self, hosts: Union[str, Sequence[str]], ports: PortSpec = None,
+             on_result: Optional[Callable[[PortResult], None]] = None) -> List[PortResult]:
+        """Blocking version of ``scan_async``."""
+        return run_sync(self.scan_async(hosts, ports, on_result))
+
+
+def scan_ports(host: str, ports: PortSpec = None, concurrency: int = DEFAULT_CONCURRENCY,
+               timeout: float = DEFAULT_TIMEOUT, rate: Optional[float] = None,
+               on_result: Optional[Callable[[PortResult], None]] = None) -> Dict[str, Any]:
+    """Scan ports on one host.
+    
+    Args:
+        host: Hostname or IP
+        ports: Port specification (see ``parse_ports``)
+        concurrency: Maximum connection attempts in flight
+        timeout: Seconds to wait for each connection
+        rate: Maximum connection attempts per second (None = unlimited)
+        on_result: Called with each PortResult as it completes
+    
+    Returns:
+        Dict with 'open_ports', 'closed_ports' (everything not open),
+        'filtered_ports' (timed out), 'services', 'total_scanned' and 'duration'
+    
+    Raises:
+        ValueError: On a bad port specification
+        socket.gaierror: If the host can't be resolved
+    """
+    start = time.monotonic()
+    scanner = PortScanner(concurrency=concurrency, timeout=timeout, rate=rate)
+    results = scanner.scan(host, ports, on_result)
+    results.sort(key=lambda r: r.port)
+    
+    open_results = [r for r in results if r.is_open]
+    return {
+        "host": host,
+        "open_ports": [r.port for r in open_results],
+        "closed_ports": [r.port for r in results if not r.is_open],
+        "filtered_ports": [r.port for r in results if r.state == "filtered"],
+        "services": {r.port: r.service for r in open_results},
+        "total_scanned": len(results),
+        "duration": round(time.monotonic() - start, 3),
+    }
@@ -0,0 +1,396 @@
+"""Lazy tool registry for Auryx Agent.
+
+Tools are registered by metadata only (name, module, attribute). The
+implementing module is imported - and the owning class instantiated - the
+first time the tool is called, so building an agent no longer pays for
+psutil, subprocess helpers or plugin dependencies it never uses.
+
+Tools are discovered from three places:
+
+- the built-in tool table (``BUILTIN_TOOLS``)
+- the ``auryx_agent.tools`` entry point group of installed packages
+- ``*.py`` files in the plugins directory (~/.config/auryx-agent/plugins)
+
+A plugin file declares its tools in a module-level ``AURYX_TOOLS`` literal,
+which is read with ``ast`` so the plugin is not executed until used::
+
+    AURYX_TOOLS = {
+        "hello": {"function": "say_hello", "description": "Say hello(name)"},
+    }
+
+    def say_hello(name: str = "world"):
+        return {"success": True, "message": f"Hello, {name}!"}
+"""
+
+import ast
+import importlib
+import importlib.util
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from auryx_agent.core.paths import get_plugins_dir
+
+
+ENTRY_POINT_GROUP = "auryx_agent.tools"
+
+
+@dataclass
+class ToolSpec:
+    """Metadata describing a tool without importing it.
+
+    Attributes:
+        name: Tool name used by the model
+        module: Dotted module name (or plugin file path when ``path`` is set)
+        attribute: Function name, or "Class.method" for methods of a tool class
+        description: Short description shown in the system prompt
+        source: Where the tool came from ("builtin", "entry_point", "plugin", "callable")
+        read_only: True if the tool never modifies the system
+        path: Plugin file path for tools loaded from the plugins directory
+        target: Already-imported callable (source "callable")
+        entry_point: Entry point object (source "entry_point")
+    """
+    name: str
+    module: str
+    attribute: str
+    description: str = ""
+    source: str = "builtin"
+    read_only: bool = False
+    path: Optional[str] = None
+    target: Optional[Callable[..., Any]] = field(default=None, repr=False, compare=False)
+    entry_point: Optional[Any] = field(default=None, repr=False, compare=False)
+
+
+def _builtin(name: str, module: str, attribute: str, read_only: bool = False) -> ToolSpec:
+    return ToolSpec(name=name, module=f"auryx_agent.tools.{module}",
+                    attribute=attribute, read_only=read_only)
+
+
+BUILTIN_TOOLS: List[ToolSpec] = [
+    # Basic computer tools
+    _builtin("execute_command", "computer_tools", "ComputerTools.execute_command"),
+    _builtin("run_in_session", "computer_tools", "ComputerTools.run_in_session"),
+    _builtin("read_file", "computer_tools", "ComputerTools.read_file", read_only=True),
+    _builtin("write_file", "computer_tools", "ComputerTools.write_file"),
+    _builtin("list_directory", "computer_tools", "ComputerTools.list_directory", read_only=True),
+    _builtin("get_system_info", "computer_tools", "ComputerTools.get_system_info", read_only=True),
+    _builtin("apply_patch", "patch_tools", "PatchTools.apply_patch"),
+    _builtin("edit_files", "patch_tools", "PatchTools.edit_files"),
+    _builtin("watch_directory", "file_watcher", "WatchTools.watch_directory"),
+    _builtin("recent_changes", "file_watcher", "WatchTools.recent_changes", read_only=True),
+    
+    # Network tools
+    _builtin("ping", "network_tools", "NetworkTools.ping", read_only=True),
+    _builtin("dns_lookup", "network_tools", "NetworkTools.dns_lookup", read_only=True),
+    _builtin("scan_ports", "network_tools", "NetworkTools.scan_ports", read_only=True),
+    _builtin("network_sweep", "network_tools", "NetworkTools.network_sweep", read_only=True),
+    _builtin("network_monitor", "network_tools", "NetworkTools.network_monitor"),
+    _builtin("traceroute", "network_tools", "NetworkTools.traceroute", read_only=True),
+    
+    # Code tools
+    _builtin("generate_code", "code_tools", "CodeTools.generate_code"),
+    _builtin("review_code", "code_tools", "CodeTools.review_code", read_only=True),
+    _builtin("refactor_code", "code_tools", "CodeTools.refactor_code"),
+    _builtin("find_bugs", "code_tools", "CodeTools.find_bugs", read_only=True),
+    _builtin("generate_docs", "code_tools", "CodeTools.generate_docs", read_only=True),
+    _builtin("git_status", "code_tools", "CodeTools.git_status", read_only=True),
+    _builtin("git_diff", "code_tools", "CodeTools.git_diff", read_only=True),
+    _builtin("create_template", "code_tools", "CodeTools.create_template"),
+    
+    # Web tools
+    _builtin("web_search", "web_tools", "WebTools.web_search", read_only=True),
+    _builtin("fetch_url", "web_tools", "WebTools.fetch_url", read_only=True),
+    _builtin("fetch_many", "web_tools", "WebTools.fetch_many", read_only=True),
+    _builtin("download_file", "web_tools", "WebTools.download_file"),
+    _builtin("check_website", "web_tools", "WebTools.check_website", read_only=True),
+    _builtin("get_weather", "web_tools", "WebTools.get_weather", read_only=True),
+    _builtin("extract_links", "web_tools", "WebTools.extract_links", read_only=True),
+    _builtin("crawl_site", "web_tools", "WebTools.crawl_site"),
+    _builtin("search_crawl_index", "web_tools", "WebTools.search_crawl_index", read_only=True),
+    
+    # Advanced computer tools
+    _builtin("list_processes", "advanced_computer_tools", "AdvancedComputerTools.list_processes", read_only=True),
+    _builtin("kill_process", "advanced_computer_tools", "AdvancedComputerTools.kill_process"),
+    _builtin("get_disk_usage", "advanced_computer_tools", "AdvancedComputerTools.get_disk_usage", read_only=True),
+    _builtin("get_memory_info", "advanced_computer_tools", "AdvancedComputerTools.get_memory_info", read_only=True),
+    _builtin("get_cpu_info", "advanced_computer_tools", "AdvancedComputerTools.get_cpu_info", read_only=True),
+    _builtin("get_network_connections", "advanced_computer_tools", "AdvancedComputerTools.get_network_connections", read_only=True),
+    _builtin("find_files", "advanced_computer_tools", "AdvancedComputerTools.find_files", read_only=True),
+    _builtin("compress_files", "advanced_computer_tools", "AdvancedComputerTools.compress_files"),
+    _builtin("extract_archive", "advanced_computer_tools", "AdvancedComputerTools.extract_archive"),
+    _builtin("monitor_system", "advanced_computer_tools", "AdvancedComputerTools.monitor_system", read_only=True),
+]
+
+
+class ToolRegistry:
+    """Registry mapping tool names to lazily imported callables.
+
+    Behaves like a read-only mapping of name -> callable, so existing code
+    using ``name in tools`` and ``tools[name](**args)`` keeps working.
+    """
+    
+    def __init__(self, specs: Optional[List[ToolSpec]] = None):
+        """Initialize registry.
+
+        Args:
+            specs: Initial tool specs (default: built-in tools)
+        """
+        self._specs: Dict[str, ToolSpec] = {}
+        self._resolved: Dict[str, Callable[..., Any]] = {}
+        self._instances: Dict[tuple, Any] = {}
+        self._lock = threading.RLock()
+        
+        for spec in BUILTIN_TOOLS if specs is None else specs:
+            self.register(spec)
+    
+    def register(self, spec: ToolSpec, replace: bool = True) -> bool:
+        """Register a tool by metadata.
+
+        Args:
+            spec: Tool spec
+            replace: Replace an existing tool with the same name
+
+        Returns:
+            True if the tool was registered
+        """
+        with self._lock:
+            if spec.name in self._specs and not replace:
+                return False
+            self._specs[spec.name] = spec
+            self._resolved.pop(spec.name, None)
+            return True
+    
+    def register_callable(self, name: str, func: Callable[..., Any],
+                          description: str = "", read_only: bool = False) -> None:
+        """Register an already-imported callable (e.g. agent-bound methods).
+
+        Args:
+            name: Tool name
+            func: Callable implementing the tool
+            description: Short description
+            read_only: True if the tool never modifies the system
+        """
+        spec = ToolSpec(name=name, module=getattr(func, "__module__", "") or "",
+                        attribute=getattr(func, "__qualname__", name),
+                        description=description, source="callable",
+                        read_only=read_only, target=func)
+        self.register(spec)
+    
+    def update(self, tools: Dict[str, Callable[..., Any]]) -> None:
+        """Register several callables at once (dict-style)."""
+        for name, func in tools.items():
+            self.register_callable(name, func)
+    
+    def spec(self, name: str) -> Optional[ToolSpec]:
+        """Get the spec of a tool without importing it."""
+        return self._specs.get(name)
+    
+    def specs(self, source: Optional[str] = None) -> List[ToolSpec]:
+        """List registered tool specs, optionally filtered by source."""
+        return [s for s in self._specs.values() if source is None or s.source == source]
+    
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a tool's implementation has been imported."""
+        return name in self._resolved
+    
+    def get(self, name: str) -> Optional[Callable[..., Any]]:
+        """Resolve a tool to its callable, importing it on first use.
+
+        Args:
+            name: Tool name
+
+        Returns:
+            Callable or None if the tool is unknown
+        """
+        func = self._resolved.get(name)
+        if func is not None:
+            return func
+        
+        with self._lock:
+            func = self._resolved.get(name)
+            if func is not None:
+                return func
+            
+            spec = self._specs.get(name)
+            if spec is None:
+                return None
+            
+            func = self._load(spec)
+            self._resolved[name] = func
+            return func
+    
+    def _load(self, spec: ToolSpec) -> Callable[..., Any]:
+        """Import the module behind a spec and return the tool callable."""
+        if spec.target is not None:
+            return spec.target
+        
+        if spec.entry_point is not None:
+            return spec.entry_point.load()
+        
+        if spec.path:
+            module = _import_plugin_file(Path(spec.path))
+        else:
+            module = importlib.import_module(spec.module)
+        
+        owner_name, _, method = spec.attribute.rpartition(".")
+        if not owner_name:
+            return getattr(module, method)
+        
+        # Methods share one instance per class, like the agent used to hold
+        key = (module.__name__, owner_name)
+        instance = self._instances.get(key)
+        if instance is None:
+            instance = getattr(module, owner_name)()
+            self._instances[key] = instance
+        return getattr(instance, method)
+    
+    def load_plugins(self, plugins_dir: Optional[Path] = None) -> List[str]:
+        """Discover tools declared by plugin files.
+
+        Args:
+            plugins_dir: Directory to scan (default: config plugins dir)
+
+        Returns:
+            Names of registered plugin tools
+        """
+        directory = Path(plugins_dir) if plugins_dir else get_plugins_dir()
+        if not directory.is_dir():
+            return []
+        
+        names = []
+        for path in sorted(directory.glob("*.py")):
+            if path.name.startswith("_"):
+                continue
+            for spec in read_plugin_manifest(path):
+                if self.register(spec, replace=False):
+                    names.append(spec.name)
+        return names
+    
+    def load_entry_points(self) -> List[str]:
+        """Discover tools exposed via the ``auryx_agent.tools`` entry point group.
+
+        Entry point names become tool names; values point at the callable
+        (``package.module:function``). Nothing is imported until first call.
+
+        Returns:
+            Names of registered entry point tools
+        """
+        names = []
+        for entry in _iter_entry_points(ENTRY_POINT_GROUP):
+            module, _, attribute = entry.value.partition(":")
+            spec = ToolSpec(name=entry.name, module=module.strip(),
+                            attribute=attribute.strip(), source="entry_point",
+                            entry_point=entry)
+            if self.register(spec, replace=False):
+                names.append(spec.name)
+        return names
+    
+    def describe(self, source: Optional[str] = None) -> str:
+        """Format tool descriptions for the system prompt."""
+        lines = []
+        for spec in self.specs(source):
+            description = f": {spec.description}" if spec.description else ""
+            lines.append(f"- {spec.name}{description}")
+        return "\n".join(lines)
+    
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+    
+    def __getitem__(self, name: str) -> Callable[..., Any]:
+        func = self.get(name)
+        if func is None:
+            raise KeyError(name)
+        return func
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._specs))
+    
+    def __len__(self) -> int:
+        return len(self._specs)
+    
+    def keys(self) -> List[str]:
+        """List registered tool names."""
+        return list(self._specs)
+
+
+def read_plugin_manifest(path: Path) -> List[ToolSpec]:
+    """Read the ``AURYX_TOOLS`` declaration of a plugin without executing it.
+
+    Args:
+        path: Plugin file path
+
+    Returns:
+        Tool specs declared by the plugin (empty if none or invalid)
+    """
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return []
+    
+    manifest = None
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+                isinstance(t, ast.Name) and t.id == "AURYX_TOOLS" for t in node.targets):
+            try:
+                manifest = ast.literal_eval(node.value)
+            except ValueError:
+                return []
+    
+    if not isinstance(manifest, dict):
+        return []
+    
+    specs = []
+    for name, meta in manifest.items():
+        if isinstance(meta, str):
+            meta = {"function": meta}
+        if not isinstance(meta, dict) or "function" not in meta:
+            continue
+        specs.append(ToolSpec(
+            name=str(name),
+            module=f"auryx_plugin_{path.stem}",
+            attribute=str(meta["function"]),
+            description=str(meta.get("description", "")),
+            source="plugin",
+            read_only=bool(meta.get("read_only", False)),
+            path=str(path),
+        ))
+    return specs
+
+
+def _import_plugin_file(path: Path):
+    """Import a plugin file as a module (cached in sys.modules)."""
+    module_name = f"auryx_plugin_{path.stem}"
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load plugin: {path}")
+    
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    try:
+        spec.loader.exec_module(module)
+    except Exception:
+        sys.modules.pop(module_name, None)
+        raise
+    return module
+
+
+def _iter_entry_points(group: str):
+    """Iterate entry points of a group across Python versions."""
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return []
+    
+    try:
+        eps = entry_points()
+        if hasattr(eps, "select"):
+            return list(eps.select(group=group))
+        return list(eps.get(group, []))
+    except Exception:
+        return []
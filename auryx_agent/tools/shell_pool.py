@@ -0,0 +1,424 @@
+"""Pool of persistent shell sessions.
+
+Every ``execute_command`` spawns a fresh shell and forgets ``cd`` and
+``export``. A shell session keeps one long-lived ``bash``/``sh`` process per
+session id and frames each command with a random sentinel, so multi-step
+workflows run as a warm session with preserved cwd and environment.
+
+Framing: each command is sent as::
+
+    { <command>
+    } < /dev/null
+    printf '\\n<token> %d %s\\n' "$?" "$PWD"; printf '\\n<token>\\n' >&2
+
+and output is read until the token shows up on both streams.
+
+POSIX only; on Windows use ``ComputerTools.execute_command``.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import atexit
+import codecs
+import os
+import shutil
+import signal
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+from auryx_agent.tools.streaming import OutputBuffer
+
+
+@dataclass
+class ResourceLimits:
+    """Resource limits applied to a shell session and every command it runs.
+    
+    The limits are per process, so every program a command starts gets the
+    full allowance. The exception is the session's shell itself: commands
+    run in it, so its CPU time (builtins, shell loops) adds up over the
+    session, and a shell that runs out is killed and the session reset.
+    
+    Attributes:
+        max_memory_mb: Address space limit per process (None for unlimited)
+        max_cpu_seconds: CPU time limit per process (None for unlimited)
+        max_file_size_mb: Largest file a command may write (None for unlimited)
+        max_open_files: Open file descriptor limit (None for unlimited)
+    """
+    max_memory_mb: Optional[int] = None
+    max_cpu_seconds: Optional[int] = None
+    max_file_size_mb: Optional[int] = None
+    max_open_files: Optional[int] = None
+    
+    def apply(self) -> None:
+        """Apply the limits to the current process (used as preexec_fn)."""
+        import resource
+        
+        def set_limit(kind, value):
+            soft, hard = resource.getrlimit(kind)
+            if hard != resource.RLIM_INFINITY:
+                value = min(value, hard)
+            resource.setrlimit(kind, (value, hard))
+        
+        if self.max_memory_mb:
+            set_limit(resource.RLIMIT_AS, self.max_memory_mb * 1024 * 1024)
+        if self.max_cpu_seconds:
+            set_limit(resource.RLIMIT_CPU, self.max_cpu_seconds)
+        if self.max_file_size_mb:
+            set_limit(resource.RLIMIT_FSIZE, self.max_file_size_mb * 1024 * 1024)
+        if self.max_open_files:
+            set_limit(resource.RLIMIT_NOFILE, self.max_open_files)
+    
+    @classmethod
+    def from_config(cls, config) -> "ResourceLimits":
+        """Limits from the [shell] config section (0 means unlimited)."""
+        return cls(max_memory_mb=config.shell_max_memory_mb or None,
+                   max_cpu_seconds=config.shell_max_cpu_seconds or None,
+                   max_file_size_mb=config.shell_max_file_size_mb or None,
+                   max_open_files=config.shell_max_open_files or None)
+    
+    @property
+    def enabled(self) -> bool:
+        """True if any limit is set."""
+        return any((self.max_memory_mb, self.max_cpu_seconds,
+                    self.max_file_size_mb, self.max_open_files))
+
+
+class _StreamState:
+    """Output of one stream for the command currently running."""
+    
+    def __init__(self, max_output: int):
+        self.buffer = OutputBuffer(max_output // 2, max_output // 2)
+        self.pending = ""
+        self.done = threading.Event()
+        self.trailer = ""
+
+
+class ShellSession:
+    """A long-lived shell process that runs commands one at a time."""
+    
+    def __init__(self, session_id: str = "default", cwd: Optional[str] = None,
+                 env: Optional[Dict[str, str]] = None, limits: Optional[ResourceLimits] = None,
+                 shell: Optional[str] = None):
+        """Initialize session (the shell is spawned on first command).
+        
+        Args:
+            session_id: Session name
+            cwd: Initial working directory
+            env: Initial environment (None to inherit)
+            limits: Resource limits for the shell and its commands
+            shell: Shell binary (default: bash, falling back to sh)
+        """
+        if sys.platform == "win32":
+            raise OSError("Shell sessions are not supported on Windows")
+        
+        self.session_id = session_id
+        self.cwd = cwd or os.getcwd()
+        self.env = env
+        self.limits = limits or ResourceLimits()
+        self.shell = shell or shutil.which("bash") or "/bin/sh"
+        self.process: Optional[subprocess.Popen] = None
+        self.commands_run = 0
+        self.last_used = time.monotonic()
+        self._lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._token = ""
+        self._states: Dict[str, _StreamState] = {}
+        self._on_output: Optional[Callable[[str, str], None]] = None
+    
+    @property
+    def alive(self) -> bool:
+        """True if the shell process is running."""
+        return self.process is not None and self.process.poll() is None
+    
+    def _spawn(self) -> None:
+        args = [self.shell]
+        if os.path.basename(self.shell) == "bash":
+            args += ["--noprofile", "--norc"]
+        
+        self.process = subprocess.Popen(
+            args,
+            cwd=self.cwd,
+            env=self.env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
+            preexec_fn=self.limits.apply if self.limits.enabled else None,
+        )
+        for name, pipe in (("stdout", self.process.stdout), ("stderr", self.process.stderr)):
+            threading.Thread(target=self._read, args=(name, pipe, self.process), daemon=True).start()
+    
+    def _read(self, name: str, pipe, process: subprocess.Popen) -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        fd = pipe.fileno()
+        try:
+            while True:
+                chunk = os.read(fd, 65536)
+                if not chunk or self.process is not process:
+                    break
+                self._feed(name, decoder.decode(chunk))
+        except (OSError, ValueError):
+            pass
+        finally:
+            pipe.close()
+            # Shell died: release anyone waiting for a sentinel
+            with self._state_lock:
+                state = self._states.get(name)
+                if state is not None and self.process is process:
+                    state.done.set()
+    
+    def _feed(self, name: str, text: str) -> None:
+        with self._state_lock:
+            state = self._states.get(name)
+            token = self._token
+        if state is None or state.done.is_set() or not text:
+            return
+        
+        state.pending += text
+        marker = "\n" + token
+        index = state.pending.find(marker)
+        if index >= 0:
+            output = state.pending[:index]
+            line_end = state.pending.find("\n", index + len(marker))
+            if line_end < 0:
+                # Wait for the rest of the sentinel line
+                return
+            state.trailer = state.pending[index + len(marker):line_end].strip()
+            state.pending = ""
+            self._emit(name, state, output)
+            state.done.set()
+            return
+        
+        # Keep enough text back to detect a token split across reads
+        keep = len(marker) + 1
+        if len(state.pending) > keep:
+            output, state.pending = state.pending[:-keep], state.pending[-keep:]
+            self._emit(name, state, output)
+    
+    def _emit(self, name: str, state: _StreamState, text: str) -> None:
+        if text:
+            state.buffer.write(text)
+            if self._on_output:
+                self._on_output(name, text)
+    
+    def run(self, command: str, timeout: Optional[float] = 30,
+            on_output: Optional[Callable[[str, str], None]] = None,
+            max_output: int = 65536) -> Dict[str, Any]:
+        """Run a command in the session.
+        
+        On timeout or Ctrl+C the whole session is killed and a fresh shell is
+        started in the last known cwd for the next command (exported
+        variables are lost).
+        
+        Args:
+            command: Shell command
+            timeout: Timeout in seconds (None for no timeout)
+            on_output: Called with (stream_name, text) as output arrives
+            max_output: Characters of output kept per stream
+        
+        Returns:
+            Dict with 'stdout', 'stderr', 'returncode', 'success', 'cwd',
+            'timed_out', 'session_reset', 'truncated', 'duration'
+        """
+        with self._lock:
+            if not self.alive:
+                self._spawn()
+            
+            token = f"__AURYX_{uuid.uuid4().hex}__"
+            states = {"stdout": _StreamState(max_output), "stderr": _StreamState(max_output)}
+            with self._state_lock:
+                self._token = token
+                self._states = states
+            self._on_output = on_output
+            
+            script = (
+                f"{{ {command}\n}} < /dev/null\n"
+                f"printf '\\n{token} %d %s\\n' \"$?\" \"$PWD\"; printf '\\n{token}\\n' >&2\n"
+            )
+            
+            started = time.monotonic()
+            timed_out = False
+            try:
+                self.process.stdin.write(script.encode("utf-8"))
+                self.process.stdin.flush()
+                
+                deadline = started + timeout if timeout else None
+                for state in states.values():
+                    remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+                    if not state.done.wait(remaining):
+                        timed_out = True
+                        break
+            except KeyboardInterrupt:
+                self.close()
+                raise
+            except (BrokenPipeError, OSError) as e:
+                self.close()
+                return {"stdout": "", "stderr": f"Shell session failed: {e}", "returncode": -1,
+                        "success": False, "cwd": self.cwd, "timed_out": False,
+                        "session_reset": True, "truncated": False, "duration": 0.0}
+            
+            duration = round(time.monotonic() - started, 3)
+            self.commands_run += 1
+            self.last_used = time.monotonic()
+            
+            stdout_trailer = states["stdout"].trailer
+            session_reset = timed_out or not states["stdout"].trailer
+            if session_reset:
+                self.close()
+            
+            returncode = -1
+            if not timed_out and stdout_trailer:
+                code, _, cwd = stdout_trailer.partition(" ")
+                try:
+                    returncode = int(code)
+                except ValueError:
+                    pass
+                if cwd:
+                    self.cwd = cwd
+            
+            stderr = states["stderr"].buffer.text()
+            if timed_out:
+                stderr += f"\nCommand timed out after {timeout} seconds (session was reset)"
+            elif session_reset:
+                stderr += "\nShell exited (session was reset)"
+            
+            return {
+                "stdout": states["stdout"].buffer.text(),
+                "stderr": stderr.lstrip("\n"),
+                "returncode": returncode,
+                "success": returncode == 0,
+                "cwd": self.cwd,
+                "timed_out": timed_out,
+                "session_reset": session_reset,
+                "truncated": states["stdout"].buffer.truncated or states["stderr"].buffer.truncated,
+                "duration": duration,
+            }
+    
+    def close(self) -> None:
+        """Kill the shell and every process it started."""
+        process, self.process = self.process, None
+        if process is None:
+            return
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (OSError, ProcessLookupError):
+            pass
+        try:
+            process.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            pass
+        with self._state_lock:
+            for state in self._states.values():
+                state.done.set()
+
+
+class ShellPool:
+    """Named shell sessions with LRU eviction and idle expiry."""
+    
+    def __init__(self, max_sessions: int = 8, idle_timeout: float = 1800,
+                 limits: Optional[ResourceLimits] = None):
+        """Initialize pool.
+        
+        Args:
+            max_sessions: Maximum live sessions; the least recently used is closed
+            idle_timeout: Seconds after which an unused session is closed
+            limits: Resource limits for new sessions
+        """
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.limits = limits or ResourceLimits()
+        self._sessions: Dict[str, ShellSession] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, session_id: str = "default", cwd: Optional[str] = None) -> ShellSession:
+        """Get (or create) a session by id."""
+        with self._lock:
+            self._expire()
+            session = self._sessions.get(session_id)
+            if session is None:
+                if len(self._sessions) >= self.max_sessions:
+                    oldest = min(self._sessions.values(), key=lambda s: s.last_used)
+                    oldest.close()
+                    del self._sessions[oldest.session_id]
+                session = ShellSession(session_id, cwd=cwd, limits=self.limits)
+                self._sessions[session_id] = session
+            return session
+    
+    def _expire(self) -> None:
+        now = time.monotonic()
+        for session_id, session in list(self._sessions.items()):
+            if now - session.last_used > self.idle_timeout:
+                session.close()
+                del self._sessions[session_id]
+    
+    def run(self, command: str, session: str = "default", timeout: Optional[float] = 30,
+            on_output: Optional[Callable[[str, str], None]] = None,
+            max_output: int = 65536) -> Dict[str, Any]:
+        """Run a command in a named session (see ``ShellSession.run``)."""
+        result = self.get(session).run(command, timeout=timeout, on_output=on_output,
+                                       max_output=max_output)
+        result["session"] = session
+        return result
+    
+    def sessions(self) -> Dict[str, Dict[str, Any]]:
+        """Describe live sessions."""
+        with self._lock:
+            return {
+                sid: {"cwd": s.cwd, "alive": s.alive, "commands_run": s.commands_run}
+                for sid, s in self._sessions.items()
+            }
+    
+    def close(self, session_id: str) -> bool:
+        """Close a session; returns False if it did not exist."""
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        session.close()
+        return True
+    
+    def close_all(self) -> None:
+        """Close every session."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+_default_limits: Optional[ResourceLimits] = None
+_default_limits_lock = threading.Lock()
+_default_pool: Optional[ShellPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_resource_limits() -> ResourceLimits:
+    """Limits for commands the agent runs, from the [shell] config section."""
+    global _default_limits
+    with _default_limits_lock:
+        if _default_limits is None:
+            from auryx_agent.core.config import Config, load_config
+            from auryx_agent.core.paths import get_config_file
+            
+            try:
+                config = load_config() if get_config_file().exists() else Config()
+            except Exception:
+                config = Config()
+            _default_limits = ResourceLimits.from_config(config)
+        return _default_limits
+
+
+def get_shell_pool() -> ShellPool:
+    """Get the process-wide shell pool (with the configured resource limits)."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = ShellPool(limits=get_resource_limits())
+            atexit.register(_default_pool.close_all)
+        return _default_pool
@@ -0,0 +1,292 @@
+"""Streaming command execution with bounded output buffers.
+
+Output is read incrementally from stdout/stderr, forwarded to an optional
+callback as it arrives, and kept in bounded head + tail buffers, so huge
+build logs do not blow memory and a timed out command still returns the
+beginning and the end of what it printed.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import codecs
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+
+OutputCallback = Callable[[str, str], None]
+
+
+class OutputBuffer:
+    """Keeps the first ``head_size`` and last ``tail_size`` characters of a stream."""
+    
+    def __init__(self, head_size: int = 32768, tail_size: int = 32768):
+        """Initialize buffer.
+        
+        Args:
+            head_size: Characters kept from the beginning
+            tail_size: Characters kept from the end
+        """
+        self.head_size = head_size
+        self.tail_size = tail_size
+        self._head = []
+        self._head_len = 0
+        self._tail = deque()
+        self._tail_len = 0
+        self.total = 0
+        self.lines = 0
+        self._lock = threading.Lock()
+    
+    def write(self, text: str) -> None:
+        """Append text to the buffer."""
+        with self._lock:
+            self.total += len(text)
+            self.lines += text.count("\n")
+            
+            if self._head_len < self.head_size:
+                room = self.head_size - self._head_len
+                self._head.append(text[:room])
+                self._head_len += min(room, len(text))
+                text = text[room:]
+            
+            if text:
+                self._tail.append(text)
+                self._tail_len += len(text)
+                while self._tail and self._tail_len - len(self._tail[0]) >= self.tail_size:
+                    self._tail_len -= len(self._tail.popleft())
+    
+    @property
+    def truncated(self) -> bool:
+        """True if some output was dropped."""
+        return self.total > self.head_size + self.tail_size
+    
+    def text(self) -> str:
+        """Return the kept output, with a marker where output was dropped."""
+        with self._lock:
+            head = "".join(self._head)
+            tail = "".join(self._tail)
+        
+        if len(tail) > self.tail_size:
+            tail = tail[len(tail) - self.tail_size:]
+        
+        omitted = self.total - len(head) - len(tail)
+        if omitted > 0:
+            return f"{head}\n...[{omitted} chars omitted]...\n{tail}"
+        return head + tail
+
+
+class StreamingCommand:
+    """A shell command whose output is read while it runs."""
+    
+    def __init__(self, command: str, cwd: Optional[str] = None, timeout: Optional[float] = 30,
+                 on_output: Optional[OutputCallback] = None, max_output: int = 65536,
+                 env: Optional[Dict[str, str]] = None,
+                 preexec_fn: Optional[Callable[[], None]] = None):
+        """Initialize command.
+        
+        Args:
+            command: Shell command to execute
+            cwd: Working directory (None for current)
+            timeout: Timeout in seconds (None for no timeout)
+            on_output: Called with (stream_name, text) for every chunk read
+            max_output: Characters kept per stream (half head, half tail)
+            env: Environment for the command (None to inherit)
+            preexec_fn: Run in the child before the shell starts, e.g. to set limits (POSIX)
+        """
+        self.command = command
+        self.cwd = cwd
+        self.timeout = timeout
+        self.on_output = on_output
+        self.env = env
+        self.preexec_fn = preexec_fn
+        self.stdout = OutputBuffer(max_output // 2, max_output // 2)
+        self.stderr = OutputBuffer(max_output // 2, max_output // 2)
+        self.process: Optional[subprocess.Popen] = None
+        self.started_at = 0.0
+        self.finished_at = 0.0
+        self.timed_out = False
+        self.cancelled = False
+        self._readers = []
+        self._cancel = threading.Event()
+    
+    def start(self) -> "StreamingCommand":
+        """Start the command and its reader threads."""
+        kwargs: Dict[str, Any] = {}
+        if sys.platform == "win32":
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            # Own process group, so the whole pipeline can be killed on timeout
+            kwargs["start_new_session"] = True
+            kwargs["preexec_fn"] = self.preexec_fn
+        
+        self.started_at = time.monotonic()
+        self.process = subprocess.Popen(
+            self.command,
+            shell=True,
+            cwd=self.cwd,
+            env=self.env,
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            **kwargs
+        )
+        
+        for name, pipe, buffer in (("stdout", self.process.stdout, self.stdout),
+                                   ("stderr", self.process.stderr, self.stderr)):
+            reader = threading.Thread(target=self._read, args=(name, pipe, buffer), daemon=True)
+            reader.start()
+            self._readers.append(reader)
+        return self
+    
+    def _read(self, name: str, pipe, buffer: OutputBuffer) -> None:
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        fd = pipe.fileno()
+        try:
+            while True:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                text = decoder.decode(chunk)
+                if text:
+                    buffer.write(text)
+                    if self.on_output:
+                        self.on_output(name, text)
+            text = decoder.decode(b"", final=True)
+            if text:
+                buffer.write(text)
+        except (OSError, ValueError):
+            pass
+        finally:
+            pipe.close()
+    
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the command started."""
+        end = self.finished_at or time.monotonic()
+        return end - self.started_at if self.started_at else 0.0
+    
+    @property
+    def running(self) -> bool:
+        """True while the process has not exited."""
+        return self.process is not None and self.process.poll() is None
+    
+    def progress(self) -> Dict[str, Any]:
+        """Snapshot of the command's progress."""
+        return {
+            "running": self.running,
+            "elapsed": round(self.elapsed, 2),
+            "stdout_chars": self.stdout.total,
+            "stderr_chars": self.stderr.total,
+            "lines": self.stdout.lines + self.stderr.lines,
+        }
+    
+    def cancel(self) -> None:
+        """Request cancellation; the process group is killed by ``wait``."""
+        self._cancel.set()
+    
+    def _kill(self) -> None:
+        if self.process is None or self.process.poll() is not None:
+            return
+        try:
+            if sys.platform == "win32":
+                self.process.kill()
+            else:
+                os.killpg(self.process.pid, signal.SIGKILL)
+        except (OSError, ProcessLookupError):
+            pass
+    
+    def wait(self, poll_interval: float = 0.05) -> Dict[str, Any]:
+        """Wait for the command to finish, time out or be cancelled.
+        
+        Returns:
+            Dict with 'stdout', 'stderr', 'returncode', 'success' plus
+            'timed_out', 'cancelled', 'truncated' and 'duration'
+        """
+        if self.process is None:
+            self.start()
+        
+        deadline = self.started_at + self.timeout if self.timeout else None
+        try:
+            while self.process.poll() is None:
+                if self._cancel.is_set():
+                    self.cancelled = True
+                    self._kill()
+                    break
+                if deadline is not None and time.monotonic() >= deadline:
+                    self.timed_out = True
+                    self._kill()
+                    break
+                try:
+                    self.process.wait(timeout=poll_interval)
+                except subprocess.TimeoutExpired:
+                    pass
+        except KeyboardInterrupt:
+            self.cancelled = True
+            self._kill()
+            raise
+        finally:
+            self.process.wait()
+            self.finished_at = time.monotonic()
+            for reader in self._readers:
+                reader.join(timeout=1)
+        
+        return self.result()
+    
+    def result(self) -> Dict[str, Any]:
+        """Build the result dict from the collected output."""
+        stderr = self.stderr.text()
+        if self.timed_out:
+            stderr += f"\nCommand timed out after {self.timeout} seconds"
+        elif self.cancelled:
+            stderr += "\nCommand cancelled"
+        
+        returncode = -1 if (self.timed_out or self.cancelled) else self.process.returncode
+        return {
+            "stdout": self.stdout.text(),
+            "stderr": stderr.lstrip("\n"),
+            "returncode": returncode,
+            "success": returncode == 0,
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled,
+            "truncated": self.stdout.truncated or self.stderr.truncated,
+            "duration": round(self.elapsed, 3),
+        }
+
+
+def run_streaming(command: str, cwd: Optional[str] = None, timeout: Optional[float] = 30,
+                  on_output: Optional[OutputCallback] = None, max_output: int = 65536,
+                  cancel_event: Optional[threading.Event] = None,
+                  preexec_fn: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+    """Run a shell command, streaming its output.
+    
+    Args:
+        command: Shell command to execute
+        cwd: Working directory (None for current)
+        timeout: Timeout in seconds
+        on_output: Called with (stream_name, text) for every chunk read
+        max_output: Characters kept per stream
+        cancel_event: Set from another thread to cancel the command
+        preexec_fn: Run in the child before the shell starts (POSIX)
+    
+    Returns:
+        Result dict (see ``StreamingCommand.wait``)
+    """
+    cmd = StreamingCommand(command, cwd=cwd, timeout=timeout,
+                           on_output=on_output, max_output=max_output, preexec_fn=preexec_fn)
+    cmd.start()
+    
+    if cancel_event is not None:
+        def watch():
+            while cmd.running:
+                if cancel_event.wait(0.1):
+                    cmd.cancel()
+                    return
+        threading.Thread(target=watch, daemon=True).start()
+    
+    return cmd.wait()
@@ -0,0 +1,320 @@
+"""Multi-host network sweep.
+
+Expands CIDR blocks and host lists and checks every host concurrently:
+liveness through unprivileged ICMP echo or a bounded pool of ``ping``
+processes (falling back to TCP connects when ping is unavailable or
+blocked), forward and reverse DNS through the shared caching resolver,
+and optional TCP port probes through the port scanner. Results are
+handed out per host as soon as each host finishes.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import asyncio
+import ipaddress
+import socket
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Union
+
+from auryx_agent.tools.aio import run_sync
+from auryx_agent.tools.dns_resolver import get_resolver
+from auryx_agent.tools.icmp import ping_async
+from auryx_agent.tools.port_scanner import PortScanner, PortSpec, parse_ports
+
+
+MAX_HOSTS = 4096
+DEFAULT_CONCURRENCY = 64
+DEFAULT_TIMEOUT = 1.0
+PING_WORKERS = 32
+# Probed when ping gives no answer; a refused connection also proves the host is up
+LIVENESS_PORTS = [80, 443, 22, 445]
+
+TargetSpec = Union[str, Iterable[str]]
+
+
+@dataclass
+class HostResult:
+    """Everything learned about one host."""
+    host: str
+    address: str = ""
+    hostname: str = ""
+    alive: bool = False
+    method: str = ""  # "ping", "tcp" or "" when the host didn't answer
+    latency: Optional[float] = None
+    open_ports: List[int] = field(default_factory=list)
+    services: Dict[int, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict:
+        return {
+            "host": self.host,
+            "address": self.address,
+            "hostname": self.hostname,
+            "alive": self.alive,
+            "method": self.method,
+            "latency_ms": round(self.latency * 1000, 2) if self.latency is not None else None,
+            "open_ports": self.open_ports,
+            "services": self.services,
+            "error": self.error,
+        }
+
+
+def expand_targets(spec: TargetSpec, max_hosts: int = MAX_HOSTS) -> List[str]:
+    """Expand targets into a list of hosts.
+    
+    Args:
+        spec: "10.0.0.0/24", "a.example.com, 10.0.0.5" or a list of such items
+        max_hosts: Refuse to expand to more hosts than this
+    
+    Returns:
+        Hosts in the given order, without duplicates
+    
+    Raises:
+        ValueError: On an empty spec, a malformed network or too many hosts
+    """
+    items = spec.replace(",", " ").split() if isinstance(spec, str) else list(spec)
+    hosts: Dict[str, None] = {}
+    for item in items:
+        item = item.strip()
+        if not item:
+            continue
+        if "/" in item:
+            try:
+                network = ipaddress.ip_network(item, strict=False)
+            except ValueError as e:
+                raise ValueError(f"Invalid network: {item} ({e})") from None
+            if network.num_addresses > max_hosts + 2:
+                raise ValueError(f"{item} has {network.num_addresses} addresses (limit {max_hosts})")
+            # hosts() skips the network and broadcast addresses, but is empty for /32
+            addresses = list(network.hosts()) or [network.network_address]
+            for address in addresses:
+                hosts[str(address)] = None
+        else:
+            hosts[item] = None
+        if len(hosts) > max_hosts:
+            raise ValueError(f"Too many hosts (limit {max_hosts})")
+    if not hosts:
+        raise ValueError("No targets given")
+    return list(hosts)
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class NetworkSweep:
+    """Concurrent liveness, DNS and port checks over many hosts."""
+    
+    def __init__(self, ports: PortSpec = (), ping: bool = True, resolve: bool = True,
+                 concurrency: int = DEFAULT_CONCURRENCY, timeout: float = DEFAULT_TIMEOUT):
+        """Configure the sweep.
+        
+        Args:
+            ports: Ports to probe on each host (empty = none)
+            ping: Check liveness with ping before falling back to TCP
+            resolve: Look up hostnames (reverse DNS for addresses)
+            concurrency: Hosts checked at once
+            timeout: Seconds to wait for each ping, connect or lookup
+        """
+        self.ports = parse_ports(ports) if ports else []
+        self.ping = ping
+        self.resolve = resolve
+        self.concurrency = max(1, concurrency)
+        self.timeout = timeout
+        self.scanner = PortScanner(concurrency=concurrency * 4, timeout=timeout)
+        self._ping_available = True
+        self._connect_slots: Optional[asyncio.Semaphore] = None
+    
+    async def _ping(self, address: str, slots: asyncio.Semaphore) -> Optional[float]:
+        """Round-trip time of one ping, or None if there was no answer."""
+        if not self._ping_available:
+            return None
+        async with slots:
+            stats = await ping_async(address, count=1, timeout=self.timeout)
+        if stats.method == "subprocess" and stats.error and not stats.transmitted:
+            # ping could not be started (neither ICMP sockets nor a ping
+            # binary): rely on TCP from now on. A ping that ran and failed
+            # for this one host says nothing about the others.
+            self._ping_available = False
+        return stats.rtts[0] if stats.rtts else None
+    
+    async def _lookup(self, result: HostResult) -> None:
+        resolver = get_resolver()
+        if _is_ip(result.host):
+            result.address = result.host
+            if self.resolve:
+                try:
+                    result.hostname = await asyncio.wait_for(
+                        resolver.reverse(result.host), self.timeout) or ""
+                except asyncio.TimeoutError:
+                    pass
+            return
+        addresses = await asyncio.wait_for(resolver.resolve(result.host), self.timeout * 5)
+        result.address = addresses[0]
+        result.hostname = result.host
+    
+    async def _probe(self, result: HostResult, port: int):
+        # Shared across hosts so the total number of open sockets stays bounded
+        if self._connect_slots is None:
+            self._connect_slots = asyncio.Semaphore(self.scanner.concurrency)
+        async with self._connect_slots:
+            return await self.scanner.probe(result.host, result.address, port)
+    
+    async def _probe_ports(self, result: HostResult, ports: List[int],
+                           stop_when_alive: bool = False) -> None:
+        pending = [asyncio.ensure_future(self._probe(result, port)) for port in ports]
+        try:
+            for future in asyncio.as_completed(pending):
+                probe = await future
+                if probe.state != "filtered" and not result.alive:
+                    result.alive = True
+                    result.method = "tcp"
+                    result.latency = probe.latency
+                if probe.is_open:
+                    result.open_ports.append(probe.port)
+                    result.services[probe.port] = probe.service
+                if stop_when_alive and result.alive:
+                    break
+        finally:
+            for future in pending:
+                future.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        result.open_ports.sort()
+    
+    async def check(self, host: str, ping_slots: asyncio.Semaphore) -> HostResult:
+        """Check one host."""
+        result = HostResult(host)
+        try:
+            await self._lookup(result)
+        except (asyncio.TimeoutError, OSError) as e:
+            result.error = f"resolve failed: {e or 'timed out'}"
+            return result
+        
+        if self.ping:
+            rtt = await self._ping(result.address, ping_slots)
+            if rtt is not None:
+                result.alive, result.method, result.latency = True, "ping", rtt
+        if self.ports:
+            await self._probe_ports(result, self.ports)
+        elif not result.alive:
+            await self._probe_ports(result, LIVENESS_PORTS, stop_when_alive=True)
+        return result
+    
+    async def stream(self, targets: TargetSpec) -> AsyncIterator[HostResult]:
+        """Check every target, yielding results in completion order.
+        
+        Raises:
+            ValueError: On a bad target or port specification
+        """
+        hosts = iter(expand_targets(targets))
+        self._connect_slots = asyncio.Semaphore(self.scanner.concurrency)
+        ping_slots = asyncio.Semaphore(PING_WORKERS)
+        queue: "asyncio.Queue[Optional[HostResult]]" = asyncio.Queue()
+        
+        async def worker() -> None:
+            try:
+                for host in hosts:
+                    await queue.put(await self.check(host, ping_slots))
+            finally:
+                await queue.put(None)
+        
+        workers = [asyncio.ensure_future(worker()) for _ in range(self.concurrency)]
+        try:
+            remaining = len(workers)
+            while remaining:
+                result = await queue.get()
+                if result is None:
+                    remaining -= 1
+                else:
+                    yield result
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    
+    async def sweep_async(self, targets: TargetSpec,
+                          on_result: Optional[Callable[[HostResult], None]] = None) -> List[HostResult]:
+        """Collect all results, calling ``on_result`` as each host finishes."""
+        results = []
+        async for result in self.stream(targets):
+            results.append(result)
+            if on_result:
+                on_result(result)
+        return results
+    
+    def sweep(self, targets: TargetSpec,
+              on_result: Optional[Callable[[HostResult], None]] = None) -> List[HostResult]:
+        """Blocking version of ``sweep_async``."""
+        return run_sync(self.sweep_async(targets, on_result))
+
+
+def _address_key(result: HostResult):
+    try:
+        address = ipaddress.ip_address(result.address or result.host)
+    except ValueError:
+        return (1, 0, 0, result.host)
+    return (0, address.version, int(address), "")
+
+
+def sort_results(results: List[HostResult]) -> List[HostResult]:
+    """Addresses in numeric order, then unresolved names alphabetically."""
+    return sorted(results, key=_address_key)
+
+
+def format_table(results: List[HostResult], show_down: bool = False) -> str:
+    """Summary table of a sweep, one row per host."""
+    rows = [("HOST", "ADDRESS", "NAME", "STATUS", "RTT", "OPEN PORTS")]
+    for r in sort_results(results):
+        if not r.alive and not show_down:
+            continue
+        status = f"up ({r.method})" if r.alive else ("error" if r.error else "down")
+        rtt = f"{r.latency * 1000:.1f}ms" if r.latency is not None else "-"
+        ports = ", ".join(f"{p}/{r.services[p]}" if r.services.get(p) else str(p)
+                          for p in r.open_ports) or "-"
+        name = r.hostname if r.hostname != r.host else ""
+        rows.append((r.host, r.address if r.address != r.host else "", name or "-", status, rtt, ports))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]) - 1)]
+    lines = ["  ".join(cell.ljust(width) for cell, width in zip(row, widths)) + "  " + row[-1]
+             for row in rows]
+    return "\n".join(line.rstrip() for line in lines)
+
+
+def sweep_network(targets: TargetSpec, ports: PortSpec = (), ping: bool = True,
+                  resolve: bool = True, concurrency: int = DEFAULT_CONCURRENCY,
+                  timeout: float = DEFAULT_TIMEOUT,
+                  on_result: Optional[Callable[[HostResult], None]] = None) -> Dict:
+    """Sweep a set of hosts.
+    
+    Args:
+        targets: CIDR blocks and/or host names (see ``expand_targets``)
+        ports: Ports to probe on each host (empty = none)
+        ping: Check liveness with ping
+        resolve: Look up hostnames
+        concurrency: Hosts checked at once
+        timeout: Seconds per ping, connect or lookup
+        on_result: Called with each HostResult as it completes
+    
+    Returns:
+        Dict with 'hosts' (sorted results), 'results' (HostResult objects),
+        'alive', 'total' and 'duration'
+    
+    Raises:
+        ValueError: On a bad target or port specification
+    """
+    start = time.monotonic()
+    sweeper = NetworkSweep(ports=ports, ping=ping, resolve=resolve,
+                           concurrency=concurrency, timeout=timeout)
+    results = sort_results(sweeper.sweep(targets, on_result))
+    return {
+        "hosts": [r.to_dict() for r in results],
+        "results": results,
+        "alive": sum(1 for r in results if r.alive),
+        "total": len(results),
+        "duration": round(time.monotonic() - start, 3),
+    }
@@ -0,0 +1,350 @@
+"""Parallel, streaming traceroute.
+
+On Linux every probe is an unprivileged UDP datagram with its own TTL and
+``IP_RECVERR`` enabled, so the ICMP "time exceeded" and "port
+unreachable" replies come back on the socket's error queue together with
+the address of the router that sent them (the same trick ``tracepath``
+uses). Whole batches of TTLs are probed at once, which is what lets a
+30-hop trace finish in about one probe timeout, and hops are reported in
+order as soon as each one (and every hop before it) is complete.
+
+Elsewhere, or if the kernel refuses, the system ``traceroute``/``tracert``
+is run and its output is parsed line by line as it arrives.
+
+Author: sqrilizz
+GitHub: https://github.com/Sqrilizz/auryx-agent
+"""
+
+import asyncio
+import platform
+import re
+import socket
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from auryx_agent.tools.aio import run_sync
+
+
+DEFAULT_MAX_HOPS = 30
+DEFAULT_PROBES = 3
+DEFAULT_TIMEOUT = 1.0
+DEFAULT_BATCH = 16
+BASE_PORT = 33434
+
+# Linux socket options (not all are exported by the socket module)
+IP_RECVERR = getattr(socket, "IP_RECVERR", 11)
+IPV6_RECVERR = getattr(socket, "IPV6_RECVERR", 25)
+MSG_ERRQUEUE = getattr(socket, "MSG_ERRQUEUE", 0x2000)
+SO_EE_ORIGIN_ICMP = 2
+SO_EE_ORIGIN_ICMP6 = 3
+_EXTENDED_ERR = struct.Struct("=IBBBBII")
+
+_HOP_LINE = re.compile(r"^\s*(\d+)\s+(.*)$")
+_ADDRESS = re.compile(r"\(?(\d{1,3}(?:\.\d{1,3}){3}|[0-9a-fA-F]*:[0-9a-fA-F:]+)\)?")
+_TIME = re.compile(r"<?(\d+(?:\.\d+)?)\s*ms")
+
+
+@dataclass
+class Hop:
+    """One TTL of a trace."""
+    ttl: int
+    addresses: List[str] = field(default_factory=list)  # several if load-balanced
+    hostname: str = ""
+    rtts: List[Optional[float]] = field(default_factory=list)  # seconds; None = no reply
+    reached: bool = False  # the destination itself answered
+    final: bool = False  # an "unreachable" reply ended the trace here
+    
+    @property
+    def address(self) -> str:
+        return self.addresses[0] if self.addresses else ""
+    
+    @property
+    def loss(self) -> float:
+        """Probe loss in percent."""
+        if not self.rtts:
+            return 100.0
+        return round(100.0 * sum(1 for rtt in self.rtts if rtt is None) / len(self.rtts), 1)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        answered = [rtt * 1000 for rtt in self.rtts if rtt is not None]
+        return {
+            "ttl": self.ttl,
+            "address": self.address or None,
+            "addresses": self.addresses,
+            "hostname": self.hostname or None,
+            "rtts_ms": [round(rtt * 1000, 3) if rtt is not None else None for rtt in self.rtts],
+            "avg_ms": round(sum(answered) / len(answered), 3) if answered else None,
+            "loss": self.loss,
+        }
+    
+    def text(self) -> str:
+        """A line in the style of traceroute's output."""
+        if not self.addresses:
+            return f"{self.ttl:>2}  " + "  ".join("*" for _ in self.rtts or [None])
+        name = f"{self.hostname} ({self.address})" if self.hostname else self.address
+        times = "  ".join(f"{rtt * 1000:.3f} ms" if rtt is not None else "*" for rtt in self.rtts)
+        return f"{self.ttl:>2}  {name}  {times}"
+
+
+@dataclass
+class TraceResult:
+    """A complete trace."""
+    host: str
+    address: str = ""
+    hops: List[Hop] = field(default_factory=list)
+    reached: bool = False
+    method: str = ""  # "udp" or "subprocess"
+    duration: float = 0.0
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "host": self.host,
+            "address": self.address,
+            "hops": [hop.to_dict() for hop in self.hops],
+            "reached": self.reached,
+            "method": self.method,
+            "duration": round(self.duration, 3),
+            "error": self.error,
+        }
+    
+    def text(self) -> str:
+        return "\n".join(hop.text() for hop in self.hops)
+
+
+def parse_hop_line(line: str) -> Optional[Hop]:
+    """Parse one hop line of traceroute or tracert output (None for other lines)."""
+    match = _HOP_LINE.match(line)
+    if not match:
+        return None
+    hop = Hop(int(match.group(1)))
+    rest = match.group(2)
+    for token in re.findall(r"\*|<?\d+(?:\.\d+)?\s*ms", rest):
+        if token == "*":
+            hop.rtts.append(None)
+        else:
+            hop.rtts.append(float(_TIME.match(token).group(1)) / 1000)
+    # Times are stripped so "1.234 ms" isn't mistaken for part of an address
+    for address in _ADDRESS.findall(_TIME.sub(" ", rest)):
+        if address not in hop.addresses:
+            hop.addresses.append(address)
+    return hop
+
+
+def traceroute_command(address: str, max_hops: int, probes: int, timeout: float) -> List[str]:
+    """Command line for the system traceroute without name lookups."""
+    if platform.system().lower() == "windows":
+        return ["tracert", "-d", "-h", str(max_hops), "-w", str(int(timeout * 1000)), address]
+    family = ["-6"] if ":" in address else []
+    return ["traceroute", *family, "-n", "-m", str(max_hops), "-q", str(probes),
+            "-w", str(max(1, round(timeout))), address]
+
+
+def recverr_supported() -> bool:
+    """Whether UDP error-queue probing is available (Linux)."""
+    return platform.system() == "Linux" and hasattr(socket, "SOL_IP")
+
+
+class _Probe:
+    """One UDP datagram sent with a fixed TTL."""
+    
+    def __init__(self, address: str, ttl: int, port: int):
+        self.ipv6 = ":" in address
+        family = socket.AF_INET6 if self.ipv6 else socket.AF_INET
+        self.sock = socket.socket(family, socket.SOCK_DGRAM)
+        try:
+            self.sock.setblocking(False)
+            if self.ipv6:
+                self.sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_UNICAST_HOPS, ttl)
+                self.sock.setsockopt(socket.IPPROTO_IPV6, IPV6_RECVERR, 1)
+            else:
+                self.sock.setsockopt(socket.SOL_IP, socket.IP_TTL, ttl)
+                self.sock.setsockopt(socket.SOL_IP, IP_RECVERR, 1)
+            self.sock.connect((address, port))
+        except OSError:
+            self.sock.close()
+            raise
+    
+    def read_error(self) -> Optional[tuple]:
+        """(responder address, unreachable) from the error queue, if any."""
+        try:
+            _, ancdata, _, _ = self.sock.recvmsg(512, 512, MSG_ERRQUEUE)
+        except (BlockingIOError, InterruptedError):
+            return None
+        for _, _, data in ancdata:
+            if len(data) < _EXTENDED_ERR.size + 8:
+                continue
+            _, origin, icmp_type, _, _, _, _ = _EXTENDED_ERR.unpack_from(data)
+            offender = data[_EXTENDED_ERR.size:]
+            if origin == SO_EE_ORIGIN_ICMP and len(offender) >= 8:
+                responder = socket.inet_ntop(socket.AF_INET, offender[4:8])
+                # Port unreachable comes from the target; other unreachables
+                # from a router that won't forward the probe either way
+                return responder, icmp_type == 3
+            if origin == SO_EE_ORIGIN_ICMP6 and len(offender) >= 24:
+                responder = socket.inet_ntop(socket.AF_INET6, offender[8:24])
+                return responder, icmp_type == 1
+        return None
+    
+    async def run(self, timeout: float) -> tuple:
+        """Send the probe and wait for the ICMP reply: (responder, rtt, unreachable)."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        start = time.monotonic()
+        
+        def ready() -> None:
+            try:
+                result = self.read_error()
+            except OSError as e:
+                result = None
+                if not future.done():
+                    future.set_exception(e)
+            if result and not future.done():
+                future.set_result((result[0], time.monotonic() - start, result[1]))
+        
+        loop.add_reader(self.sock.fileno(), ready)
+        try:
+            self.sock.send(b"auryx-trace")
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None, None, False
+        finally:
+            loop.remove_reader(self.sock.fileno())
+            self.sock.close()
+
+
+async def _send_probe(address: str, ttl: int, port: int, timeout: float) -> tuple:
+    return await _Probe(address, ttl, port).run(timeout)
+
+
+async def _resolve_name(hop: Hop, timeout: float) -> None:
+    from auryx_agent.tools.dns_resolver import get_resolver
+    
+    try:
+        hop.hostname = await asyncio.wait_for(get_resolver().reverse(hop.address), timeout) or ""
+    except asyncio.TimeoutError:
+        pass
+
+
+async def _trace_udp(result: TraceResult, max_hops: int, probes: int, timeout: float,
+                     batch: int, resolve: bool, on_hop: Optional[Callable[[Hop], None]]) -> None:
+    result.method = "udp"
+    
+    async def probe_hop(ttl: int) -> Hop:
+        hop = Hop(ttl)
+        replies = await asyncio.gather(*(
+            _send_probe(result.address, ttl, BASE_PORT + (ttl - 1) * probes + i, timeout)
+            for i in range(probes)))
+        for responder, rtt, unreachable in replies:
+            hop.rtts.append(rtt)
+            if responder and responder not in hop.addresses:
+                hop.addresses.append(responder)
+            hop.final = hop.final or unreachable
+        hop.reached = result.address in hop.addresses
+        if resolve and hop.addresses:
+            await _resolve_name(hop, timeout)
+        return hop
+    
+    for first in range(1, max_hops + 1, batch):
+        tasks = [asyncio.ensure_future(probe_hop(ttl))
+                 for ttl in range(first, min(first + batch, max_hops + 1))]
+        try:
+            # Report hops in order, each as soon as it and those before it are done
+            for task in tasks:
+                hop = await task
+                result.hops.append(hop)
+                if on_hop:
+                    on_hop(hop)
+                if hop.reached or hop.final:
+                    result.reached = hop.reached
+                    return
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _trace_subprocess(result: TraceResult, max_hops: int, probes: int, timeout: float,
+                            on_hop: Optional[Callable[[Hop], None]]) -> None:
+    result.method = "subprocess"
+    try:
+        process = await asyncio.create_subprocess_exec(
+            *traceroute_command(result.address, max_hops, probes, timeout),
+            stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+        )
+    except OSError as e:
+        result.error = f"traceroute is unavailable: {e}"
+        return
+    try:
+        async for raw in process.stdout:
+            hop = parse_hop_line(raw.decode(errors="replace"))
+            if hop is None:
+                continue
+            hop.reached = result.address in hop.addresses
+            result.hops.append(hop)
+            if on_hop:
+                on_hop(hop)
+            if hop.reached:
+                result.reached = True
+                break
+    finally:
+        if process.returncode is None:
+            process.kill()
+        _, err = await process.communicate()
+    if not result.hops and err:
+        result.error = err.decode(errors="replace").strip()
+
+
+async def trace_async(host: str, max_hops: int = DEFAULT_MAX_HOPS, probes: int = DEFAULT_PROBES,
+                      timeout: float = DEFAULT_TIMEOUT, batch: int = DEFAULT_BATCH,
+                      resolve: bool = True,
+                      on_hop: Optional[Callable[[Hop], None]] = None) -> TraceResult:
+    """Trace the route to a host.
+    
+    Args:
+        host: Hostname or IP
+        max_hops: Highest TTL to probe
+        probes: Probes per hop
+        timeout: Seconds to wait for each probe's reply
+        batch: TTLs probed at the same time
+        resolve: Look up hop names (reverse DNS)
+        on_hop: Called with each Hop, in TTL order, as soon as it's complete
+    
+    Returns:
+        TraceResult (errors are recorded in ``error``, not raised)
+    """
+    from auryx_agent.tools.dns_resolver import get_resolver
+    
+    start = time.monotonic()
+    result = TraceResult(host)
+    try:
+        result.address = (await get_resolver().resolve(host))[0]
+    except OSError as e:
+        result.error = f"resolve failed: {e}"
+        return result
+    
+    used_udp = False
+    if recverr_supported():
+        try:
+            await _trace_udp(result, max_hops, max(1, probes), timeout, max(1, batch), resolve, on_hop)
+            used_udp = True
+        except OSError as e:
+            if result.hops:
+                # Hops already went to on_hop; re-tracing would report them twice
+                result.error = str(e)
+                used_udp = True
+            else:
+                result.hops.clear()
+    if not used_udp:
+        await _trace_subprocess(result, max_hops, max(1, probes), timeout, on_hop)
+    result.duration = time.monotonic() - start
+    return result
+
+
+def trace(host: str, max_hops: int = DEFAULT_MAX_HOPS, probes: int = DEFAULT_PROBES,
+          timeout: float = DEFAULT_TIMEOUT, resolve: bool = True,
+          on_hop: Optional[Callable[[Hop], None]] = None) -> TraceResult:
+    """Blocking version of ``trace_async``."""
+    return run_sync(trace_async(host, max_hops, probes, timeout, resolve=resolve, on_hop=on_hop))
@@ -4,11 +4,40 @@ Author: sqrilizz
 GitHub: https://github.com/Sqrilizz/auryx-agent
 """
 
-import json
 import subprocess
-from typing import Dict, Any, Optional, List
-from urllib.parse import quote_plus, urlparse
-import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from itertools import zip_longest
+from typing import Dict, Any, Optional, List, Union
+from urllib.parse import quote_plus, urlsplit
+
+from auryx_agent.tools.crawl_index import DEFAULT_RESULTS, get_crawl_index
+from auryx_agent.tools.crawler import (DEFAULT_CONCURRENCY, DEFAULT_DELAY, DEFAULT_MAX_DEPTH,
+                                       DEFAULT_MAX_PAGES, Crawler, origin)
+from auryx_agent.tools.downloader import Downloader
+from auryx_agent.tools.html_extract import CHARS_PER_TOKEN, DEFAULT_MAX_TOKENS, extract_stream
+from auryx_agent.tools.http_client import get_client
+from auryx_agent.tools.link_extract import DEFAULT_MAX_LINKS, SCOPES, extract_links_stream, normalize_url
+
+# How long responses that carry no caching headers are reused (seconds)
+SEARCH_TTL = 3600
+WEATHER_TTL = 900
+PAGE_TTL = 60
+HTML_TYPES = ("text/html", "application/xhtml+xml")
+
+# fetch_many limits
+MAX_BATCH_URLS = 20
+BATCH_MAX_TOKENS = 6000
+MIN_PAGE_TOKENS = 300
+FETCH_CONCURRENCY = 8
+FETCH_PER_HOST = 4
+
+
+def with_scheme(url: str) -> str:
+    """The URL with http:// added to a bare host such as "example.com"."""
+    url = url.strip()
+    return url if "://" in url else f"http://{url}"
 
 
 class WebTools:
@@ -25,20 +54,15 @@ class WebTools:
             Dict with search results
         """
         try:
-            # Use curl to search DuckDuckGo's instant answer API
+            # DuckDuckGo's instant answer API
             url = f"https://api.duckduckgo.com/?q={quote_plus(query)}&format=json"
             
-            result = subprocess.run(
-                ['curl', '-s', url],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
-                return {"success": False, "error": "Search failed"}
+            response = get_client().get(url, timeout=10, cache=True, default_ttl=SEARCH_TTL)
+            if not response.ok:
+                response.close()
+                return {"success": False, "error": f"Search failed (HTTP {response.status_code})"}
             
-            data = json.loads(result.stdout)
+            data = response.json()
             
             results = []
             
@@ -68,69 +92,146 @@ class WebTools:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def fetch_url(self, url: str, timeout: int = 10) -> Dict[str, Any]:
+    def fetch_url(self, url: str, timeout: int = 10, max_tokens: int = DEFAULT_MAX_TOKENS,
+                  query: Optional[str] = None) -> Dict[str, Any]:
         """Fetch content from URL.
         
+        HTML pages are reduced to their readable content as markdown
+        (navigation, scripts and other boilerplate removed).
+        
         Args:
             url: URL to fetch
             timeout: Request timeout in seconds
+            max_tokens: Approximate size limit of the returned content
+            query: Return the parts of the page most relevant to this
             
         Returns:
             Dict with page content
         """
         try:
-            result = subprocess.run(
-                ['curl', '-s', '-L', '--max-time', str(timeout), url],
-                capture_output=True,
-                text=True,
-                timeout=timeout + 2
-            )
-            
-            if result.returncode != 0:
-                return {"success": False, "error": "Failed to fetch URL"}
-            
-            content = result.stdout
-            
-            return {
+            response = get_client().get(with_scheme(url), timeout=timeout, cache=True, default_ttl=PAGE_TTL)
+            if not response.ok:
+                response.close()
+                return {
+                    "success": False,
+                    "error": f"HTTP {response.status_code} {response.reason}",
+                    "status_code": response.status_code,
+                }
+            
+            result = {
                 "success": True,
-                "url": url,
-                "content": content[:5000],  # Limit to first 5000 chars
-                "size": len(content),
-                "preview": content[:500]
+                "url": response.url,
+                "status_code": response.status_code,
+                "cached": response.cache_status in ("hit", "stale", "revalidated"),
             }
+            if response.headers.get_content_type() in HTML_TYPES:
+                page, size = extract_stream(response.iter_content(), response.encoding,
+                                            response.url, max_tokens, query)
+                response.close()
+                result.update(page.to_dict())
+                result["size"] = size
+                return result
+            
+            text = response.text
+            limit = max_tokens * CHARS_PER_TOKEN
+            result.update({
+                "content_type": response.headers.get_content_type(),
+                "content": text[:limit],
+                "truncated": len(text) > limit,
+                "size": len(response.content),
+            })
+            return result
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def download_file(self, url: str, output_path: str) -> Dict[str, Any]:
+    def fetch_many(self, urls: Union[str, List[str]], timeout: int = 10,
+                   max_tokens: int = BATCH_MAX_TOKENS, query: Optional[str] = None,
+                   concurrency: int = FETCH_CONCURRENCY,
+                   per_host: int = FETCH_PER_HOST) -> Dict[str, Any]:
+        """Fetch several pages concurrently in one call.
+        
+        Each page goes through the same cache and readable-content
+        extraction as fetch_url.
+        
+        Args:
+            urls: List of URLs, or a comma/space separated string
+            timeout: Request timeout in seconds per page
+            max_tokens: Approximate size limit of all pages together
+                (split evenly between them)
+            query: Return the parts of each page most relevant to this
+            concurrency: Pages fetched at once
+            per_host: Pages fetched at once from the same host
+            
+        Returns:
+            Dict with one entry per URL, in the given order
+        """
+        if isinstance(urls, str):
+            urls = urls.replace(",", " ").split()
+        urls = list(dict.fromkeys(with_scheme(url) for url in urls if url.strip()))
+        if not urls:
+            return {"success": False, "error": "No URLs given"}
+        if len(urls) > MAX_BATCH_URLS:
+            return {"success": False, "error": f"Too many URLs ({len(urls)}, limit {MAX_BATCH_URLS})"}
+        
+        start = time.monotonic()
+        page_tokens = max(MIN_PAGE_TOKENS, max_tokens // len(urls))
+        host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        lock = threading.Lock()
+        
+        def fetch(url: str) -> Dict[str, Any]:
+            host = (urlsplit(url).hostname or "").lower()
+            with lock:
+                slots = host_slots.setdefault(host, threading.BoundedSemaphore(max(1, per_host)))
+            with slots:
+                result = self.fetch_url(url, timeout, page_tokens, query)
+            if not result["success"]:
+                return {"url": url, "error": result["error"]}
+            page = {"url": url, "title": result.get("title", ""), "content": result["content"]}
+            if result.get("truncated"):
+                page["truncated"] = True
+            if result["url"] != url:
+                page["final_url"] = result["url"]
+            return page
+        
+        # Interleave hosts so workers don't queue up behind one host's limit
+        by_host: Dict[str, List[str]] = {}
+        for url in urls:
+            by_host.setdefault((urlsplit(url).hostname or "").lower(), []).append(url)
+        order = [url for group in zip_longest(*by_host.values()) for url in group if url]
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(urls)))) as pool:
+            pages = dict(zip(order, pool.map(fetch, order)))
+        
+        results = [pages[url] for url in urls]
+        failed = sum(1 for page in results if "error" in page)
+        return {
+            "success": failed < len(results),
+            "pages": results,
+            "fetched": len(results) - failed,
+            "failed": failed,
+            "duration": round(time.monotonic() - start, 3),
+        }
+    
+    def download_file(self, url: str, output_path: str, checksum: Optional[str] = None,
+                      parallel: bool = True) -> Dict[str, Any]:
         """Download file from URL.
         
+        Partial downloads are resumed, large files are fetched in parallel
+        ranges and the result is verified against checksum when given.
+        
         Args:
             url: URL to download from
-            output_path: Where to save the file
+            output_path: Where to save the file (a directory keeps the URL's file name)
+            checksum: Expected digest, e.g. "sha256:<hex>"
+            parallel: Allow splitting large files into parallel ranges
             
         Returns:
             Dict with download status
         """
         try:
-            result = subprocess.run(
-                ['curl', '-L', '-o', output_path, url],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
-            
-            if result.returncode != 0:
-                return {"success": False, "error": "Download failed"}
-            
-            import os
-            size = os.path.getsize(output_path)
-            
-            return {
-                "success": True,
-                "url": url,
-                "output": output_path,
-                "size": size
-            }
+            result = Downloader().download(with_scheme(url), output_path, checksum=checksum,
+                                           parallel=None if parallel else False)
+            return {"success": True, **result.to_dict()}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
@@ -144,40 +245,36 @@ class WebTools:
             Dict with website status
         """
         try:
-            # Parse URL
-            parsed = urlparse(url)
-            host = parsed.netloc or parsed.path
-            port = 443 if parsed.scheme == 'https' else 80
+            target = with_scheme(url)
+            client = get_client()
             
-            # Try to connect
-            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            sock.settimeout(5)
-            result = sock.connect_ex((host, port))
-            sock.close()
-            
-            accessible = result == 0
-            
-            # Get HTTP status if accessible
+            # One request answers both questions: a response means the site is up
+            start = time.monotonic()
             status_code = None
-            if accessible:
-                try:
-                    curl_result = subprocess.run(
-                        ['curl', '-s', '-o', '/dev/null', '-w', '%{http_code}', url],
-                        capture_output=True,
-                        text=True,
-                        timeout=10
-                    )
-                    status_code = int(curl_result.stdout)
-                except:
-                    pass
-            
-            return {
+            error = None
+            try:
+                response = client.head(target, timeout=5)
+                response.close()
+                if response.status_code in (405, 501):
+                    # Some servers refuse HEAD
+                    response = client.get(target, timeout=5)
+                    response.close()
+                status_code = response.status_code
+            except OSError as e:
+                error = str(e) or type(e).__name__
+            
+            accessible = status_code is not None
+            result = {
                 "success": True,
                 "url": url,
                 "accessible": accessible,
                 "status_code": status_code,
+                "response_time_ms": round((time.monotonic() - start) * 1000, 1),
                 "message": "Website is accessible" if accessible else "Website is not accessible"
             }
+            if error:
+                result["error"] = error
+            return result
         except Exception as e:
             return {"success": False, "error": str(e)}
     
@@ -193,17 +290,12 @@ class WebTools:
         try:
             url = f"https://wttr.in/{quote_plus(location)}?format=j1"
             
-            result = subprocess.run(
-                ['curl', '-s', url],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
+            response = get_client().get(url, timeout=10, cache=True, default_ttl=WEATHER_TTL)
+            if not response.ok:
+                response.close()
                 return {"success": False, "error": "Failed to get weather"}
             
-            data = json.loads(result.stdout)
+            data = response.json()
             
             current = data['current_condition'][0]
             
@@ -245,44 +337,91 @@ class WebTools:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
-    def extract_links(self, url: str) -> Dict[str, Any]:
-        """Extract all links from a webpage.
+    def extract_links(self, url: str, limit: int = DEFAULT_MAX_LINKS,
+                      scope: str = "all") -> Dict[str, Any]:
+        """Extract links from a webpage.
+        
+        Links are resolved against the page URL and returned in page order
+        without duplicates; reading stops once limit links are found.
         
         Args:
             url: URL to extract links from
+            limit: Maximum number of links to return
+            scope: "all", "internal" (same host) or "external"
             
         Returns:
             Dict with extracted links
         """
         try:
-            # Fetch page
-            result = subprocess.run(
-                ['curl', '-s', '-L', url],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
-                return {"success": False, "error": "Failed to fetch page"}
-            
-            content = result.stdout
+            if scope not in SCOPES:
+                return {"success": False, "error": f"scope must be one of {', '.join(SCOPES)}"}
+            response = get_client().get(with_scheme(url), timeout=10, cache=True, default_ttl=PAGE_TTL)
+            if not response.ok:
+                response.close()
+                return {"success": False, "error": f"Failed to fetch page (HTTP {response.status_code})"}
             
-            # Simple regex to find links
-            import re
-            links = re.findall(r'href=[\'"]?([^\'" >]+)', content)
-            
-            # Filter and clean links
-            clean_links = []
-            for link in links:
-                if link.startswith('http') or link.startswith('//'):
-                    clean_links.append(link)
+            parser, size = extract_links_stream(response.iter_content(), response.encoding,
+                                                response.url, max(1, limit), scope)
+            response.close()
             
             return {
                 "success": True,
-                "url": url,
-                "links": list(set(clean_links))[:50],  # Unique, max 50
-                "count": len(clean_links)
+                "url": response.url,
+                "links": [link.to_dict() for link in parser.links],
+                "count": len(parser.links),
+                "internal": len(parser.internal),
+                "external": len(parser.external),
+                # The rest of the page wasn't read
+                "truncated": parser.full,
+                "size": size,
             }
         except Exception as e:
             return {"success": False, "error": str(e)}
+    
+    def crawl_site(self, url: str, max_pages: int = DEFAULT_MAX_PAGES, max_depth: int = DEFAULT_MAX_DEPTH,
+                   concurrency: int = DEFAULT_CONCURRENCY, delay: float = DEFAULT_DELAY) -> Dict[str, Any]:
+        """Crawl a site and index its pages for search_crawl_index.
+        
+        Only pages on the seed's origin are visited; robots.txt is respected
+        and requests are spaced by delay seconds.
+        
+        Args:
+            url: Seed URL, e.g. the start page of the documentation
+            max_pages: Maximum pages to fetch (up to 200)
+            max_depth: Maximum link hops from the seed (up to 5)
+            concurrency: Pages fetched at once (up to 8)
+            delay: Minimum seconds between requests
+            
+        Returns:
+            Dict with the indexed pages and the site to search
+        """
+        try:
+            crawler = Crawler(max_pages=max_pages, max_depth=max_depth,
+                              concurrency=concurrency, delay=delay)
+            result = crawler.crawl(url).to_dict()
+            return {"success": True, "site": origin(result["seed"]), **result}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def search_crawl_index(self, query: str, site: Optional[str] = None,
+                           limit: int = DEFAULT_RESULTS) -> Dict[str, Any]:
+        """Search pages indexed by crawl_site.
+        
+        Args:
+            query: Words to search for
+            site: Limit results to one crawled site (e.g. "https://docs.python.org")
+            limit: Maximum number of results
+            
+        Returns:
+            Dict with the best matching page sections
+        """
+        try:
+            index = get_crawl_index()
+            results = index.search(query, site=origin(normalize_url(site)) if site else None,
+                                   limit=max(1, limit))
+            response = {"success": True, "query": query, "results": results, "count": len(results)}
+            if not results:
+                response["sites"] = [entry["site"] for entry in index.sites()]
+            return response
+        except Exception as e:
+            return {"success": False, "error": str(e)}
@@ -0,0 +1,27 @@
+"""Shared fixtures for the test suite."""
+
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+
+@pytest.fixture
+def serve():
+    """Start local HTTP servers: ``serve(Handler)`` returns the base URL.
+    
+    Every server started in a test is shut down when the test ends.
+    """
+    servers = []
+    
+    def start(handler):
+        httpd = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        httpd.daemon_threads = True
+        threading.Thread(target=httpd.serve_forever, args=(0.05,), daemon=True).start()
+        servers.append(httpd)
+        return f"http://127.0.0.1:{httpd.server_address[1]}"
+    
+    yield start
+    for httpd in servers:
+        httpd.shutdown()
+        httpd.server_close()
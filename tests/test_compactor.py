@@ -0,0 +1,60 @@
+"""Tests for tool result compaction."""
+
+import json
+
+from auryx_agent.core.compactor import compact_result, head_tail
+
+
+class TestCompactor:
+    """Test suite for size-aware result compaction."""
+    
+    def test_small_results_are_compact_json(self):
+        """Small results are serialized without indentation."""
+        result = {"success": True, "path": "/", "percent": 42.5}
+        
+        assert compact_result(result) == '{"success":true,"path":"/","percent":42.5}'
+    
+    def test_large_lists_are_summarized(self):
+        """Long lists keep a count, the top items and field value counts."""
+        processes = [
+            {"pid": i, "name": "python" if i % 2 else "bash", "cpu": 100 - i}
+            for i in range(500)
+        ]
+        text = compact_result({"success": True, "processes": processes}, budget=1500)
+        data = json.loads(text)
+        
+        assert len(text) <= 1500
+        summary = data["processes"]
+        assert summary["count"] == 500
+        assert summary["top"][0]["pid"] == 0
+        assert summary["omitted"] == 500 - len(summary["top"])
+        assert summary["by_name"] == {"python": 250, "bash": 250}
+    
+    def test_long_output_keeps_head_and_tail(self):
+        """Long stdout keeps its beginning and its end."""
+        stdout = "\n".join(f"line {i}" for i in range(5000)) + "\nERROR: build failed"
+        text = compact_result({"stdout": stdout, "returncode": 1}, budget=2000)
+        data = json.loads(text)
+        
+        assert len(text) <= 2000
+        assert data["stdout"].startswith("line 0\n")
+        assert data["stdout"].endswith("ERROR: build failed")
+        assert "chars omitted" in data["stdout"]
+        assert data["returncode"] == 1
+    
+    def test_output_always_fits_and_stays_valid(self):
+        """Even pathological results fit the budget as valid JSON."""
+        result = {f"key{i}": i for i in range(5000)}
+        
+        for budget in (200, 1000, 5000):
+            text = compact_result(result, budget=budget)
+            assert len(text) <= budget
+            json.loads(text)
+    
+    def test_head_tail(self):
+        """Short text is untouched; long text is cut with a marker."""
+        assert head_tail("short", 100) == "short"
+        cut = head_tail("a" * 1000 + "TAIL", 200)
+        assert cut.startswith("aaa")
+        assert cut.endswith("TAIL")
+        assert len(cut) <= 220
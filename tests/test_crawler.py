@@ -0,0 +1,229 @@
+"""Tests for the site crawler and its search index."""
+
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from auryx_agent.tools import crawl_index
+from auryx_agent.tools.crawl_index import CrawlIndex, match_expression
+from auryx_agent.tools.crawler import Crawler, RateLimiter
+from auryx_agent.tools.html_extract import Chunk
+from auryx_agent.tools.http_cache import HTTPCache
+from auryx_agent.tools.http_client import HTTPClient, get_client
+from auryx_agent.tools.web_tools import WebTools
+
+
+HITS = Counter()
+ROBOTS = {"body": b"User-agent: *\nDisallow: /private/\n", "status": 200}
+
+
+def page(title, text, *links):
+    anchors = "".join(f'<li><a href="{href}">{href}</a></li>' for href in links)
+    return (f"<html><head><title>{title}</title></head><body><ul>{anchors}</ul>"
+            f"<main><h1>{title}</h1><p>{text}</p></main></body></html>").encode()
+
+
+SITE = {
+    "/": page("Home", "Welcome to the widget documentation.",
+              "/install", "/usage#top", "/private/secret", "https://elsewhere.example/", "/logo.png"),
+    "/install": page("Install", "Install widgets with pip install widgets.", "/", "/usage", "/deep/1"),
+    "/usage": page("Usage", "Call frobnicate() to spin the widget.", "/install"),
+    "/deep/1": page("Deep 1", "One level down.", "/deep/2"),
+    "/deep/2": page("Deep 2", "Two levels down.", "/deep/3"),
+    "/private/secret": page("Secret", "Hidden."),
+    "/moved": b"",
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, *args):
+        pass
+    
+    def send_body(self, body, status=200, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+    
+    def do_HEAD(self):
+        self.do_GET()
+    
+    def do_GET(self):
+        path = self.path.split("#")[0]
+        if self.command == "GET":
+            HITS[path] += 1
+        if path == "/robots.txt":
+            self.send_body(ROBOTS["body"], ROBOTS["status"], [("Content-Type", "text/plain")])
+        elif path == "/start":
+            self.send_body(b"", 301, [("Location", "/")])
+        elif path in SITE:
+            self.send_body(SITE[path], headers=[("Content-Type", "text/html; charset=utf-8")])
+        else:
+            self.send_body(b"missing", 404)
+
+
+@pytest.fixture
+def server(serve):
+    HITS.clear()
+    ROBOTS.update(body=b"User-agent: *\nDisallow: /private/\n", status=200)
+    return serve(Handler)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = CrawlIndex(tmp_path / "crawl.db")
+    yield index
+    index.close()
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = HTTPClient(timeout=5, cache=HTTPCache(tmp_path / "cache.db"))
+    yield client
+    client.close()
+
+
+def crawl(client, index, url, **kwargs):
+    kwargs.setdefault("delay", 0)
+    return Crawler(client, index, **kwargs).crawl(url)
+
+
+class TestCrawler:
+    """Test suite for crawling a local site."""
+    
+    def test_crawl(self, server, client, index):
+        """Same-origin pages are crawled breadth-first and indexed once each."""
+        result = crawl(client, index, server + "/")
+        
+        urls = [page.url for page in result.pages]
+        assert urls == [server + "/", server + "/install", server + "/usage", server + "/deep/1"]
+        assert [page.depth for page in result.pages] == [0, 1, 1, 2]
+        assert all(HITS[path] == 1 for path in ("/", "/install", "/usage"))
+        assert result.pages[1].title == "Install"
+    
+    def test_robots(self, server, client, index):
+        """Paths disallowed by robots.txt are skipped."""
+        result = crawl(client, index, server + "/")
+        
+        assert HITS["/private/secret"] == 0
+        assert result.to_dict()["skipped"] == {"robots": 1}
+    
+    def test_robots_server_error(self, server, client, index):
+        """A robots.txt server error disallows the whole site."""
+        ROBOTS["status"] = 503
+        
+        result = crawl(client, index, server + "/")
+        
+        assert result.pages == []
+        assert HITS["/"] == 0
+    
+    def test_crawl_delay(self, server, client, index):
+        """Crawl-delay in robots.txt slows the crawl down."""
+        ROBOTS["body"] = b"User-agent: *\nCrawl-delay: 1\n"
+        
+        start = time.monotonic()
+        result = crawl(client, index, server + "/", max_pages=2)
+        
+        assert result.delay == 1
+        assert time.monotonic() - start >= 1
+    
+    def test_limits(self, server, client, index):
+        """max_pages and max_depth bound the crawl."""
+        assert len(crawl(client, index, server + "/", max_pages=2).pages) == 2
+        
+        result = crawl(client, index, server + "/", max_depth=0)
+        assert [page.url for page in result.pages] == [server + "/"]
+    
+    def test_seed_redirect(self, server, client, index):
+        """A redirecting seed is crawled from where it lands."""
+        result = crawl(client, index, server + "/start", max_depth=0)
+        
+        assert result.seed == server + "/"
+        assert result.pages[0].title == "Home"
+    
+    def test_search(self, server, client, index):
+        """Crawled pages can be searched afterwards."""
+        crawl(client, index, server + "/")
+        
+        results = index.search("how do I frobnicate a widget", site=server)
+        assert results[0]["url"] == server + "/usage"
+        assert "frobnicate()" in results[0]["content"]
+        assert index.search("frobnicate", site="http://other.example") == []
+        assert index.sites() == [{"site": server, "pages": 4, "crawled_at": pytest.approx(time.time(), abs=60)}]
+
+
+class TestCrawlIndex:
+    """Test suite for the index on its own."""
+    
+    def test_match_expression(self):
+        """Free text becomes quoted OR terms, so FTS syntax can't break queries."""
+        assert match_expression('AND "x" near(y)') == '"and" OR "x" OR "near" OR "y"'
+        assert match_expression("?!") == ""
+    
+    def test_replace_page(self, index):
+        """Re-adding a page replaces its old chunks."""
+        index.add_page("https://s/a", "https://s", "A", [Chunk(0, "old words")])
+        index.add_page("https://s/a", "https://s", "A", [Chunk(0, "new words")])
+        
+        assert index.search("old") == []
+        assert [r["content"] for r in index.search("words")] == ["new words"]
+    
+    def test_clear(self, index):
+        """clear removes one site or everything."""
+        index.add_page("https://a/x", "https://a", "X", [Chunk(0, "alpha")])
+        index.add_page("https://b/y", "https://b", "Y", [Chunk(0, "alpha")])
+        
+        index.clear("https://a")
+        assert [r["url"] for r in index.search("alpha")] == ["https://b/y"]
+
+
+class TestRateLimiter:
+    """Test suite for request spacing."""
+    
+    def test_spacing(self):
+        """Calls from several threads are spaced by the interval."""
+        limiter = RateLimiter(0.05)
+        times = []
+        
+        def call():
+            limiter.wait()
+            times.append(time.monotonic())
+        
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        times.sort()
+        assert all(b - a >= 0.045 for a, b in zip(times, times[1:]))
+
+
+class TestCrawlTools:
+    """Test suite for the crawl_site and search_crawl_index tools."""
+    
+    def test_crawl_and_search(self, server, tmp_path, monkeypatch):
+        """The tools crawl into the shared index and search it."""
+        monkeypatch.setattr(crawl_index, "_index", CrawlIndex(tmp_path / "shared.db"))
+        monkeypatch.setattr(get_client(), "cache", HTTPCache(tmp_path / "cache.db"))
+        tools = WebTools()
+        
+        result = tools.crawl_site(server + "/", delay=0)
+        assert result["success"]
+        assert result["pages_indexed"] == 4
+        assert result["site"] == server
+        
+        found = tools.search_crawl_index("pip install", site=server + "/install")
+        assert found["results"][0]["url"] == server + "/install"
+        
+        missing = tools.search_crawl_index("nothing matches this")
+        assert missing["count"] == 0
+        assert missing["sites"] == [server]
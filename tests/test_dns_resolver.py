@@ -0,0 +1,277 @@
+"""Tests for the caching DNS resolver, against a local stand-in server."""
+
+import asyncio
+import socket
+import struct
+import threading
+import time
+
+import pytest
+
+from auryx_agent.tools.dns_resolver import (
+    DNSCache, DNSError, HostsFile, Resolver, encode_name, read_resolv_conf
+)
+
+
+def ipv4(address):
+    return socket.inet_pton(socket.AF_INET, address)
+
+
+def txt(*parts):
+    return b"".join(bytes([len(p)]) + p for p in parts)
+
+
+ZONE = {
+    ("example.test", 1): [(1, 300, ipv4("192.0.2.10"))],
+    ("example.test", 28): [(28, 300, socket.inet_pton(socket.AF_INET6, "2001:db8::10"))],
+    ("example.test", 15): [(15, 300, struct.pack("!H", 10) + encode_name("mail.example.test"))],
+    ("example.test", 16): [(16, 300, txt(b"v=spf1 ", b"-all"))],
+    ("www.example.test", 1): [(5, 300, encode_name("example.test")), (1, 300, ipv4("192.0.2.10"))],
+    ("short.test", 1): [(1, 0, ipv4("192.0.2.20"))],
+    ("db.corp.test", 1): [(1, 300, ipv4("192.0.2.30"))],
+    ("big.test", 16): [(16, 300, txt(b"x" * 200))] * 3,
+}
+
+
+class FakeDNSServer:
+    """Answers from ZONE over UDP and TCP; 'big.test' is truncated over UDP."""
+    
+    def __init__(self, silent=False):
+        self.tcp = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.tcp.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.tcp.bind(("127.0.0.1", 0))
+        self.tcp.listen(8)
+        self.port = self.tcp.getsockname()[1]
+        self.udp = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.udp.bind(("127.0.0.1", self.port))
+        self.silent = silent
+        self.queries = []
+        self.delay = 0.0
+        threading.Thread(target=self._serve_udp, daemon=True).start()
+        threading.Thread(target=self._serve_tcp, daemon=True).start()
+    
+    def answer(self, query, over_tcp=False):
+        query_id = struct.unpack_from("!H", query)[0]
+        offset, labels = 12, []
+        while query[offset]:
+            labels.append(query[offset + 1:offset + 1 + query[offset]].decode())
+            offset += 1 + query[offset]
+        name = ".".join(labels)
+        qtype = struct.unpack_from("!H", query, offset + 1)[0]
+        question = query[12:offset + 5]
+        self.queries.append((name, qtype, over_tcp))
+        
+        records = ZONE.get((name, qtype))
+        known = any(key[0] == name for key in ZONE)
+        flags = 0x8180 | (0 if known else 3)
+        if name == "big.test" and not over_tcp:
+            flags |= 0x0200
+            records = []
+        body = b""
+        for rtype, ttl, rdata in records or []:
+            body += b"\xc0\x0c" + struct.pack("!HHIH", rtype, 1, ttl, len(rdata)) + rdata
+        return struct.pack("!HHHHHH", query_id, flags, 1, len(records or []), 0, 0) + question + body
+    
+    def _serve_udp(self):
+        while True:
+            try:
+                data, addr = self.udp.recvfrom(4096)
+            except OSError:
+                return
+            if self.silent:
+                continue
+            time.sleep(self.delay)
+            self.udp.sendto(self.answer(data), addr)
+    
+    def _serve_tcp(self):
+        while True:
+            try:
+                conn, _ = self.tcp.accept()
+            except OSError:
+                return
+            with conn:
+                prefix = conn.recv(2)
+                if len(prefix) < 2:
+                    continue
+                reply = self.answer(conn.recv(struct.unpack("!H", prefix)[0]), over_tcp=True)
+                conn.sendall(struct.pack("!H", len(reply)) + reply)
+    
+    def close(self):
+        self.udp.close()
+        try:
+            # Wakes the accept() thread so the port stops listening
+            self.tcp.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.tcp.close()
+
+
+@pytest.fixture
+def server():
+    srv = FakeDNSServer()
+    yield srv
+    srv.close()
+
+
+@pytest.fixture
+def hosts(tmp_path):
+    path = tmp_path / "hosts"
+    path.write_text("127.0.0.1 localhost\n10.1.2.3 printer.test printer  # office\n")
+    return HostsFile(str(path))
+
+
+def make_resolver(server, hosts, **kwargs):
+    kwargs.setdefault("nameservers", ["127.0.0.1"])
+    return Resolver(port=server.port, timeout=1.0, attempts=1, hosts=hosts, **kwargs)
+
+
+class TestQuery:
+    """Test suite for record queries."""
+    
+    def test_record_types(self, server, hosts):
+        """A, AAAA, MX and TXT records are decoded."""
+        resolver = make_resolver(server, hosts)
+        
+        async def run():
+            return await asyncio.gather(*(resolver.query("example.test", t)
+                                          for t in ("A", "AAAA", "MX", "TXT")))
+        
+        a, aaaa, mx, text = asyncio.run(run())
+        
+        assert a.values == ["192.0.2.10"]
+        assert aaaa.values == ["2001:db8::10"]
+        assert mx.values == ["10 mail.example.test"]
+        assert text.values == ["v=spf1 -all"]
+    
+    def test_cname_chain(self, server, hosts):
+        """Records of the requested type are separated from the CNAME chain."""
+        answer = asyncio.run(make_resolver(server, hosts).query("www.example.test"))
+        
+        assert answer.values == ["192.0.2.10"]
+        assert answer.aliases == ["www.example.test"]
+    
+    def test_cache(self, server, hosts):
+        """Repeated queries are answered from the cache until the TTL runs out."""
+        resolver = make_resolver(server, hosts)
+        
+        asyncio.run(resolver.query("example.test"))
+        again = asyncio.run(resolver.query("EXAMPLE.test."))
+        asyncio.run(resolver.query("short.test"))
+        asyncio.run(resolver.query("short.test"))
+        
+        assert again.cached
+        assert [q[0] for q in server.queries] == ["example.test", "short.test", "short.test"]
+    
+    def test_negative_cache(self, server, hosts):
+        """NXDOMAIN answers are cached too."""
+        resolver = make_resolver(server, hosts)
+        
+        first = asyncio.run(resolver.query("missing.test"))
+        second = asyncio.run(resolver.query("missing.test"))
+        
+        assert first.rcode == "NXDOMAIN" and second.cached
+        assert len(server.queries) == 1
+    
+    def test_concurrent_lookups_share_a_query(self, server, hosts):
+        """Identical lookups in flight are sent once."""
+        server.delay = 0.1
+        resolver = make_resolver(server, hosts)
+        
+        async def run():
+            return await asyncio.gather(*(resolver.query("example.test") for _ in range(5)))
+        
+        answers = asyncio.run(run())
+        
+        assert all(a.values == ["192.0.2.10"] for a in answers)
+        assert len(server.queries) == 1
+    
+    def test_truncated_retries_over_tcp(self, server, hosts):
+        """Truncated UDP answers are fetched again over TCP."""
+        answer = asyncio.run(make_resolver(server, hosts).query("big.test", "TXT"))
+        
+        assert len(answer.values) == 3
+        assert server.queries[-1] == ("big.test", 16, True)
+    
+    def test_races_past_a_dead_server(self, server, hosts):
+        """A silent first nameserver only costs the stagger, not the timeout."""
+        dead = FakeDNSServer(silent=True)
+        try:
+            resolver = make_resolver(server, hosts, stagger=0.05, nameservers=[
+                ("127.0.0.1", dead.port), ("127.0.0.1", server.port)])
+            start = time.monotonic()
+            
+            answer = asyncio.run(resolver.query("example.test"))
+            
+            assert answer.values == ["192.0.2.10"]
+            assert answer.nameserver == f"127.0.0.1:{server.port}"
+            assert time.monotonic() - start < 0.9
+        finally:
+            dead.close()
+
+
+class TestResolve:
+    """Test suite for host name resolution."""
+    
+    def test_addresses(self, server, hosts):
+        """A and AAAA are combined, IPv4 first."""
+        addresses = asyncio.run(make_resolver(server, hosts).resolve("example.test"))
+        
+        assert addresses == ["192.0.2.10", "2001:db8::10"]
+    
+    def test_canonical_name_and_aliases(self, server, hosts):
+        """resolve_ex reports the CNAME chain without extra cache lookups."""
+        resolver = make_resolver(server, hosts)
+        
+        result = asyncio.run(resolver.resolve_ex("www.example.test", socket.AF_INET))
+        
+        assert result == ("example.test", ["www.example.test"], ["192.0.2.10"])
+        assert (resolver.cache.hits, resolver.cache.misses) == (0, 1)
+        assert asyncio.run(resolver.resolve_ex("printer")) == ("printer", [], ["10.1.2.3"])
+    
+    def test_hosts_file_and_literals(self, server, hosts):
+        """The hosts file and IP literals never reach the nameserver."""
+        resolver = make_resolver(server, hosts)
+        
+        assert asyncio.run(resolver.resolve("printer")) == ["10.1.2.3"]
+        assert asyncio.run(resolver.resolve("192.0.2.1")) == ["192.0.2.1"]
+        assert asyncio.run(resolver.reverse("10.1.2.3")) == "printer.test"
+        assert server.queries == []
+    
+    def test_search_domains(self, server, hosts):
+        """Single-label names are tried with the search domains."""
+        resolver = make_resolver(server, hosts, search=["corp.test"])
+        
+        assert asyncio.run(resolver.resolve("db")) == ["192.0.2.30"]
+    
+    def test_unknown_host(self, server, hosts):
+        """Names unknown to DNS and the system resolver raise DNSError."""
+        with pytest.raises(socket.gaierror):
+            asyncio.run(make_resolver(server, hosts).resolve("nothing.invalid"))
+        
+        assert issubclass(DNSError, OSError)
+
+
+class TestConfig:
+    """Test suite for system configuration and the cache."""
+    
+    def test_resolv_conf(self, tmp_path):
+        """Nameservers, search domains and options are read."""
+        path = tmp_path / "resolv.conf"
+        path.write_text("# comment\nnameserver 10.0.0.1\nnameserver ::1\n"
+                        "search a.test b.test\noptions timeout:3 attempts:4 ndots:1\n")
+        
+        conf = read_resolv_conf(str(path))
+        
+        assert conf.nameservers == ["10.0.0.1", "::1"]
+        assert conf.search == ["a.test", "b.test"]
+        assert (conf.timeout, conf.attempts) == (3.0, 4)
+    
+    def test_cache_eviction(self, server, hosts):
+        """The cache keeps at most max_entries answers."""
+        resolver = make_resolver(server, hosts, cache=DNSCache(max_entries=1))
+        
+        asyncio.run(resolver.query("example.test", "A"))
+        asyncio.run(resolver.query("example.test", "MX"))
+        
+        assert len(resolver.cache) == 1
+        assert resolver.cache.get("example.test", "A") is None
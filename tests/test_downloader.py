@@ -0,0 +1,207 @@
+"""Tests for resumable downloads."""
+
+import hashlib
+import json
+import re
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+from pathlib import Path
+
+import pytest
+
+from auryx_agent.tools import downloader
+from auryx_agent.tools.downloader import (ChecksumMismatch, DownloadError, Downloader,
+                                          output_path, parse_checksum)
+from auryx_agent.tools.http_client import HTTPClient
+
+
+DATA = bytes(range(256)) * 4096  # 1 MiB
+HITS = Counter()
+RANGES = []
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, *args):
+        pass
+    
+    def send_data(self, body, status=200, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+    
+    def do_HEAD(self):
+        self.do_GET()
+    
+    def do_GET(self):
+        HITS[self.path, self.command] += 1
+        if self.path == "/missing":
+            self.send_data(b"nope", 404)
+            return
+        if self.path == "/norange":
+            self.send_data(DATA)
+            return
+        if self.path == "/flaky" and self.command == "GET" and HITS[self.path, "GET"] == 1:
+            # Promise the whole file, send half and hang up
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(DATA)))
+            self.end_headers()
+            self.wfile.write(DATA[:len(DATA) // 2])
+            self.close_connection = True
+            return
+        
+        headers = [("Accept-Ranges", "bytes"), ("ETag", '"v1"')]
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if match and self.headers.get("If-Range", '"v1"') == '"v1"':
+            start = int(match.group(1))
+            end = int(match.group(2)) + 1 if match.group(2) else len(DATA)
+            if self.command == "GET":
+                RANGES.append((start, end))
+            headers.append(("Content-Range", f"bytes {start}-{end - 1}/{len(DATA)}"))
+            self.send_data(DATA[start:end], 206, headers)
+        else:
+            self.send_data(DATA, headers=headers)
+
+
+@pytest.fixture
+def server(serve):
+    HITS.clear()
+    RANGES.clear()
+    return serve(Handler)
+
+
+@pytest.fixture
+def client():
+    client = HTTPClient(timeout=5)
+    yield client
+    client.close()
+
+
+class TestHelpers:
+    """Test suite for checksum and path helpers."""
+    
+    def test_parse_checksum(self):
+        """Checksums take an algorithm prefix or are recognised by length."""
+        assert parse_checksum("SHA-256:ABCD") == ("sha256", "abcd")
+        assert parse_checksum("0" * 40) == ("sha1", "0" * 40)
+        with pytest.raises(ValueError):
+            parse_checksum("sha256:xyz")
+        with pytest.raises(ValueError):
+            parse_checksum("nope:abcd")
+    
+    def test_output_path(self, tmp_path):
+        """A directory output keeps the file name from the URL."""
+        assert output_path("http://h/a/file%20x.tar.gz", str(tmp_path)) == tmp_path / "file x.tar.gz"
+        assert output_path("http://h/", str(tmp_path / "out.bin")) == tmp_path / "out.bin"
+    
+    def test_output_path_traversal(self, tmp_path):
+        """Encoded separators and dot segments in the URL stay inside output."""
+        output = str(tmp_path) + "/"
+        for url in ("http://x/..%2F..%2Fevil.sh", "http://x/a/..%5C..%5Cevil.sh", "http://x/%2Fetc%2Fevil.sh"):
+            path = output_path(url, output)
+            assert path == tmp_path / "evil.sh"
+            assert path.resolve().parent == tmp_path.resolve()
+        
+        assert output_path("http://x/%2Fetc%2Fpasswd") == Path("passwd")
+        assert output_path("http://x/a/%2E%2E", output) == tmp_path / "download"
+
+
+class TestDownloader:
+    """Test suite for streaming, resuming and parallel downloads."""
+    
+    def test_single_stream(self, server, client, tmp_path):
+        """A small file is fetched in one request and moved into place."""
+        output = tmp_path / "file.bin"
+        progress = []
+        
+        result = Downloader(client, on_progress=lambda done, total: progress.append(done)).download(
+            server + "/file", str(output))
+        
+        assert output.read_bytes() == DATA
+        assert result.size == len(DATA) and result.parts == 1
+        assert progress[-1] == len(DATA)
+        assert not (tmp_path / "file.bin.part").exists()
+        assert not (tmp_path / "file.bin.part.json").exists()
+    
+    def test_parallel_ranges(self, server, client, tmp_path, monkeypatch):
+        """Large files are split into ranges fetched in parallel."""
+        monkeypatch.setattr(downloader, "MIN_PART_SIZE", 128 * 1024)
+        output = tmp_path / "file.bin"
+        
+        result = Downloader(client, parts=4).download(server + "/file", str(output), parallel=True)
+        
+        assert output.read_bytes() == DATA
+        assert result.parts == 4
+        assert sorted(RANGES) == [(i * 262144, (i + 1) * 262144) for i in range(4)]
+    
+    def test_resume(self, server, client, tmp_path):
+        """A partial download continues with a Range request."""
+        output = tmp_path / "file.bin"
+        (tmp_path / "file.bin.part").write_bytes(DATA[:1000])
+        (tmp_path / "file.bin.part.json").write_text(json.dumps({
+            "url": server + "/file", "size": len(DATA), "validator": '"v1"',
+            "segments": [[0, len(DATA), 1000]]}))
+        
+        result = Downloader(client).download(server + "/file", str(output))
+        
+        assert output.read_bytes() == DATA
+        assert result.resumed_from == 1000
+        assert RANGES == [(1000, len(DATA))]
+    
+    def test_changed_file_restarts(self, server, client, tmp_path):
+        """Saved progress for a different version of the file is discarded."""
+        output = tmp_path / "file.bin"
+        (tmp_path / "file.bin.part").write_bytes(b"x" * 1000)
+        (tmp_path / "file.bin.part.json").write_text(json.dumps({
+            "url": server + "/file", "size": len(DATA), "validator": '"v0"',
+            "segments": [[0, len(DATA), 1000]]}))
+        
+        result = Downloader(client).download(server + "/file", str(output))
+        
+        assert output.read_bytes() == DATA
+        assert result.resumed_from == 0
+    
+    def test_retry_resumes(self, server, client, tmp_path, monkeypatch):
+        """A dropped connection is retried from where it stopped."""
+        monkeypatch.setattr(downloader.time, "sleep", lambda seconds: None)
+        output = tmp_path / "file.bin"
+        
+        Downloader(client).download(server + "/flaky", str(output))
+        
+        assert output.read_bytes() == DATA
+        assert HITS["/flaky", "GET"] == 2
+        assert RANGES == [(len(DATA) // 2, len(DATA))]
+    
+    def test_no_range_support(self, server, client, tmp_path, monkeypatch):
+        """Servers without ranges are downloaded in one stream."""
+        monkeypatch.setattr(downloader, "MIN_PART_SIZE", 128 * 1024)
+        output = tmp_path / "file.bin"
+        
+        result = Downloader(client).download(server + "/norange", str(output), parallel=True)
+        
+        assert output.read_bytes() == DATA
+        assert result.parts == 1
+    
+    def test_checksum(self, server, client, tmp_path):
+        """A matching checksum is verified; a mismatch removes the file."""
+        output = tmp_path / "file.bin"
+        digest = hashlib.sha256(DATA).hexdigest()
+        
+        result = Downloader(client).download(server + "/file", str(output), checksum=f"sha256:{digest}")
+        assert result.checksum == {"algorithm": "sha256", "digest": digest, "verified": True}
+        
+        with pytest.raises(ChecksumMismatch):
+            Downloader(client).download(server + "/file", str(tmp_path / "bad.bin"), checksum="0" * 64)
+        assert list(tmp_path.glob("bad.bin*")) == []
+    
+    def test_http_error(self, server, client, tmp_path):
+        """Error statuses fail without retrying."""
+        with pytest.raises(DownloadError):
+            Downloader(client).download(server + "/missing", str(tmp_path / "x"))
+        assert HITS["/missing", "GET"] == 1
+        assert list(tmp_path.iterdir()) == []
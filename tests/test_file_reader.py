@@ -0,0 +1,143 @@
+"""Tests for windowed file reading."""
+
+import pytest
+
+from auryx_agent.tools import file_reader
+from auryx_agent.tools.computer_tools import ComputerTools
+from auryx_agent.tools.file_reader import (
+    BinaryFileError, LineIndex, read_window, sniff_encoding
+)
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    with open(path, "w") as f:
+        for i in range(1, 10001):
+            f.write(f"line {i} {'ERROR' if i % 2500 == 0 else 'ok'}\n")
+    return str(path)
+
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    """Use tiny index chunks so line lookups cross chunk boundaries."""
+    monkeypatch.setattr(file_reader, "INDEX_CHUNK", 1000)
+    monkeypatch.setattr(file_reader, "_index_cache", file_reader.OrderedDict())
+
+
+class TestSniffEncoding:
+    """Test suite for encoding detection."""
+    
+    def test_encodings(self):
+        """BOMs, UTF-8, legacy text and binary are told apart."""
+        assert sniff_encoding("привет".encode("utf-8")) == "utf-8"
+        assert sniff_encoding("привет".encode("utf-8")[:-1]) == "utf-8"
+        assert sniff_encoding("hi".encode("utf-16")) == "utf-16"
+        assert sniff_encoding(b"\xef\xbb\xbfhi") == "utf-8-sig"
+        assert sniff_encoding("café au lait".encode("latin-1")) == "latin-1"
+        assert sniff_encoding(b"\x7fELF\x02\x01\x00\x00") is None
+
+
+class TestLineIndex:
+    """Test suite for the sparse line index."""
+    
+    def test_offsets_match_lines(self):
+        """Offsets and line numbers agree across chunk boundaries."""
+        data = b"".join(f"{i}\n".encode() * (i % 3 + 1) for i in range(500))
+        lines = data.split(b"\n")
+        index = LineIndex(data, len(data), chunk_size=64)
+        
+        assert index.total_lines == len(lines) - 1
+        for line in (0, 1, 63, 64, 500, index.total_lines - 1):
+            offset = index.offset_of_line(data, line)
+            assert data[offset:].split(b"\n", 1)[0] == lines[line]
+            assert index.line_of_offset(data, offset) == line
+
+
+class TestReadWindow:
+    """Test suite for windowed reads."""
+    
+    def test_line_range(self, log_file, small_chunks):
+        """A line range returns just those lines."""
+        result = read_window(log_file, start_line=4999, end_line=5001)
+        
+        assert result["content"] == "line 4999 ok\nline 5000 ERROR\nline 5001 ok\n"
+        assert (result["start_line"], result["end_line"]) == (4999, 5001)
+        assert result["total_lines"] == 10000
+    
+    def test_tail(self, log_file):
+        """Tail reads the last lines without an index."""
+        result = read_window(log_file, tail_lines=2)
+        
+        assert result["content"] == "line 9999 ok\nline 10000 ERROR\n"
+    
+    def test_grep_with_context(self, log_file):
+        """Grep returns numbered matches and context lines."""
+        result = read_window(log_file, grep=r"ERROR", context=1, max_matches=2)
+        
+        assert [m["line"] for m in result["matches"]] == [2500, 5000]
+        assert result["content"].splitlines()[:3] == [
+            "2499-line 2499 ok", "2500:line 2500 ERROR", "2501-line 2501 ok"
+        ]
+        assert "--" in result["content"]
+        assert result["truncated"]
+    
+    def test_grep_anchors(self, tmp_path):
+        """^ and $ match at line boundaries, in the mmap and wide-encoding paths alike."""
+        for encoding in ("utf-8", "utf-16"):
+            path = tmp_path / f"anchors-{encoding}.txt"
+            path.write_text("alpha\nERROR one\nbeta\nERROR two\n", encoding=encoding)
+            
+            assert [m["line"] for m in read_window(str(path), grep="^ERROR")["matches"]] == [2, 4]
+            assert [m["line"] for m in read_window(str(path), grep="one$")["matches"]] == [2]
+            assert read_window(str(path), grep="^$")["matches"] == []
+    
+    def test_grep_stays_within_lines(self, tmp_path):
+        """A pattern that would only match across a newline matches nothing."""
+        path = tmp_path / "lines.txt"
+        path.write_text("alpha\nbeta\nalpha beta\n")
+        
+        result = read_window(str(path), grep=r"alpha\s+beta")
+        assert [m["line"] for m in result["matches"]] == [3]
+    
+    def test_max_bytes_cuts_at_line_end(self, log_file):
+        """Windows larger than max_bytes are cut at a line boundary."""
+        result = read_window(log_file, max_bytes=100)
+        
+        assert result["truncated"]
+        assert result["content"].endswith("\n")
+        assert len(result["content"]) <= 100
+    
+    def test_binary(self, tmp_path):
+        """Binary files raise for text reads and hex dump byte ranges."""
+        path = tmp_path / "blob.bin"
+        path.write_bytes(bytes(range(64)))
+        
+        with pytest.raises(BinaryFileError):
+            read_window(str(path))
+        
+        result = read_window(str(path), offset=16, length=16)
+        assert result["content"].startswith("00000010  10 11 12")
+    
+    def test_utf16(self, tmp_path):
+        """Wide encodings are decoded before splitting lines."""
+        path = tmp_path / "wide.txt"
+        path.write_text("один\nдва\nтри\n", encoding="utf-16")
+        
+        result = read_window(str(path), start_line=2, end_line=2)
+        assert result["content"] == "два\n"
+
+
+class TestReadFileTool:
+    """Test suite for ComputerTools.read_file."""
+    
+    def test_keeps_result_shape(self, log_file):
+        """max_lines still works and errors keep the old keys."""
+        result = ComputerTools.read_file(log_file, max_lines=2)
+        assert result["success"]
+        assert result["content"] == "line 1 ok\nline 2 ok\n"
+        
+        result = ComputerTools.read_file(log_file + ".missing")
+        assert not result["success"]
+        assert result["content"] == ""
+        assert result["error"]
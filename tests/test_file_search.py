@@ -0,0 +1,88 @@
+"""Tests for the parallel file search engine."""
+
+import os
+
+import pytest
+
+from auryx_agent.tools.file_search import FileSearch, NameIndex, search_files
+
+
+@pytest.fixture
+def tree(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.tmp\n")
+    for i in range(5):
+        pkg = tmp_path / f"pkg{i}" / "sub"
+        pkg.mkdir(parents=True)
+        (pkg / f"mod{i}.py").write_text(f"def handler_{i}():\n    return {i}\n")
+        (pkg / f"notes{i}.tmp").write_text("scratch")
+    (tmp_path / "node_modules" / "lib").mkdir(parents=True)
+    (tmp_path / "node_modules" / "lib" / "vendored.py").write_text("def handler_x(): pass\n")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "secret.py").write_text("")
+    (tmp_path / "blob.py").write_bytes(b"\0\1\2def handler_bin")
+    return tmp_path
+
+
+class TestFileSearch:
+    """Test suite for name and content search."""
+    
+    def test_name_search_prunes(self, tree):
+        """Vendored, hidden and gitignored entries are skipped."""
+        result = search_files(str(tree), pattern="*.py")
+        
+        assert result["results"] == ["blob.py"] + [f"pkg{i}/sub/mod{i}.py" for i in range(5)]
+        assert not result["truncated"]
+        
+        assert search_files(str(tree), pattern="*.tmp")["results"] == []
+        assert "secret.py" in str(search_files(str(tree), pattern="*.py", include_hidden=True)["results"])
+    
+    def test_stops_at_max_results(self, tree):
+        """The search stops once enough files were found."""
+        result = search_files(str(tree), pattern="*.py", max_results=2, workers=1)
+        
+        assert len(result["results"]) == 2
+        assert result["truncated"]
+    
+    def test_content_search(self, tree):
+        """Content search returns matching lines and skips binary files."""
+        result = search_files(str(tree), pattern="*.py", content=r"def handler_[13]\(")
+        
+        assert [r["path"] for r in result["results"]] == ["pkg1/sub/mod1.py", "pkg3/sub/mod3.py"]
+        assert result["results"][0]["matches"] == [{"line": 1, "text": "def handler_1():"}]
+    
+    def test_anchored_content_search(self, tree):
+        """Anchored content patterns match at the start and end of lines."""
+        result = search_files(str(tree), pattern="*.py", content=r"^    return [24]$")
+        
+        assert [r["path"] for r in result["results"]] == ["pkg2/sub/mod2.py", "pkg4/sub/mod4.py"]
+        assert result["results"][0]["matches"] == [{"line": 2, "text": "    return 2"}]
+    
+    def test_missing_directory(self, tmp_path):
+        """Searching a missing directory is an error."""
+        with pytest.raises(NotADirectoryError):
+            FileSearch(str(tmp_path / "missing")).run()
+
+
+class TestNameIndex:
+    """Test suite for the persistent name index."""
+    
+    def test_reuses_listings_until_mtime_changes(self, tree, tmp_path_factory):
+        """Unchanged directories are served from the saved index."""
+        index_path = tmp_path_factory.mktemp("index") / "files.json"
+        
+        FileSearch(str(tree), pattern="*.py", index=NameIndex(index_path)).run()
+        assert index_path.exists()
+        
+        index = NameIndex(index_path)
+        results, _ = FileSearch(str(tree), pattern="*.py", index=index).run()
+        assert index.misses == 0
+        assert len(results) == 6
+        
+        (tree / "pkg0" / "sub" / "new.py").write_text("")
+        stat = os.stat(tree / "pkg0" / "sub")
+        os.utime(tree / "pkg0" / "sub", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        index = NameIndex(index_path)
+        results, _ = FileSearch(str(tree), pattern="*.py", index=index).run()
+        assert index.misses == 1
+        assert "pkg0/sub/new.py" in results
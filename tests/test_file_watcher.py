@@ -0,0 +1,94 @@
+"""Tests for the incremental file watcher."""
+
+import sys
+import time
+
+import pytest
+
+from auryx_agent.tools.computer_tools import ComputerTools
+from auryx_agent.tools.file_watcher import (
+    FileWatcher, WatchTools, find_watcher, unwatch_path, watch_path
+)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+@pytest.fixture(params=["inotify", "polling"])
+def watcher(request, tmp_path):
+    if request.param == "inotify" and not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux only")
+    (tmp_path / ".gitignore").write_text("*.log\n")
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("print('hi')\n")
+    
+    w = FileWatcher(str(tmp_path), use_inotify=request.param == "inotify", poll_interval=0.1).start()
+    assert w.backend == request.param
+    yield w
+    w.stop()
+
+
+class TestFileWatcher:
+    """Test suite for index maintenance."""
+    
+    def test_initial_index(self, watcher):
+        """The first walk fills the index."""
+        assert watcher.find("*.py") == (["src/app.py"], False)
+        assert watcher.stats()["files"] == 2
+    
+    def test_tracks_changes(self, watcher, tmp_path):
+        """Created, modified and deleted files are indexed and logged."""
+        (tmp_path / "src" / "pkg").mkdir()
+        (tmp_path / "src" / "pkg" / "util.py").write_text("x = 1\n")
+        (tmp_path / "debug.log").write_text("ignored\n")
+        assert wait_for(lambda: "src/pkg/util.py" in watcher.find("*.py")[0])
+        
+        (tmp_path / "src" / "app.py").write_text("print('changed, longer')\n")
+        (tmp_path / "src" / "pkg" / "util.py").unlink()
+        assert wait_for(lambda: "src/pkg/util.py" not in watcher.find("*.py")[0])
+        assert wait_for(lambda: any(c["event"] == "modified" for c in watcher.changes()))
+        
+        events = {(c["event"], c["path"]) for c in watcher.changes()}
+        assert ("created", "src/pkg") in events
+        assert ("deleted", "src/pkg/util.py") in events
+        assert ("modified", "src/app.py") in events
+        assert not any(path == "debug.log" for _, path in events)
+    
+    def test_changes_filter(self, watcher, tmp_path):
+        """Changes can be limited to a subdirectory and a time window."""
+        (tmp_path / "other.txt").write_text("x")
+        (tmp_path / "src" / "new.py").write_text("x")
+        assert wait_for(lambda: len(watcher.changes()) >= 2)
+        
+        assert [c["path"] for c in watcher.changes(under="src")] == ["src/new.py"]
+        assert watcher.changes(since=time.time() + 1) == []
+
+
+class TestWatchIntegration:
+    """Test suite for tools answering from the index."""
+    
+    def test_tools_use_index(self, tmp_path):
+        """list_directory and recent_changes use a watched directory's index."""
+        (tmp_path / "a.txt").write_text("a")
+        assert not WatchTools.recent_changes(str(tmp_path))["success"]
+        
+        result = WatchTools.watch_directory(str(tmp_path))
+        try:
+            assert result["success"] and result["files"] == 1
+            assert find_watcher(str(tmp_path))[1] == ""
+            assert watch_path(str(tmp_path)) is find_watcher(str(tmp_path))[0]
+            
+            (tmp_path / "b.txt").write_text("b")
+            assert wait_for(lambda: WatchTools.recent_changes(str(tmp_path))["count"] == 1)
+            
+            listing = ComputerTools.list_directory(str(tmp_path), sizes=True)
+            assert sorted(listing["files"]) == [str(tmp_path / "a.txt"), str(tmp_path / "b.txt")]
+        finally:
+            assert unwatch_path(str(tmp_path))
+        assert find_watcher(str(tmp_path)) is None
@@ -0,0 +1,118 @@
+"""Tests for gitignore-aware directory walking."""
+
+import pytest
+
+from auryx_agent.tools.computer_tools import ComputerTools
+from auryx_agent.tools.fs_walk import GitIgnore, list_tree, walk
+
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / ".gitignore").write_text("*.log\nbuild/\n/secret.txt\n!keep.log\n")
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "main.py").write_text("x" * 100)
+    (tmp_path / "src" / "pkg" / "util.py").write_text("x" * 50)
+    (tmp_path / "src" / "pkg" / ".gitignore").write_text("generated.py\n")
+    (tmp_path / "src" / "pkg" / "generated.py").write_text("x")
+    (tmp_path / "src" / "secret.txt").write_text("not anchored here")
+    (tmp_path / "secret.txt").write_text("hidden")
+    (tmp_path / "debug.log").write_text("log")
+    (tmp_path / "keep.log").write_text("log")
+    (tmp_path / "build").mkdir()
+    (tmp_path / "build" / "out.bin").write_text("x")
+    (tmp_path / "node_modules" / "dep").mkdir(parents=True)
+    (tmp_path / "node_modules" / "dep" / "index.js").write_text("x")
+    (tmp_path / ".env").write_text("x")
+    return tmp_path
+
+
+class TestGitIgnore:
+    """Test suite for gitignore rule matching."""
+    
+    def test_rules(self):
+        """Globs, anchors, directory-only rules and negation."""
+        ignore = GitIgnore(["*.pyc", "/dist", "logs/", "docs/**/*.tmp", "!important.pyc", "# comment"])
+        
+        assert ignore.match("a/b/c.pyc", False)
+        assert ignore.match("important.pyc", False) is False
+        assert ignore.match("dist", True)
+        assert ignore.match("src/dist", True) is None
+        assert ignore.match("logs", True)
+        assert ignore.match("logs", False) is None
+        assert ignore.match("docs/x/y/z.tmp", False)
+        assert ignore.match("docs/z.tmp", False)
+        assert ignore.match("readme.md", False) is None
+    
+    def test_nested_base(self):
+        """Rules of a nested .gitignore only apply below its directory."""
+        ignore = GitIgnore(["*.py"], base="src/pkg")
+        
+        assert ignore.match("src/pkg/a.py", False)
+        assert ignore.match("src/a.py", False) is None
+
+
+class TestWalk:
+    """Test suite for the scandir walker."""
+    
+    def test_gitignore_and_pruning(self, repo):
+        """Ignored entries are skipped and vendored dirs are not entered."""
+        paths = {e.path for e in walk(str(repo))}
+        
+        assert "src/pkg/util.py" in paths
+        assert "src/secret.txt" in paths
+        assert "keep.log" in paths
+        assert "node_modules" in paths
+        for ignored in ("debug.log", "secret.txt", "build", "src/pkg/generated.py",
+                        "node_modules/dep"):
+            assert ignored not in paths
+    
+    def test_depth_and_hidden(self, repo):
+        """max_depth limits levels and dotfiles can be hidden."""
+        paths = {e.path for e in walk(str(repo), max_depth=1, include_hidden=False)}
+        
+        assert "src" in paths
+        assert "src/main.py" not in paths
+        assert ".env" not in paths
+
+
+class TestListTree:
+    """Test suite for listing with sizes and pagination."""
+    
+    def test_sizes_are_aggregated(self, repo):
+        """Directory sizes cover the whole subtree, ignored files included."""
+        result = list_tree(str(repo), depth=1, gitignore=True, sizes=True, sort="size")
+        sizes = {e["path"]: e["size"] for e in result["entries"]}
+        
+        assert sizes["src"] == 100 + 50 + len("not anchored here") + len("generated.py\n") + 1
+        assert sizes["node_modules"] == 1
+        assert "build" not in sizes
+        assert result["entries"][0]["path"] == "src"
+        assert result["total_size"] == sum(
+            p.stat().st_size for p in repo.rglob("*") if p.is_file())
+    
+    def test_pagination_and_pattern(self, repo):
+        """Results are filtered by glob and paginated."""
+        result = list_tree(str(repo), depth=3, pattern="*.py", gitignore=True, limit=1, offset=1)
+        
+        assert result["total"] == 2
+        assert [e["path"] for e in result["entries"]] == ["src/pkg/util.py"]
+        assert not result["has_more"]
+    
+    def test_list_directory_keys(self, repo):
+        """list_directory keeps its files/dirs result shape."""
+        result = ComputerTools.list_directory(str(repo))
+        
+        assert result["success"]
+        assert str(repo / "src") in result["dirs"]
+        assert str(repo / "keep.log") in result["files"]
+        
+        assert str(repo / "debug.log") in result["files"]
+        assert not result["has_more"]
+        
+        result = ComputerTools.list_directory(str(repo), gitignore=True)
+        assert str(repo / "debug.log") not in result["files"]
+        assert str(repo / "build") not in result["dirs"]
+        
+        result = ComputerTools.list_directory(str(repo / "missing"))
+        assert not result["success"]
+        assert result["files"] == [] and result["dirs"] == []
@@ -2,49 +2,18 @@
 
 import pytest
 
+from auryx_agent.core.guard import HallucinationGuard
+
 
 class MockAgent:
     """Mock agent with only hallucination detection method."""
     
+    def __init__(self):
+        self.guard = HallucinationGuard()
+    
     def _detect_hallucination_risk(self, user_input: str, response: str) -> bool:
         """Detect if response might contain hallucinated data."""
-        system_info_keywords = [
-            'neofetch', 'system info', 'disk usage', 'disk space', 'memory', 'cpu', 'processes',
-            'running', 'network', 'connections', 'files', 'directory', 'ls',
-            'ps', 'top', 'df', 'free', 'ifconfig', 'ip addr', 'netstat',
-            'uname', 'hostname', 'uptime', 'who', 'w', 'last', 'kernel'
-        ]
-        
-        user_lower = user_input.lower()
-        asking_for_system_info = any(keyword in user_lower for keyword in system_info_keywords)
-        
-        if not asking_for_system_info:
-            return False
-        
-        has_specific_data = any([
-            'GB' in response or 'MB' in response or 'KB' in response or 'TB' in response,
-            'CPU:' in response or 'Memory:' in response,
-            'Kernel:' in response or 'OS:' in response,
-            '/dev/' in response or '/home/' in response,
-            'PID' in response and 'USER' in response,
-        ])
-        
-        excuse_phrases = [
-            'слишком много данных',
-            'не может быть полностью отображён',
-            'ограничений',
-            'обычно neofetch отображает',
-            'если вам нужно что-то конкретное',
-            'too much data',
-            'cannot be displayed',
-            'limitations',
-            'usually shows',
-            'if you need something specific',
-        ]
-        
-        making_excuses = any(phrase.lower() in response.lower() for phrase in excuse_phrases)
-        
-        return has_specific_data or making_excuses
+        return self.guard.detect(user_input, response)
 
 
 class TestHallucinationPrevention:
@@ -141,6 +110,32 @@ class TestHallucinationPrevention:
         for user_input, response in excuses:
             assert agent._detect_hallucination_risk(user_input, response) is True, \
                 f"Failed to detect excuse in: {response}"
+    
+    def test_word_boundaries(self):
+        """Short keywords must not match inside other words."""
+        agent = MockAgent()
+        
+        # Old substring checks matched 'w', 'ls' and 'ps' inside these words
+        assert agent._detect_hallucination_risk(
+            "what's new in windows tools?",
+            "The update is about 3 GB and adds new settings."
+        ) is False
+        
+        assert agent._detect_hallucination_risk(
+            "show me ps output",
+            "PID USER COMMAND\n1 root init"
+        ) is True
+    
+    def test_relevant_tool(self):
+        """The guard picks the read-only tool that answers the request."""
+        guard = HallucinationGuard()
+        
+        assert guard.relevant_tool("what's my disk usage?") == "get_disk_usage"
+        assert guard.relevant_tool("how much free memory") == "get_memory_info"
+        assert guard.relevant_tool("show running processes") == "list_processes"
+        assert guard.relevant_tool("show neofetch") == "get_system_info"
+        assert guard.relevant_tool("list files in directory") is None
+        assert guard.relevant_tool("disk usage", available={"ping": None}) is None
 
 
 if __name__ == "__main__":
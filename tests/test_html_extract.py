@@ -0,0 +1,160 @@
+"""Tests for readable-content extraction."""
+
+from auryx_agent.tools.html_extract import (
+    HTMLExtractor, estimate_tokens, extract_html, extract_stream
+)
+
+
+PAGE = """<!doctype html>
+<html><head><title>Widget  Guide</title>
+<style>body { color: red }</style><script>trackVisitor();</script>
+<body class="with-sidebar">
+<header><a href="/">Home</a> <a href="/blog">Blog</a></header>
+<nav><ul><li><a href="/a">Docs</a></li><li><a href="/b">Pricing</a></li></ul></nav>
+<main>
+<h1>Installing widgets</h1>
+<p>Run <code>pip install widget</code> and read the <a href="../api/">API <b>reference</b></a>.</p>
+<h2>Configuration</h2>
+<p>Set the <em>timeout</em> option.<br>It defaults to ten seconds.</p>
+<ol><li>First</li><li>Second<ul><li>Nested</li></ul></li></ol>
+<pre>def main():
+    return 1</pre>
+<table><tr><th>Name</th><th>Default</th></tr><tr><td>timeout</td><td>10</td></tr></table>
+<div class="share-buttons"><a href="https://twitter.com">Tweet</a></div>
+</main>
+<footer>Copyright 2024</footer>
+</body></html>
+"""
+
+
+class TestExtraction:
+    """Test suite for HTML to markdown conversion."""
+    
+    def test_markdown(self):
+        """Headings, inline markup, links, lists, code and tables become markdown."""
+        result = extract_html(PAGE, "https://example.com/docs/install")
+        
+        assert result.title == "Widget Guide"
+        assert result.content == (
+            "# Installing widgets\n\n"
+            "Run `pip install widget` and read the "
+            "[API **reference**](https://example.com/api/).\n\n"
+            "## Configuration\n\n"
+            "Set the *timeout* option.\nIt defaults to ten seconds.\n\n"
+            "1. First\n1. Second\n  - Nested\n\n"
+            "```\ndef main():\n    return 1\n```\n\n"
+            "| Name | Default |\n| timeout | 10 |"
+        )
+        assert not result.truncated
+    
+    def test_boilerplate_removed(self):
+        """Scripts, styles, navigation, header, footer and share widgets are dropped."""
+        content = extract_html(PAGE).content
+        
+        for text in ("trackVisitor", "color: red", "Pricing", "Home", "Copyright", "Tweet"):
+            assert text not in content
+    
+    def test_without_main(self):
+        """Without marked main content, link-heavy menus are dropped."""
+        html = ("<div><a href='/1'>One</a> <a href='/2'>Two</a></div>"
+                "<div><p>Real text with a <a href='/x'>link</a> in it.</p></div>")
+        
+        assert extract_html(html).content == "Real text with a link in it."
+    
+    def test_absolute_link_menus_dropped(self):
+        """Link density ignores the markdown URLs, so absolute-link menus are dropped too."""
+        html = ("<div><a href='https://x.com/1'>One</a> <a href='https://x.com/2'>Two</a> "
+                "<a href='https://x.com/3'>Three</a></div><p>Real text here.</p>")
+        
+        assert extract_html(html).content == "Real text here."
+    
+    def test_inline_boilerplate_flushed(self):
+        """Text around a nav inside a block isn't merged into the nav or out of it."""
+        html = "<div>Intro<nav><a href='/z'>Nav link</a></nav>Body text</div>"
+        
+        assert extract_html(html, "https://example.com/").content == "Intro\n\nBody text"
+    
+    def test_svg_title_ignored(self):
+        """Only the page's title counts, not titles inside inline SVG."""
+        html = ("<html><head><title>Real Page</title></head><body>"
+                "<svg><title>Search icon</title></svg><p>Text</p></body></html>")
+        
+        result = extract_html(html)
+        assert result.title == "Real Page"
+        assert result.content == "Text"
+    
+    def test_unclosed_tags(self):
+        """Sloppy HTML with unclosed paragraphs and list items still parses."""
+        html = "<html><head><title>T</title><body><p>one<p>two<ul><li>a<li>b</ul>"
+        
+        assert extract_html(html).content == "one\n\ntwo\n\n- a\n- b"
+
+
+class TestBudget:
+    """Test suite for token budgets and query ranking."""
+    
+    def make_page(self):
+        sections = []
+        for topic in ("installation", "authentication", "pagination", "rate limits"):
+            body = " ".join(f"Details about {topic} number {i}." for i in range(40))
+            sections.append(f"<h2>{topic.title()}</h2><p>{body}</p>")
+        return "<article>" + "".join(sections) + "</article>"
+    
+    def test_budget_from_top(self):
+        """Without a query the page is taken from the top until the budget is used."""
+        result = extract_html(self.make_page(), max_tokens=500)
+        
+        assert result.tokens <= 500
+        assert result.truncated
+        assert result.content.startswith("## Installation")
+        assert "Rate Limits" not in result.content
+    
+    def test_query_ranking(self):
+        """A query selects the most relevant section."""
+        result = extract_html(self.make_page(), max_tokens=500, query="how do rate limits work")
+        
+        assert result.content.startswith("## Rate Limits")
+        assert "Installation" not in result.content
+    
+    def test_oversized_chunk_is_cut(self):
+        """A single block over the budget is cut rather than dropped."""
+        result = extract_html("<p>" + "word " * 2000 + "</p>", max_tokens=100)
+        
+        assert 0 < result.tokens <= 100
+        assert result.truncated
+    
+    def test_estimate_tokens(self):
+        """Tokens are estimated at about four characters each."""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("a" * 400) == 100
+
+
+class TestStreaming:
+    """Test suite for incremental parsing."""
+    
+    def test_split_chunks(self):
+        """Bytes split anywhere, even inside tags and UTF-8 sequences, parse the same."""
+        data = PAGE.replace("widgets", "widgets ünïcödé").encode()
+        whole = extract_html(data.decode()).content
+        
+        result, size = extract_stream((data[i:i + 7] for i in range(0, len(data), 7)))
+        
+        assert result.content == whole
+        assert size == len(data)
+    
+    def test_stops_early(self):
+        """Parsing stops once enough text has been collected."""
+        blocks = [b"<p>block %d %s</p>" % (i, b"x" * 100) for i in range(10000)]
+        
+        result, size = extract_stream(iter(blocks), max_tokens=50)
+        
+        assert size < sum(len(block) for block in blocks) / 2
+        assert result.truncated
+    
+    def test_max_chars(self):
+        """The extractor reports done after max_chars of text."""
+        parser = HTMLExtractor(max_chars=100)
+        parser.feed("<p>" + "a" * 60 + "</p><p>" + "b" * 60 + "</p>")
+        
+        assert parser.done
+        assert len(parser.close().blocks) == 2
@@ -0,0 +1,208 @@
+"""Tests for the on-disk HTTP cache."""
+
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from auryx_agent.tools.http_cache import CacheEntry, HTTPCache, parse_cache_control
+from auryx_agent.tools.http_client import HTTPClient
+
+
+HITS = Counter()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, *args):
+        pass
+    
+    def reply(self, status, body=b"", headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def do_GET(self):
+        path = self.path.split("?")[0]
+        HITS[path] += 1
+        if path == "/fresh":
+            self.reply(200, b"fresh body", [("Cache-Control", "max-age=60")])
+        elif path == "/etag":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.reply(304, headers=[("ETag", '"v1"'), ("Cache-Control", "no-cache")])
+            else:
+                self.reply(200, b"etag body", [("ETag", '"v1"'), ("Cache-Control", "no-cache")])
+        elif path == "/no-store":
+            self.reply(200, b"secret", [("Cache-Control", "no-store"), ("ETag", '"x"')])
+        elif path == "/swr":
+            self.reply(200, b"version %d" % HITS[path],
+                       [("Cache-Control", "max-age=0, stale-while-revalidate=60")])
+        elif path == "/plain":
+            self.reply(200, b"no caching headers")
+        elif path == "/chunked":
+            self.send_response(200)
+            self.send_header("Cache-Control", "max-age=60")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for _ in range(10):
+                self.wfile.write(b"64\r\n" + b"x" * 100 + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.reply(200, b"x" * 1000, [("Cache-Control", "max-age=60")])
+
+
+@pytest.fixture
+def server(serve):
+    HITS.clear()
+    return serve(Handler)
+
+
+@pytest.fixture
+def client(tmp_path):
+    client = HTTPClient(timeout=5, cache=HTTPCache(tmp_path / "cache.db"))
+    yield client
+    client.close()
+
+
+class TestFreshness:
+    """Test suite for freshness calculations."""
+    
+    def test_parse_cache_control(self):
+        """Directives are lower-cased and values unquoted."""
+        assert parse_cache_control('Max-Age=60, no-cache, foo="bar"') == {
+            "max-age": "60", "no-cache": None, "foo": "bar"}
+    
+    def test_lifetime(self):
+        """max-age wins, then Expires, then the Last-Modified heuristic."""
+        now = time.time()
+        entry = CacheEntry("u", 200, "OK", [("Cache-Control", "max-age=30")], b"", now)
+        assert entry.lifetime() == 30
+        assert entry.is_fresh(now + 10) and not entry.is_fresh(now + 40)
+        
+        entry = CacheEntry("u", 200, "OK", [("Date", "Mon, 01 Jan 2024 00:00:00 GMT"),
+                                            ("Expires", "Mon, 01 Jan 2024 00:02:00 GMT")], b"", now)
+        assert entry.lifetime() == 120
+        
+        entry = CacheEntry("u", 200, "OK", [("Date", "Thu, 11 Jan 2024 00:00:00 GMT"),
+                                            ("Last-Modified", "Mon, 01 Jan 2024 00:00:00 GMT")], b"", now)
+        assert entry.lifetime() == 86400
+    
+    def test_default_ttl(self):
+        """default_ttl applies only without explicit freshness information."""
+        now = time.time()
+        assert CacheEntry("u", 200, "OK", [], b"", now).lifetime(300) == 300
+        assert CacheEntry("u", 200, "OK", [("Cache-Control", "no-cache")], b"", now).lifetime(300) == 0
+
+
+class TestHTTPCache:
+    """Test suite for cached fetches."""
+    
+    def test_fresh_hit(self, server, client):
+        """A fresh response is served from disk without a request."""
+        first = client.get(server + "/fresh", cache=True)
+        assert first.content == b"fresh body"
+        second = client.get(server + "/fresh", cache=True)
+        
+        assert second.content == b"fresh body"
+        assert (first.cache_status, second.cache_status) == ("miss", "hit")
+        assert HITS["/fresh"] == 1
+    
+    def test_revalidation(self, server, client):
+        """A stale response with an ETag is revalidated with a 304."""
+        client.get(server + "/etag", cache=True).content
+        second = client.get(server + "/etag", cache=True)
+        
+        assert second.cache_status == "revalidated"
+        assert second.content == b"etag body"
+        assert HITS["/etag"] == 2
+        assert client.cache.stats()["revalidated"] == 1
+    
+    def test_no_store(self, server, client):
+        """no-store responses are never kept."""
+        client.get(server + "/no-store", cache=True).content
+        client.get(server + "/no-store", cache=True).content
+        
+        assert HITS["/no-store"] == 2
+        assert client.cache.stats()["entries"] == 0
+    
+    def test_default_ttl(self, server, client):
+        """Responses without caching headers are reused for default_ttl."""
+        client.get(server + "/plain", cache=True, default_ttl=60).content
+        assert client.get(server + "/plain", cache=True, default_ttl=60).cache_status == "hit"
+        
+        client.get(server + "/plain", cache=True).content
+        assert HITS["/plain"] == 2
+    
+    def test_stale_while_revalidate(self, server, client):
+        """A stale response is served at once and refreshed in the background."""
+        assert client.get(server + "/swr", cache=True).content == b"version 1"
+        
+        stale = client.get(server + "/swr", cache=True)
+        assert stale.cache_status == "stale"
+        assert stale.content == b"version 1"
+        
+        deadline = time.time() + 5
+        while client.cache.get(server + "/swr").body != b"version 2" and time.time() < deadline:
+            time.sleep(0.05)
+        assert client.cache.get(server + "/swr").body == b"version 2"
+    
+    def test_request_no_cache(self, server, client):
+        """Cache-Control: no-cache in the request bypasses a fresh entry."""
+        client.get(server + "/fresh", cache=True).content
+        response = client.get(server + "/fresh", cache=True, headers={"Cache-Control": "no-cache"})
+        
+        assert response.cache_status == "miss"
+        assert HITS["/fresh"] == 2
+    
+    def test_uncached_requests(self, server, client):
+        """Requests without cache=True always go to the network."""
+        client.get(server + "/fresh").content
+        client.get(server + "/fresh").content
+        
+        assert HITS["/fresh"] == 2
+    
+    def test_abandoned_body_not_stored(self, server, client):
+        """A body that is read only partly is not cached, and not read in full."""
+        response = client.get(server + "/big", cache=True)
+        assert len(next(response.iter_content(100))) <= 100
+        response.close()
+        
+        assert client.cache.get(server + "/big") is None
+    
+    def test_oversized_body_not_stored(self, server, tmp_path):
+        """Chunked bodies over max_entry_bytes stream through uncached."""
+        client = HTTPClient(cache=HTTPCache(tmp_path / "small.db", max_entry_bytes=10))
+        
+        assert client.get(server + "/chunked", cache=True).content == b"x" * 1000
+        assert client.cache.get(server + "/chunked") is None
+        client.close()
+    
+    def test_lru_eviction(self, server, tmp_path):
+        """The least recently used entries are evicted past max_bytes."""
+        cache = HTTPCache(tmp_path / "small.db", max_bytes=2500)
+        client = HTTPClient(cache=cache)
+        for name in ("a", "b", "c"):
+            client.get(f"{server}/{name}", cache=True).content
+            time.sleep(0.01)
+        client.get(f"{server}/a", cache=True).content  # a is now more recent than b
+        client.get(f"{server}/d", cache=True).content
+        
+        assert cache.get(f"{server}/b") is None
+        assert cache.get(f"{server}/a") is not None
+        assert cache.stats()["bytes"] <= 2500
+        client.close()
+    
+    def test_persistence(self, server, tmp_path):
+        """Entries survive a new cache instance on the same file."""
+        client = HTTPClient(cache=HTTPCache(tmp_path / "cache.db"))
+        client.get(server + "/fresh", cache=True).content
+        
+        other = HTTPClient(cache=HTTPCache(tmp_path / "cache.db"))
+        assert other.get(server + "/fresh", cache=True).cache_status == "hit"
+        client.close()
+        other.close()
@@ -0,0 +1,364 @@
+"""Tests for the pooled HTTP client."""
+
+import base64
+import gzip
+import json
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler
+from urllib.parse import quote, unquote
+
+import pytest
+
+from auryx_agent.tools.http_cache import HTTPCache
+from auryx_agent.tools.http_client import HTTPClient, HTTPError, get_client, redirect_headers
+from auryx_agent.tools.web_tools import WebTools
+
+
+PAGE = b"<html><body>" + b"<p>hello world</p>" * 200 + b"</body></html>"
+ACTIVE = {"now": 0, "max": 0}
+ACTIVE_LOCK = threading.Lock()
+PROXIED = []
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    
+    def log_message(self, *args):
+        pass
+    
+    def send_body(self, body, status=200, headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+    
+    def do_HEAD(self):
+        if self.path == "/nohead":
+            self.send_body(b"", 405)
+        else:
+            self.send_body(PAGE, headers=[("Content-Type", "text/html")])
+    
+    def do_GET(self):
+        if self.path == "/gzip":
+            self.send_body(gzip.compress(PAGE), headers=[("Content-Encoding", "gzip"),
+                                                         ("Content-Type", "text/html")])
+        elif self.path == "/deflate":
+            self.send_body(zlib.compress(PAGE), headers=[("Content-Encoding", "deflate")])
+        elif self.path == "/redirect":
+            self.send_body(b"moved", 302, [("Location", "/final")])
+        elif self.path == "/loop":
+            self.send_body(b"", 301, [("Location", "/loop")])
+        elif self.path == "/slow":
+            time.sleep(1)
+            self.send_body(b"late")
+        elif self.path.startswith("/to?"):
+            self.send_body(b"", 302, [("Location", unquote(self.path[4:]))])
+        elif self.path == "/credentials":
+            received = {name: self.headers.get(name) for name in ("Authorization", "Cookie", "X-Trace")}
+            self.send_body(json.dumps(received).encode(), headers=[("Content-Type", "application/json")])
+        elif self.path == "/missing":
+            self.send_body(b"not here", 404)
+        elif self.path == "/chunked":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for part in (b"one ", b"two ", b"three"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+            self.wfile.write(b"0\r\n\r\n")
+        elif self.path.startswith("/slow-page/"):
+            with ACTIVE_LOCK:
+                ACTIVE["now"] += 1
+                ACTIVE["max"] = max(ACTIVE["max"], ACTIVE["now"])
+            time.sleep(0.3)
+            with ACTIVE_LOCK:
+                ACTIVE["now"] -= 1
+            name = self.path.rsplit("/", 1)[1].encode()
+            self.send_body(b"<title>%s</title><p>Page %s</p>" % (name, name),
+                           headers=[("Content-Type", "text/html")])
+        elif self.path == "/many-links":
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Cache-Control", "max-age=60")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            try:
+                for i in range(2000):
+                    part = b"".join(b'<a href="/p%d-%d">page</a>' % (i, j) for j in range(100))
+                    self.wfile.write(b"%x\r\n%s\r\n" % (len(part), part))
+                self.wfile.write(b"0\r\n\r\n")
+            except OSError:
+                pass  # the client stopped reading
+        elif self.path == "/links":
+            self.send_body(b'<a href="https://example.com/a">a</a> <a href="/local">b</a>',
+                           headers=[("Content-Type", "text/html; charset=utf-8")])
+        else:
+            self.send_body(PAGE, headers=[("Content-Type", "text/html; charset=utf-8")])
+
+
+class ProxyHandler(Handler):
+    """Answers every request itself, recording what a proxy would forward."""
+    
+    def do_GET(self):
+        PROXIED.append((self.path, self.headers.get("Host"), self.headers.get("Proxy-Authorization")))
+        self.send_body(b"via proxy")
+
+
+@pytest.fixture
+def proxy(serve):
+    """A local HTTP proxy stand-in."""
+    PROXIED.clear()
+    return serve(ProxyHandler)
+
+
+@pytest.fixture
+def server(serve):
+    """A keep-alive HTTP/1.1 server on a free local port."""
+    return serve(Handler)
+
+
+@pytest.fixture
+def other_server(serve):
+    """A second server, i.e. another origin."""
+    return serve(Handler)
+
+
+@pytest.fixture
+def client():
+    client = HTTPClient(timeout=5)
+    yield client
+    client.close()
+
+
+class TestHTTPClient:
+    """Test suite for requests, pooling and decoding."""
+    
+    def test_keep_alive_reuse(self, server, client):
+        """Sequential requests to one host share a connection."""
+        for _ in range(3):
+            assert client.get(server + "/").content == PAGE
+        
+        stats = client.stats()
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 2
+        assert stats["idle_connections"] == 1
+    
+    def test_content_encodings(self, server, client):
+        """gzip and deflate bodies are decoded."""
+        assert client.get(server + "/gzip").content == PAGE
+        assert client.get(server + "/deflate").content == PAGE
+    
+    def test_streaming(self, server, client):
+        """Chunked bodies stream and the connection is reused afterwards."""
+        response = client.get(server + "/chunked")
+        assert b"".join(response.iter_content(4)) == b"one two three"
+        
+        assert client.get(server + "/").ok
+        assert client.stats()["connections_opened"] == 1
+    
+    def test_redirects(self, server, client):
+        """Redirects are followed and recorded in the history."""
+        response = client.get(server + "/redirect")
+        
+        assert response.status_code == 200
+        assert response.url == server + "/final"
+        assert [r.status_code for r in response.history] == [302]
+    
+    def test_redirect_credentials(self, server, other_server, client):
+        """Credentials follow same-origin redirects only."""
+        headers = {"Authorization": "Bearer secret", "Cookie": "id=1", "X-Trace": "t"}
+        
+        same = client.get(f"{server}/to?{quote(server + '/credentials')}", headers=headers).json()
+        other = client.get(f"{server}/to?{quote(other_server + '/credentials')}", headers=headers).json()
+        
+        assert same == {"Authorization": "Bearer secret", "Cookie": "id=1", "X-Trace": "t"}
+        assert other == {"Authorization": None, "Cookie": None, "X-Trace": "t"}
+    
+    def test_redirect_downgrade(self):
+        """Redirects from https to http are refused."""
+        with pytest.raises(HTTPError):
+            redirect_headers("https://example.com/", "http://example.com/", {})
+        assert redirect_headers("http://example.com/", "https://example.com:443/a",
+                                {"Cookie": "id=1"}) == {}
+        assert redirect_headers("https://example.com/", "https://example.com:443/a",
+                                {"Cookie": "id=1"}) == {"Cookie": "id=1"}
+    
+    def test_redirect_loop(self, server, client):
+        """A redirect loop stops after max_redirects."""
+        client.max_redirects = 3
+        with pytest.raises(HTTPError):
+            client.get(server + "/loop")
+    
+    def test_head_keeps_connection(self, server, client):
+        """A closed HEAD response returns its connection to the pool."""
+        response = client.head(server + "/")
+        response.close()
+        
+        assert response.status_code == 200
+        assert client.get(server + "/").content == PAGE
+        assert client.stats()["connections_reused"] == 1
+    
+    def test_abandoned_body_drops_connection(self, server, client):
+        """Closing a response with unread body discards the connection."""
+        client.get(server + "/").close()
+        
+        assert client.get(server + "/").content == PAGE
+        assert client.stats()["connections_opened"] == 2
+    
+    def test_timeout(self, server, client):
+        """Slow responses raise a timeout error."""
+        with pytest.raises(OSError):
+            client.get(server + "/slow", timeout=0.2).content
+    
+    def test_bad_url(self, client):
+        """Only http and https URLs are accepted."""
+        with pytest.raises(HTTPError):
+            client.get("ftp://example.com/file")
+    
+    def test_http_proxy(self, proxy, monkeypatch):
+        """http_proxy from the environment gets absolute-URI requests and the credentials."""
+        monkeypatch.setenv("http_proxy", proxy.replace("//", "//user:p%40ss@"))
+        client = HTTPClient(timeout=5)
+        
+        assert client.get("http://example.invalid/page?q=1").content == b"via proxy"
+        client.close()
+        
+        credentials = base64.b64encode(b"user:p@ss").decode()
+        assert PROXIED == [("http://example.invalid/page?q=1", "example.invalid", f"Basic {credentials}")]
+    
+    def test_no_proxy(self, server, proxy):
+        """Hosts listed in no_proxy are reached directly."""
+        client = HTTPClient(timeout=5, proxies={"http": proxy, "no": "127.0.0.1"})
+        
+        assert client.get(server + "/").content == PAGE
+        client.close()
+        assert PROXIED == []
+
+
+class TestWebTools:
+    """Test suite for the web tools on top of the client."""
+    
+    @pytest.fixture(autouse=True)
+    def private_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(get_client(), "cache", HTTPCache(tmp_path / "cache.db"))
+    
+    def test_fetch_url(self, server):
+        """Pages are fetched, decoded and reduced to their text."""
+        result = WebTools().fetch_url(server + "/gzip")
+        
+        assert result["success"]
+        assert result["content"] == "hello world"
+        assert result["size"] == len(PAGE)
+    
+    def test_fetch_url_bare_host(self, server):
+        """A URL without a scheme is fetched over http."""
+        result = WebTools().fetch_url(server[len("http://"):] + "/gzip")
+        
+        assert result["success"]
+        assert result["content"] == "hello world"
+    
+    def test_fetch_url_cached(self, server):
+        """A repeated fetch is answered from the cache."""
+        tools = WebTools()
+        
+        assert not tools.fetch_url(server + "/")["cached"]
+        assert tools.fetch_url(server + "/")["cached"]
+    
+    def test_fetch_url_error_status(self, server):
+        """HTTP errors are reported as failures."""
+        result = WebTools().fetch_url(server + "/missing")
+        
+        assert not result["success"]
+        assert result["status_code"] == 404
+    
+    def test_check_website(self, server):
+        """A running site is accessible; HEAD refusals fall back to GET."""
+        tools = WebTools()
+        
+        assert tools.check_website(server)["status_code"] == 200
+        assert tools.check_website(server + "/nohead")["status_code"] == 200
+    
+    def test_check_website_down(self):
+        """A closed port is reported as not accessible."""
+        result = WebTools().check_website("http://127.0.0.1:9")
+        
+        assert result["success"]
+        assert not result["accessible"]
+        assert result["error"]
+    
+    def test_download_file(self, server, tmp_path):
+        """Downloads stream the body to disk."""
+        output = tmp_path / "page.html"
+        
+        result = WebTools().download_file(server + "/", str(output))
+        
+        assert result["success"]
+        assert output.read_bytes() == PAGE
+        assert result["size"] == len(PAGE)
+    
+    def test_extract_links_streams_with_cache(self, server):
+        """With the cache on, reading still stops at the limit and nothing partial is cached."""
+        result = WebTools().extract_links(server + "/many-links", limit=5)
+        
+        assert result["count"] == 5
+        assert result["size"] < 100_000
+        assert get_client().cache.get(server + "/many-links") is None
+    
+    def test_extract_links(self, server):
+        """Links are resolved, classified and filtered by scope."""
+        tools = WebTools()
+        
+        result = tools.extract_links(server + "/links")
+        assert [link["url"] for link in result["links"]] == ["https://example.com/a", server + "/local"]
+        assert (result["internal"], result["external"]) == (1, 1)
+        
+        result = tools.extract_links(server + "/links", scope="internal")
+        assert result["links"] == [{"url": server + "/local", "text": "b", "internal": True}]
+
+
+class TestFetchMany:
+    """Test suite for batch fetching."""
+    
+    @pytest.fixture(autouse=True)
+    def private_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(get_client(), "cache", HTTPCache(tmp_path / "cache.db"))
+        ACTIVE.update(now=0, max=0)
+    
+    def test_concurrent(self, server):
+        """Pages are fetched in parallel and returned in the given order."""
+        urls = [f"{server}/slow-page/{i}" for i in range(4)]
+        
+        start = time.monotonic()
+        result = WebTools().fetch_many(urls)
+        
+        assert time.monotonic() - start < 1.0
+        assert result["fetched"] == 4
+        assert [page["title"] for page in result["pages"]] == ["0", "1", "2", "3"]
+        assert result["pages"][2]["content"] == "Page 2"
+    
+    def test_per_host_limit(self, server):
+        """No more than per_host requests run against one host at once."""
+        urls = ",".join(f"{server}/slow-page/{i}" for i in range(4))
+        
+        result = WebTools().fetch_many(urls, per_host=2)
+        
+        assert result["fetched"] == 4
+        assert ACTIVE["max"] == 2
+    
+    def test_errors_are_per_page(self, server):
+        """A failing URL is reported without failing the batch."""
+        result = WebTools().fetch_many([server + "/missing", server + "/slow-page/ok"])
+        
+        assert result["success"]
+        assert result["failed"] == 1
+        assert "404" in result["pages"][0]["error"]
+        assert result["pages"][1]["content"] == "Page ok"
+    
+    def test_limits(self):
+        """Empty and oversized batches are rejected."""
+        assert not WebTools().fetch_many([])["success"]
+        assert not WebTools().fetch_many([f"http://h{i}.test/" for i in range(50)])["success"]
@@ -0,0 +1,111 @@
+"""Tests for the in-process ping."""
+
+import socket
+import sys
+
+import pytest
+
+from auryx_agent.tools import icmp
+from auryx_agent.tools.icmp import (
+    PingStats, build_echo, checksum, parse_echo_reply, parse_ping_output, ping, ping_many
+)
+
+
+LINUX_OUTPUT = """\
+PING example.com (93.184.216.34) 56(84) bytes of data.
+64 bytes from 93.184.216.34: icmp_seq=1 ttl=56 time=11.2 ms
+64 bytes from 93.184.216.34: icmp_seq=2 ttl=56 time=12.8 ms
+"""
+
+WINDOWS_OUTPUT = """\
+Reply from 10.0.0.1: bytes=32 time<1ms TTL=64
+Reply from 10.0.0.1: bytes=32 time=3ms TTL=64
+"""
+
+
+@pytest.fixture
+def fake_ping(monkeypatch):
+    """Route the subprocess fallback to a script printing canned output."""
+    monkeypatch.setattr(icmp, "icmp_available", lambda family=socket.AF_INET: False)
+    monkeypatch.setattr(icmp, "ping_command", lambda address, count, timeout, interval=1.0: [
+        sys.executable, "-c", f"print({LINUX_OUTPUT!r})",
+    ])
+
+
+class TestPackets:
+    """Test suite for ICMP packet handling."""
+    
+    def test_checksum(self):
+        """A packet including its checksum sums to zero."""
+        packet = build_echo(0x1234, 7, b"payload!")
+        
+        assert checksum(packet) == 0
+        assert checksum(b"\x00\x01\xf2") == checksum(b"\x00\x01\xf2\x00")
+    
+    def test_reply_parsing(self):
+        """Echo replies are parsed with or without an IP header."""
+        reply = bytearray(build_echo(1, 9, b"abcdefgh"))
+        reply[0] = icmp.ICMP_ECHO_REPLY
+        ip_header = bytes([0x45]) + bytes(19)
+        
+        assert parse_echo_reply(bytes(reply)) == (9, b"abcdefgh")
+        assert parse_echo_reply(ip_header + bytes(reply)) == (9, b"abcdefgh")
+        assert parse_echo_reply(build_echo(1, 9, b"abcdefgh")) is None
+
+
+class TestStats:
+    """Test suite for ping statistics."""
+    
+    def test_output_parsing(self):
+        """Reply times are read from Linux and Windows output."""
+        assert parse_ping_output(LINUX_OUTPUT) == [0.0112, 0.0128]
+        assert parse_ping_output(WINDOWS_OUTPUT) == [0.001, 0.003]
+    
+    def test_summary(self):
+        """min/avg/max/mdev and loss follow ping's definitions."""
+        stats = PingStats("h", transmitted=4, rtts=[0.010, 0.020, 0.030])
+        summary = stats.summary()
+        
+        assert stats.loss == 25.0
+        assert (summary["min_ms"], summary["avg_ms"], summary["max_ms"]) == (10.0, 20.0, 30.0)
+        assert summary["mdev_ms"] == pytest.approx(8.165, abs=0.001)
+        assert "3 received, 25% packet loss" in stats.text()
+    
+    def test_no_replies(self):
+        """A host that never answered has full loss and no RTTs."""
+        result = PingStats("h", transmitted=2).to_dict()
+        
+        assert result["packet_loss"] == 100.0
+        assert result["avg_ms"] is None and not result["success"]
+
+
+class TestPing:
+    """Test suite for pinging hosts."""
+    
+    def test_subprocess_fallback(self, fake_ping):
+        """Without ICMP sockets the ping binary's output is parsed."""
+        stats = ping("127.0.0.1", count=2)
+        
+        assert stats.method == "subprocess"
+        assert stats.received == 2 and stats.loss == 0
+    
+    def test_many(self, fake_ping):
+        """Several hosts are pinged concurrently, in order."""
+        results = ping_many(["127.0.0.1", "localhost"], count=2)
+        
+        assert [r.host for r in results] == ["127.0.0.1", "localhost"]
+        assert results[1].address == "127.0.0.1"
+    
+    def test_unresolvable(self):
+        """Resolution failures are reported, not raised."""
+        stats = ping("nonexistent.invalid", count=1)
+        
+        assert "resolve failed" in stats.error
+    
+    @pytest.mark.skipif(not icmp.icmp_available(), reason="unprivileged ICMP sockets not permitted")
+    def test_icmp_loopback(self):
+        """Loopback answers over an ICMP datagram socket."""
+        stats = ping("127.0.0.1", count=3, interval=0.01, timeout=1.0)
+        
+        assert stats.method == "icmp"
+        assert stats.received == 3
@@ -0,0 +1,106 @@
+"""Tests for streaming link extraction."""
+
+import pytest
+
+from auryx_agent.tools.link_extract import LinkExtractor, extract_links_stream, normalize_url
+
+
+BASE = "https://docs.example.com/guide/intro.html"
+
+
+def links_of(html, **kwargs):
+    parser = LinkExtractor(BASE, **kwargs)
+    parser.feed(html)
+    return parser.close()
+
+
+class TestNormalizeURL:
+    """Test suite for URL normalisation."""
+    
+    def test_normalize(self):
+        """Scheme and host are lower-cased; default ports and fragments dropped."""
+        assert normalize_url("HTTPS://Example.COM:443/a?b=1#top") == "https://example.com/a?b=1"
+        assert normalize_url("http://example.com") == "http://example.com/"
+        assert normalize_url("http://user:pw@example.com:8080/x") == "http://example.com:8080/x"
+
+
+class TestLinkExtractor:
+    """Test suite for the link parser."""
+    
+    def test_resolves_relative_links(self):
+        """Relative, root-relative and protocol-relative links become absolute."""
+        links = links_of('<a href="next.html">Next</a><a href="/api/">API</a>'
+                         '<a href="//cdn.example.org/x.js">cdn</a><a href="../up">Up</a>')
+        
+        assert [link.url for link in links] == [
+            "https://docs.example.com/guide/next.html",
+            "https://docs.example.com/api/",
+            "https://cdn.example.org/x.js",
+            "https://docs.example.com/up",
+        ]
+    
+    def test_classifies_and_dedups(self):
+        """Duplicates keep their first position; links are internal or external."""
+        links = links_of('<a href="https://other.org/">Other</a><a href="/a">A</a>'
+                         '<a href="/a#section">A again</a><a href="https://OTHER.org">Dup</a>')
+        
+        assert [(link.url, link.internal) for link in links] == [
+            ("https://other.org/", False), ("https://docs.example.com/a", True)]
+        assert links[0].text == "Other"
+    
+    def test_skips_non_http(self):
+        """Fragments, javascript:, mailto: and empty hrefs are ignored."""
+        assert links_of('<a href="#top">t</a><a href="javascript:void(0)">j</a>'
+                        '<a href="mailto:a@b.c">m</a><a>none</a><a href=" ">blank</a>') == []
+    
+    def test_link_text(self):
+        """Anchor text is collapsed and falls back to an image's alt text."""
+        links = links_of('<a href="/a">  Read\n <b>more</b> &amp; more </a>'
+                         '<a href="/logo"><img src="l.png" alt="Home"></a>'
+                         '<a href="/x" rel="nofollow ugc">x</a>')
+        
+        assert [link.text for link in links] == ["Read more & more", "Home", "x"]
+        assert links[2].nofollow
+    
+    def test_base_tag(self):
+        """The first <base> changes how relative links resolve."""
+        links = links_of('<base href="https://docs.example.com/v2/"><base href="/ignored/">'
+                         '<a href="page">p</a>')
+        
+        assert links[0].url == "https://docs.example.com/v2/page"
+    
+    def test_scope(self):
+        """scope keeps only internal or only external links."""
+        html = '<a href="https://other.org/">o</a><a href="/a">a</a>'
+        
+        assert [link.url for link in links_of(html, scope="internal")] == ["https://docs.example.com/a"]
+        assert [link.url for link in links_of(html, scope="external")] == ["https://other.org/"]
+        with pytest.raises(ValueError):
+            LinkExtractor(BASE, scope="nearby")
+
+
+class TestStreaming:
+    """Test suite for chunked input."""
+    
+    def test_split_across_chunks(self):
+        """Tags and multi-byte characters split between chunks are handled."""
+        html = '<p>café</p><a href="/späť">Ünïcode</a>'.encode()
+        chunks = [html[i:i + 3] for i in range(0, len(html), 3)]
+        
+        parser, size = extract_links_stream(chunks, "utf-8", BASE)
+        
+        assert size == len(html)
+        assert [(link.url, link.text) for link in parser.links] == [
+            ("https://docs.example.com/späť", "Ünïcode")]
+    
+    def test_stops_at_limit(self):
+        """Reading stops once the limit is reached, after the last link's text."""
+        def chunks():
+            for i in range(100_000):
+                yield b'<a href="/p%d">Page %d</a>' % (i, i)
+        
+        parser, size = extract_links_stream(chunks(), base_url=BASE, limit=5)
+        
+        assert len(parser.links) == 5
+        assert parser.links[-1].text == "Page 4"
+        assert size < 200
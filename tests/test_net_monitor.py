@@ -0,0 +1,125 @@
+"""Tests for the background network monitor."""
+
+import math
+import socket
+import time
+
+import pytest
+
+from auryx_agent.tools.net_monitor import (
+    NetworkMonitor, RingBuffer, Target, find_anomalies, percentile, stop_monitor, summarize
+)
+from auryx_agent.tools.network_tools import NetworkTools
+
+
+@pytest.fixture
+def listener():
+    """A listening socket on a free local port."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(64)
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+class TestRingBuffer:
+    """Test suite for the array-backed ring buffer."""
+    
+    def test_wraps_around(self):
+        """Only the newest samples are kept, oldest first."""
+        buffer = RingBuffer(3)
+        for i in range(5):
+            buffer.append(float(i), i / 10)
+        
+        times, values = buffer.snapshot()
+        
+        assert len(buffer) == 3
+        assert times == [2.0, 3.0, 4.0]
+        assert values == pytest.approx([0.2, 0.3, 0.4])
+    
+    def test_window(self):
+        """snapshot(since) drops older samples."""
+        buffer = RingBuffer(10)
+        for i in range(4):
+            buffer.append(float(i), 0.01)
+        
+        assert buffer.snapshot(since=2.0)[0] == [2.0, 3.0]
+
+
+class TestStatistics:
+    """Test suite for summaries and anomaly flags."""
+    
+    def test_percentiles(self):
+        """Percentiles interpolate between ranks."""
+        values = [1.0, 2.0, 3.0, 4.0, 5.0]
+        
+        assert percentile(values, 50) == 3.0
+        assert percentile(values, 90) == pytest.approx(4.6)
+        assert math.isnan(percentile([], 50))
+    
+    def test_summary(self):
+        """Loss counts lost samples; latency stats are in milliseconds."""
+        summary = summarize([0.010, float("nan"), 0.020, 0.030])
+        
+        assert summary["samples"] == 4 and summary["loss"] == 25.0
+        assert (summary["min_ms"], summary["p50_ms"], summary["max_ms"]) == (10.0, 20.0, 30.0)
+        assert summary["jitter_ms"] == 10.0
+    
+    def test_anomalies(self):
+        """Outages, loss and latency spikes are flagged."""
+        nan = float("nan")
+        down = [0.01, 0.01, nan, nan, nan]
+        spike = [0.01] * 10 + [0.2]
+        
+        assert find_anomalies("ping", down, summarize(down))[0].startswith("down")
+        assert any("spike" in f for f in find_anomalies("ping", spike, summarize(spike)))
+        assert find_anomalies("ping", [0.01] * 10, summarize([0.01] * 10)) == []
+
+
+class TestTargets:
+    """Test suite for target specs."""
+    
+    def test_parse(self):
+        """Hosts are pinged, host:port is TCP and dns: is a DNS timing."""
+        assert Target.parse("1.1.1.1").kind == "ping"
+        assert Target.parse("example.com:443").port == 443
+        assert Target.parse("[2001:db8::1]:22").host == "2001:db8::1"
+        assert Target.parse("dns:example.com").kind == "dns"
+        with pytest.raises(ValueError):
+            Target.parse("example.com:http")
+
+
+class TestMonitor:
+    """Test suite for sampling."""
+    
+    def test_background_sampling(self, listener):
+        """Samples accumulate on the background thread until stopped."""
+        rounds = []
+        monitor = NetworkMonitor([f"127.0.0.1:{listener}", "127.0.0.1:1"], interval=0.1,
+                                 on_sample=rounds.append)
+        
+        monitor.start()
+        time.sleep(0.5)
+        monitor.stop()
+        summary = monitor.summary()
+        
+        assert not monitor.running and len(rounds) >= 3
+        up, down = summary["targets"]
+        assert up["loss"] == 0 and up["p50_ms"] is not None
+        assert down["loss"] == 100.0
+        assert any(a.startswith("127.0.0.1:1: down") for a in summary["anomalies"])
+    
+    def test_tool(self, listener):
+        """One call starts the monitor and returns a summary."""
+        try:
+            result = NetworkTools.network_monitor(targets=f"127.0.0.1:{listener}", interval=0.1)
+            
+            assert result["success"] and result["running"]
+            assert result["targets"][0]["samples"] >= 1
+            assert NetworkTools.network_monitor("stop")["running"] is False
+        finally:
+            stop_monitor()
+    
+    def test_bad_action(self):
+        """Unknown actions are reported."""
+        assert not NetworkTools.network_monitor("restart")["success"]
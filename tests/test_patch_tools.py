@@ -0,0 +1,161 @@
+"""Tests for batched multi-file editing."""
+
+import pytest
+
+from auryx_agent.tools.patch_tools import (
+    Document, PatchError, PatchTools, parse_unified_diff, replace_text
+)
+
+
+DIFF = """\
+diff --git a/app.py b/app.py
+index 1111111..2222222 100644
+--- a/app.py
++++ b/app.py
+@@ -1,4 +1,4 @@
+ import os
+
+-DEBUG = True
++DEBUG = False
+ PORT = 8000
+--- /dev/null
++++ b/notes.txt
+@@ -0,0 +1,2 @@
++first
++second
+"""
+
+
+@pytest.fixture
+def project(tmp_path):
+    (tmp_path / "app.py").write_text("import os\n\nDEBUG = True\nPORT = 8000\n")
+    (tmp_path / "config.ini").write_text("[main]\r\nname = demo\r\n")
+    return tmp_path
+
+
+class TestParseDiff:
+    """Test suite for unified diff parsing."""
+    
+    def test_trailing_blank_lines(self):
+        """Blank lines after a complete hunk are not read as context."""
+        patches = parse_unified_diff(DIFF + "\n\n")
+        
+        assert [len(hunk.lines) for patch in patches for hunk in patch.hunks] == [5, 2]
+    
+    def test_format_patch_trailer(self):
+        """A git format-patch signature after the last hunk is ignored."""
+        patches = parse_unified_diff(DIFF + "-- \n2.43.0\n")
+        
+        assert patches[1].hunks[0].new_lines == ["first", "second"]
+    
+    def test_multi_file(self):
+        """git headers are skipped and a/ b/ prefixes stripped."""
+        patches = parse_unified_diff(DIFF)
+        
+        assert [p.path for p in patches] == ["app.py", "notes.txt"]
+        assert patches[1].is_new
+        assert patches[0].hunks[0].old_lines == ["import os", "", "DEBUG = True", "PORT = 8000"]
+    
+    def test_bad_counts(self):
+        """Hunks whose line counts don't match the header are rejected."""
+        with pytest.raises(PatchError):
+            parse_unified_diff("--- a/x\n+++ b/x\n@@ -1,3 +1,3 @@\n-a\n+b\n")
+    
+    def test_no_headers(self):
+        """Text without file headers is not a patch."""
+        with pytest.raises(PatchError):
+            parse_unified_diff("just some text")
+
+
+class TestDocument:
+    """Test suite for newline handling."""
+    
+    def test_round_trip(self):
+        """Newline style and missing final newline are preserved."""
+        for text in ("a\nb\n", "a\r\nb\r\n", "a\nb", ""):
+            assert Document(text).text() == text
+
+
+class TestApplyPatch:
+    """Test suite for PatchTools.apply_patch."""
+    
+    def test_applies_across_files(self, project):
+        """A multi-file diff modifies and creates files."""
+        result = PatchTools.apply_patch(DIFF, base_dir=str(project))
+        
+        assert result["success"]
+        assert [f["status"] for f in result["files"]] == ["modified", "created"]
+        assert (project / "app.py").read_text() == "import os\n\nDEBUG = False\nPORT = 8000\n"
+        assert (project / "notes.txt").read_text() == "first\nsecond\n"
+    
+    def test_offset_hunk(self, project):
+        """Hunks are found by context when line numbers drifted."""
+        (project / "app.py").write_text("# header\n# more\nimport os\n\nDEBUG = True\nPORT = 8000\n")
+        
+        result = PatchTools.apply_patch(DIFF, base_dir=str(project))
+        
+        assert result["success"]
+        assert "DEBUG = False" in (project / "app.py").read_text()
+    
+    def test_all_or_nothing(self, project):
+        """If one file fails, no file is written."""
+        (project / "notes.txt").write_text("already here\n")
+        
+        result = PatchTools.apply_patch(DIFF, base_dir=str(project))
+        
+        assert not result["success"]
+        assert "already exists" in result["error"]
+        assert "DEBUG = True" in (project / "app.py").read_text()
+    
+    def test_dry_run(self, project):
+        """dry_run validates without writing."""
+        result = PatchTools.apply_patch(DIFF, base_dir=str(project), dry_run=True)
+        
+        assert result["success"]
+        assert not result["applied"]
+        assert not (project / "notes.txt").exists()
+
+
+class TestEditFiles:
+    """Test suite for PatchTools.edit_files."""
+    
+    def test_search_replace(self, project):
+        """Edits apply in order and keep CRLF line endings."""
+        result = PatchTools.edit_files([
+            {"path": "app.py", "search": "DEBUG = True", "replace": "DEBUG = False"},
+            {"path": "app.py", "search": "PORT = 8000", "replace": "PORT = 9000"},
+            {"path": "config.ini", "search": "name = demo\n", "replace": "name = prod\nmode = fast\n"},
+        ], base_dir=str(project))
+        
+        assert result["success"]
+        assert (project / "app.py").read_text() == "import os\n\nDEBUG = False\nPORT = 9000\n"
+        assert (project / "config.ini").read_bytes() == b"[main]\r\nname = prod\r\nmode = fast\r\n"
+    
+    def test_create_and_delete(self, project):
+        """Whole-file content creates files and delete removes them."""
+        result = PatchTools.edit_files([
+            {"path": "sub/new.py", "content": "x = 1\n"},
+            {"path": "config.ini", "delete": True},
+        ], base_dir=str(project))
+        
+        assert [f["status"] for f in result["files"]] == ["created", "deleted"]
+        assert (project / "sub" / "new.py").read_text() == "x = 1\n"
+        assert not (project / "config.ini").exists()
+    
+    def test_ambiguous_search(self):
+        """A snippet that occurs twice needs more context or 'all'."""
+        with pytest.raises(PatchError):
+            replace_text("a a", "a", "b", "f")
+        
+        assert replace_text("a a", "a", "b", "f", replace_all=True) == ("b b", 2)
+    
+    def test_failure_writes_nothing(self, project):
+        """A missing snippet aborts the whole batch."""
+        result = PatchTools.edit_files([
+            {"path": "app.py", "search": "DEBUG = True", "replace": "DEBUG = False"},
+            {"path": "app.py", "search": "missing", "replace": "x"},
+        ], base_dir=str(project))
+        
+        assert not result["success"]
+        assert "DEBUG = True" in (project / "app.py").read_text()
+        assert [f["status"] for f in result["files"]] == ["not applied"]
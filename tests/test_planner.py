@@ -0,0 +1,74 @@
+"""Tests for plan-and-execute mode."""
+
+import threading
+
+import pytest
+
+from auryx_agent.core.planner import PlanError, PlanExecutor, parse_plan, plan_waves
+
+
+class TestPlanner:
+    """Test suite for plan parsing and execution."""
+    
+    def test_parse_plan(self):
+        """Plans are extracted from JSON surrounded by text."""
+        response = 'Here is my plan: {"plan": [' \
+                   '{"id": "a", "tool": "get_disk_usage", "args": {"path": "/"}},' \
+                   '{"id": "b", "tool": "get_memory_info"},' \
+                   '{"id": "c", "tool": "list_processes", "after": ["a", "b"]}]}'
+        
+        steps = parse_plan(response)
+        
+        assert [s.id for s in steps] == ["a", "b", "c"]
+        assert steps[0].args == {"path": "/"}
+        assert steps[2].after == ["a", "b"]
+        assert [[s.id for s in wave] for wave in plan_waves(steps)] == [["a", "b"], ["c"]]
+    
+    def test_single_tool_call_is_a_plan(self):
+        """A classic tool call is treated as a one-step plan."""
+        steps = parse_plan('{"tool": "ping", "args": {"host": "example.com"}}')
+        
+        assert len(steps) == 1
+        assert steps[0].tool == "ping"
+    
+    def test_plain_answer_has_no_plan(self):
+        """A direct answer means no tools are needed."""
+        assert parse_plan("Python is a programming language.") is None
+    
+    def test_invalid_plans(self):
+        """Cycles, unknown dependencies and oversized plans are rejected."""
+        with pytest.raises(PlanError):
+            parse_plan('{"plan": [{"id": "a", "tool": "x", "after": ["b"]},'
+                       '{"id": "b", "tool": "y", "after": ["a"]}]}')
+        with pytest.raises(PlanError):
+            parse_plan('{"plan": [{"id": "a", "tool": "x", "after": ["zzz"]}]}')
+        with pytest.raises(PlanError):
+            parse_plan('{"plan": [%s]}' % ",".join('{"tool": "x"}' for _ in range(20)))
+    
+    def test_independent_steps_run_in_parallel(self):
+        """Steps of one wave run concurrently; failures skip dependents."""
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def wait_for_peer():
+            barrier.wait()
+            return {"success": True}
+        
+        tools = {
+            "first": wait_for_peer,
+            "second": wait_for_peer,
+            "broken": lambda: {"success": False, "error": "nope"},
+            "after": lambda: {"success": True},
+        }
+        steps = parse_plan('{"plan": ['
+                           '{"id": "a", "tool": "first"},'
+                           '{"id": "b", "tool": "second"},'
+                           '{"id": "c", "tool": "broken"},'
+                           '{"id": "d", "tool": "after", "after": ["c"]},'
+                           '{"id": "e", "tool": "missing"}]}')
+        
+        results = PlanExecutor(tools).execute(steps)
+        
+        assert results[0].ok and results[1].ok
+        assert not results[2].ok
+        assert results[3].skipped
+        assert "Unknown tool" in results[4].error
@@ -0,0 +1,112 @@
+"""Tests for the concurrent port scanner."""
+
+import socket
+import time
+
+import pytest
+
+from auryx_agent.tools.network_tools import NetworkTools
+from auryx_agent.tools.port_scanner import (
+    COMMON_PORTS, PortScanner, parse_ports, scan_ports, service_name
+)
+
+
+@pytest.fixture
+def listener():
+    """A listening socket on a free local port."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(16)
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+def free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class TestParsePorts:
+    """Test suite for port specifications."""
+    
+    def test_ranges_and_lists(self):
+        """Ranges and single ports are merged, deduplicated and sorted."""
+        assert parse_ports("8080, 20-22,21") == [20, 21, 22, 8080]
+        assert parse_ports([443, 80]) == [80, 443]
+        assert parse_ports(22) == [22]
+    
+    def test_default(self):
+        """No specification means the common ports."""
+        assert parse_ports(None) == COMMON_PORTS
+    
+    def test_invalid(self):
+        """Malformed and out-of-range ports are rejected."""
+        for spec in ("abc", "10-5", "0", "70000", "1-70000"):
+            with pytest.raises(ValueError):
+                parse_ports(spec)
+
+
+class TestPortScanner:
+    """Test suite for the asynchronous scanner."""
+    
+    def test_open_and_closed(self, listener):
+        """A listening port is open and a free port is closed."""
+        closed = free_port()
+        
+        result = scan_ports("127.0.0.1", [listener, closed], timeout=1.0)
+        
+        assert result["open_ports"] == [listener]
+        assert closed in result["closed_ports"]
+        assert result["total_scanned"] == 2
+    
+    def test_results_streamed(self, listener):
+        """on_result sees every port as it completes."""
+        seen = []
+        
+        PortScanner(concurrency=8).scan("127.0.0.1", f"{listener},{free_port()}", seen.append)
+        
+        assert len(seen) == 2
+        assert [r.port for r in seen if r.is_open] == [listener]
+    
+    def test_concurrent(self, listener):
+        """Hundreds of ports finish well within one timeout each."""
+        start = time.monotonic()
+        
+        result = scan_ports("127.0.0.1", f"{listener},40000-40299", concurrency=128)
+        
+        assert result["total_scanned"] == 301
+        assert listener in result["open_ports"]
+        assert time.monotonic() - start < 10
+    
+    def test_rate_limit(self, listener):
+        """A per-host rate limit spaces out connection attempts."""
+        start = time.monotonic()
+        
+        PortScanner(rate=20).scan("127.0.0.1", [listener] + list(range(40000, 40005)))
+        
+        assert time.monotonic() - start >= 0.2
+
+
+class TestNetworkTools:
+    """Test suite for the NetworkTools.scan_ports wrapper."""
+    
+    def test_result_keys(self, listener):
+        """The wrapper keeps the original result keys and adds services."""
+        result = NetworkTools.scan_ports("127.0.0.1", ports=str(listener))
+        
+        assert result["success"]
+        assert result["open_ports"] == [listener]
+        assert listener in result["services"]
+    
+    def test_bad_spec(self):
+        """A bad port specification is reported as an error."""
+        result = NetworkTools.scan_ports("127.0.0.1", ports="nope")
+        
+        assert not result["success"]
+        assert "Invalid port" in result["error"]
+    
+    def test_service_name(self):
+        """Well-known ports are named."""
+        assert service_name(22) == "ssh"
+        assert service_name(27017) == "mongodb"
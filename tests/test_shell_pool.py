@@ -0,0 +1,142 @@
+"""Tests for persistent shell sessions."""
+
+import sys
+
+import pytest
+
+from auryx_agent.core.config import Config
+from auryx_agent.tools import shell_pool
+from auryx_agent.tools.computer_tools import ComputerTools
+from auryx_agent.tools.shell_pool import ResourceLimits, ShellPool, get_shell_pool
+
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX shell sessions")
+
+
+@pytest.fixture
+def pool():
+    shells = ShellPool(max_sessions=2)
+    yield shells
+    shells.close_all()
+
+
+class TestShellSession:
+    """Test suite for sentinel-framed shell sessions."""
+    
+    def test_state_persists(self, pool, tmp_path):
+        """cd and export carry over to the next command."""
+        pool.run(f"cd {tmp_path} && export AURYX_TEST=42")
+        result = pool.run("pwd; echo $AURYX_TEST")
+        
+        assert result["success"]
+        assert result["stdout"] == f"{tmp_path}\n42\n"
+        assert result["cwd"] == str(tmp_path)
+    
+    def test_output_and_exit_code(self, pool):
+        """stdout, stderr and exit codes are framed per command."""
+        result = pool.run("printf no-newline; echo oops >&2; false")
+        
+        assert result["stdout"] == "no-newline"
+        assert result["stderr"] == "oops\n"
+        assert result["returncode"] == 1
+        assert not result["success"]
+    
+    def test_stdin_is_not_consumed(self, pool):
+        """Commands reading stdin don't swallow the framing."""
+        result = pool.run("cat; echo done")
+        
+        assert result["stdout"] == "done\n"
+    
+    def test_timeout_resets_session(self, pool, tmp_path):
+        """A timed out command kills the shell, the next one gets a fresh shell."""
+        pool.run(f"cd {tmp_path}")
+        result = pool.run("sleep 10", timeout=0.5)
+        
+        assert result["timed_out"]
+        assert result["session_reset"]
+        
+        result = pool.run("pwd")
+        assert result["success"]
+        assert result["stdout"] == f"{tmp_path}\n"
+    
+    def test_exit_resets_session(self, pool):
+        """Exiting the shell is reported and recovered from."""
+        result = pool.run("exit 3")
+        assert result["session_reset"]
+        
+        assert pool.run("echo back")["stdout"] == "back\n"
+    
+    def test_streaming_callback(self, pool):
+        """Output is forwarded to the callback without the sentinel."""
+        chunks = []
+        pool.run("echo one; echo two", on_output=lambda stream, text: chunks.append(text))
+        
+        assert "".join(chunks) == "one\ntwo\n"
+    
+    def test_resource_limits(self, tmp_path):
+        """File size limits are inherited by commands."""
+        pool = ShellPool(limits=ResourceLimits(max_file_size_mb=1))
+        try:
+            pool.run(f"cd {tmp_path}")
+            result = pool.run("head -c 2000000 /dev/zero > /dev/null && echo ok; "
+                              "head -c 2000000 /dev/zero > big.bin 2>/dev/null; echo $?; rm -f big.bin",
+                              timeout=10)
+            assert result["stdout"].startswith("ok\n")
+            assert result["stdout"].strip().splitlines()[-1] != "0"
+        finally:
+            pool.close_all()
+
+
+class TestShellPool:
+    """Test suite for session management."""
+    
+    def test_sessions_are_isolated(self, pool, tmp_path):
+        """Each named session has its own cwd."""
+        pool.run(f"cd {tmp_path}", session="a")
+        pool.run("cd /", session="b")
+        
+        assert pool.run("pwd", session="a")["stdout"] == f"{tmp_path}\n"
+        assert pool.run("pwd", session="b")["stdout"] == "/\n"
+    
+    def test_lru_eviction(self, pool):
+        """The least recently used session is closed when the pool is full."""
+        for name in ("a", "b", "c"):
+            pool.run("true", session=name)
+        
+        assert set(pool.sessions()) == {"b", "c"}
+    
+    def test_close(self, pool):
+        """Sessions can be closed explicitly."""
+        pool.run("true", session="x")
+        
+        assert pool.close("x")
+        assert not pool.close("x")
+
+
+class TestConfiguredLimits:
+    """Test suite for limits from the [shell] config section."""
+    
+    @pytest.fixture
+    def limits(self, monkeypatch):
+        limits = ResourceLimits.from_config(Config(shell_max_file_size_mb=1))
+        monkeypatch.setattr(shell_pool, "_default_limits", limits)
+        monkeypatch.setattr(shell_pool, "_default_pool", None)
+        yield limits
+        if shell_pool._default_pool is not None:
+            shell_pool._default_pool.close_all()
+    
+    def test_from_config(self):
+        """Zero means unlimited."""
+        limits = ResourceLimits.from_config(Config(shell_max_cpu_seconds=5))
+        
+        assert limits == ResourceLimits(max_cpu_seconds=5)
+        assert not ResourceLimits.from_config(Config()).enabled
+    
+    def test_tools_use_configured_limits(self, limits, tmp_path):
+        """execute_command and the shared session pool both apply the limits."""
+        command = f"head -c 2000000 /dev/zero > {tmp_path}/big.bin"
+        
+        assert get_shell_pool().limits is limits
+        assert not ComputerTools.execute_command(command)["success"]
+        assert not ComputerTools.run_in_session(command, session="limits")["success"]
+        assert ComputerTools.execute_command(f"head -c 1000 /dev/zero > {tmp_path}/small.bin")["success"]
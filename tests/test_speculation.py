@@ -0,0 +1,63 @@
+"""Tests for speculative tool prefetch."""
+
+from auryx_agent.core.speculation import SpeculativeExecutor, predict_tools
+from auryx_agent.tools.registry import ToolRegistry, ToolSpec
+
+
+class CountingTools:
+    """Fake tool implementations that count calls."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def get_disk_usage(self, path: str = "/"):
+        self.calls += 1
+        return {"success": True, "path": path}
+
+
+def make_registry(impl):
+    registry = ToolRegistry(specs=[])
+    registry.register(ToolSpec(name="get_disk_usage", module="", attribute="",
+                               read_only=True, target=impl.get_disk_usage))
+    registry.register(ToolSpec(name="list_processes", module="", attribute="",
+                               read_only=False, target=lambda: {"success": True}))
+    return registry
+
+
+class TestSpeculation:
+    """Test suite for prefetch prediction and hand-over."""
+    
+    def test_predict_tools(self):
+        """Keywords map to tools on word boundaries only."""
+        assert predict_tools("what's my disk usage?") == ["get_disk_usage"]
+        assert predict_tools("show free memory and top processes") == ["get_memory_info", "list_processes"]
+        assert predict_tools("explain the dfs algorithm") == []
+        assert predict_tools("hello") == []
+    
+    def test_prefetched_result_is_handed_over(self):
+        """A matching call reuses the prefetched result."""
+        impl = CountingTools()
+        executor = SpeculativeExecutor(make_registry(impl))
+        
+        assert executor.start("disk usage please") == ["get_disk_usage"]
+        assert executor.take("get_disk_usage", {"path": "/"}) == {"success": True, "path": "/"}
+        assert impl.calls == 1
+        assert executor.hits == 1
+        executor.shutdown()
+    
+    def test_different_args_are_not_reused(self):
+        """A call with other arguments must run the tool normally."""
+        impl = CountingTools()
+        executor = SpeculativeExecutor(make_registry(impl))
+        
+        executor.start("disk space")
+        assert executor.take("get_disk_usage", {"path": "/home"}) is None
+        assert executor.take("get_disk_usage", {}) is None
+        executor.shutdown()
+    
+    def test_only_read_only_tools_are_prefetched(self):
+        """Tools not marked read-only are never started speculatively."""
+        executor = SpeculativeExecutor(make_registry(CountingTools()))
+        
+        assert executor.start("show running processes") == []
+        executor.shutdown()
@@ -0,0 +1,112 @@
+"""Tests for streaming command execution."""
+
+import inspect
+import sys
+import threading
+
+import pytest
+
+from auryx_agent.tools.computer_tools import ComputerTools, run_command
+from auryx_agent.tools.streaming import OutputBuffer, StreamingCommand, run_streaming
+
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX shell commands")
+
+
+class TestOutputBuffer:
+    """Test suite for bounded head/tail buffers."""
+    
+    def test_small_output_is_kept(self):
+        """Output smaller than the buffer is returned unchanged."""
+        buffer = OutputBuffer(10, 10)
+        buffer.write("hello\n")
+        buffer.write("world\n")
+        
+        assert buffer.text() == "hello\nworld\n"
+        assert buffer.lines == 2
+        assert not buffer.truncated
+    
+    def test_large_output_keeps_head_and_tail(self):
+        """Only the head and the tail of large output are kept."""
+        buffer = OutputBuffer(5, 5)
+        for chunk in ("HEAD-", "x" * 1000, "-TAIL"):
+            buffer.write(chunk)
+        
+        text = buffer.text()
+        assert text.startswith("HEAD-")
+        assert text.endswith("-TAIL")
+        assert "chars omitted" in text
+        assert buffer.total == 1010
+        assert buffer.truncated
+
+
+class TestStreamingCommand:
+    """Test suite for streaming subprocess execution."""
+    
+    def test_output_is_streamed(self):
+        """Chunks reach the callback and the result matches the old format."""
+        chunks = []
+        result = run_streaming("echo out; echo err >&2; exit 3",
+                               on_output=lambda stream, text: chunks.append((stream, text)))
+        
+        assert result["stdout"] == "out\n"
+        assert result["stderr"] == "err\n"
+        assert result["returncode"] == 3
+        assert result["success"] is False
+        assert ("stdout", "out\n") in chunks
+    
+    def test_timeout_keeps_partial_output(self):
+        """A timed out command still returns what it printed."""
+        result = run_streaming("echo started; sleep 10", timeout=0.5)
+        
+        assert result["timed_out"] is True
+        assert result["stdout"] == "started\n"
+        assert "timed out" in result["stderr"]
+        assert result["duration"] < 5
+    
+    def test_cancel(self):
+        """Commands can be cancelled from another thread."""
+        cancel = threading.Event()
+        timer = threading.Timer(0.3, cancel.set)
+        timer.start()
+        
+        result = run_streaming("sleep 10", timeout=None, cancel_event=cancel)
+        
+        assert result["cancelled"] is True
+        assert result["returncode"] == -1
+    
+    def test_progress(self):
+        """Progress reports characters and lines read so far."""
+        command = StreamingCommand("printf 'a\\nb\\n'").start()
+        command.wait()
+        
+        progress = command.progress()
+        assert progress["running"] is False
+        assert progress["stdout_chars"] == 4
+        assert progress["lines"] == 2
+
+
+class TestExecuteCommand:
+    """Test suite for the execute_command tool."""
+    
+    def test_callbacks_are_not_tool_arguments(self):
+        """The model can't pass callbacks, events or limits to the tool."""
+        parameters = inspect.signature(ComputerTools.execute_command).parameters
+        
+        assert list(parameters) == ["command", "cwd", "timeout"]
+        with pytest.raises(TypeError):
+            ComputerTools.execute_command("echo hi", on_output=print)
+    
+    def test_session_callbacks_are_not_tool_arguments(self):
+        """run_in_session takes only the model-facing arguments as well."""
+        parameters = inspect.signature(ComputerTools.run_in_session).parameters
+        
+        assert list(parameters) == ["command", "session", "timeout"]
+    
+    def test_run_command_streams(self):
+        """The agent-side entry point streams output like the tool would return it."""
+        chunks = []
+        result = run_command("echo out", on_output=lambda stream, text: chunks.append(text))
+        
+        assert result == {**ComputerTools.execute_command("echo out"), "duration": result["duration"]}
+        assert "".join(chunks) == "out\n"
@@ -0,0 +1,112 @@
+"""Tests for multi-host network sweeps."""
+
+import asyncio
+import socket
+
+import pytest
+
+from auryx_agent.tools import sweep
+from auryx_agent.tools.icmp import PingStats
+from auryx_agent.tools.network_tools import NetworkTools
+from auryx_agent.tools.sweep import HostResult, NetworkSweep, expand_targets, format_table, sweep_network
+
+
+@pytest.fixture
+def listener():
+    """A listening socket on a free local port."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(16)
+    yield sock.getsockname()[1]
+    sock.close()
+
+
+class TestExpandTargets:
+    """Test suite for target expansion."""
+    
+    def test_cidr_and_names(self):
+        """Networks expand to their hosts and duplicates are dropped."""
+        hosts = expand_targets("10.0.0.0/30, example.com 10.0.0.1")
+        
+        assert hosts == ["10.0.0.1", "10.0.0.2", "example.com"]
+    
+    def test_single_address_network(self):
+        """A /32 is the address itself."""
+        assert expand_targets(["192.168.1.7/32"]) == ["192.168.1.7"]
+    
+    def test_limits(self):
+        """Oversized, malformed and empty specs are rejected."""
+        for spec in ("10.0.0.0/8", "10.0.0.0/33", " , "):
+            with pytest.raises(ValueError):
+                expand_targets(spec)
+
+
+class TestSweep:
+    """Test suite for NetworkSweep."""
+    
+    def test_ports_and_streaming(self, listener):
+        """Every host is reported once, with its open ports."""
+        seen = []
+        
+        result = sweep_network(["127.0.0.1", "localhost"], ports=str(listener), ping=False,
+                               resolve=False, on_result=seen.append)
+        
+        assert sorted(h.host for h in seen) == ["127.0.0.1", "localhost"]
+        assert result["alive"] == 2
+        assert all(h["open_ports"] == [listener] for h in result["hosts"])
+        assert result["hosts"][1]["address"] == "127.0.0.1"
+    
+    def test_ping_fallback(self, monkeypatch):
+        """Only a ping that can't be started switches the sweep to TCP."""
+        outcomes = {
+            "10.0.0.1": PingStats("10.0.0.1", method="subprocess", transmitted=1, error="ping exited with 2"),
+            "10.0.0.2": PingStats("10.0.0.2", method="subprocess", error="ping is unavailable"),
+        }
+        
+        async def fake_ping(address, count, timeout):
+            return outcomes[address]
+        
+        async def ping(sweeper, address):
+            return await sweeper._ping(address, asyncio.Semaphore(1))
+        
+        monkeypatch.setattr(sweep, "ping_async", fake_ping)
+        sweeper = NetworkSweep()
+        
+        assert asyncio.run(ping(sweeper, "10.0.0.1")) is None
+        assert sweeper._ping_available
+        assert asyncio.run(ping(sweeper, "10.0.0.2")) is None
+        assert not sweeper._ping_available
+    
+    def test_unresolvable(self):
+        """Names that don't resolve are reported as errors, not exceptions."""
+        result = sweep_network("nonexistent.invalid", ping=False, timeout=0.5)
+        
+        assert result["alive"] == 0
+        assert "resolve failed" in result["hosts"][0]["error"]
+    
+    def test_table(self):
+        """The summary table lists live hosts with their ports."""
+        up = HostResult("10.0.0.2", address="10.0.0.2", alive=True, method="tcp", latency=0.002,
+                        open_ports=[22], services={22: "ssh"})
+        down = HostResult("10.0.0.1", address="10.0.0.1")
+        
+        table = format_table([up, down])
+        
+        assert "22/ssh" in table and "10.0.0.1 " not in table
+        assert format_table([up, down], show_down=True).splitlines()[1].startswith("10.0.0.1")
+
+
+class TestNetworkTools:
+    """Test suite for the NetworkTools.network_sweep wrapper."""
+    
+    def test_result(self, listener):
+        """The tool returns JSON-friendly host dicts and a table."""
+        result = NetworkTools.network_sweep("127.0.0.1/32", ports=[listener], ping=False)
+        
+        assert result["success"]
+        assert result["hosts"][0]["open_ports"] == [listener]
+        assert "127.0.0.1" in result["table"]
+    
+    def test_bad_targets(self):
+        """Bad targets are reported as an error."""
+        assert not NetworkTools.network_sweep("10.0.0.0/8")["success"]
@@ -0,0 +1,95 @@
+"""Tests for the lazy tool registry."""
+
+import sys
+
+import pytest
+
+from auryx_agent.tools.registry import ToolRegistry, ToolSpec, read_plugin_manifest
+
+
+PLUGIN_SOURCE = '''
+AURYX_TOOLS = {
+    "hello": {"function": "say_hello", "description": "Say hello(name)", "read_only": True},
+    "shout": "shout",
+}
+
+LOADED = True
+
+
+def say_hello(name="world"):
+    return {"success": True, "message": f"Hello, {name}!"}
+
+
+def shout(text):
+    return {"success": True, "text": text.upper()}
+'''
+
+
+class TestToolRegistry:
+    """Test suite for tool discovery and lazy loading."""
+    
+    def test_builtin_tools_are_not_imported(self):
+        """Registering built-ins must not import tool modules."""
+        registry = ToolRegistry()
+        
+        assert "get_disk_usage" in registry
+        assert "execute_command" in registry
+        assert not registry.is_loaded("get_disk_usage")
+        assert registry.spec("get_disk_usage").read_only is True
+    
+    def test_plugin_manifest_is_read_without_import(self, tmp_path):
+        """Plugin metadata comes from the AST, not from executing the file."""
+        plugin = tmp_path / "greeter.py"
+        plugin.write_text(PLUGIN_SOURCE)
+        
+        specs = read_plugin_manifest(plugin)
+        
+        assert [s.name for s in specs] == ["hello", "shout"]
+        assert specs[0].description == "Say hello(name)"
+        assert specs[0].read_only is True
+        assert "auryx_plugin_greeter" not in sys.modules
+    
+    def test_plugin_tool_imported_on_first_call(self, tmp_path):
+        """Plugin module is imported only when the tool is called."""
+        plugin = tmp_path / "greeter2.py"
+        plugin.write_text(PLUGIN_SOURCE)
+        
+        registry = ToolRegistry(specs=[])
+        assert registry.load_plugins(tmp_path) == ["hello", "shout"]
+        assert not registry.is_loaded("hello")
+        
+        result = registry["hello"](name="auryx")
+        
+        assert result == {"success": True, "message": "Hello, auryx!"}
+        assert registry.is_loaded("hello")
+        assert "hello" in registry.describe("plugin")
+        sys.modules.pop("auryx_plugin_greeter2", None)
+    
+    def test_plugins_do_not_replace_builtins(self, tmp_path):
+        """A plugin cannot silently shadow a built-in tool."""
+        plugin = tmp_path / "evil.py"
+        plugin.write_text('AURYX_TOOLS = {"read_file": "read_file"}\n')
+        
+        registry = ToolRegistry()
+        
+        assert registry.load_plugins(tmp_path) == []
+        assert registry.spec("read_file").source == "builtin"
+    
+    def test_invalid_plugins_are_ignored(self, tmp_path):
+        """Broken plugin files are skipped instead of crashing the agent."""
+        (tmp_path / "broken.py").write_text("AURYX_TOOLS = {\n")
+        (tmp_path / "dynamic.py").write_text("AURYX_TOOLS = dict(a=1)\n")
+        
+        registry = ToolRegistry(specs=[])
+        
+        assert registry.load_plugins(tmp_path) == []
+    
+    def test_callables_and_unknown_tools(self):
+        """Agent-bound callables resolve directly; unknown names raise KeyError."""
+        registry = ToolRegistry(specs=[ToolSpec(name="x", module="json", attribute="dumps")])
+        registry.update({"echo": lambda value: value})
+        
+        assert registry["echo"](value=3) == 3
+        assert registry["x"]([1]) == "[1]"
+        with pytest.raises(KeyError):
+            registry["missing"]
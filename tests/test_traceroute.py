@@ -0,0 +1,105 @@
+"""Tests for the parallel traceroute."""
+
+import pytest
+
+from auryx_agent.tools import traceroute
+from auryx_agent.tools.network_tools import NetworkTools
+from auryx_agent.tools.traceroute import Hop, parse_hop_line, recverr_supported, trace
+
+
+class TestParsing:
+    """Test suite for traceroute output parsing."""
+    
+    def test_linux_line(self):
+        """Addresses, times and timeouts are read from traceroute -n lines."""
+        hop = parse_hop_line(" 3  10.0.0.1  1.234 ms  10.0.0.2  2.5 ms *\n")
+        
+        assert hop.ttl == 3
+        assert hop.addresses == ["10.0.0.1", "10.0.0.2"]
+        assert hop.rtts == [0.001234, 0.0025, None]
+    
+    def test_windows_line(self):
+        """tracert lines with '<1 ms' times are understood."""
+        hop = parse_hop_line("  1    <1 ms    <1 ms     2 ms  192.168.1.1")
+        
+        assert hop.address == "192.168.1.1"
+        assert hop.rtts == [0.001, 0.001, 0.002]
+    
+    def test_other_lines(self):
+        """Header lines are not hops, and silent hops have full loss."""
+        assert parse_hop_line("traceroute to example.com (1.2.3.4), 30 hops max") is None
+        assert parse_hop_line(" 7  * * *").loss == 100.0
+    
+    def test_hop_output(self):
+        """Hops render like traceroute lines and as JSON-friendly dicts."""
+        hop = Hop(2, ["10.0.0.1"], "gw.local", [0.001, None])
+        
+        assert hop.text() == " 2  gw.local (10.0.0.1)  1.000 ms  *"
+        assert hop.to_dict()["loss"] == 50.0
+
+
+class TestFallback:
+    """Test suite for falling back to the traceroute command."""
+    
+    @pytest.fixture
+    def subprocess_calls(self, monkeypatch):
+        calls = []
+        
+        async def fake_subprocess(result, max_hops, probes, timeout, on_hop):
+            calls.append(result.host)
+        
+        monkeypatch.setattr(traceroute, "recverr_supported", lambda: True)
+        monkeypatch.setattr(traceroute, "_trace_subprocess", fake_subprocess)
+        return calls
+    
+    def test_before_first_hop(self, subprocess_calls, monkeypatch):
+        """A probe socket failing up front hands the trace to the command."""
+        async def failing_udp(result, *args):
+            raise OSError("no socket")
+        
+        monkeypatch.setattr(traceroute, "_trace_udp", failing_udp)
+        
+        trace("127.0.0.1", resolve=False)
+        assert subprocess_calls == ["127.0.0.1"]
+    
+    def test_after_reported_hops(self, subprocess_calls, monkeypatch):
+        """Once hops are reported, a failure ends the trace instead of repeating it."""
+        async def failing_udp(result, max_hops, probes, timeout, batch, resolve, on_hop):
+            hop = Hop(1, ["10.0.0.1"], rtts=[0.001])
+            result.hops.append(hop)
+            on_hop(hop)
+            raise OSError("socket died")
+        
+        monkeypatch.setattr(traceroute, "_trace_udp", failing_udp)
+        seen = []
+        
+        result = trace("127.0.0.1", resolve=False, on_hop=seen.append)
+        
+        assert subprocess_calls == []
+        assert [hop.ttl for hop in seen] == [1]
+        assert [hop.ttl for hop in result.hops] == [1]
+        assert result.error == "socket died"
+
+
+@pytest.mark.skipif(not recverr_supported(), reason="UDP error-queue probing needs Linux")
+class TestTrace:
+    """Test suite for live traces over loopback."""
+    
+    def test_loopback(self):
+        """Loopback is reached at the first hop, which is streamed."""
+        seen = []
+        
+        result = trace("127.0.0.1", max_hops=5, timeout=1.0, resolve=False, on_hop=seen.append)
+        
+        assert result.method == "udp"
+        assert result.reached
+        assert [hop.ttl for hop in seen] == [1]
+        assert seen[0].address == "127.0.0.1" and seen[0].loss == 0
+    
+    def test_network_tools(self):
+        """The tool returns structured hops and a text rendering."""
+        result = NetworkTools.traceroute("127.0.0.1", max_hops=3)
+        
+        assert result["success"]
+        assert result["hops"][0]["address"] == "127.0.0.1"
+        assert "127.0.0.1" in result["output"]